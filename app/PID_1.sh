@@ -16,7 +16,8 @@ fi
 
 
 cd /dcsp/app/dcsp
-python3 manage.py runserver 0.0.0.0:8000 &
+python3 manage.py migrate --noinput
+python3 -m uvicorn dcsp.asgi:application --host 0.0.0.0 --port 8000 --reload &
 
 while :
 do
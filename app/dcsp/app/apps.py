@@ -1,6 +1,19 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class AppConfig(AppConfig):  # type: ignore[no-redef]
     default_auto_field = "django.db.models.BigAutoField"
     name = "app"
+
+    def ready(self) -> None:
+        """Starts the auto-commit, if AUTO_COMMIT is set
+
+        Saves left in the journal from before a restart are then committed
+        once quiet, rather than only after the next save.
+        """
+        from app.views import auto_committer
+
+        if settings.AUTO_COMMIT:
+            auto_committer()
+        return
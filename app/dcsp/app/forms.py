@@ -1,6 +1,7 @@
 """Form management for the Django dynamic site app
 
 Classes:
+    GithubCredentials: placeholder
     InstallationForm: placeholder
     TemplateSelectForm: placeholder
     PlaceholdersForm: placeholder
@@ -17,21 +18,33 @@ Functions:
 
 from django import forms
 from django.conf import settings
+from asgiref.sync import sync_to_async
 
 import os
 import glob
 from fnmatch import fnmatch
 import sys
 
-from typing import Any
+from typing import Any, TypedDict
 
 import app.functions.constants as c
 from app.functions.constants import GhCredentials
 
 sys.path.append(c.FUNCTIONS_APP)
 from app.functions.docs_builder import Builder
-from app.functions.git_control import GitController
+from app.functions.git_control import GitController, AsyncGitController
 from app.functions.email_functions import EmailFunctions
+from app.functions.label_registry import LabelRegistry, label_registry
+
+
+class GithubCredentials(TypedDict):
+    """GitHub credentials entered on the installation form"""
+
+    github_username: str
+    email: str
+    github_organisation: str
+    github_repo: str
+    github_token: str
 
 
 def validation_response(
@@ -108,6 +121,7 @@ class InstallationForm(forms.Form):
 
     Methods:
         clean: placeholder
+        ais_valid: placeholder
 
     Fields:
         installation_type: Selection of installation type (stand alone or
@@ -205,6 +219,9 @@ class InstallationForm(forms.Form):
         ),
     )
 
+    _defer_credentials_check: bool = False
+    _credentials: GithubCredentials | None = None
+
     def clean(self) -> dict:
         """Cleans data from InstallationForm
 
@@ -225,6 +242,7 @@ class InstallationForm(forms.Form):
             code_location_I: if space in directory path.
         """
         cleaned_data: Any = self.cleaned_data
+        credentials: GithubCredentials
         installation_type: str = cleaned_data["installation_type"]
         github_username: str = cleaned_data["github_username_SA"]
         email: str = cleaned_data["email_SA"]
@@ -232,7 +250,6 @@ class InstallationForm(forms.Form):
         github_repo: str = cleaned_data["github_repo_SA"]
         github_token: str = cleaned_data["github_token_SA"]
         code_location: str = cleaned_data["code_location_I"]
-        credentials_check_results: dict[str, str | bool | None] = {}
 
         # TODO - may not need this test, as seems 'cleaned_data["installation_type"] fails with bad select data
         if installation_type != "SA" and installation_type != "I":
@@ -262,44 +279,19 @@ class InstallationForm(forms.Form):
                     "",
                 )
 
-                gc = GitController(
-                    github_username=github_username,
-                    email=email,
-                    github_organisation=github_organisation,
-                    github_repo=github_repo,
-                    github_token=github_token,
-                )
-
-                credentials_check_results = gc.check_github_credentials()
-                validation_response(
-                    self,
-                    "github_username_SA",
-                    bool(credentials_check_results["github_username_exists"]),
-                    "Username does not exist on Github",
-                )
-
-                validation_response(
-                    self,
-                    "github_organisation_SA",
-                    bool(
-                        credentials_check_results["github_organisation_exists"]
-                    ),
-                    "Organisation does not exist on Github",
-                )
+                credentials = {
+                    "github_username": github_username,
+                    "email": email,
+                    "github_organisation": github_organisation,
+                    "github_repo": github_repo,
+                    "github_token": github_token,
+                }
 
-                validation_response(
-                    self,
-                    "github_repo_SA",
-                    bool(credentials_check_results["repo_exists"]),
-                    "Repository does not exist",
-                )
-
-                validation_response(
-                    self,
-                    "github_repo_SA",
-                    credentials_check_results["permission"] == "admin",
-                    "No admin rights to this repo",
-                )
+                if self._defer_credentials_check:
+                    self._credentials = credentials
+                else:
+                    gc = GitController(**credentials)
+                    self.credentials_response(gc.check_github_credentials())
 
         if " " in github_repo:
             self.add_error("github_repo_SA", "Invalid URL")
@@ -316,6 +308,69 @@ class InstallationForm(forms.Form):
             )
         return cleaned_data
 
+    async def ais_valid(self) -> bool:
+        """Validates the form from an async view
+
+        As for is_valid, but the GitHub credentials are checked on the event
+        loop, so the worker can serve other requests while GitHub replies.
+
+        Returns:
+            bool: True if the form is valid.
+        """
+        gc: AsyncGitController
+
+        self._defer_credentials_check = True
+        try:
+            await sync_to_async(self.full_clean)()
+        finally:
+            self._defer_credentials_check = False
+
+        if self._credentials is not None:
+            gc = await sync_to_async(AsyncGitController)(**self._credentials)
+            async with gc:
+                self.credentials_response(await gc.check_github_credentials())
+            self._credentials = None
+
+        return self.is_bound and not self.errors
+
+    def credentials_response(
+        self, credentials_check_results: dict[str, str | bool | None]
+    ) -> None:
+        """Validation results for the GitHub credentials
+
+        Args:
+            credentials_check_results (dict[str, str | bool | None]): as
+                returned by GitController.check_github_credentials.
+        """
+        validation_response(
+            self,
+            "github_username_SA",
+            bool(credentials_check_results["github_username_exists"]),
+            "Username does not exist on Github",
+        )
+
+        validation_response(
+            self,
+            "github_organisation_SA",
+            bool(credentials_check_results["github_organisation_exists"]),
+            "Organisation does not exist on Github",
+        )
+
+        validation_response(
+            self,
+            "github_repo_SA",
+            bool(credentials_check_results["repo_exists"]),
+            "Repository does not exist",
+        )
+
+        validation_response(
+            self,
+            "github_repo_SA",
+            credentials_check_results["permission"] == "admin",
+            "No admin rights to this repo",
+        )
+        return
+
 
 class TemplateSelectForm(forms.Form):
     """Template selection form
@@ -517,7 +572,8 @@ class LogHazardForm(forms.Form):
     def __init__(self, *args, **kwargs) -> None:
         """Initialise the log hazard form
 
-        Gets available hazard labels and creates fields for a new hazard log.
+        Gets available hazard labels, grouped by category, and creates fields
+        for a new hazard log.
 
         Fields:
             title: title of the new hazard.
@@ -525,14 +581,16 @@ class LogHazardForm(forms.Form):
             labels: hazard labels.
         """
         super(LogHazardForm, self).__init__(*args, **kwargs)
-        gc: GitController = GitController(env_location=settings.ENV_LOCATION)
-        available_labels: list[dict[str, str]] | list[
-            str
-        ] = gc.available_hazard_labels("name_only")
+        registry: LabelRegistry = label_registry()
         labels_choices: list = []
 
-        for label in available_labels:
-            labels_choices.append([label, label])
+        for category, labels in registry.categories.items():
+            labels_choices.append(
+                [
+                    category.capitalize(),
+                    [[label, label] for label in labels],
+                ]
+            )
 
         CHOICES = tuple(labels_choices)
 
@@ -585,6 +643,86 @@ class HazardCommentForm(forms.Form):
     )
 
 
+class HazardFilterForm(forms.Form):
+    """Filters for the list of open hazards
+
+    Sent with GET, so filtered pages can be bookmarked and shared.
+
+    Fields:
+        label: only hazards with this label.
+        risk: only hazards with this risk level label.
+        text: only hazards with this text in their title or body.
+        page: page of the list to show.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Initialise the hazard filter form
+
+        Gets available hazard labels, grouped by category, for the label
+        filter, and the risk level labels for the risk filter.
+        """
+        super(HazardFilterForm, self).__init__(*args, **kwargs)
+        registry: LabelRegistry = label_registry()
+        labels_choices: list = [["", "Any label"]]
+        risk_choices: list = [["", "Any risk level"]]
+
+        for category, labels in registry.categories.items():
+            labels_choices.append(
+                [
+                    category.capitalize(),
+                    [[label, label] for label in labels],
+                ]
+            )
+
+        for label in registry.in_category("risk"):
+            risk_choices.append([label, label])
+
+        self.fields["label"] = forms.ChoiceField(
+            required=False,
+            choices=tuple(labels_choices),
+            widget=forms.Select(attrs={"class": "form-select w-auto"}),
+        )
+
+        self.fields["risk"] = forms.ChoiceField(
+            label="Risk level",
+            required=False,
+            choices=tuple(risk_choices),
+            widget=forms.Select(attrs={"class": "form-select w-auto"}),
+        )
+
+        self.fields["text"] = forms.CharField(
+            label="Text",
+            required=False,
+            max_length=200,
+            widget=forms.TextInput(attrs={"class": "form-control"}),
+        )
+
+        self.fields["page"] = forms.IntegerField(
+            required=False,
+            min_value=1,
+            widget=forms.HiddenInput(),
+        )
+
+    def labels(self) -> list[str]:
+        """Labels a hazard must have to be listed
+
+        Returns:
+            list[str]: the chosen label and risk level, if any. Empty if the
+                       form is not valid.
+        """
+        if not self.is_valid():
+            return []
+
+        return [
+            label
+            for label in (
+                self.cleaned_data["label"],
+                self.cleaned_data["risk"],
+            )
+            if label
+        ]
+
+
 class UploadToGithubForm(forms.Form):
     """Add comment for commit
 
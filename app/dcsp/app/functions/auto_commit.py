@@ -0,0 +1,284 @@
+"""Automatic commits of saved documents
+
+When turned on, each document saved by the user is recorded in a journal.
+Once no document has been saved for a quiet period, all of the saves are
+committed together, with a message listing the documents, and pushed to
+GitHub. A burst of edits becomes one commit rather than one per save. Only
+the documents saved are committed. The journal is persisted to a json file,
+so saves not yet pushed survive a restart of the web server. The file is the
+journal: it is locked, read and written again for each change, so more than
+one process can share it without losing each other's saves.
+
+Classes:
+    AutoCommit: journal saves and commit them once quiet
+
+Functions:
+    auto_commit: returns the process-wide auto-commit for a journal
+    commit_message: message for a commit of saved documents
+"""
+
+import json
+import os
+import threading
+import time as t
+from typing import Any, Callable
+
+import app.functions.constants as c
+from app.functions.constants import PushStatus
+from app.functions.locked_files import atomic_write, file_lock
+
+
+class AutoCommit:
+    def __init__(
+        self,
+        commit: Callable[[str, list[str]], dict[str, Any]],
+        journal_path: str = c.AUTO_COMMIT_JOURNAL_PATH,
+        quiet: float = c.AUTO_COMMIT_QUIET,
+        docs_path: str = c.MKDOCS_DOCS,
+    ) -> None:
+        """Initialises the AutoCommit class
+
+        Saves left in the journal from before a restart are committed after
+        the quiet period.
+
+        Args:
+            commit (Callable[[str, list[str]], dict[str, Any]]): commits and
+                pushes the documents given with the message given, returning
+                the outcome as from GitController.commit_and_push.
+            journal_path (str): location of the json file the saves are
+                                persisted to.
+            quiet (float): seconds without a save before committing.
+            docs_path (str): folder of the documents, which the documents are
+                             named relative to in the commit message.
+
+        Raises:
+            ValueError: if quiet is negative.
+        """
+        if quiet < 0:
+            raise ValueError(f"'{ quiet }' is not a valid quiet period")
+
+        self.commit: Callable[[str, list[str]], dict[str, Any]] = commit
+        self.journal_path: str = journal_path
+        self.quiet: float = quiet
+        self.docs_path: str = docs_path
+        self.commits: int = 0
+        self.last_outcome: dict[str, Any] | None = None
+        self._saves: dict[str, float] = {}
+        self._committing: bool = False
+        self._timer: threading.Timer | None = None
+        self._lock: threading.Lock = threading.Lock()
+        self._idle: threading.Event = threading.Event()
+        self._idle.set()
+
+        with file_lock(self.journal_path, shared=True):
+            self._saves = self._load()
+        if self._saves:
+            with self._lock:
+                self._idle.clear()
+                self._start_timer()
+        return
+
+    def record(self, path: str) -> None:
+        """Records a saved document and schedules a commit
+
+        Each save restarts the quiet period. Saves made while a commit is
+        running are held back for a single follow-up commit.
+
+        Args:
+            path (str): the document saved.
+        """
+        with self._lock:
+            with file_lock(self.journal_path):
+                self._saves = self._load()
+                self._saves[path] = t.time()
+                self._save()
+            self._idle.clear()
+            if not self._committing:
+                self._start_timer()
+        return
+
+    def pending(self) -> list[str]:
+        """Documents saved but not yet committed
+
+        Returns:
+            list[str]: the documents, sorted.
+        """
+        with self._lock:
+            with file_lock(self.journal_path, shared=True):
+                self._saves = self._load()
+            return sorted(self._saves)
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Waits for all scheduled commits to complete
+
+        Args:
+            timeout (float | None): seconds to wait, None to wait forever.
+
+        Returns:
+            bool: True if idle, False if timed out.
+        """
+        return self._idle.wait(timeout)
+
+    def _start_timer(self) -> None:
+        """(Re)starts the quiet period timer
+
+        Must be called with the lock held.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.quiet, self._run_commit)
+        self._timer.daemon = True
+        self._timer.start()
+        return
+
+    def _run_commit(self) -> None:
+        """Commits and pushes all the saves recorded so far
+
+        Saves are only taken off the journal once pushed, or if there was
+        nothing to commit or push. Otherwise they are kept, and committed or
+        pushed along with the next save. Only the saves committed are taken
+        off, so saves recorded meanwhile, here or by another process, are
+        kept.
+        """
+        saves: dict[str, float] = {}
+        outcome: dict[str, Any] = {}
+        pushed: bool = False
+        path: str
+
+        with self._lock:
+            with file_lock(self.journal_path, shared=True):
+                self._saves = self._load()
+            if self._committing:
+                return
+            if not self._saves:
+                # Committed by another process meanwhile
+                self._timer = None
+                self._idle.set()
+                return
+            saves = self._saves.copy()
+            self._committing = True
+            self._timer = None
+
+        try:
+            outcome = self.commit(
+                commit_message(sorted(saves), self.docs_path), sorted(saves)
+            )
+        except Exception as error:
+            outcome = {
+                "status": PushStatus.FAILED.value,
+                "commit": None,
+                "summary": f"{ type(error).__name__ }: { error }",
+            }
+
+        pushed = outcome.get("status") in (
+            PushStatus.PUSHED.value,
+            PushStatus.NOTHING_TO_COMMIT.value,
+        )
+
+        with self._lock:
+            self.commits += 1
+            self.last_outcome = outcome
+            self._committing = False
+            if pushed:
+                with file_lock(self.journal_path):
+                    self._saves = self._load()
+                    for path in saves:
+                        # Unless saved again while committing
+                        if self._saves.get(path) == saves[path]:
+                            del self._saves[path]
+                    self._save()
+            if pushed and self._saves:
+                self._start_timer()
+            else:
+                self._idle.set()
+        return
+
+    def _load(self) -> dict[str, float]:
+        """Loads the persisted journal
+
+        Returns:
+            dict[str, float]: time of the last save, keyed by document. Empty
+                              if there is no journal or it is unreadable.
+        """
+        saves: dict[str, float] = {}
+
+        if not os.path.isfile(self.journal_path):
+            return saves
+
+        try:
+            with open(self.journal_path, "r") as file:
+                saves = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        return saves
+
+    def _save(self) -> None:
+        """Persists the journal
+
+        Must be called with the lock and the journal file lock held.
+        """
+        atomic_write(self.journal_path, json.dumps(self._saves))
+        return
+
+
+_auto_commits: dict[str, AutoCommit] = {}
+_auto_commits_lock: threading.Lock = threading.Lock()
+
+
+def auto_commit(
+    commit: Callable[[str, list[str]], dict[str, Any]],
+    journal_path: str = c.AUTO_COMMIT_JOURNAL_PATH,
+    quiet: float = c.AUTO_COMMIT_QUIET,
+    docs_path: str = c.MKDOCS_DOCS,
+) -> AutoCommit:
+    """Returns the process-wide auto-commit for a journal
+
+    Created on first use, so that all saves in the process share one quiet
+    period and commits are never run concurrently.
+
+    Args:
+        commit (Callable[[str, list[str]], dict[str, Any]]): commits and
+            pushes the documents given with the message given. Only used on
+            first call.
+        journal_path (str): location of the journal.
+        quiet (float): seconds without a save before committing. Only used on
+                       first call.
+        docs_path (str): folder of the documents. Only used on first call.
+
+    Returns:
+        AutoCommit: the shared auto-commit.
+    """
+    with _auto_commits_lock:
+        if journal_path not in _auto_commits:
+            _auto_commits[journal_path] = AutoCommit(
+                commit, journal_path, quiet, docs_path
+            )
+        return _auto_commits[journal_path]
+
+
+def commit_message(paths: list[str], docs_path: str = c.MKDOCS_DOCS) -> str:
+    """Message for a commit of saved documents
+
+    Args:
+        paths (list[str]): the documents saved.
+        docs_path (str): folder the documents are named relative to.
+
+    Returns:
+        str: a summary line, then each document on its own line.
+    """
+    docs: str = os.path.abspath(docs_path)
+    names: list[str] = [
+        (
+            os.path.relpath(path, docs)
+            if os.path.commonpath([os.path.abspath(path), docs]) == docs
+            else path
+        )
+        for path in paths
+    ]
+
+    if len(names) == 1:
+        return f"Update { names[0] }"
+
+    return f"Update { len(names) } documents\n\n" + "\n".join(
+        [f"- { name }" for name in names]
+    )
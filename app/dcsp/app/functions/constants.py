@@ -16,6 +16,38 @@ FUNCTIONS_APP: str = f"{ MAIN_FOLDER }app/dcsp/app/functions/"
 # For mkdocs_control
 TIME_INTERVAL: float = 0.1
 MAX_WAIT: int = 100
+MKDOCS_REBUILD_WINDOW: float = 0.5
+
+
+# For mkdocs_builder
+LOCKS_DIR: str = "/tmp/dcsp_locks/"  # nosec B108
+
+MKDOCS_BUILDER_SOCKET: str = "/tmp/dcsp_mkdocs_builder.sock"  # nosec B108
+MKDOCS_BUILD_TIMEOUT: float = 120
+MKDOCS_PRELOAD_MODULES: list[str] = [
+    "material",
+    "mkdocs_macros",
+    "mkdocstrings",
+    "mkdocstrings_handlers.python",
+]
+
+
+# For static_site
+HASHED_ASSET_REGEX: str = r"\.[0-9a-fA-F]{8,}(\.min)?\.[A-Za-z0-9]+$"
+CACHE_CONTROL_IMMUTABLE: str = "public, max-age=31536000, immutable"
+CACHE_CONTROL_REVALIDATE: str = "no-cache"
+ETAG_CACHE_SIZE: int = 1024
+
+
+# For job_queue
+JOBS_STATUS_PATH: str = f"{ MAIN_FOLDER }app/dcsp/jobs.json"
+JOBS_WORKERS: int = 2
+JOBS_MAX_KEPT: int = 50
+
+# For auto_commit
+AUTO_COMMIT_JOURNAL_PATH: str = f"{ MAIN_FOLDER }app/dcsp/auto_commit.json"
+# Seconds without a save before the saves are committed
+AUTO_COMMIT_QUIET: float = 30
 
 
 # For mkDocs
@@ -23,6 +55,7 @@ MKDOCS: str = f"{ MAIN_FOLDER }mkdocs/"
 MKDOCS_DOCS: str = f"{ MKDOCS }docs/"
 MKDOCS_TEMPLATES: str = f"{ MKDOCS }templates/"
 MKDOCS_PLACEHOLDER_YML: str = f"{ MKDOCS_DOCS }placeholders.yml"
+MKDOCS_SITE: str = f"{ MKDOCS }site/"
 
 # .env
 ENV_PATH = f"{ MAIN_FOLDER }.env"
@@ -58,17 +91,64 @@ TESTING_MKDOCS_NO_TEMPLATES_FOLDER: str = (
 TESTING_MKDOCS_EMPTY_FOLDERS: str = (
     f"{ TESTS_LOCATION }test_docs/mkdocs_empty_folders/"
 )
+TESTING_MKDOCS_SITE: str = f"{ TESTS_LOCATION }test_docs/site/"
 TESTING_MKDOCS_LINTER: str = f"{ TESTS_LOCATION }test_docs/mkdocs_linter/"
 TESTING_MKDOCS_LINTER_DOCS: str = f"{ TESTING_MKDOCS_LINTER }docs/"
 # testing Django
 TESTING_ENV_PATH_DJANGO: str = (
     f"{ TESTS_LOCATION }test_django/.env_placeholders_test"
 )
+TESTING_JOBS_STATUS_PATH: str = f"{ TESTS_LOCATION }test_django/jobs.json"
+TESTING_AUTO_COMMIT_JOURNAL_PATH: str = (
+    f"{ TESTS_LOCATION }test_django/auto_commit.json"
+)
 
 # git and Github
 REPO_NAME: str = "digital-clinical-safety-platform"
+GITHUB_API_URL: str = "https://api.github.com"
+GITHUB_POOL_SIZE: int = 10
+GITHUB_CHECK_DEADLINE: float = 10
+GITHUB_CACHE_SIZE: int = 512
+# Set to a file path to keep the GitHub response cache between restarts
+GITHUB_CACHE_PATH: str = ""
+GITHUB_CACHE_HEADER: str = "X-DCSP-Cache"
+GITHUB_PER_PAGE: int = 100
+# Seconds before the local copy of the hazards is refreshed from GitHub
+HAZARD_SYNC_INTERVAL: int = 300
+# Used instead once GitHub is pushing changes to the hazards by webhook
+HAZARD_WEBHOOK_SYNC_INTERVAL: int = 3600
+HAZARDS_PER_PAGE: int = 20
+# Hazards read from the database at a time when the open hazards are streamed
+HAZARDS_STREAM_CHUNK: int = 50
+GITHUB_GRAPHQL_URL: str = "https://api.github.com/graphql"
+# Seconds a single hazard looked up on GitHub is reused for
+HAZARD_CACHE_SECONDS: float = 30
+HAZARD_RECENT_COMMENTS: int = 10
+# Calls of the GitHub rate limit kept for pages a user is waiting on
+GITHUB_BACKGROUND_RESERVE: int = 100
+GITHUB_BACKGROUND_WORKERS: int = 2
+GITHUB_BACKGROUND_MAX_WAIT: float = 300
+GITHUB_RETRIES: int = 3
+GITHUB_BACKOFF_BASE: float = 0.5
+GITHUB_BACKOFF_MAX: float = 30
+# Longest a page waits on GitHub, including retries
+GITHUB_INTERACTIVE_TIMEOUT: float = 5
+GITHUB_INTERACTIVE_DEADLINE: float = 8
+GITHUB_BREAKER_FAILURES: int = 5
+GITHUB_BREAKER_COOLDOWN: float = 30
+# Seconds the answer to whether a repository exists is reused for
+REPO_EXISTS_SECONDS: float = 60
+REPO_MISSING_SECONDS: float = 10
+# Seconds a git push may take before it is stopped
+GIT_PUSH_TIMEOUT: float = 60
+# GitHub asks for at least a second between calls that create content
+HAZARD_IMPORT_WORKERS: int = 4
+HAZARD_IMPORT_INTERVAL: float = 1
+
 ISSUE_LABELS_PATH: str = "/dcsp/app/dcsp/app/functions/labels.yml"
 REPO_PATH_LOCAL: str = "/dcsp"
+# Paths, relative to REPO_PATH_LOCAL, that uploads to GitHub commit
+GIT_MANAGED_PATHS: list[str] = ["mkdocs/docs/"]
 
 TESTING_GITHUB_REPO = "test-repo-exists"
 TESTING_CURRENT_ISSUE = 220
@@ -80,11 +160,36 @@ class GhCredentials(Enum):
     INVALID = "invalid"
 
 
+class JobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    FINISHED = "finished"
+    FAILED = "failed"
+
+
+class GithubPriority(Enum):
+    INTERACTIVE = "interactive"
+    BACKGROUND = "background"
+
+
+class HazardLookup(Enum):
+    NOT_FOUND = "not_found"
+
+
+class PushStatus(Enum):
+    PUSHED = "pushed"
+    NOTHING_TO_COMMIT = "nothing_to_commit"
+    REJECTED = "rejected"
+    TIMED_OUT = "timed_out"
+    FAILED = "failed"
+
+
 class EnvKeys(Enum):
     DJANGO_SECRET_KEY = "DJANGO_SECRET_KEY"  # nosec B105
     ALLOW_HOSTS = "ALLOW_HOSTS"
     DOCKERHUB_USERNAME = "DOCKERHUB_USERNAME"
     DOCKERHUB_PASSWORD = "DOCKERHUB_PASSORD"  # nosec B105
+    GITHUB_WEBHOOK_SECRET = "GITHUB_WEBHOOK_SECRET"  # nosec B105
 
 
 # Placeholder env keys
@@ -12,10 +12,11 @@ from fnmatch import fnmatch
 import re
 import yaml
 import shutil
-from typing import TextIO, Pattern
+from typing import Any, TextIO, Pattern
 
 
 import app.functions.constants as c
+from app.functions.locked_files import atomic_write, cached_read
 
 
 class Builder:
@@ -228,10 +229,8 @@ class Builder:
             None
         """
         placeholders_extra: dict = {"extra": placeholders}
-        file: TextIO
 
-        with open(self.placeholders_yml_path, "w") as file:
-            yaml.dump(placeholders_extra, file)
+        atomic_write(self.placeholders_yml_path, yaml.dump(placeholders_extra))
         return
 
     def read_placeholders(self) -> dict[str, str]:
@@ -248,18 +247,18 @@ class Builder:
         """
         placeholders_extra: dict = {}
         return_dict: dict[str, str] = {}
-        file: TextIO
 
         if not os.path.isfile(self.placeholders_yml_path):
             raise FileNotFoundError(
                 f"'{ self.placeholders_yml_path }' is not a valid path"
             )
 
-        with open(self.placeholders_yml_path, "r") as file:
-            placeholders_extra = yaml.safe_load(file)
+        placeholders_extra = cached_read(
+            self.placeholders_yml_path, _parse_yaml
+        )
 
         try:
-            return_dict = placeholders_extra["extra"]
+            return_dict = dict(placeholders_extra["extra"])
         except:
             raise ValueError(
                 "Error with placeholders yaml file, likely 'extra' missing from file"
@@ -384,3 +383,15 @@ class Builder:
             linter_results["overal"] = "fail"
 
         return linter_results
+
+
+def _parse_yaml(content: str) -> Any:
+    """Parses the content of a yaml file
+
+    Args:
+        content (str): content of the yaml file.
+
+    Returns:
+        Any: the parsed yaml.
+    """
+    return yaml.safe_load(content)
@@ -2,12 +2,24 @@
 
 Better live env manipulation than standard python library.
 
+Parsed env files are kept in a process-wide cache, so that each file is only
+parsed again once it has changed on disk. Writes are locked and atomic, see
+locked_files, so the env files can be shared by several web server workers.
+
 Classes:
     ENVManipulator: placeholder
+
+Functions:
+    clear_cache: empties the process-wide cache of parsed env files
 """
-from dotenv import set_key, dotenv_values
+import io
+from contextlib import contextmanager
+from typing import Iterator
+from dotenv import dotenv_values
 
 import app.functions.constants as c
+import app.functions.locked_files as locked_files
+from app.functions.locked_files import atomic_write, cached_read, file_lock
 
 
 class ENVManipulator:
@@ -21,6 +33,42 @@ class ENVManipulator:
                             sets.
         """
         self.env_path = env_path
+        self._batch: dict[str, str] | None = None
+        self._batch_changed: bool = False
+        return
+
+    @contextmanager
+    def batch(self) -> Iterator["ENVManipulator"]:
+        """Groups changes to the env file into a single write
+
+        Adds and deletes made within the batch are applied in memory, and then
+        written to the env file in one go when the batch ends. Nothing is
+        written if the batch raises an exception. Batches can be nested, only
+        the outermost batch writes. An exclusive lock is held on the env file
+        for the whole batch, so that changes made by other workers are not
+        lost.
+
+        Example:
+            with env_m.batch():
+                env_m.add("key1", "value1")
+                env_m.delete("key2")
+
+        Yields:
+            ENVManipulator: this env manipulator.
+        """
+        if self._batch is not None:
+            yield self
+            return
+
+        with file_lock(self.env_path):
+            self._batch = self._values()
+            self._batch_changed = False
+            try:
+                yield self
+                if self._batch_changed:
+                    self._write(self._batch)
+            finally:
+                self._batch = None
         return
 
     def delete(self, variable_to_delete: str) -> bool:
@@ -34,24 +82,13 @@ class ENVManipulator:
         Returns:
             bool: True if was present and deleted, False if was never present.
         """
-        variable_set: bool = False
-        env_variables = dotenv_values(self.env_path)  # TODO need type
-        key: str = ""
-        value2: str | None = ""
-        key2: str | None = ""
+        with self.batch():
+            if self._batch is None or variable_to_delete not in self._batch:
+                return False
 
-        for key in env_variables:
-            if key == variable_to_delete:
-                variable_set = True
-
-        if variable_set == True:
-            del env_variables[variable_to_delete]
-            open(self.env_path, "w").close()
-
-            for key2, value2 in env_variables.items():
-                set_key(self.env_path, str(key2), str(value2))
-
-        return variable_set
+            del self._batch[variable_to_delete]
+            self._batch_changed = True
+        return True
 
     def delete_all(self) -> None:
         """Remove all variables from env file
@@ -59,7 +96,10 @@ class ENVManipulator:
         Removes all the variables from the env file, keeping the file itself
         however.
         """
-        open(self.env_path, "w").close()
+        with self.batch():
+            if self._batch is not None:
+                self._batch.clear()
+            self._batch_changed = True
         return
 
     def add(self, variable: str, value: str) -> None:
@@ -74,7 +114,10 @@ class ENVManipulator:
         Returns:
             None
         """
-        set_key(self.env_path, variable, value)
+        with self.batch():
+            if self._batch is not None:
+                self._batch[variable] = value
+            self._batch_changed = True
         return
 
     def read(self, key_to_read: str) -> str:
@@ -89,8 +132,9 @@ class ENVManipulator:
             str: value of the variable. This will return empty string ("")
                  if the variable has not been set.
         """
-        dot_values: dict[str, str | None] = dotenv_values(self.env_path)
-        return str(dot_values.get(key_to_read) or "")
+        if self._batch is not None:
+            return self._batch.get(key_to_read, "")
+        return self._values().get(key_to_read, "")
 
     def read_all(self) -> dict[str, str]:
         """Reads all variables from env file
@@ -103,16 +147,68 @@ class ENVManipulator:
                             return empty string ("") if the variable has not been
                             set.
         """
-        dot_values_raw: dict[str, str | None] = dotenv_values(self.env_path)
-        dot_values_clean: dict[str, str] = {}
-        key: str = ""
-        value: str | None = ""
+        dot_values_clean: dict[str, str] = (
+            self._batch if self._batch is not None else self._values()
+        )
         sorted_dict: dict[str, str]
 
-        for key, value in dot_values_raw.items():
-            dot_values_clean[key] = str(value or "")
-
         keys_list = list(dot_values_clean.keys())
         keys_list.sort(key=str.lower)
         sorted_dict = {i: dot_values_clean[i] for i in keys_list}
         return sorted_dict
+
+    def _values(self) -> dict[str, str]:
+        """Variables in the env file, from the process-wide cache
+
+        The file is parsed again only if its modification time, inode or size
+        has changed since it was last parsed.
+
+        Returns:
+            dict[str, str]: all variables in the env file, with unset values
+                            as empty strings. Empty if the file does not exist.
+        """
+        try:
+            return cached_read(self.env_path, _parse_env).copy()
+        except FileNotFoundError:
+            return {}
+
+    def _write(self, variables: dict[str, str]) -> None:
+        """Writes all variables to the env file
+
+        The file is replaced in one go, see locked_files.atomic_write. Values
+        are quoted in the same way as dotenv's set_key.
+
+        Args:
+            variables (dict[str, str]): all variables to be in the env file.
+        """
+        lines: list[str] = []
+        key: str = ""
+        value: str = ""
+
+        for key, value in variables.items():
+            escaped_value = value.replace("'", "\\'")
+            lines.append(f"{ key }='{ escaped_value }'\n")
+
+        atomic_write(self.env_path, "".join(lines))
+        return
+
+
+def clear_cache() -> None:
+    """Empties the process-wide cache of parsed env files"""
+    locked_files.clear_cache()
+    return
+
+
+def _parse_env(content: str) -> dict[str, str]:
+    """Parses the content of an env file
+
+    Args:
+        content (str): content of the env file.
+
+    Returns:
+        dict[str, str]: all variables, with unset values as empty strings.
+    """
+    dot_values_raw: dict[str, str | None] = dotenv_values(
+        stream=io.StringIO(content)
+    )
+    return {key: str(value or "") for key, value in dot_values_raw.items()}
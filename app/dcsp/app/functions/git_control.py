@@ -5,15 +5,15 @@ on Github
 
 Classes:
     GitController: handle git and GitHub functionality
+    AsyncGitController: GitHub functionality for async views, on aiohttp
 """
 
 # TODO - need to check all function work with username and organisations as domain_name
 
 from dotenv import dotenv_values
 import sys
-from git import Repo
+from git import GitCommandError, PushInfo, RemoteProgress, Repo
 from github import (
-    Github,
     GithubException,
     Repository,
     NamedUser,
@@ -22,18 +22,91 @@ from github import (
     PaginatedList,
     Issue,
 )
-import pexpect
-import yaml
+import asyncio
+import aiohttp
 import requests
 from requests import Response, exceptions
 import os
-import subprocess  # nosec B404
-from typing import Any
+import threading
+import time as t
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterator
 
 sys.path.append("/dcsp/app/dcsp/")  # TODO temp
 import app.functions.constants as c
-from app.functions.constants import GhCredentials
+from app.functions.constants import GhCredentials, HazardLookup, PushStatus
 from app.functions.email_functions import EmailFunctions
+from app.functions.settings_store import SettingsStore
+from app.functions.github_client import GithubClient, github_client
+from app.functions.label_registry import label_registry
+from app.functions.locked_files import file_lock
+from app.functions.github_scheduler import (
+    GithubUnavailable,
+    RateLimitScheduler,
+    github_scheduler,
+)
+
+
+_HAZARD_QUERY: str = """
+query ($owner: String!, $name: String!, $number: Int!, $comments: Int!) {
+  repository(owner: $owner, name: $name) {
+    issue(number: $number) {
+      number
+      title
+      body
+      state
+      labels(first: 100) { nodes { name } }
+      comments(last: $comments) {
+        nodes { author { login } body createdAt }
+      }
+    }
+  }
+}
+"""
+
+_HAZARDS_QUERY: str = """
+query (
+  $owner: String!
+  $name: String!
+  $states: [IssueState!]
+  $first: Int!
+  $after: String
+  $comments: Int!
+  $withComments: Boolean!
+) {
+  repository(owner: $owner, name: $name) {
+    issues(
+      first: $first
+      after: $after
+      states: $states
+      orderBy: { field: CREATED_AT, direction: ASC }
+    ) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        title
+        body
+        state
+        updatedAt
+        labels(first: 100) { nodes { name } }
+        assignees(first: 100) { nodes { login } }
+        comments(last: $comments) @include(if: $withComments) {
+          totalCount
+          nodes { author { login } body createdAt }
+        }
+      }
+    }
+  }
+}
+"""
+
+_hazard_cache: dict[
+    tuple[str, str, int], tuple[float, dict[str, Any] | HazardLookup]
+] = {}
+_hazard_cache_lock: threading.Lock = threading.Lock()
+_repo_cache: dict[tuple[str, str], tuple[float, bool]] = {}
+_repo_cache_lock: threading.Lock = threading.Lock()
 
 
 class GitController:
@@ -45,7 +118,8 @@ class GitController:
         github_repo: str = c.REPO_NAME,
         github_token: str = "",
         repo_path_local: str = c.REPO_PATH_LOCAL,
-        env_location: str = c.ENV_PATH_PLACEHOLDERS,
+        env_location: str | None = None,
+        pool_size: int = c.GITHUB_POOL_SIZE,
     ) -> None:
         """Initialising GitController class
 
@@ -61,8 +135,13 @@ class GitController:
             github_repo (str): Name of the GitHub repository.
             github_token (str): GitHub token.
             repo_path_local (str): Local name of repository.
-            env_location (str): Location of .env file. Mainly changed for unit
-                                testing purposes.
+            env_location (str | None): Location of .env file to read settings
+                                       from. Defaults to None, where settings
+                                       are read from the settings store. Mainly
+                                       changed for unit testing purposes.
+            pool_size (int): maximum number of keep-alive connections to the
+                             GitHub API, shared by all GitControllers with the
+                             same credentials.
 
         Raises:
             ValueError: if a empty string is supplied as the env_location.
@@ -84,16 +163,22 @@ class GitController:
         self.email: str = ""
         self.github_organisation: str = ""
         self.github_token: str = ""
+        self.pool_size: int = pool_size
 
-        if env_location == "":
-            raise ValueError(f".env location is set to empty string")
+        dot_values: dict[str, str | None]
 
-        if not os.path.isfile(env_location):
-            raise ValueError(
-                f"'{ env_location }' path for .env file does not exist"
-            )
+        if env_location is None:
+            dot_values = dict(SettingsStore().read_all())
+        else:
+            if env_location == "":
+                raise ValueError(f".env location is set to empty string")
+
+            if not os.path.isfile(env_location):
+                raise ValueError(
+                    f"'{ env_location }' path for .env file does not exist"
+                )
 
-        dot_values = dotenv_values(env_location)
+            dot_values = dotenv_values(env_location)
 
         if github_username == "":
             self.github_username = str(dot_values.get("GITHUB_USERNAME") or "")
@@ -155,32 +240,141 @@ class GitController:
                 )
         return None
 
-    # TODO #28 - need to find a good way to see if github token and username pair is valid
-    # TODO #29 - need to handle 404, 500, Timeout and connection errors
-    def check_github_credentials(self) -> dict[str, str | bool | None]:
+    def client(self) -> GithubClient:
+        """Shared GitHub client for these credentials
+
+        Returns:
+            GithubClient: pooled requests session and PyGithub instance.
+        """
+        return github_client(
+            self.github_username, self.github_token, self.pool_size
+        )
+
+    def check_github_credentials(
+        self, deadline: float = c.GITHUB_CHECK_DEADLINE
+    ) -> dict[str, str | bool | None]:
         """Checking Github credentials
 
         If no organisation is provided, then username will be used for repo storage location
 
+        The username, organisation and repository checks are independent, so
+        are run at the same time. The collaborator permission is checked as
+        soon as the repository is found to exist. All checks share the one
+        deadline.
+
+        Args:
+            deadline (float): seconds allowed for all of the checks.
+
         Returns:
             dict: a dictionary with 4 values covering the validity of the credentials supplied
                   in the initialisation of the GitController class
+
+        Raises:
+            requests.exceptions.Timeout: if the checks do not complete within
+                                         the deadline.
         """
-        g: Github
         github_username_exists: bool = False
         github_organisation_exists: bool = False
         repo_exists: bool = False
         permission: str | None = None
         results: dict[str, str | bool | None] = {}
-        username_request: Response
-        repo_request: Response
-        repo: Repository.Repository
+        executor: ThreadPoolExecutor
+        checks: dict[str, Future] = {}
+        not_done: set[Future] = set()
+        end_time: float = t.monotonic() + deadline
+
+        executor = ThreadPoolExecutor(
+            max_workers=3, thread_name_prefix="dcsp-credentials"
+        )
+        try:
+            checks = {
+                "username": executor.submit(self.username_exists),
+                "organisation": executor.submit(
+                    self.organisation_exists, self.github_organisation
+                ),
+                "repo": executor.submit(self._repo_permission, end_time),
+            }
+            _, not_done = wait(checks.values(), timeout=deadline)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if not_done:
+            raise requests.exceptions.Timeout(
+                "Timeout while connecting to GitHub API"
+            )
+
+        # Raises any error in the same order as the checks would run one by one
+        github_username_exists = checks["username"].result()
+        github_organisation_exists = checks["organisation"].result()
+        repo_exists, permission = checks["repo"].result()
+
+        results = {
+            "github_username_exists": github_username_exists,
+            "github_organisation_exists": github_organisation_exists,
+            "repo_exists": repo_exists,
+            "permission": permission,
+        }
+        return results
+
+    def _repo_permission(self, end_time: float) -> tuple[bool, str | None]:
+        """Checks the repository exists, and if so the collaborator permission
+
+        Args:
+            end_time (float): monotonic time of the deadline of the checks.
+                              The permission is not looked up once passed.
+
+        Returns:
+            tuple[bool, str | None]: if the repository exists, and the
+                                     permission of the user on it. None if
+                                     the user is not a collaborator.
+
+        Raises:
+            requests.exceptions.Timeout: if the deadline passes before the
+                                         permission is looked up.
+            GithubException: if GitHub returns an error other than not found
+                             for the permission.
+        """
+        client: GithubClient
+        repo_name: str = f"{ self.repo_domain_name() }/{ self.github_repo }"
+        repo_exists: bool = self.repo_exists()
+        permission: str | None = None
+
+        if not repo_exists:
+            return repo_exists, permission
+
+        if t.monotonic() > end_time:
+            raise requests.exceptions.Timeout(
+                "Timeout while connecting to GitHub API"
+            )
+
+        client = self.client()
+        try:
+            permission = client.call(
+                "GET",
+                f"/repos/{ repo_name }/collaborators/{ self.github_username }/permission",
+                lambda: client.github.get_repo(
+                    repo_name, lazy=True
+                ).get_collaborator_permission(self.github_username),
+            )
+        except GithubException as error:
+            if error.status != 404:
+                raise
+        return True, permission
+
+    def username_exists(self) -> bool:
+        """Checks if the GitHub username exists
+
+        Returns:
+            bool: True if exists, False if does not.
 
-        # TODO ? manage rate limiters
+        Raises:
+            ValueError: if bad return code from GET request
+        """
+        username_request: Response
 
         try:
-            username_request = requests.get(
-                f"https://api.github.com/users/{ self.github_username }",
+            username_request = self.client().get(
+                f"{ c.GITHUB_API_URL }/users/{ self.github_username }",
                 auth=(self.github_username, self.github_token),
                 timeout=10,
             )
@@ -194,21 +388,28 @@ class GitController:
             )
 
         if username_request.status_code == 200:
-            github_username_exists = True
+            return True
         elif username_request.status_code == 404:
-            github_username_exists = False
+            return False
         else:
             raise ValueError(
                 f"Error with Github username checking. Returned value of: {username_request.status_code }"
             )
 
-        github_organisation_exists = self.organisation_exists(
-            self.github_organisation
-        )
+    def repo_exists(self) -> bool:
+        """Checks if the GitHub repository exists
+
+        Returns:
+            bool: True if exists, False if does not.
+
+        Raises:
+            ValueError: if bad return code from GET request
+        """
+        repo_request: Response
 
         try:
-            repo_request = requests.get(
-                f"https://api.github.com/repos/{ self.repo_domain_name() }/{ self.github_repo }",
+            repo_request = self.client().get(
+                f"{ c.GITHUB_API_URL }/repos/{ self.repo_domain_name() }/{ self.github_repo }",
                 auth=(self.github_organisation, self.github_token),
                 timeout=10,
             )
@@ -222,35 +423,14 @@ class GitController:
             )
 
         if repo_request.status_code == 200:
-            repo_exists = True
-
-            # patch
-            g = Github(self.github_username, self.github_token)
-            repo = g.get_repo(
-                f"{ self.repo_domain_name() }/{ self.github_repo }"
-            )
-
-            try:
-                permission = repo.get_collaborator_permission(
-                    self.github_username
-                )
-            except GithubException:
-                pass
+            return True
         elif repo_request.status_code == 404:
-            repo_exists = False
+            return False
         else:
             raise ValueError(
                 f"Error with Github repo checking. Returned value of: {repo_request.status_code }"
             )
 
-        results = {
-            "github_username_exists": github_username_exists,
-            "github_organisation_exists": github_organisation_exists,
-            "repo_exists": repo_exists,
-            "permission": permission,
-        }
-        return results
-
     def organisation_exists(self, organisation: str) -> bool:
         """Checks if the GitHub organisation exists
 
@@ -269,10 +449,9 @@ class GitController:
         organisation_request: Response
         github_organisation_exists: bool = False
 
-        # TODO will need to manage other errors like time outs and rate limiters
         try:
-            organisation_request = requests.get(
-                f"https://api.github.com/users/{ organisation }",
+            organisation_request = self.client().get(
+                f"{ c.GITHUB_API_URL }/users/{ organisation }",
                 auth=(self.github_organisation, self.github_token),
                 timeout=10,
             )
@@ -296,40 +475,36 @@ class GitController:
 
         return github_organisation_exists
 
-    def get_repos(self, github_user_org: str) -> list[str]:
-        """Returns a list of repositories for a user or organisation
+    def get_repos(self, github_user_org: str) -> Iterator[str]:
+        """Repositories of a user or organisation
 
-        Gets a list of repositories under a specified user or organisation
+        Pages of repositories are requested from GitHub as the names are used,
+        so stopping early saves requesting the rest.
 
         Args:
             github_user_org (str): the username or organisation to look for the
                                    repositories under.
 
-        Returns:
-            list[str]: a list of repositories. Returns empty list if unsuccessful in
-                       getting.
+        Yields:
+            str: name of each repository.
 
         Raises:
             ValueError: if unable to get user or organisation.
         """
-        g: Github
-        github_user: NamedUser.NamedUser | AuthenticatedUser.AuthenticatedUser
-        repos_found: list[str] = []
-        repo: Repository.Repository
-
-        g = Github(self.github_username, self.github_token)
+        repo: dict[str, Any]
 
         try:
-            github_user = g.get_user(github_user_org)
-        except GithubException as error:
+            for repo in self.client().get_all(
+                f"{ c.GITHUB_API_URL }/users/{ github_user_org }/repos",
+                auth=(self.github_username, self.github_token),
+                timeout=10,
+            ):
+                yield repo["name"]
+        except requests.exceptions.HTTPError as error:
             raise ValueError(
-                f"Error with getting user / organisastion '{ github_user_org }', returned - '{ error.data['message'] }'"
+                f"Error with getting user / organisastion '{ github_user_org }', returned - '{ _error_message(error) }'"
             )
-        else:
-            for repo in github_user.get_repos():
-                repos_found.append(repo.name)
-
-        return repos_found
+        return
 
     def current_repo_on_github(
         self, github_user_org: str, github_repo: str
@@ -337,7 +512,9 @@ class GitController:
         """Checks if supplied repository is on GitHub
 
         Checks if the supplied repository name is on GitHub, in the format
-        "github_user_org/github_repo".
+        "github_user_org/github_repo", with a single request for the
+        repository. The answer is reused for c.REPO_EXISTS_SECONDS if the
+        repository exists, or c.REPO_MISSING_SECONDS if it does not.
 
         Args:
             github_user_org (str): the username or organisation that the
@@ -347,14 +524,37 @@ class GitController:
         Returns:
             bool: True if is a current repository under the user/organisation
                   or False if not.
+
+        Raises:
+            ValueError: if bad return code from GET request
         """
-        current_repos_on_github: list[str] = self.get_repos(github_user_org)
-        # print("")
-        # print(str(current_repos_on_github))
-        if github_repo in current_repos_on_github:
-            return True
+        key: tuple[str, str] = self._repo_key(github_user_org, github_repo)
+        repo_request: Response
+        exists: bool = False
+
+        with _repo_cache_lock:
+            if key in _repo_cache:
+                if t.monotonic() < _repo_cache[key][0]:
+                    return _repo_cache[key][1]
+                del _repo_cache[key]
+
+        repo_request = self.client().get(
+            f"{ c.GITHUB_API_URL }/repos/{ github_user_org }/{ github_repo }",
+            auth=(self.github_username, self.github_token),
+            timeout=10,
+        )
+
+        if repo_request.status_code == 200:
+            exists = True
+        elif repo_request.status_code == 404:
+            exists = False
         else:
-            return False
+            raise ValueError(
+                f"Error with Github repo checking. Returned value of: {repo_request.status_code }"
+            )
+
+        self._remember_repo(github_user_org, github_repo, exists)
+        return exists
 
     def create_repo(self, github_use_org: str, github_repo: str) -> bool:
         """Create a new repository on GitHub
@@ -373,8 +573,9 @@ class GitController:
         Raises:
             ValueError: if invalid credentials supplied to
                         'current_repo_on_github'.
+            ValueError: if the organisation does not exist.
         """
-        g: Github
+        client: GithubClient
         github_get: Organization.Organization
 
         try:
@@ -383,9 +584,23 @@ class GitController:
         except ValueError as error:
             raise ValueError(f"{ error }")
 
-        g = Github(self.github_username, self.github_token)
-        github_get = g.get_organization(github_use_org)
-        github_get.create_repo(github_repo)
+        client = self.client()
+        try:
+            github_get = client.call(
+                "GET",
+                f"/orgs/{ github_use_org }",
+                lambda: client.github.get_organization(github_use_org),
+            )
+        except GithubException as error:
+            raise ValueError(
+                f"Error with getting user / organisastion '{ github_use_org }', returned - '{ error.data['message'] }'"
+            )
+        client.call(
+            "POST",
+            f"/orgs/{ github_use_org }/repos",
+            lambda: github_get.create_repo(github_repo),
+        )
+        self._remember_repo(github_use_org, github_repo, True)
         return True
 
     def delete_repo(self, github_use_org: str, github_repo: str) -> bool:
@@ -401,103 +616,261 @@ class GitController:
         Returns:
             bool: False if does not exist. True if exists and deleted.
         """
-        g: Github
-        github_get: Organization.Organization
-        repo: Repository.Repository
+        client: GithubClient
 
         if not self.current_repo_on_github(github_use_org, github_repo):
             return False
 
-        g = Github(self.github_username, self.github_token)
-        github_get = g.get_organization(github_use_org)
-        repo = github_get.get_repo(github_repo)
-        repo.delete()
+        client = self.client()
+        client.call(
+            "DELETE",
+            f"/repos/{ github_use_org }/{ github_repo }",
+            lambda: client.github.get_organization(github_use_org)
+            .get_repo(github_repo)
+            .delete(),
+        )
+        self._remember_repo(github_use_org, github_repo, False)
         return True
 
-    # TODO #20 - needs lots of testing
-    # TODO - need to figure out if it failed
-    # TODO - also need to make sure a push to gh pages is set on Github
+    def _repo_key(
+        self, github_user_org: str, github_repo: str
+    ) -> tuple[str, str]:
+        """Key of a repository in the cache of repositories looked up
+
+        GitHub names are not case sensitive.
+
+        Args:
+            github_user_org (str): username or organisation of the repository.
+            github_repo (str): name of the repository.
+
+        Returns:
+            tuple[str, str]: username and repository.
+        """
+        return (
+            self.github_username,
+            f"{ github_user_org }/{ github_repo }".lower(),
+        )
+
+    def _remember_repo(
+        self, github_user_org: str, github_repo: str, exists: bool
+    ) -> None:
+        """Caches whether a repository exists
+
+        Args:
+            github_user_org (str): username or organisation of the repository.
+            github_repo (str): name of the repository.
+            exists (bool): True if the repository exists.
+        """
+        expires: float = t.monotonic() + (
+            c.REPO_EXISTS_SECONDS if exists else c.REPO_MISSING_SECONDS
+        )
+
+        with _repo_cache_lock:
+            _repo_cache[self._repo_key(github_user_org, github_repo)] = (
+                expires,
+                exists,
+            )
+        return
+
     def commit_and_push(
         self,
         commit_message: str = "Automated commit",
         verbose: bool = False,
-    ) -> bool:
+        progress: Callable[[dict[str, Any]], None] | None = None,
+        timeout: float = c.GIT_PUSH_TIMEOUT,
+        paths: list[str] | None = None,
+    ) -> dict[str, Any]:
         """Commits changes and then pushes to repo
 
-        Initially checks if the git configs are set, and if not sets
-        The username and email. Then commits the changes with the supplied
-        message. If verbose is set to true, then a print out of the pexpect
-        execution is given.
+        Changes under the managed paths, the documents and placeholders, are
+        committed with the supplied message, then pushed to the remote
+        "origin". Nothing else in the repository is staged or committed, and
+        the status of the managed paths is checked first so that nothing is
+        done at all if they have not changed and the branch has no commits
+        that are not yet on the remote. Commits left by an earlier push that
+        failed are pushed even if nothing has changed since. If git has no
+        user name or email set for the repository, the GitHub username and
+        email are used for the commit. Nothing is written to the git config.
+
+        The token is handed to git by a credential helper that reads it from
+        the environment of the push, so it is never written to disk or put in
+        the remote URL, and git never prompts for it.
+
+        Commits and pushes of the same local repository, from the manual
+        upload or the auto-commit, in any web server worker, run one at a
+        time.
 
         Args:
             commit_message (str): message for the commit
-            verbose (bool): set to True to display stdout of push.
+            verbose (bool): set to True to print the progress of the push.
+            progress (Callable[[dict[str, Any]], None] | None): called with
+                each progress event of the push, with the stage, the current
+                and total counts and git's message.
+            timeout (float): seconds the push may take before it is stopped.
+            paths (list[str] | None): paths to commit, relative to the local
+                repository. Sets to c.GIT_MANAGED_PATHS if None.
 
         Returns:
-            bool: currently returns False if commit fails
+            dict[str, Any]: status (a PushStatus value), the commit pushed,
+                            a summary from git, the seconds the push took and
+                            the files changed.
         """
+        with file_lock(os.path.join(self.repo_path_local, ".git")):
+            return self._commit_and_push(
+                commit_message, verbose, progress, timeout, paths
+            )
 
-        repo = Repo(self.repo_path_local)
+    def _commit_and_push(
+        self,
+        commit_message: str,
+        verbose: bool,
+        progress: Callable[[dict[str, Any]], None] | None,
+        timeout: float,
+        paths: list[str] | None,
+    ) -> dict[str, Any]:
+        """Commits changes and then pushes to repo, with the lock held
 
-        # TODO #19 - how will this work with lots of other users.
-        try:
-            repo.config_reader().get_value("user", "name")
-            repo.config_reader().get_value("user", "email")
-        except:
-            subprocess.Popen(
-                [
-                    "/usr/bin/git",
-                    "config",
-                    "--global",
-                    "user.name",
-                    self.github_username,
-                ],
-                shell=False,
-            ).wait()  # nosec B603
-
-            subprocess.Popen(
-                [
-                    "/usr/bin/git",
-                    "config",
-                    "--global",
-                    "user.email",
-                    self.email,
-                ],
-                shell=False,
-            ).wait()  # nosec B603
-
-        repo = Repo(self.repo_path_local)
-        repo.git.add("--all")
+        Args:
+            as for commit_and_push.
+
+        Returns:
+            dict[str, Any]: as for commit_and_push.
+        """
+        repo: Repo = Repo(self.repo_path_local)
+        identity: dict[str, str] = {}
+        commit: str | None = None
+        start: float = 0
+        infos: list[PushInfo] = []
+        files: list[str] = []
+        existing: list[str] = []
+
+        if paths is None:
+            paths = c.GIT_MANAGED_PATHS
+
+        files = _changed_files(repo, paths)
+        if not files and not _unpushed_commits(repo):
+            return _push_outcome(
+                PushStatus.NOTHING_TO_COMMIT, None, "Nothing to commit"
+            )
+
+        if files:
+            if not _has_identity(repo):
+                identity = {
+                    "GIT_AUTHOR_NAME": self.github_username,
+                    "GIT_AUTHOR_EMAIL": self.email,
+                    "GIT_COMMITTER_NAME": self.github_username,
+                    "GIT_COMMITTER_EMAIL": self.email,
+                }
+
+            # git add fails on a path that is not there, and a path that has
+            # gone entirely is still committed from its changed files below
+            existing = [
+                path
+                for path in paths
+                if os.path.exists(os.path.join(self.repo_path_local, path))
+            ]
+            if existing:
+                repo.git.add("--all", "--", *existing)
+
+            try:
+                with repo.git.custom_environment(**identity):
+                    # Only the changed files, even if more is staged
+                    repo.git.commit("-m", commit_message, "--", *files)
+            except GitCommandError as error:
+                return _push_outcome(
+                    PushStatus.FAILED,
+                    None,
+                    str(error.stderr).strip(),
+                    files=files,
+                )
+
+        commit = repo.head.commit.hexsha
+        start = t.monotonic()
 
         try:
-            # This fails if branch is up to date
-            repo.git.commit("-m", commit_message)
-        except Exception as e:
-            return False
+            with repo.git.custom_environment(**self._credential_environment()):
+                infos = list(
+                    repo.remote(name="origin").push(
+                        progress=_PushProgress(progress, verbose),
+                        kill_after_timeout=timeout,
+                    )
+                )
+        except GitCommandError as error:
+            if t.monotonic() - start >= timeout:
+                return _push_outcome(
+                    PushStatus.TIMED_OUT,
+                    commit,
+                    f"Push stopped after { timeout } seconds",
+                    start,
+                    files,
+                )
+            return _push_outcome(
+                PushStatus.FAILED,
+                commit,
+                str(error.stderr).strip(),
+                start,
+                files,
+            )
 
-        # origin = repo.remote(name="origin")
+        if not infos:
+            return _push_outcome(
+                PushStatus.FAILED, commit, "No reply from remote", start, files
+            )
+
+        for info in infos:
+            if info.flags & (
+                PushInfo.ERROR | PushInfo.REJECTED | PushInfo.REMOTE_REJECTED
+            ):
+                return _push_outcome(
+                    PushStatus.REJECTED,
+                    commit,
+                    info.summary.strip(),
+                    start,
+                    files,
+                )
 
-        # TODO - need to error handle this part with 'try'
-        child = pexpect.spawn("git push", timeout=10)
-        child.expect("Username for 'https://github.com': ")
-        child.sendline(self.github_username)
-        child.expect(
-            f"Password for 'https://{ self.github_username }@github.com': "
+        return _push_outcome(
+            PushStatus.PUSHED,
+            commit,
+            "; ".join([info.summary.strip() for info in infos]),
+            start,
+            files,
         )
-        child.sendline(self.github_token)
-
-        if verbose:
-            output = child.readline()
-            while b"\r\n" in output:
-                split = output.split(b"\r")
-                for s in split:
-                    print(s.decode("ascii"))
-                output = child.readline()
-        else:
-            child.wait()
-        return True
 
-    def hazard_log(self, title: str, body: str, labels: list[str]) -> None:
+    def _credential_environment(self) -> dict[str, str]:
+        """Environment for git to push with the GitHub token
+
+        Any credential helpers already configured are cleared, then a helper
+        is added that answers with the username and token from this
+        environment. Prompting is switched off, so a push with bad
+        credentials fails rather than waits.
+
+        Returns:
+            dict[str, str]: environment variables for the push.
+        """
+        return {
+            "GIT_TERMINAL_PROMPT": "0",
+            "GIT_CONFIG_COUNT": "2",
+            "GIT_CONFIG_KEY_0": "credential.helper",
+            "GIT_CONFIG_VALUE_0": "",
+            "GIT_CONFIG_KEY_1": "credential.helper",
+            "GIT_CONFIG_VALUE_1": (
+                "!f() { "
+                'echo "username=$DCSP_GIT_USERNAME"; '
+                'echo "password=$DCSP_GIT_TOKEN"; '
+                "}; f"
+            ),
+            "DCSP_GIT_USERNAME": self.github_username,
+            "DCSP_GIT_TOKEN": self.github_token,
+        }
+
+    def hazard_log(
+        self,
+        title: str,
+        body: str,
+        labels: list[str],
+        check_labels: bool = True,
+    ) -> int:
         """Uses GitHub issues to log a new hazard
 
         Hazards are logged as issues on GitHub
@@ -506,45 +879,50 @@ class GitController:
             title (str): Title for the issue.
             body (str): Body for the issue.
             labels (list[str]): a list of labels for the issue.
+            check_labels (bool): set to False if the labels have already been
+                                 checked, for example by a bulk import.
 
         Returns:
-            None
+            int: number of the new hazard (issue).
 
         Raises:
             ValueError: if a hazard label is not valid
             ValueError: if issue with accessing the repo
         """
-        g: Github
-        repo: Repository.Repository
+        client: GithubClient
+        repo_name: str = f"{ self.repo_domain_name() }/{ self.github_repo }"
+        issue: Issue.Issue
+        invalid_labels: list[str] = []
 
-        for label in labels:
-            if not self.verify_hazard_label(label):
+        if check_labels:
+            invalid_labels = label_registry().invalid(labels)
+            if invalid_labels:
                 raise ValueError(
-                    f"'{ label }' is not a valid hazard label. Please review label.yml for available values."
+                    f"'{ invalid_labels[0] }' is not a valid hazard label. Please review label.yml for available values."
                 )
 
-        g = Github(self.github_username, self.github_token)
+        client = self.client()
 
         try:
-            repo = g.get_repo(
-                f"{ self.repo_domain_name() }/{ self.github_repo }"
-            )
-            repo.create_issue(
-                title=title,
-                body=body,
-                labels=labels,
+            issue = client.call(
+                "POST",
+                f"/repos/{ repo_name }/issues",
+                lambda: client.github.get_repo(
+                    repo_name, lazy=True
+                ).create_issue(title=title, body=body, labels=labels),
             )
         except GithubException as error:
             raise ValueError(
                 f"Error with accessing repo '{ self.repo_domain_name() }/{ self.github_repo }', return value '{ error.data['message'] }'"
             )
 
-        return
+        return issue.number
 
     def available_hazard_labels(self, details: str = "full") -> list:
         """Provides a list of available hazard labels
 
-        Reads from the labels yaml file and returns a list of valid hazard labels
+        Returns the valid hazard labels from the label registry, which only
+        reads the labels yaml file again when it changes.
 
         Args:
             details (str): full = all details of all hazard labels. name_only =
@@ -558,34 +936,21 @@ class GitController:
             ValueError: if details argument is not "full" or "name_only"
             FileNotFoundError: if a bad file path is given for the labels yaml.
         """
-        issues_yml: list[dict[str, str]]
-        issues_names_only: list[str] = []
-
         if details != "full" and details != "name_only":
             raise ValueError(
                 f"'{ details }' is not a valid option for return values of hazard labels"
             )
 
-        try:
-            with open(c.ISSUE_LABELS_PATH, "r") as file:
-                issues_yml = yaml.safe_load(file)
-        except FileNotFoundError:
-            raise FileNotFoundError(
-                f"Labels.yml does not exist at '{ c.ISSUE_LABELS_PATH }'"
-            )
-
         if details == "full":
-            return issues_yml
+            return label_registry().definitions()
         else:
-            for label_definition in issues_yml:
-                issues_names_only.append(label_definition["name"].lower())
-            return issues_names_only
+            return list(label_registry().names)
 
     def verify_hazard_label(self, label: str) -> bool:
         """Checks if a label name is valid
 
-        Checking against all known valid hazard labels, checks if label name
-        supplied is valid.
+        Checks the label name exactly matches (ignoring case) one of the known
+        valid hazard labels.
 
         Args:
             label (str): label to be examined.
@@ -593,14 +958,7 @@ class GitController:
         Returns:
             bool: True if a valid label, False if not.
         """
-        issues_yml: list = self.available_hazard_labels("name_only")
-        label_name: str = ""
-
-        for label_name in issues_yml:
-            if label.lower() in label_name.lower():
-                return True
-
-        return False
+        return label_registry().is_valid(label)
 
     def hazards_open(self) -> list[dict[str, Any]]:
         """Returns a list of open hazards on GitHub
@@ -613,38 +971,236 @@ class GitController:
         Raises:
             ValueError: if error with accessing the repository
         """
-        g: Github
         hazards_open: list[dict[str, Any]] = []
-        label_list: list = []
-        issue: Any
-        open_issues: PaginatedList.PaginatedList
-        repo: Repository.Repository
+        issue: dict[str, Any]
+
+        try:
+            for issue in self.client().get_all(
+                f"{ c.GITHUB_API_URL }/repos/{ self.repo_domain_name() }/{ self.github_repo }/issues",
+                params={"state": "open"},
+                auth=(self.github_username, self.github_token),
+                timeout=10,
+            ):
+                hazards_open.append(
+                    {
+                        "number": issue["number"],
+                        "title": issue["title"],
+                        "body": issue["body"],
+                        "labels": [label["name"] for label in issue["labels"]],
+                    }
+                )
+        except requests.exceptions.HTTPError as error:
+            raise ValueError(
+                f"Error with accessing repo '{ self.repo_domain_name() }/{ self.github_repo }', return value '{ _error_message(error) }'"
+            )
+        return hazards_open
 
-        g = Github(self.github_username, self.github_token)
+    def hazard(self, number: int) -> dict[str, Any] | HazardLookup:
+        """Looks up a single hazard on GitHub
+
+        The hazard, its labels and its most recent comments are fetched in one
+        GraphQL query. Results are reused for c.HAZARD_CACHE_SECONDS, so
+        reloading a page does not go back to GitHub. Callers must not change
+        the returned value, as it is shared.
+
+        Args:
+            number (int): hazard (issue) number.
+
+        Returns:
+            dict[str, Any] | HazardLookup: number, title, body, labels, state
+                                           and comments of the hazard, or
+                                           HazardLookup.NOT_FOUND if there is
+                                           no issue with that number.
+
+        Raises:
+            ValueError: if error with accessing the repository
+        """
+        key: tuple[str, str, int] = self._hazard_key(number)
+        cached: dict[str, Any] | HazardLookup | None = _cached_hazard(key)
+        response: Response
+        data: dict[str, Any]
+        result: dict[str, Any] | HazardLookup
+
+        if cached is not None:
+            return cached
+
+        response = self.client().post(
+            c.GITHUB_GRAPHQL_URL,
+            json=self._hazard_query(number),
+            headers={"Authorization": f"bearer { self.github_token }"},
+            timeout=10,
+        )
 
         try:
-            repo = g.get_repo(
-                f"{ self.repo_domain_name() }/{ self.github_repo }"
+            response.raise_for_status()
+            data = response.json()
+        except (requests.exceptions.HTTPError, ValueError) as error:
+            raise ValueError(
+                f"Error with accessing repo '{ key[1] }', return value '{ error }'"
             )
-            open_issues = repo.get_issues(state="open")
-        except GithubException as error:
+
+        result = _hazard_result(key[1], data)
+        _remember_hazard(key, result)
+        return result
+
+    def hazards_full(
+        self,
+        state: str = "open",
+        comments: int = c.HAZARD_RECENT_COMMENTS,
+    ) -> Iterator[dict[str, Any]]:
+        """Hazards with their labels, assignees and recent comments
+
+        Hazards are fetched with GraphQL in pages of c.GITHUB_PER_PAGE, each
+        page bringing the labels, assignees and most recent comments of its
+        hazards with it, so a full hazard log costs one request per page
+        rather than one or more per hazard. Pages are requested as the hazards
+        are used, oldest hazard first. Pull requests are not included.
+
+        Where the usual number of recent comments is fetched, each hazard is
+        also added to the cache used by hazard().
+
+        Args:
+            state (str): "open", "closed" or "all".
+            comments (int): number of most recent comments to fetch for each
+                            hazard, from 0 to 100.
+
+        Yields:
+            dict[str, Any]: number, title, body, labels, assignees, state,
+                            updated_at, comments and comment_count of each
+                            hazard.
+
+        Raises:
+            ValueError: if state or comments is not valid.
+            ValueError: if error with accessing the repository
+        """
+        states: dict[str, list[str] | None] = {
+            "open": ["OPEN"],
+            "closed": ["CLOSED"],
+            "all": None,
+        }
+        repo: str = f"{ self.repo_domain_name() }/{ self.github_repo }"
+        variables: dict[str, Any]
+        response: Response
+        data: dict[str, Any]
+        issues: dict[str, Any]
+        issue: dict[str, Any]
+        hazard: dict[str, Any]
+
+        if state not in states:
+            raise ValueError(f"'{ state }' is not a valid hazard state")
+
+        if not 0 <= comments <= 100:
             raise ValueError(
-                f"Error with accessing repo '{ self.repo_domain_name() }/{ self.github_repo }', return value '{ error.data['message'] }'"
+                f"'{ comments }' is not a valid number of comments"
+            )
+
+        variables = {
+            "owner": self.repo_domain_name(),
+            "name": self.github_repo,
+            "states": states[state],
+            "first": c.GITHUB_PER_PAGE,
+            "after": None,
+            "comments": max(comments, 1),
+            "withComments": comments > 0,
+        }
+
+        while True:
+            response = self.client().post(
+                c.GITHUB_GRAPHQL_URL,
+                json={"query": _HAZARDS_QUERY, "variables": variables},
+                headers={"Authorization": f"bearer { self.github_token }"},
+                timeout=10,
+            )
+
+            try:
+                response.raise_for_status()
+                data = response.json()
+            except (requests.exceptions.HTTPError, ValueError) as error:
+                raise ValueError(
+                    f"Error with accessing repo '{ repo }', return value '{ error }'"
+                )
+
+            if (data.get("data") or {}).get("repository") is None:
+                raise ValueError(
+                    f"Error with accessing repo '{ repo }', return value '{ _graphql_error(data) }'"
+                )
+
+            issues = data["data"]["repository"]["issues"]
+            for issue in issues["nodes"]:
+                hazard = _graphql_issue(issue) | {
+                    "assignees": [
+                        assignee["login"]
+                        for assignee in issue["assignees"]["nodes"]
+                    ],
+                    "updated_at": issue["updatedAt"],
+                    "comment_count": (issue.get("comments") or {}).get(
+                        "totalCount", 0
+                    ),
+                }
+                if comments == c.HAZARD_RECENT_COMMENTS:
+                    _remember_hazard(self._hazard_key(issue["number"]), hazard)
+                yield hazard
+
+            if not issues["pageInfo"]["hasNextPage"]:
+                break
+            variables["after"] = issues["pageInfo"]["endCursor"]
+        return
+
+    def hazards_updated(
+        self, since: datetime | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """Hazards, open or closed, that have changed on GitHub
+
+        Hazards are returned in the order they were last updated, oldest first,
+        so a sync that stops part way can carry on from the last one it saw.
+        Pull requests, which GitHub also returns as issues, are skipped.
+
+        Args:
+            since (datetime | None): only return hazards updated at or after
+                                     this time. All hazards if None.
+
+        Yields:
+            dict[str, Any]: number, title, body, labels, state and updated_at
+                            of each hazard.
+
+        Raises:
+            ValueError: if error with accessing the repository
+        """
+        params: dict[str, str] = {
+            "state": "all",
+            "sort": "updated",
+            "direction": "asc",
+        }
+        issue: dict[str, Any]
+
+        if since is not None:
+            params["since"] = since.astimezone(timezone.utc).strftime(
+                "%Y-%m-%dT%H:%M:%SZ"
             )
 
-        for issue in open_issues:
-            label_list.clear()
-            for label in issue.labels:
-                label_list.append(label.name)
-            hazards_open.append(
-                {
-                    "number": issue.number,
-                    "title": issue.title,
-                    "body": issue.body,
-                    "labels": label_list.copy(),
+        try:
+            for issue in self.client().get_all(
+                f"{ c.GITHUB_API_URL }/repos/{ self.repo_domain_name() }/{ self.github_repo }/issues",
+                params=params,
+                auth=(self.github_username, self.github_token),
+                timeout=10,
+            ):
+                if "pull_request" in issue:
+                    continue
+
+                yield {
+                    "number": issue["number"],
+                    "title": issue["title"],
+                    "body": issue["body"],
+                    "labels": [label["name"] for label in issue["labels"]],
+                    "state": issue["state"],
+                    "updated_at": issue["updated_at"],
                 }
+        except requests.exceptions.HTTPError as error:
+            raise ValueError(
+                f"Error with accessing repo '{ self.repo_domain_name() }/{ self.github_repo }', return value '{ _error_message(error) }'"
             )
-        return hazards_open
+        return
 
     def repo_domain_name(self) -> str:
         """Domain name set
@@ -685,9 +1241,9 @@ class GitController:
             ValueError: if no comment if provided.
             ValueError: if issue with accessing the repository.
         """
-        g: Github
+        client: GithubClient
+        repo_name: str = f"{ self.repo_domain_name() }/{ self.github_repo }"
         repo: Repository.Repository
-        issue: Issue.Issue
 
         if hazard_number == 0:
             raise ValueError("No Hazard Number has been provided")
@@ -695,17 +1251,833 @@ class GitController:
         if comment == "":
             raise ValueError("No comment has been provided")
 
-        g = Github(self.github_username, self.github_token)
+        client = self.client()
 
         try:
-            repo = g.get_repo(
-                f"{ self.repo_domain_name() }/{ self.github_repo }"
+            repo = client.call(
+                "GET",
+                f"/repos/{ repo_name }",
+                lambda: client.github.get_repo(repo_name),
             )
         except GithubException as error:
             raise ValueError(
                 f"Error with accessing repo '{ self.repo_domain_name() }/{ self.github_repo }', return value '{ error.data['message'] }'"
             )
         else:
-            issue = repo.get_issue(number=int(hazard_number))
-            issue.create_comment(comment)
+            client.call(
+                "POST",
+                f"/repos/{ repo_name }/issues/{ int(hazard_number) }/comments",
+                lambda: repo.get_issue(
+                    number=int(hazard_number)
+                ).create_comment(comment),
+            )
+            _forget_hazard(self._hazard_key(int(hazard_number)))
+        return
+
+    def _hazard_query(self, number: int) -> dict[str, Any]:
+        """GraphQL request body to look up a hazard
+
+        Args:
+            number (int): hazard (issue) number.
+
+        Returns:
+            dict[str, Any]: the query and its variables.
+        """
+        return {
+            "query": _HAZARD_QUERY,
+            "variables": {
+                "owner": self.repo_domain_name(),
+                "name": self.github_repo,
+                "number": number,
+                "comments": c.HAZARD_RECENT_COMMENTS,
+            },
+        }
+
+    def _hazard_key(self, number: int) -> tuple[str, str, int]:
+        """Key of a hazard in the cache of hazards looked up on GitHub
+
+        Args:
+            number (int): hazard (issue) number.
+
+        Returns:
+            tuple[str, str, int]: username, repository and hazard number.
+        """
+        return (
+            self.github_username,
+            f"{ self.repo_domain_name() }/{ self.github_repo }",
+            number,
+        )
+
+
+class AsyncGitController(GitController):
+    """GitHub functionality for async views
+
+    The GitHub calls used by the web pages are made on aiohttp, so a worker
+    waiting on GitHub can serve other requests in the meantime. Calls share
+    the circuit breaker and rate limit budget of the requests based client,
+    see github_scheduler, and the hazard lookups share the cache of
+    GitController. Everything else, including the git functions, is
+    inherited and stays synchronous.
+
+    Use as an async context manager, or await close(), so the connections
+    opened are closed on the event loop that opened them.
+    """
+
+    _session: aiohttp.ClientSession | None = None
+
+    async def __aenter__(self) -> "AsyncGitController":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+        return
+
+    async def close(self) -> None:
+        """Closes the connections to the GitHub API"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        return
+
+    async def check_github_credentials(  # type: ignore[override]
+        self, deadline: float = c.GITHUB_CHECK_DEADLINE
+    ) -> dict[str, str | bool | None]:
+        """Checking Github credentials
+
+        As for GitController.check_github_credentials, with the username,
+        organisation and repository checks run at the same time on the event
+        loop.
+
+        Args:
+            deadline (float): seconds allowed for all of the checks.
+
+        Returns:
+            dict: a dictionary with 4 values covering the validity of the
+                  credentials supplied
+
+        Raises:
+            requests.exceptions.Timeout: if the checks do not complete within
+                                         the deadline.
+        """
+        try:
+            return await asyncio.wait_for(
+                self._check_github_credentials(), deadline
+            )
+        except asyncio.TimeoutError:
+            raise requests.exceptions.Timeout(
+                "Timeout while connecting to GitHub API"
+            )
+
+    async def username_exists(self) -> bool:  # type: ignore[override]
+        """Checks if the GitHub username exists
+
+        Returns:
+            bool: True if exists, False if does not.
+
+        Raises:
+            ValueError: if bad return code from GET request
+        """
+        status: int
+
+        status, _ = await self._request(
+            "GET",
+            f"{ c.GITHUB_API_URL }/users/{ self.github_username }",
+            auth=(self.github_username, self.github_token),
+        )
+        return _exists(status, "username")
+
+    async def repo_exists(self) -> bool:  # type: ignore[override]
+        """Checks if the GitHub repository exists
+
+        Returns:
+            bool: True if exists, False if does not.
+
+        Raises:
+            ValueError: if bad return code from GET request
+        """
+        status: int
+
+        status, _ = await self._request(
+            "GET",
+            f"{ c.GITHUB_API_URL }/repos/{ self.repo_domain_name() }/{ self.github_repo }",
+            auth=(self.github_organisation, self.github_token),
+        )
+        return _exists(status, "repo")
+
+    async def organisation_exists(  # type: ignore[override]
+        self, organisation: str
+    ) -> bool:
+        """Checks if the GitHub organisation exists
+
+        Args:
+            organisation (str): name of GitHub organisation to test.
+
+        Returns:
+            bool: True if exists, False if does not.
+
+        Raises:
+            ValueError: if bad return code from GET request
+        """
+        status: int
+
+        status, _ = await self._request(
+            "GET",
+            f"{ c.GITHUB_API_URL }/users/{ organisation }",
+            auth=(self.github_organisation, self.github_token),
+        )
+        return _exists(status, "organisation")
+
+    async def hazard_log(  # type: ignore[override]
+        self,
+        title: str,
+        body: str,
+        labels: list[str],
+        check_labels: bool = True,
+    ) -> int:
+        """Uses GitHub issues to log a new hazard
+
+        Args:
+            title (str): Title for the issue.
+            body (str): Body for the issue.
+            labels (list[str]): a list of labels for the issue.
+            check_labels (bool): set to False if the labels have already been
+                                 checked.
+
+        Returns:
+            int: number of the new hazard (issue).
+
+        Raises:
+            ValueError: if a hazard label is not valid
+            ValueError: if issue with accessing the repo
+        """
+        status: int
+        data: Any
+        invalid_labels: list[str] = []
+
+        if check_labels:
+            invalid_labels = label_registry().invalid(labels)
+            if invalid_labels:
+                raise ValueError(
+                    f"'{ invalid_labels[0] }' is not a valid hazard label. Please review label.yml for available values."
+                )
+
+        status, data = await self._request(
+            "POST",
+            f"{ c.GITHUB_API_URL }/repos/{ self.repo_domain_name() }/{ self.github_repo }/issues",
+            json={"title": title, "body": body, "labels": labels},
+        )
+
+        if status != 201 or not isinstance(data, dict):
+            raise ValueError(
+                f"Error with accessing repo '{ self.repo_domain_name() }/{ self.github_repo }', return value '{ _response_message(status, data) }'"
+            )
+        return int(data["number"])
+
+    async def hazard(  # type: ignore[override]
+        self, number: int
+    ) -> dict[str, Any] | HazardLookup:
+        """Looks up a single hazard on GitHub
+
+        As for GitController.hazard, sharing its cache.
+
+        Args:
+            number (int): hazard (issue) number.
+
+        Returns:
+            dict[str, Any] | HazardLookup: number, title, body, labels, state
+                                           and comments of the hazard, or
+                                           HazardLookup.NOT_FOUND if there is
+                                           no issue with that number.
+
+        Raises:
+            ValueError: if error with accessing the repository
+        """
+        key: tuple[str, str, int] = self._hazard_key(number)
+        cached: dict[str, Any] | HazardLookup | None = _cached_hazard(key)
+        status: int
+        data: Any
+        result: dict[str, Any] | HazardLookup
+
+        if cached is not None:
+            return cached
+
+        status, data = await self._request(
+            "POST",
+            c.GITHUB_GRAPHQL_URL,
+            json=self._hazard_query(number),
+            headers={"Authorization": f"bearer { self.github_token }"},
+        )
+
+        if status != 200 or not isinstance(data, dict):
+            raise ValueError(
+                f"Error with accessing repo '{ key[1] }', return value '{ _response_message(status, data) }'"
+            )
+
+        result = _hazard_result(key[1], data)
+        _remember_hazard(key, result)
+        return result
+
+    async def add_comment_to_hazard(  # type: ignore[override]
+        self,
+        hazard_number: int = 0,
+        comment: str = "",
+    ) -> None:
+        """Add a comment to a hazard
+
+        Args:
+            hazard_number (int): hazard (issue) number to add comment to.
+            comment (str): comment to add to hazard.
+
+        Raises:
+            ValueError: if no hazard number is provided.
+            ValueError: if no comment if provided.
+            ValueError: if issue with accessing the repository.
+        """
+        status: int
+        data: Any
+
+        if hazard_number == 0:
+            raise ValueError("No Hazard Number has been provided")
+
+        if comment == "":
+            raise ValueError("No comment has been provided")
+
+        status, data = await self._request(
+            "POST",
+            f"{ c.GITHUB_API_URL }/repos/{ self.repo_domain_name() }/{ self.github_repo }/issues/{ int(hazard_number) }/comments",
+            json={"body": comment},
+        )
+
+        if status != 201:
+            raise ValueError(
+                f"Error with accessing repo '{ self.repo_domain_name() }/{ self.github_repo }', return value '{ _response_message(status, data) }'"
+            )
+
+        _forget_hazard(self._hazard_key(int(hazard_number)))
+        return
+
+    async def _check_github_credentials(self) -> dict[str, str | bool | None]:
+        """The checks of check_github_credentials, without the deadline
+
+        Returns:
+            dict: a dictionary with 4 values covering the validity of the
+                  credentials supplied
+        """
+        checks: list[bool | BaseException]
+        check: bool | BaseException
+        github_username_exists: bool
+        github_organisation_exists: bool
+        repo_exists: bool
+        permission: str | None = None
+        status: int
+        data: Any
+
+        checks = list(
+            await asyncio.gather(
+                self.username_exists(),
+                self.organisation_exists(self.github_organisation),
+                self.repo_exists(),
+                return_exceptions=True,
+            )
+        )
+
+        # Raises any error in the same order as the checks would run one by one
+        for check in checks:
+            if isinstance(check, BaseException):
+                raise check
+
+        github_username_exists, github_organisation_exists, repo_exists = [
+            bool(check) for check in checks
+        ]
+
+        if repo_exists:
+            status, data = await self._request(
+                "GET",
+                f"{ c.GITHUB_API_URL }/repos/{ self.repo_domain_name() }/{ self.github_repo }/collaborators/{ self.github_username }/permission",
+            )
+            if status == 200 and isinstance(data, dict):
+                permission = data.get("permission")
+            elif status != 404:
+                raise ValueError(
+                    f"Error with Github permission checking. Returned value of: { status }"
+                )
+
+        return {
+            "github_username_exists": github_username_exists,
+            "github_organisation_exists": github_organisation_exists,
+            "repo_exists": repo_exists,
+            "permission": permission,
+        }
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        auth: tuple[str, str] | None = None,
+        **kwargs: Any,
+    ) -> tuple[int, Any]:
+        """Makes a call to the GitHub API
+
+        Calls fail straight away if the circuit breaker is open or the rate
+        limit budget is used up, and the outcome of each call is recorded
+        against them. A call that raises, or is cancelled, is recorded as a
+        failure, so a trial call of the breaker always completes it.
+
+        Args:
+            method (str): HTTP method.
+            url (str): URL to call.
+            auth (tuple[str, str] | None): username and token to authenticate
+                                           with. Defaults to the username and
+                                           token of the controller.
+            **kwargs (Any): as for aiohttp.ClientSession.request.
+
+        Returns:
+            tuple[int, Any]: status code and the decoded JSON body, or None if
+                             the body is not JSON.
+
+        Raises:
+            GithubUnavailable: if GitHub is not being called.
+            requests.exceptions.ConnectionError: if no connection.
+            requests.exceptions.Timeout: if GitHub does not reply in time.
+        """
+        scheduler: RateLimitScheduler = github_scheduler()
+        username: str
+        token: str
+        identity: requests.PreparedRequest
+        budget: dict[str, int] | None
+        status: int = 0
+        data: Any = None
+        failed: bool = True
+
+        username, token = auth or (self.github_username, self.github_token)
+        if "headers" not in kwargs:
+            kwargs["auth"] = aiohttp.BasicAuth(username, token)
+
+        # Keyed the same as the calls made through the requests client
+        identity = requests.Request(
+            method,
+            url,
+            auth=None if "headers" in kwargs else (username, token),
+            headers=kwargs.get("headers"),
+        ).prepare()
+        budget = scheduler.budget(identity)
+        if (
+            budget is not None
+            and budget["remaining"] <= 0
+            and budget["reset"] > t.time()
+        ):
+            raise GithubUnavailable(
+                f"GitHub API rate limit used up, resets in { int(budget['reset'] - t.time()) } seconds"
+            )
+
+        if not scheduler.breaker.allow():
+            raise GithubUnavailable(
+                "GitHub API is not available, calls paused for a while"
+            )
+
+        try:
+            async with self._client().request(
+                method, url, **kwargs
+            ) as response:
+                status = response.status
+                scheduler.update(identity, response.headers)
+                try:
+                    data = await response.json(content_type=None)
+                except ValueError:
+                    data = None
+            failed = status >= 500
+        except asyncio.TimeoutError:
+            raise requests.exceptions.Timeout(
+                "Timeout while connecting to GitHub API"
+            )
+        except aiohttp.ClientError:
+            raise requests.exceptions.ConnectionError(
+                "No connection available to GitHub API"
+            )
+        finally:
+            if failed:
+                scheduler.breaker.record_failure()
+            else:
+                scheduler.breaker.record_success()
+        return status, data
+
+    def _client(self) -> aiohttp.ClientSession:
+        """Session for calls to the GitHub API, created on first use
+
+        Returns:
+            aiohttp.ClientSession: the session of this controller.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(
+                    total=c.GITHUB_INTERACTIVE_TIMEOUT
+                ),
+                headers={"Accept": "application/vnd.github+json"},
+            )
+        return self._session
+
+
+class _PushProgress(RemoteProgress):
+    """Passes on the progress of a push"""
+
+    _STAGES: dict[int, str] = {
+        RemoteProgress.COUNTING: "counting",
+        RemoteProgress.COMPRESSING: "compressing",
+        RemoteProgress.WRITING: "writing",
+        RemoteProgress.RESOLVING: "resolving",
+    }
+
+    def __init__(
+        self,
+        callback: Callable[[dict[str, Any]], None] | None = None,
+        verbose: bool = False,
+    ) -> None:
+        """Initialises the _PushProgress class
+
+        Args:
+            callback (Callable[[dict[str, Any]], None] | None): called with
+                each progress event.
+            verbose (bool): set to True to print each progress event.
+        """
+        super().__init__()
+        self.callback: Callable[[dict[str, Any]], None] | None = callback
+        self.verbose: bool = verbose
+        return
+
+    def update(
+        self,
+        op_code: int,
+        cur_count: str | float,
+        max_count: str | float | None = None,
+        message: str = "",
+    ) -> None:
+        """Called by GitPython for each progress line of the push"""
+        event: dict[str, Any] = {
+            "stage": self._STAGES.get(op_code & self.OP_MASK, "other"),
+            "current": cur_count,
+            "total": max_count,
+            "message": message,
+        }
+
+        if self.verbose:
+            print(
+                f"{ event['stage'] } { event['current'] }/{ event['total'] or '?' } { message }"
+            )
+        if self.callback is not None:
+            self.callback(event)
         return
+
+
+def _unpushed_commits(repo: Repo) -> int:
+    """Number of commits on the current branch not yet on the remote
+
+    The branch is compared with its upstream, or with the branch of the same
+    name on "origin" if it has no upstream. If neither exists, every commit
+    on the branch is still to be pushed.
+
+    Args:
+        repo (Repo): the local repository.
+
+    Returns:
+        int: commits to push. 0 if the repository has no commits or HEAD is
+             not on a branch.
+    """
+    upstream: str
+
+    if repo.head.is_detached or not repo.head.is_valid():
+        return 0
+
+    for upstream in ("@{u}", f"origin/{ repo.active_branch.name }"):
+        try:
+            return int(repo.git.rev_list("--count", f"{ upstream }..HEAD"))
+        except GitCommandError:
+            continue
+    return int(repo.git.rev_list("--count", "HEAD"))
+
+
+def _has_identity(repo: Repo) -> bool:
+    """Checks if git has a user name and email set for a repository
+
+    Args:
+        repo (Repo): the repository.
+
+    Returns:
+        bool: True if both are set.
+    """
+    reader = repo.config_reader()
+
+    return bool(
+        reader.get_value("user", "name", default="")
+        and reader.get_value("user", "email", default="")
+    )
+
+
+def _push_outcome(
+    status: PushStatus,
+    commit: str | None,
+    summary: str,
+    start: float | None = None,
+    files: list[str] | None = None,
+) -> dict[str, Any]:
+    """Outcome of commit_and_push
+
+    Args:
+        status (PushStatus): how the push went.
+        commit (str | None): the commit made, if any.
+        summary (str): summary from git.
+        start (float | None): time the push started, from t.monotonic.
+        files (list[str] | None): the files changed.
+
+    Returns:
+        dict[str, Any]: the outcome.
+    """
+    return {
+        "status": status.value,
+        "commit": commit,
+        "summary": summary,
+        "seconds": (0 if start is None else round(t.monotonic() - start, 3)),
+        "files": [] if files is None else files,
+    }
+
+
+def _changed_files(repo: Repo, paths: list[str]) -> list[str]:
+    """Files changed under paths, in the index or the working tree
+
+    Only the paths are looked at, so this stays quick however large the rest
+    of the repository is.
+
+    Args:
+        repo (Repo): the local repository.
+        paths (list[str]): paths to look under, relative to the repository.
+
+    Returns:
+        list[str]: the files changed, relative to the repository, sorted.
+    """
+    entries: list[str] = []
+    files: set[str] = set()
+    entry: str
+    renamed: bool = False
+
+    if not paths:
+        return []
+
+    entries = repo.git.status(
+        "--porcelain=v1", "-z", "--untracked-files=all", "--", *paths
+    ).split("\0")
+    for entry in entries:
+        if renamed:
+            # The path a file was renamed or copied from
+            files.add(entry)
+            renamed = False
+        elif entry:
+            files.add(entry[3:])
+            renamed = entry[0] in "RC"
+    return sorted(files)
+
+
+def _cached_hazard(
+    key: tuple[str, str, int]
+) -> dict[str, Any] | HazardLookup | None:
+    """Hazard looked up on GitHub in the last c.HAZARD_CACHE_SECONDS
+
+    Args:
+        key (tuple[str, str, int]): key of the hazard in the cache.
+
+    Returns:
+        dict[str, Any] | HazardLookup | None: the cached result, or None if
+                                              not cached or expired.
+    """
+    with _hazard_cache_lock:
+        if key in _hazard_cache:
+            if t.monotonic() - _hazard_cache[key][0] < c.HAZARD_CACHE_SECONDS:
+                return _hazard_cache[key][1]
+            del _hazard_cache[key]
+    return None
+
+
+def _remember_hazard(
+    key: tuple[str, str, int], result: dict[str, Any] | HazardLookup
+) -> None:
+    """Caches a hazard looked up on GitHub
+
+    Args:
+        key (tuple[str, str, int]): key of the hazard in the cache.
+        result (dict[str, Any] | HazardLookup): the result of the lookup.
+    """
+    with _hazard_cache_lock:
+        _hazard_cache[key] = (t.monotonic(), result)
+    return
+
+
+def _forget_hazard(key: tuple[str, str, int]) -> None:
+    """Drops a hazard from the cache, as it has been changed
+
+    Args:
+        key (tuple[str, str, int]): key of the hazard in the cache.
+    """
+    with _hazard_cache_lock:
+        _hazard_cache.pop(key, None)
+    return
+
+
+def _hazard_result(
+    repo: str, data: dict[str, Any]
+) -> dict[str, Any] | HazardLookup:
+    """Hazard from the response to a hazard GraphQL query
+
+    Args:
+        repo (str): the repository, as "domain/name".
+        data (dict[str, Any]): the response body.
+
+    Returns:
+        dict[str, Any] | HazardLookup: the hazard, or HazardLookup.NOT_FOUND.
+
+    Raises:
+        ValueError: if the repository could not be accessed.
+    """
+    issue: dict[str, Any] | None
+
+    if (data.get("data") or {}).get("repository") is None:
+        raise ValueError(
+            f"Error with accessing repo '{ repo }', return value '{ _graphql_error(data) }'"
+        )
+
+    issue = data["data"]["repository"]["issue"]
+    if issue is None:
+        return HazardLookup.NOT_FOUND
+
+    return _graphql_issue(issue)
+
+
+def _graphql_issue(issue: dict[str, Any]) -> dict[str, Any]:
+    """Hazard from an issue returned by the GitHub GraphQL API
+
+    Args:
+        issue (dict[str, Any]): the issue, with its labels and any comments.
+
+    Returns:
+        dict[str, Any]: number, title, body, labels, state and comments.
+    """
+    return {
+        "number": issue["number"],
+        "title": issue["title"],
+        "body": issue["body"],
+        "labels": [label["name"] for label in issue["labels"]["nodes"]],
+        "state": issue["state"].lower(),
+        "comments": [
+            {
+                "author": (comment["author"] or {}).get("login", ""),
+                "body": comment["body"],
+                "created_at": comment["createdAt"],
+            }
+            for comment in (issue.get("comments") or {}).get("nodes", [])
+        ],
+    }
+
+
+def clear_hazard_cache(repo: str = "", number: int | None = None) -> None:
+    """Forgets hazards looked up on GitHub
+
+    Used when GitHub reports a hazard has changed, and for unit testing.
+
+    Args:
+        repo (str): only forget hazards of this repository, as "domain/name",
+                    ignoring case. All repositories if empty.
+        number (int | None): only forget the hazard with this number.
+    """
+    key: tuple[str, str, int]
+
+    with _hazard_cache_lock:
+        for key in list(_hazard_cache):
+            if repo and key[1].lower() != repo.lower():
+                continue
+            if number is not None and key[2] != number:
+                continue
+            del _hazard_cache[key]
+    return
+
+
+def clear_repo_cache() -> None:
+    """Forgets all repositories looked up on GitHub
+
+    Mainly used for unit testing.
+    """
+    with _repo_cache_lock:
+        _repo_cache.clear()
+    return
+
+
+def _exists(status: int, checking: str) -> bool:
+    """Whether a user, organisation or repository exists, from a status code
+
+    Args:
+        status (int): status code of the GET request.
+        checking (str): what was being checked, for the error message.
+
+    Returns:
+        bool: True if exists, False if does not.
+
+    Raises:
+        ValueError: if the status code is neither 200 nor 404.
+    """
+    if status == 200:
+        return True
+    elif status == 404:
+        return False
+    raise ValueError(
+        f"Error with Github { checking } checking. Returned value of: { status }"
+    )
+
+
+def _response_message(status: int, data: Any) -> str:
+    """Message returned by the GitHub API with an error, for aiohttp calls
+
+    Args:
+        status (int): status code of the response.
+        data (Any): the decoded JSON body.
+
+    Returns:
+        str: the message from GitHub, or the status code if there is none.
+    """
+    if isinstance(data, dict) and "message" in data:
+        return str(data["message"])
+    if isinstance(data, dict) and data.get("errors"):
+        return _graphql_error(data)
+    return str(status)
+
+
+def _graphql_error(data: dict[str, Any]) -> str:
+    """Message returned by the GitHub GraphQL API with an error
+
+    Args:
+        data (dict[str, Any]): the response body.
+
+    Returns:
+        str: the first error message, or "Unknown error" if there is none.
+    """
+    errors: list[dict[str, Any]] = data.get("errors") or []
+
+    if errors:
+        return str(errors[0].get("message", "Unknown error"))
+    return "Unknown error"
+
+
+def _error_message(error: requests.exceptions.HTTPError) -> str:
+    """Message returned by the GitHub API with an error
+
+    Args:
+        error (requests.exceptions.HTTPError): the error.
+
+    Returns:
+        str: the message from GitHub, or the status code if there is none.
+    """
+    response: requests.Response | None = error.response
+
+    if response is None:
+        return str(error)
+
+    try:
+        return str(response.json()["message"])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return str(response.status_code)
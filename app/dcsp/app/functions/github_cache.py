@@ -0,0 +1,337 @@
+"""Conditional request cache for the GitHub API
+
+GitHub answers a GET that carries the ETag of the last response in an
+If-None-Match header with 304 Not Modified when nothing has changed, and such
+responses do not count against the rate limit. This module keeps the ETag and
+body of recent responses in a bounded LRU cache, optionally persisted to disk,
+and revalidates against it on every GET.
+
+Classes:
+    ConditionalCache: bounded LRU of ETags and response bodies
+    ConditionalCacheAdapter: requests transport adapter that uses the cache and
+                             the scheduler
+
+Functions:
+    conditional_cache: returns the process-wide cache
+"""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Mapping
+
+import requests
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+import app.functions.constants as c
+from app.functions.github_scheduler import (
+    RateLimitScheduler,
+    github_scheduler,
+)
+from app.functions.locked_files import atomic_write
+
+
+class ConditionalCache:
+    def __init__(
+        self, max_entries: int = c.GITHUB_CACHE_SIZE, path: str = ""
+    ) -> None:
+        """Initialises the ConditionalCache class
+
+        Args:
+            max_entries (int): number of responses to keep, the least recently
+                               used are dropped first.
+            path (str): file to persist the cache to. Not persisted if empty.
+
+        Raises:
+            ValueError: if max_entries is less than 1.
+        """
+        if max_entries < 1:
+            raise ValueError(f"'{ max_entries }' is not a valid cache size")
+
+        self.max_entries: int = max_entries
+        self.path: str = path
+        self.hits: int = 0
+        self._lock: threading.Lock = threading.Lock()
+        self._entries: OrderedDict[str, dict[str, Any]] = self._load()
+        return
+
+    def key(self, request: PreparedRequest) -> str:
+        """Cache key for a request
+
+        Responses depend on who is asking, so the authorization header is part
+        of the key. Only a hash is kept, so no credentials are stored.
+
+        Args:
+            request (PreparedRequest): the request.
+
+        Returns:
+            str: the cache key.
+        """
+        identity: str = "\n".join(
+            [
+                str(request.url),
+                str(request.headers.get("Authorization", "")),
+                str(request.headers.get("Accept", "")),
+            ]
+        )
+        return hashlib.sha256(identity.encode()).hexdigest()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Cached response for a key
+
+        Args:
+            key (str): the cache key.
+
+        Returns:
+            dict[str, Any] | None: "etag", "status", "headers" and "body" of
+                                   the response, or None if not cached.
+        """
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def store(self, key: str, response: Response) -> None:
+        """Stores a response that has an ETag
+
+        Args:
+            key (str): the cache key.
+            response (Response): the response, which has been read.
+        """
+        with self._lock:
+            self._entries[key] = {
+                "etag": response.headers["ETag"],
+                "status": response.status_code,
+                "headers": dict(response.headers),
+                "body": base64.b64encode(response.content).decode(),
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._save()
+        return
+
+    def record_hit(self) -> None:
+        """Counts a response served from the cache"""
+        with self._lock:
+            self.hits += 1
+        return
+
+    def clear(self) -> None:
+        """Empties the cache"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self._save()
+        return
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self) -> OrderedDict[str, dict[str, Any]]:
+        """Loads the persisted cache
+
+        Returns:
+            OrderedDict[str, dict[str, Any]]: cached responses. Empty if not
+                                              persisted or unreadable.
+        """
+        entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+        if not self.path or not os.path.isfile(self.path):
+            return entries
+
+        try:
+            with open(self.path, "r") as file:
+                entries = OrderedDict(json.load(file))
+        except (OSError, ValueError):
+            return OrderedDict()
+
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        return entries
+
+    def _save(self) -> None:
+        """Persists the cache, if a path is set
+
+        Must be called with the lock held.
+        """
+        if self.path:
+            atomic_write(self.path, json.dumps(self._entries))
+        return
+
+
+class ConditionalCacheAdapter(HTTPAdapter):
+    def __init__(
+        self,
+        cache: ConditionalCache | None = None,
+        scheduler: RateLimitScheduler | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialises the ConditionalCacheAdapter class
+
+        Args:
+            cache (ConditionalCache | None): cache to use. Defaults to the
+                                             process-wide cache.
+            scheduler (RateLimitScheduler | None): scheduler all requests are
+                                                   sent through. Defaults to
+                                                   the process-wide scheduler.
+            **kwargs: as for HTTPAdapter.
+        """
+        self.cache: ConditionalCache = (
+            cache if cache is not None else conditional_cache()
+        )
+        self.scheduler: RateLimitScheduler = (
+            scheduler if scheduler is not None else github_scheduler()
+        )
+        super().__init__(**kwargs)
+        return
+
+    def send(
+        self,
+        request: PreparedRequest,
+        stream: bool = False,
+        timeout: Any = None,
+        verify: bool | str = True,
+        cert: Any = None,
+        proxies: Mapping[str, str] | None = None,
+    ) -> Response:
+        """Sends a request, revalidating GETs against the cache
+
+        Args:
+            request (PreparedRequest): the request.
+            stream (bool): as for HTTPAdapter.send.
+            timeout (Any): as for HTTPAdapter.send.
+            verify (bool | str): as for HTTPAdapter.send.
+            cert (Any): as for HTTPAdapter.send.
+            proxies (Mapping[str, str] | None): as for HTTPAdapter.send.
+
+        Returns:
+            Response: the response. A 304 is turned back into the cached
+                      response, with the headers of the 304 applied. The
+                      cached response is also returned if GitHub cannot be
+                      reached or returns a server error.
+
+        Raises:
+            requests.exceptions.ConnectionError: if GitHub cannot be reached,
+                                                 and there is no cached
+                                                 response.
+            requests.exceptions.Timeout: if GitHub does not respond, and there
+                                         is no cached response.
+        """
+        key: str = ""
+        cached: dict[str, Any] | None = None
+        response: Response
+        kwargs: dict[str, Any] = {
+            "stream": stream,
+            "timeout": timeout,
+            "verify": verify,
+            "cert": cert,
+            "proxies": proxies,
+        }
+
+        if request.method != "GET" or "If-None-Match" in request.headers:
+            return self.scheduler.send(request, super().send, **kwargs)
+
+        key = self.cache.key(request)
+        cached = self.cache.get(key)
+        if cached is not None:
+            request.headers["If-None-Match"] = cached["etag"]
+
+        try:
+            response = self.scheduler.send(request, super().send, **kwargs)
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+        ):
+            if cached is None:
+                raise
+            self.cache.record_hit()
+            return _cached_response(request, None, cached)
+
+        if response.status_code == 304 and cached is not None:
+            self.cache.record_hit()
+            return _cached_response(request, response, cached)
+
+        if response.status_code >= 500 and cached is not None:
+            self.cache.record_hit()
+            return _cached_response(request, response, cached)
+
+        if response.status_code == 200 and "ETag" in response.headers:
+            self.cache.store(key, response)
+        return response
+
+
+def _cached_response(
+    request: PreparedRequest,
+    not_modified: Response | None,
+    cached: dict[str, Any],
+) -> Response:
+    """Builds a response from the cache
+
+    Args:
+        request (PreparedRequest): the request.
+        not_modified (Response | None): the 304 response from GitHub. None, or
+                                        a server error, if GitHub could not
+                                        confirm the cached response is
+                                        current.
+        cached (dict[str, Any]): the cached response.
+
+    Returns:
+        Response: the cached response, with the c.GITHUB_CACHE_HEADER header
+                  set to "revalidated" or "stale".
+    """
+    response: Response = Response()
+
+    response.status_code = cached["status"]
+    response.headers = CaseInsensitiveDict(cached["headers"])
+    response.headers[c.GITHUB_CACHE_HEADER] = "stale"
+    if not_modified is not None and not_modified.status_code == 304:
+        for header, value in not_modified.headers.items():
+            if header.lower() not in _BODY_HEADERS:
+                response.headers[header] = value
+        response.headers[c.GITHUB_CACHE_HEADER] = "revalidated"
+    response._content = base64.b64decode(cached["body"])
+    response.url = str(request.url)
+    response.request = request
+    response.reason = "OK"
+    if not_modified is not None:
+        response.encoding = not_modified.encoding
+        response.connection = not_modified.connection  # type: ignore[attr-defined]
+        not_modified.close()
+    return response
+
+
+_BODY_HEADERS: tuple[str, ...] = (
+    "content-length",
+    "content-encoding",
+    "content-type",
+    "transfer-encoding",
+)
+
+_conditional_cache: ConditionalCache | None = None
+_conditional_cache_lock: threading.Lock = threading.Lock()
+
+
+def conditional_cache() -> ConditionalCache:
+    """Returns the process-wide cache
+
+    Created on first use, with c.GITHUB_CACHE_SIZE entries and persisted to
+    c.GITHUB_CACHE_PATH if set.
+
+    Returns:
+        ConditionalCache: the shared cache.
+    """
+    global _conditional_cache
+
+    with _conditional_cache_lock:
+        if _conditional_cache is None:
+            _conditional_cache = ConditionalCache(
+                c.GITHUB_CACHE_SIZE, c.GITHUB_CACHE_PATH
+            )
+    return _conditional_cache
@@ -0,0 +1,236 @@
+"""Pooled GitHub clients
+
+Creating a new requests call or PyGithub instance for every GitHub call means a
+new TCP connection and TLS handshake each time. This module keeps one client
+per set of credentials for the life of the process. Each client holds a
+requests session and a PyGithub instance, both with a pool of keep-alive
+connections. GETs made through the session are revalidated against the
+conditional request cache, see github_cache. Calls made with the PyGithub
+instance are run through the rate limit scheduler with GithubClient.call.
+
+Classes:
+    GithubClient: keep-alive connections to the GitHub API
+
+Functions:
+    github_client: returns the shared client for a set of credentials
+    close_clients: closes and forgets all shared clients
+"""
+
+import hashlib
+import threading
+from typing import Any, Callable, Iterator, TypeVar
+
+import requests
+from github import Github
+from requests import Response
+
+import app.functions.constants as c
+from app.functions.github_cache import ConditionalCacheAdapter
+from app.functions.github_scheduler import RateLimitScheduler, github_scheduler
+
+_T = TypeVar("_T")
+
+
+class GithubClient:
+    def __init__(
+        self,
+        github_username: str,
+        github_token: str,
+        pool_size: int = c.GITHUB_POOL_SIZE,
+    ) -> None:
+        """Initialises the GithubClient class
+
+        Args:
+            github_username (str): the user's GitHub username.
+            github_token (str): GitHub token.
+            pool_size (int): maximum number of connections kept open to the
+                             GitHub API.
+
+        Raises:
+            ValueError: if pool_size is less than 1.
+        """
+        adapter: ConditionalCacheAdapter
+
+        if pool_size < 1:
+            raise ValueError(f"'{ pool_size }' is not a valid pool size")
+
+        self.github_username: str = github_username
+        self._github_token: str = github_token
+        self.pool_size: int = pool_size
+        self._github: Github | None = None
+        self._github_lock: threading.Lock = threading.Lock()
+        self.session: requests.Session = requests.Session()
+        adapter = ConditionalCacheAdapter(
+            pool_connections=1, pool_maxsize=pool_size
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        return
+
+    @property
+    def github(self) -> Github:
+        """PyGithub instance, created on first use
+
+        Returns:
+            Github: the shared PyGithub instance.
+        """
+        with self._github_lock:
+            if self._github is None:
+                self._github = Github(
+                    self.github_username,
+                    self._github_token,
+                    base_url=c.GITHUB_API_URL,
+                    pool_size=self.pool_size,
+                )
+            return self._github
+
+    def get(self, url: str, **kwargs: Any) -> Response:
+        """GET request over the pooled session
+
+        Args:
+            url (str): url to get.
+            **kwargs: as for requests.get.
+
+        Returns:
+            Response: the response.
+        """
+        return self.session.get(url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> Response:
+        """POST request over the pooled session
+
+        Args:
+            url (str): url to post to.
+            **kwargs: as for requests.post.
+
+        Returns:
+            Response: the response.
+        """
+        return self.session.post(url, **kwargs)
+
+    def get_all(self, url: str, **kwargs: Any) -> Iterator[Any]:
+        """Items of a paginated list from the GitHub API
+
+        Pages are requested as the items are used, following the "next" link
+        of each page. Each page is revalidated against the conditional
+        request cache.
+
+        Args:
+            url (str): url of the first page.
+            **kwargs: as for requests.get.
+
+        Yields:
+            Any: each item of the list.
+
+        Raises:
+            requests.exceptions.HTTPError: if a page is not returned.
+        """
+        response: Response
+        next_url: str | None = url
+        params: dict[str, Any] = {"per_page": c.GITHUB_PER_PAGE}
+
+        params.update(kwargs.pop("params", {}))
+
+        while next_url:
+            response = self.get(next_url, params=params, **kwargs)
+            response.raise_for_status()
+            yield from response.json()
+            next_url = response.links.get("next", {}).get("url")
+            # The next link already carries the query string
+            params = {}
+        return
+
+    def call(self, method: str, path: str, function: Callable[[], _T]) -> _T:
+        """Call made with the PyGithub instance
+
+        PyGithub does not use the pooled session, so its calls are run through
+        the rate limit scheduler here. They wait for budget, fail fast while
+        the circuit breaker is open, and the budget PyGithub last saw is
+        recorded against the token.
+
+        Args:
+            method (str): HTTP method of the call.
+            path (str): API path of the call, e.g. "/repos/owner/repo/issues".
+            function (Callable[[], _T]): makes the call with self.github.
+
+        Returns:
+            _T: what function returns.
+
+        Raises:
+            GithubUnavailable: if GitHub is not being called.
+        """
+        scheduler: RateLimitScheduler = github_scheduler()
+        identity: requests.PreparedRequest = requests.Request(
+            method,
+            f"{ c.GITHUB_API_URL }{ path }",
+            auth=(self.github_username, self._github_token),
+        ).prepare()
+        rate_limiting: Any
+
+        try:
+            return scheduler.call(identity, function)
+        finally:
+            rate_limiting = self.github.requester.rate_limiting
+            if isinstance(rate_limiting, tuple):
+                scheduler.record(
+                    identity,
+                    rate_limiting[1],
+                    rate_limiting[0],
+                    self.github.requester.rate_limiting_resettime,
+                )
+
+    def close(self) -> None:
+        """Closes the pooled connections"""
+        self.session.close()
+        if self._github is not None:
+            self._github.close()
+        return
+
+
+_clients: dict[tuple[str, str, int], GithubClient] = {}
+_clients_lock: threading.Lock = threading.Lock()
+
+
+def github_client(
+    github_username: str,
+    github_token: str,
+    pool_size: int = c.GITHUB_POOL_SIZE,
+) -> GithubClient:
+    """Returns the shared client for a set of credentials
+
+    The client is created on first use and then reused by all threads in the
+    process.
+
+    Args:
+        github_username (str): the user's GitHub username.
+        github_token (str): GitHub token.
+        pool_size (int): maximum number of connections kept open to the GitHub
+                         API. Only used when the client is created.
+
+    Returns:
+        GithubClient: the shared client.
+    """
+    key: tuple[str, str, int] = (
+        github_username,
+        hashlib.sha256(github_token.encode()).hexdigest(),
+        pool_size,
+    )
+
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = GithubClient(
+                github_username, github_token, pool_size
+            )
+        return _clients[key]
+
+
+def close_clients() -> None:
+    """Closes and forgets all shared clients
+
+    Used when credentials change, and for unit testing.
+    """
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+    return
@@ -0,0 +1,640 @@
+"""Scheduling of calls to the GitHub API
+
+Every request made through the pooled GitHub session passes through a single
+scheduler, which:
+
+- tracks the rate limit budget of each token and resource (the REST API,
+  search and GraphQL each have their own) from the X-RateLimit-* headers of
+  the responses.
+- keeps the last c.GITHUB_BACKGROUND_RESERVE calls of the budget for
+  interactive work (a user waiting on a page), and runs no more than
+  c.GITHUB_BACKGROUND_WORKERS background calls at a time.
+- retries failed reads with exponential backoff and full jitter. For
+  interactive calls, a retry is only made if it can time out before the
+  deadline, so that pages stay responsive.
+- stops calling GitHub for c.GITHUB_BREAKER_COOLDOWN seconds once
+  c.GITHUB_BREAKER_FAILURES calls in a row have failed (a circuit breaker), so
+  callers fail fast and can fall back to cached data.
+
+Calls made with PyGithub, which has its own session, are run through
+RateLimitScheduler.call, so they share the budgets and the circuit breaker.
+
+Work is interactive unless run inside background(). Jobs on the job queue are
+run as background work.
+
+Classes:
+    GithubUnavailable: raised when a call is not made to GitHub
+    CircuitBreaker: fails fast while GitHub is failing
+    RateLimitScheduler: budgets, retries and fails fast GitHub calls
+
+Functions:
+    background: runs the calls made inside it as background work
+    current_priority: priority of calls made from the current context
+    github_scheduler: returns the process-wide scheduler
+"""
+
+import base64
+import contextvars
+import hashlib
+import random
+import threading
+import time as t
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Mapping, TypeVar
+from urllib.parse import urlsplit
+
+import requests
+from github import GithubException
+from requests import PreparedRequest, Response
+
+import app.functions.constants as c
+from app.functions.constants import GithubPriority
+
+
+_priority: contextvars.ContextVar[GithubPriority] = contextvars.ContextVar(
+    "github_priority", default=GithubPriority.INTERACTIVE
+)
+_T = TypeVar("_T")
+
+
+class GithubUnavailable(requests.exceptions.ConnectionError):
+    """Raised when a call is not made to GitHub
+
+    Either the circuit breaker is open, or there is not enough rate limit
+    budget left for the call. A subclass of ConnectionError, so existing
+    handling of GitHub being unreachable applies.
+    """
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failures: int = c.GITHUB_BREAKER_FAILURES,
+        cooldown: float = c.GITHUB_BREAKER_COOLDOWN,
+    ) -> None:
+        """Initialises the CircuitBreaker class
+
+        Args:
+            failures (int): failures in a row that open the breaker.
+            cooldown (float): seconds the breaker stays open before a single
+                              trial call is let through.
+
+        Raises:
+            ValueError: if failures is less than 1.
+        """
+        if failures < 1:
+            raise ValueError(f"'{ failures }' is not a valid failure count")
+
+        self.failures: int = failures
+        self.cooldown: float = cooldown
+        self._failed: int = 0
+        self._opened: float | None = None
+        self._trial: bool = False
+        self._lock: threading.Lock = threading.Lock()
+        return
+
+    @property
+    def state(self) -> str:
+        """State of the breaker
+
+        Returns:
+            str: "closed" if calls are made, "open" if calls fail fast, or
+                 "half-open" if the cooldown is over and a trial call is
+                 allowed.
+        """
+        with self._lock:
+            if self._opened is None:
+                return "closed"
+            if t.monotonic() - self._opened < self.cooldown:
+                return "open"
+            return "half-open"
+
+    def allow(self) -> bool:
+        """Checks if a call may be made
+
+        Once the cooldown is over, one call at a time is let through to test
+        whether GitHub has recovered.
+
+        Returns:
+            bool: True if the call may be made.
+        """
+        with self._lock:
+            if self._opened is None:
+                return True
+            if t.monotonic() - self._opened < self.cooldown or self._trial:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self) -> None:
+        """Closes the breaker after a successful call"""
+        with self._lock:
+            self._failed = 0
+            self._opened = None
+            self._trial = False
+        return
+
+    def record_failure(self) -> None:
+        """Counts a failed call, opening the breaker if there are too many"""
+        with self._lock:
+            self._failed += 1
+            if self._trial or self._failed >= self.failures:
+                self._opened = t.monotonic()
+            self._trial = False
+        return
+
+
+class RateLimitScheduler:
+    def __init__(
+        self,
+        reserve: int = c.GITHUB_BACKGROUND_RESERVE,
+        background_workers: int = c.GITHUB_BACKGROUND_WORKERS,
+        retries: int = c.GITHUB_RETRIES,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
+        """Initialises the RateLimitScheduler class
+
+        Args:
+            reserve (int): calls of the rate limit budget kept for interactive
+                           work.
+            background_workers (int): background calls that may run at once.
+            retries (int): times a failed read is retried.
+            breaker (CircuitBreaker | None): circuit breaker to use. A new one
+                                             if None.
+
+        Raises:
+            ValueError: if background_workers is less than 1.
+        """
+        if background_workers < 1:
+            raise ValueError(
+                f"'{ background_workers }' is not a valid number of workers"
+            )
+
+        self.reserve: int = reserve
+        self.retries: int = retries
+        self.breaker: CircuitBreaker = breaker or CircuitBreaker()
+        self._budgets: dict[str, dict[str, int]] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._background: threading.BoundedSemaphore = (
+            threading.BoundedSemaphore(background_workers)
+        )
+        return
+
+    def send(
+        self,
+        request: PreparedRequest,
+        send: Callable[..., Response],
+        **kwargs: Any,
+    ) -> Response:
+        """Sends a request to GitHub
+
+        Args:
+            request (PreparedRequest): the request.
+            send (Callable[..., Response]): sends the request, taking the same
+                                            keyword arguments as
+                                            HTTPAdapter.send.
+            **kwargs: as for HTTPAdapter.send.
+
+        Returns:
+            Response: the response.
+
+        Raises:
+            GithubUnavailable: if the circuit breaker is open, or there is not
+                               enough rate limit budget.
+            requests.exceptions.ConnectionError: if GitHub cannot be reached
+                                                 once retries are used up.
+            requests.exceptions.Timeout: if GitHub does not respond once
+                                         retries are used up.
+        """
+        priority: GithubPriority = current_priority()
+
+        if priority == GithubPriority.INTERACTIVE:
+            return self._send(request, send, priority, kwargs)
+
+        with self._background:
+            return self._send(request, send, priority, kwargs)
+
+    def budget(self, request: PreparedRequest) -> dict[str, int] | None:
+        """Rate limit budget of the token and resource used by a request
+
+        Args:
+            request (PreparedRequest): the request.
+
+        Returns:
+            dict[str, int] | None: "limit", "remaining" and "reset" (epoch
+                                   seconds) from the last response, or None
+                                   if no response has been seen.
+        """
+        with self._lock:
+            budget: dict[str, int] | None = self._budgets.get(
+                _identity(request)
+            )
+            return None if budget is None else budget.copy()
+
+    def call(self, request: PreparedRequest, function: Callable[[], _T]) -> _T:
+        """Makes a call to GitHub other than through the pooled session
+
+        For calls made with PyGithub. As for send, the call waits for rate
+        limit budget and fails fast while the circuit breaker is open, and its
+        outcome is recorded against the breaker. It is not retried.
+
+        Args:
+            request (PreparedRequest): a request standing for the call, used
+                                       to find its token and resource.
+            function (Callable[[], _T]): makes the call.
+
+        Returns:
+            _T: what function returns.
+
+        Raises:
+            GithubUnavailable: if the circuit breaker is open, or there is not
+                               enough rate limit budget.
+        """
+        priority: GithubPriority = current_priority()
+
+        if priority == GithubPriority.INTERACTIVE:
+            return self._call(request, function, priority)
+
+        with self._background:
+            return self._call(request, function, priority)
+
+    def update(
+        self, request: PreparedRequest, headers: Mapping[str, str]
+    ) -> None:
+        """Records the rate limit budget returned with a response
+
+        Args:
+            request (PreparedRequest): the request.
+            headers (Mapping[str, str]): headers of the response, from
+                                         requests or aiohttp.
+        """
+        self.record(
+            request,
+            headers.get("X-RateLimit-Limit"),
+            headers.get("X-RateLimit-Remaining"),
+            headers.get("X-RateLimit-Reset"),
+        )
+        return
+
+    def record(
+        self, request: PreparedRequest, limit: Any, remaining: Any, reset: Any
+    ) -> None:
+        """Records the rate limit budget of a token and resource
+
+        Nothing is recorded if any of the values is missing or not a number.
+
+        Args:
+            request (PreparedRequest): the request.
+            limit (Any): calls allowed per window.
+            remaining (Any): calls left in the window.
+            reset (Any): epoch seconds when the window resets.
+        """
+        try:
+            budget: dict[str, int] = {
+                "limit": int(limit),
+                "remaining": int(remaining),
+                "reset": int(reset),
+            }
+        except (TypeError, ValueError):
+            return
+
+        if budget["limit"] < 0:
+            return
+
+        with self._lock:
+            self._budgets[_identity(request)] = budget
+        return
+
+    def _call(
+        self,
+        request: PreparedRequest,
+        function: Callable[[], _T],
+        priority: GithubPriority,
+    ) -> _T:
+        """Makes a call, once there is budget and the breaker allows it
+
+        Args:
+            request (PreparedRequest): a request standing for the call.
+            function (Callable[[], _T]): makes the call.
+            priority (GithubPriority): priority of the call.
+
+        Returns:
+            _T: what function returns.
+        """
+        result: _T
+
+        self._wait_for_budget(request, priority)
+
+        if not self.breaker.allow():
+            raise GithubUnavailable(
+                "GitHub API is failing, not calling it for now"
+            )
+
+        try:
+            result = function()
+        except GithubException as error:
+            # GitHub answered, so only a server error counts against it
+            if isinstance(error.status, int) and error.status < 500:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+            raise
+        except BaseException:
+            self.breaker.record_failure()
+            raise
+
+        self.breaker.record_success()
+        return result
+
+    def _send(
+        self,
+        request: PreparedRequest,
+        send: Callable[..., Response],
+        priority: GithubPriority,
+        kwargs: dict[str, Any],
+    ) -> Response:
+        """Sends a request, with retries
+
+        Args:
+            request (PreparedRequest): the request.
+            send (Callable[..., Response]): sends the request.
+            priority (GithubPriority): priority of the call.
+            kwargs (dict[str, Any]): as for HTTPAdapter.send.
+
+        Returns:
+            Response: the response.
+        """
+        retries: int = self.retries if _retryable(request) else 0
+        deadline: float | None = None
+        response: Response
+        delay: float = 0
+        attempt: int = 0
+
+        if priority == GithubPriority.INTERACTIVE:
+            deadline = t.monotonic() + c.GITHUB_INTERACTIVE_DEADLINE
+            kwargs["timeout"] = _cap_timeout(
+                kwargs.get("timeout"), c.GITHUB_INTERACTIVE_TIMEOUT
+            )
+
+        while True:
+            self._wait_for_budget(request, priority)
+
+            if not self.breaker.allow():
+                raise GithubUnavailable(
+                    "GitHub API is failing, not calling it for now"
+                )
+
+            try:
+                response = send(request, **kwargs)
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ):
+                self.breaker.record_failure()
+                delay = _backoff(attempt)
+                if attempt >= retries or _past(
+                    deadline, delay, kwargs.get("timeout")
+                ):
+                    raise
+            except BaseException:
+                # Any other error still ends a trial call of the breaker
+                self.breaker.record_failure()
+                raise
+            else:
+                self.update(request, response.headers)
+                if response.status_code < 500:
+                    self.breaker.record_success()
+                else:
+                    self.breaker.record_failure()
+
+                if not _should_retry(response):
+                    return response
+
+                delay = _retry_after(response, attempt)
+                if attempt >= retries or _past(
+                    deadline, delay, kwargs.get("timeout")
+                ):
+                    return response
+                response.close()
+
+            attempt += 1
+            t.sleep(delay)
+
+    def _wait_for_budget(
+        self, request: PreparedRequest, priority: GithubPriority
+    ) -> None:
+        """Waits until there is rate limit budget for a call
+
+        Interactive calls may use all of the budget. Background calls leave
+        the reserve, and wait for the budget to reset if it is used up.
+
+        Args:
+            request (PreparedRequest): the request.
+            priority (GithubPriority): priority of the call.
+
+        Raises:
+            GithubUnavailable: if the budget is used up and will not reset
+                               soon enough to wait for.
+        """
+        budget: dict[str, int] | None = self.budget(request)
+        floor: int = (
+            0 if priority == GithubPriority.INTERACTIVE else self.reserve
+        )
+        wait: float = 0
+
+        if budget is None or budget["remaining"] > floor:
+            return
+
+        wait = budget["reset"] - t.time()
+        if wait <= 0:
+            return
+
+        if (
+            priority == GithubPriority.INTERACTIVE
+            or wait > c.GITHUB_BACKGROUND_MAX_WAIT
+        ):
+            raise GithubUnavailable(
+                f"GitHub API rate limit used up, resets in { int(wait) } seconds"
+            )
+
+        t.sleep(wait)
+        return
+
+
+@contextmanager
+def background() -> Iterator[None]:
+    """Runs the GitHub calls made inside it as background work"""
+    token: contextvars.Token = _priority.set(GithubPriority.BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+    return
+
+
+def current_priority() -> GithubPriority:
+    """Priority of GitHub calls made from the current context
+
+    Returns:
+        GithubPriority: BACKGROUND inside background(), else INTERACTIVE.
+    """
+    return _priority.get()
+
+
+def _identity(request: PreparedRequest) -> str:
+    """Identifies the rate limit budget used by a request
+
+    GitHub keeps a budget for each token and resource. The same token is sent
+    with different usernames in basic auth, or as a bearer token, so only the
+    token is used. Only a hash is kept.
+
+    Args:
+        request (PreparedRequest): the request.
+
+    Returns:
+        str: hash of the resource and token.
+    """
+    scheme: str
+    credentials: str
+    token: str
+    path: str = urlsplit(str(request.url)).path
+    resource: str = "core"
+
+    scheme, _, credentials = str(
+        request.headers.get("Authorization", "")
+    ).partition(" ")
+    token = credentials
+    if scheme.lower() == "basic":
+        try:
+            token = base64.b64decode(credentials).decode().partition(":")[2]
+        except ValueError:
+            token = credentials
+
+    if path.endswith("/graphql"):
+        resource = "graphql"
+    elif "/search/" in path:
+        resource = "search"
+
+    return hashlib.sha256(f"{ resource } { token }".encode()).hexdigest()
+
+
+def _retryable(request: PreparedRequest) -> bool:
+    """Checks if a request can safely be sent again
+
+    Args:
+        request (PreparedRequest): the request.
+
+    Returns:
+        bool: True for reads.
+    """
+    return request.method in ("GET", "HEAD")
+
+
+def _should_retry(response: Response) -> bool:
+    """Checks if a response is worth trying again for
+
+    Args:
+        response (Response): the response.
+
+    Returns:
+        bool: True for server errors, and for secondary rate limits, which
+              GitHub returns as 403 or 429 with a Retry-After header.
+    """
+    if response.status_code in (502, 503, 504):
+        return True
+    return (
+        response.status_code in (403, 429)
+        and "Retry-After" in response.headers
+    )
+
+
+def _backoff(attempt: int) -> float:
+    """Delay before a retry, with exponential backoff and full jitter
+
+    Args:
+        attempt (int): number of the attempt that failed, from 0.
+
+    Returns:
+        float: seconds to wait.
+    """
+    ceiling: float = min(
+        c.GITHUB_BACKOFF_MAX, c.GITHUB_BACKOFF_BASE * 2**attempt
+    )
+    return random.uniform(0, ceiling)  # nosec B311
+
+
+def _retry_after(response: Response, attempt: int) -> float:
+    """Delay before a retry of a response
+
+    Args:
+        response (Response): the response.
+        attempt (int): number of the attempt, from 0.
+
+    Returns:
+        float: the Retry-After header if set, else the backoff.
+    """
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, TypeError, ValueError):
+        return _backoff(attempt)
+
+
+def _past(deadline: float | None, delay: float, timeout: Any = None) -> bool:
+    """Checks if a retry could go past a deadline
+
+    Args:
+        deadline (float | None): monotonic time of the deadline, if any.
+        delay (float): seconds to wait before the retry.
+        timeout (Any): timeout of the retry, as for requests.
+
+    Returns:
+        bool: True if there is a deadline and waiting, then the retry timing
+              out, would pass it.
+    """
+    seconds: float = 0
+
+    if deadline is None:
+        return False
+
+    if isinstance(timeout, tuple):
+        seconds = sum(part for part in timeout if part is not None)
+    elif timeout is not None:
+        seconds = timeout
+    return t.monotonic() + delay + seconds >= deadline
+
+
+def _cap_timeout(timeout: Any, cap: float) -> Any:
+    """Caps a requests timeout
+
+    Args:
+        timeout (Any): None, seconds, or a (connect, read) tuple.
+        cap (float): longest timeout allowed.
+
+    Returns:
+        Any: the timeout, with no part longer than cap.
+    """
+    if timeout is None:
+        return cap
+    if isinstance(timeout, tuple):
+        return tuple(
+            cap if part is None else min(part, cap) for part in timeout
+        )
+    return min(timeout, cap)
+
+
+_github_scheduler: RateLimitScheduler | None = None
+_github_scheduler_lock: threading.Lock = threading.Lock()
+
+
+def github_scheduler() -> RateLimitScheduler:
+    """Returns the process-wide scheduler
+
+    Returns:
+        RateLimitScheduler: the shared scheduler.
+    """
+    global _github_scheduler
+
+    with _github_scheduler_lock:
+        if _github_scheduler is None:
+            _github_scheduler = RateLimitScheduler()
+    return _github_scheduler
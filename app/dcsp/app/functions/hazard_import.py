@@ -0,0 +1,397 @@
+"""Bulk import of hazards
+
+An existing hazard register, kept as a CSV, XLSX or YAML file, can be logged as
+hazards (GitHub issues) in one go. Every row is checked before any hazard is
+logged, so a register with a bad label is fixed and run again rather than half
+imported. Hazards are then logged by a small pool of workers, paced to stay
+within GitHub's limits on creating content.
+
+Each hazard carries an import key, hidden in its body. Hazards already on
+GitHub with the same key are skipped, so an import that stopped part way can
+simply be run again.
+
+Classes:
+    HazardImport: checks and logs the hazards of a register
+
+Functions:
+    read_hazards: reads the hazards of a register
+    import_key: the import key of a hazard
+"""
+
+import csv
+import hashlib
+import os
+import re
+import threading
+import time as t
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Callable
+
+import openpyxl
+import yaml
+from github import GithubException
+
+import app.functions.constants as c
+from app.functions.git_control import GitController
+from app.functions.hazard_store import HazardStore
+from app.functions.label_registry import LabelRegistry, label_registry
+from app.models import Hazard
+
+
+_KEY_MARKER: str = "<!-- dcsp-import-key: {key} -->"
+_KEY_PATTERN: re.Pattern = re.compile(r"<!-- dcsp-import-key: (\S+) -->")
+
+
+class HazardImport:
+    """Checks and logs the hazards of a register
+
+    The rows of a register are checked with check, then logged with run.
+    Hazards are logged by a pool of workers, with the start of each spaced by
+    at least interval seconds across the pool.
+    """
+
+    def __init__(
+        self,
+        gc: GitController,
+        workers: int = c.HAZARD_IMPORT_WORKERS,
+        interval: float = c.HAZARD_IMPORT_INTERVAL,
+    ) -> None:
+        """Initialises the HazardImport class
+
+        Args:
+            gc (GitController): controller for the repository to log the
+                                hazards in.
+            workers (int): number of hazards logged at the same time.
+            interval (float): least seconds between starting to log each
+                              hazard.
+
+        Raises:
+            ValueError: if workers is less than 1.
+        """
+        if workers < 1:
+            raise ValueError(f"'{ workers }' is not a valid number of workers")
+
+        self.gc: GitController = gc
+        self.workers: int = workers
+        self.interval: float = interval
+        self._pace_lock: threading.Lock = threading.Lock()
+        self._next_start: float = 0
+        return
+
+    def check(
+        self, hazards: list[dict[str, Any]]
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Checks the hazards of a register
+
+        Each label is checked against the label registry.
+
+        Args:
+            hazards (list[dict[str, Any]]): hazards, as from read_hazards.
+
+        Returns:
+            tuple[list[dict[str, Any]], list[dict[str, Any]]]: the hazards
+                that can be logged, each with its import key, and the row and
+                error of each hazard that cannot.
+        """
+        registry: LabelRegistry = label_registry()
+        valid: list[dict[str, Any]] = []
+        invalid: list[dict[str, Any]] = []
+        hazard: dict[str, Any]
+        bad_labels: list[str] = []
+
+        for hazard in hazards:
+            if hazard["title"] == "":
+                invalid.append({"row": hazard["row"], "error": "No title"})
+                continue
+
+            bad_labels = registry.invalid(hazard["labels"])
+            if bad_labels:
+                invalid.append(
+                    {
+                        "row": hazard["row"],
+                        "error": f"Labels not valid - { ', '.join(bad_labels) }",
+                    }
+                )
+                continue
+
+            valid.append(hazard | {"key": hazard["key"] or import_key(hazard)})
+        return valid, invalid
+
+    def run(
+        self,
+        hazards: list[dict[str, Any]],
+        progress: Callable[[int, int], None] | None = None,
+        dry_run: bool = False,
+    ) -> dict[str, Any]:
+        """Imports the hazards of a register
+
+        If any hazard fails its checks, nothing is logged. Otherwise the local
+        store of hazards is synced to find the hazards already imported, and
+        the rest are logged.
+
+        Args:
+            hazards (list[dict[str, Any]]): hazards, as from read_hazards.
+            progress (Callable[[int, int], None] | None): called with the
+                number of hazards dealt with so far, and the total, as each
+                hazard is logged or fails.
+            dry_run (bool): set to True to check the hazards and find those
+                            already imported, without logging any.
+
+        Returns:
+            dict[str, Any]: report of the import, with the row and import key
+                            of each hazard created (with its number), skipped
+                            as already imported, or failed (with the error),
+                            and the row and error of each hazard that failed
+                            its checks.
+
+        Raises:
+            ValueError: if error with accessing the repository
+        """
+        valid: list[dict[str, Any]]
+        invalid: list[dict[str, Any]]
+        imported: set[str] = set()
+        to_log: list[dict[str, Any]] = []
+        report: dict[str, Any] = {
+            "total": len(hazards),
+            "created": [],
+            "skipped": [],
+            "failed": [],
+            "invalid": [],
+        }
+        hazard: dict[str, Any]
+        executor: ThreadPoolExecutor
+        futures: dict[Future, dict[str, Any]] = {}
+        future: Future
+
+        valid, invalid = self.check(hazards)
+        if invalid:
+            report["invalid"] = invalid
+            return report
+
+        imported = self.imported_keys()
+        for hazard in valid:
+            if hazard["key"] in imported:
+                report["skipped"].append(_entry(hazard))
+            else:
+                # Also skips a hazard repeated in the register
+                imported.add(hazard["key"])
+                to_log.append(hazard)
+
+        if dry_run or not to_log:
+            return report
+
+        executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="dcsp-import"
+        )
+        with executor:
+            futures = {
+                executor.submit(self._log, hazard): hazard for hazard in to_log
+            }
+            for future in as_completed(futures):
+                try:
+                    report["created"].append(
+                        _entry(futures[future]) | {"number": future.result()}
+                    )
+                except (ValueError, GithubException, OSError) as error:
+                    report["failed"].append(
+                        _entry(futures[future]) | {"error": str(error)}
+                    )
+
+                if progress is not None:
+                    progress(
+                        len(report["created"]) + len(report["failed"]),
+                        len(to_log),
+                    )
+
+        for outcome in ("created", "failed"):
+            report[outcome].sort(key=lambda entry: entry["row"])
+
+        HazardStore(self.gc).expire()
+        return report
+
+    def imported_keys(self) -> set[str]:
+        """Import keys of the hazards already on GitHub
+
+        Returns:
+            set[str]: the import keys.
+
+        Raises:
+            ValueError: if error with accessing the repository
+        """
+        store: HazardStore = HazardStore(self.gc)
+        body: str
+
+        store.sync()
+        return {
+            key
+            for body in Hazard.objects.filter(
+                repo=store.repo, body__contains="dcsp-import-key"
+            ).values_list("body", flat=True)
+            for key in _KEY_PATTERN.findall(body)
+        }
+
+    def _log(self, hazard: dict[str, Any]) -> int:
+        """Logs a hazard, with its import key, once its turn comes
+
+        Args:
+            hazard (dict[str, Any]): the checked hazard.
+
+        Returns:
+            int: number of the new hazard.
+        """
+        self._wait_turn()
+        return self.gc.hazard_log(
+            hazard["title"],
+            f"{ hazard['body'] }\n\n{ _KEY_MARKER.format(key=hazard['key']) }",
+            hazard["labels"],
+            check_labels=False,
+        )
+
+    def _wait_turn(self) -> None:
+        """Waits so hazards are started at least interval seconds apart"""
+        now: float
+        start: float
+
+        with self._pace_lock:
+            now = t.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+
+        if start > now:
+            t.sleep(start - now)
+        return
+
+
+def read_hazards(path: str) -> list[dict[str, Any]]:
+    """Reads the hazards of a register
+
+    CSV and XLSX registers have a heading row, with "title", "body", "labels"
+    and optionally "key" columns. Labels are separated by commas or
+    semicolons. YAML registers are a list of hazards with the same keys,
+    where labels may also be a list.
+
+    Args:
+        path (str): location of the register, ending .csv, .xlsx, .yml or
+                    .yaml.
+
+    Returns:
+        list[dict[str, Any]]: row number, title, body, labels and key (empty
+                              if not given) of each hazard.
+
+    Raises:
+        FileNotFoundError: if there is no file at path.
+        ValueError: if the file type is not supported, or the file cannot be
+                    read.
+    """
+    extension: str = os.path.splitext(path)[1].lower()
+    rows: list[dict[str, Any]] = []
+
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"'{ path }' does not exist")
+
+    if extension == ".csv":
+        with open(path, "r", newline="", encoding="utf-8-sig") as file:
+            rows = list(csv.DictReader(file))
+    elif extension == ".xlsx":
+        rows = _read_xlsx(path)
+    elif extension in (".yml", ".yaml"):
+        with open(path, "r") as file:
+            try:
+                rows = yaml.safe_load(file) or []
+            except yaml.YAMLError as error:
+                raise ValueError(f"'{ path }' is not valid YAML - { error }")
+        if not isinstance(rows, list) or not all(
+            isinstance(row, dict) for row in rows
+        ):
+            raise ValueError(f"'{ path }' is not a list of hazards")
+    else:
+        raise ValueError(f"'{ extension }' files cannot be imported")
+
+    return [_hazard(number, row) for number, row in enumerate(rows, start=1)]
+
+
+def import_key(hazard: dict[str, Any]) -> str:
+    """The import key of a hazard, from its title and body
+
+    Args:
+        hazard (dict[str, Any]): the hazard.
+
+    Returns:
+        str: the key.
+    """
+    return hashlib.sha256(
+        f"{ hazard['title'].lower() }\n{ hazard['body'] }".encode()
+    ).hexdigest()[:16]
+
+
+def _read_xlsx(path: str) -> list[dict[str, Any]]:
+    """Reads the rows of the first sheet of a workbook
+
+    Args:
+        path (str): location of the workbook.
+
+    Returns:
+        list[dict[str, Any]]: each row, keyed by the heading row.
+    """
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        values = list(workbook.worksheets[0].iter_rows(values_only=True))
+    finally:
+        workbook.close()
+
+    if not values:
+        return []
+
+    headings: list[str] = [str(heading or "") for heading in values[0]]
+    return [
+        dict(zip(headings, row))
+        for row in values[1:]
+        if any(cell is not None for cell in row)
+    ]
+
+
+def _hazard(number: int, row: dict[str, Any]) -> dict[str, Any]:
+    """A hazard from a row of a register
+
+    Args:
+        number (int): row number, counting from 1 after any heading row.
+        row (dict[str, Any]): the row.
+
+    Returns:
+        dict[str, Any]: row number, title, body, labels and key.
+    """
+    values: dict[str, Any] = {
+        str(heading).strip().lower(): value for heading, value in row.items()
+    }
+    labels: Any = values.get("labels") or []
+
+    if isinstance(labels, str):
+        labels = re.split(r"[,;]", labels)
+
+    return {
+        "row": number,
+        "title": str(values.get("title") or "").strip(),
+        "body": str(values.get("body") or "").strip(),
+        "labels": [
+            str(label).strip().lower()
+            for label in labels
+            if str(label).strip()
+        ],
+        "key": str(values.get("key") or "").strip(),
+    }
+
+
+def _entry(hazard: dict[str, Any]) -> dict[str, Any]:
+    """Entry for a hazard in the report of an import
+
+    Args:
+        hazard (dict[str, Any]): the checked hazard.
+
+    Returns:
+        dict[str, Any]: row, title and import key.
+    """
+    return {
+        "row": hazard["row"],
+        "title": hazard["title"],
+        "key": hazard["key"],
+    }
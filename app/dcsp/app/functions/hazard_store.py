@@ -0,0 +1,380 @@
+"""Local store of hazards
+
+Paging through every open issue on GitHub each time the hazards are shown is
+slow, and uses up the API rate limit, once a project has hundreds of hazards.
+The hazards are instead mirrored into the database. Each sync only asks GitHub
+for the hazards that have changed since the last one it saw (the watermark),
+using the "since" parameter of the issues API. A full sync fetches every
+hazard with GitController.hazards_full, which brings the recent comments of
+each hazard with it.
+
+Classes:
+    HazardStore: mirror of the hazards of a repository
+"""
+
+import json
+import threading
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Iterable, Iterator
+
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+import app.functions.constants as c
+from app.functions.git_control import GitController
+from app.models import Hazard, HazardSync
+
+
+_sync_locks: dict[str, threading.Lock] = {}
+_sync_locks_lock: threading.Lock = threading.Lock()
+
+
+class HazardStore:
+    def __init__(self, gc: GitController) -> None:
+        """Initialises the HazardStore class
+
+        Args:
+            gc (GitController): controller for the repository the hazards are
+                                logged in.
+        """
+        self.gc: GitController = gc
+        self.repo: str = f"{ gc.repo_domain_name() }/{ gc.github_repo }"
+        return
+
+    def sync(self, full: bool = False, blocking: bool = True) -> int:
+        """Brings the store up to date with GitHub
+
+        Only one sync of a repository runs at a time in a process.
+
+        A full sync fetches hazards in the order they were created, so the
+        watermark is only moved on once every hazard has been saved.
+
+        Args:
+            full (bool): set to True to fetch all hazards again, rather than
+                         only those changed since the last sync.
+            blocking (bool): set to False to return straight away if a sync of
+                             the repository is already running.
+
+        Returns:
+            int: number of hazards added or changed. -1 if not run as another
+                 sync was running.
+
+        Raises:
+            ValueError: if error with accessing the repository
+        """
+        lock: threading.Lock = _sync_lock(self.repo)
+        progress: HazardSync
+        updated: Iterator[dict[str, Any]]
+        hazards: list[Hazard] = []
+        latest: datetime | None = None
+        update_fields: list[str] = ["synced"]
+        count: int = 0
+        hazard: dict[str, Any]
+
+        if not lock.acquire(blocking=blocking):
+            return -1
+
+        try:
+            progress, _ = HazardSync.objects.get_or_create(repo=self.repo)
+            if full:
+                updated = self.gc.hazards_full("all")
+            else:
+                updated = self.gc.hazards_updated(progress.watermark)
+
+            for hazard in updated:
+                hazards.append(self._hazard(hazard))
+                if latest is None or hazards[-1].updated_at > latest:
+                    latest = hazards[-1].updated_at
+                if len(hazards) >= c.GITHUB_PER_PAGE:
+                    self._save(progress, hazards, move_watermark=not full)
+                    count += len(hazards)
+                    hazards = []
+
+            self._save(progress, hazards, move_watermark=not full)
+            count += len(hazards)
+
+            progress.synced = timezone.now()
+            if full and latest is not None:
+                progress.watermark = latest
+                update_fields.append("watermark")
+            progress.save(update_fields=update_fields)
+        finally:
+            lock.release()
+        return count
+
+    def hazards_open(
+        self, labels: Iterable[str] = (), text: str = ""
+    ) -> list[dict[str, Any]]:
+        """Open hazards, from the store
+
+        Args:
+            labels (Iterable[str]): only hazards with all of these labels.
+            text (str): only hazards with this text in their title or body,
+                        ignoring case.
+
+        Returns:
+            list[dict[str, Any]]: number, title, body and labels of each open
+                                  hazard, in number order.
+        """
+        return list(self._open(labels, text))
+
+    def hazards_open_page(
+        self,
+        page: int | str = 1,
+        labels: Iterable[str] = (),
+        text: str = "",
+        per_page: int = c.HAZARDS_PER_PAGE,
+    ) -> dict[str, Any]:
+        """A page of the open hazards, from the store
+
+        Only the hazards on the page are read from the database.
+
+        Args:
+            page (int | str): page number, counting from 1. The last page if
+                              past the end, and the first if not a number.
+            labels (Iterable[str]): only hazards with all of these labels.
+            text (str): only hazards with this text in their title or body,
+                        ignoring case.
+            per_page (int): most hazards on a page.
+
+        Returns:
+            dict[str, Any]: the hazards on the page, as for hazards_open, with
+                            the page number, number of pages and number of
+                            matching hazards.
+        """
+        paginator: Paginator = Paginator(self._open(labels, text), per_page)
+        current = paginator.get_page(page)
+
+        return {
+            "hazards": list(current.object_list),
+            "page": current.number,
+            "pages": paginator.num_pages,
+            "count": paginator.count,
+        }
+
+    async def aiter_hazards_open(
+        self,
+        labels: Iterable[str] = (),
+        text: str = "",
+        chunk_size: int = c.HAZARDS_STREAM_CHUNK,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Open hazards, from the store, read a chunk at a time
+
+        For async views, so the hazards can be sent as they are read without
+        holding a thread for synchronous code.
+
+        Args:
+            labels (Iterable[str]): only hazards with all of these labels.
+            text (str): only hazards with this text in their title or body,
+                        ignoring case.
+            chunk_size (int): hazards read from the database at a time.
+
+        Yields:
+            dict[str, Any]: as for hazards_open.
+        """
+        hazard: dict[str, Any]
+
+        async for hazard in self._open(labels, text).aiterator(
+            chunk_size=chunk_size
+        ):
+            yield hazard
+        return
+
+    def _open(self, labels: Iterable[str], text: str) -> QuerySet:
+        """Query for the open hazards, filtered
+
+        Labels are held as a JSON list, so each label is matched, quoted, as
+        an element of it.
+
+        Args:
+            labels (Iterable[str]): only hazards with all of these labels.
+            text (str): only hazards with this text in their title or body.
+
+        Returns:
+            QuerySet: number, title, body and labels, in number order.
+        """
+        hazards: QuerySet = Hazard.objects.filter(repo=self.repo, state="open")
+        label: str
+
+        for label in labels:
+            hazards = hazards.filter(labels__icontains=json.dumps(label))
+
+        if text:
+            hazards = hazards.filter(
+                Q(title__icontains=text) | Q(body__icontains=text)
+            )
+
+        return hazards.order_by("number").values(
+            "number", "title", "body", "labels"
+        )
+
+    def hazard(self, number: int) -> dict[str, Any] | None:
+        """A hazard, from the store
+
+        Args:
+            number (int): hazard (issue) number.
+
+        Returns:
+            dict[str, Any] | None: number, title, body, labels and state of the
+                                   hazard. None if not in the store.
+        """
+        hazard = (
+            Hazard.objects.filter(repo=self.repo, number=number)
+            .values("number", "title", "body", "labels", "state")
+            .first()
+        )
+
+        if hazard is None:
+            return None
+        return dict(hazard)
+
+    def last_synced(self) -> datetime | None:
+        """When the store was last brought up to date
+
+        Returns:
+            datetime | None: time the last sync finished. None if never synced.
+        """
+        return (
+            HazardSync.objects.filter(repo=self.repo)
+            .values_list("synced", flat=True)
+            .first()
+        )
+
+    def is_stale(self, max_age: float | None = None) -> bool:
+        """Checks if the store is due a sync
+
+        While GitHub is pushing changes by webhook, the store is kept up to
+        date by the webhook, and only synced as a check every
+        c.HAZARD_WEBHOOK_SYNC_INTERVAL. If no change has been pushed for that
+        long, the webhook may have been removed, so the store is synced every
+        c.HAZARD_SYNC_INTERVAL again.
+
+        Args:
+            max_age (float | None): seconds after a sync that the store is
+                                    stale. c.HAZARD_SYNC_INTERVAL, or
+                                    c.HAZARD_WEBHOOK_SYNC_INTERVAL if a change
+                                    was pushed within that interval, if None.
+
+        Returns:
+            bool: True if never synced, or last synced over max_age ago.
+        """
+        webhook_interval: timedelta = timedelta(
+            seconds=c.HAZARD_WEBHOOK_SYNC_INTERVAL
+        )
+        progress = (
+            HazardSync.objects.filter(repo=self.repo)
+            .values("synced", "pushed")
+            .first()
+        )
+
+        if progress is None or progress["synced"] is None:
+            return True
+
+        if max_age is None:
+            max_age = (
+                c.HAZARD_WEBHOOK_SYNC_INTERVAL
+                if progress["pushed"] is not None
+                and timezone.now() - progress["pushed"] <= webhook_interval
+                else c.HAZARD_SYNC_INTERVAL
+            )
+        return timezone.now() - progress["synced"] > timedelta(seconds=max_age)
+
+    def expire(self) -> None:
+        """Marks the store as due a sync
+
+        Used after a hazard has been changed through this app, so that the
+        change is picked up the next time the hazards are shown.
+        """
+        HazardSync.objects.filter(repo=self.repo).update(synced=None)
+        return
+
+    def _hazard(self, hazard: dict[str, Any]) -> Hazard:
+        """Hazard model for a hazard from GitHub
+
+        Args:
+            hazard (dict[str, Any]): hazard, as from
+                                     GitController.hazards_updated.
+
+        Returns:
+            Hazard: the unsaved model.
+
+        Raises:
+            ValueError: if the time the hazard was last updated is not valid.
+        """
+        updated_at: datetime | None = parse_datetime(hazard["updated_at"])
+
+        if updated_at is None:
+            raise ValueError(
+                f"'{ hazard['updated_at'] }' is not a valid time for hazard { hazard['number'] }"
+            )
+
+        return Hazard(
+            repo=self.repo,
+            number=hazard["number"],
+            title=hazard["title"],
+            body=hazard["body"],
+            labels=hazard["labels"],
+            state=hazard["state"],
+            updated_at=updated_at,
+        )
+
+    def _save(
+        self,
+        progress: HazardSync,
+        hazards: list[Hazard],
+        move_watermark: bool = True,
+    ) -> None:
+        """Saves a batch of hazards and moves on the watermark
+
+        The hazards and the watermark are saved together, so a sync that
+        fails part way carries on from the last batch saved.
+
+        Args:
+            progress (HazardSync): sync progress of the repository.
+            hazards (list[Hazard]): hazards to add or update, in the order
+                                    they were last updated.
+            move_watermark (bool): set to False to save the hazards only, for
+                                   hazards not in the order they were last
+                                   updated.
+        """
+        if not hazards:
+            return
+
+        with transaction.atomic():
+            Hazard.objects.bulk_create(
+                hazards,
+                update_conflicts=True,
+                unique_fields=["repo", "number"],
+                update_fields=[
+                    "title",
+                    "body",
+                    "labels",
+                    "state",
+                    "updated_at",
+                ],
+            )
+            if move_watermark:
+                progress.watermark = max(
+                    [hazard.updated_at for hazard in hazards]
+                    + ([progress.watermark] if progress.watermark else [])
+                )
+                progress.save(update_fields=["watermark"])
+        return
+
+
+def _sync_lock(repo: str) -> threading.Lock:
+    """Lock held while a repository is synced
+
+    Args:
+        repo (str): the repository, as "domain/name".
+
+    Returns:
+        threading.Lock: the lock for the repository.
+    """
+    with _sync_locks_lock:
+        if repo not in _sync_locks:
+            _sync_locks[repo] = threading.Lock()
+        return _sync_locks[repo]
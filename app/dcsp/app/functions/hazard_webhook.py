@@ -0,0 +1,273 @@
+"""GitHub webhooks for the hazards
+
+GitHub can push each change to the hazards (issues), their comments and the
+repository labels to the app as it happens, rather than the app polling for
+changes. Each delivery is signed with a secret shared with GitHub, set as
+GITHUB_WEBHOOK_SECRET in the environment, and is applied to the local store
+of hazards and the cache of hazards looked up on GitHub.
+
+Classes:
+    HazardWebhook: checks and applies webhook deliveries
+
+Functions:
+    signature: the signature GitHub gives a delivery
+    read_deliveries: reads recorded webhook deliveries
+"""
+
+import hashlib
+import hmac
+import json
+import os
+from datetime import datetime
+from typing import Any
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from app.functions.git_control import clear_hazard_cache
+from app.models import Hazard, HazardSync
+
+
+class HazardWebhook:
+    def __init__(self, secret: str = "") -> None:
+        """Initialises the HazardWebhook class
+
+        Args:
+            secret (str): secret shared with GitHub for signing deliveries.
+                          No delivery is verified if empty.
+        """
+        self.secret: str = secret
+        return
+
+    def verify(self, body: bytes, header: str) -> bool:
+        """Checks a delivery was signed with the secret
+
+        Args:
+            body (bytes): body of the delivery, as sent.
+            header (str): the X-Hub-Signature-256 header.
+
+        Returns:
+            bool: True if the signature is right, False if not or if there is
+                  no secret.
+        """
+        if self.secret == "":
+            return False
+        return hmac.compare_digest(signature(self.secret, body), header)
+
+    def handle(self, event: str, payload: dict[str, Any]) -> str:
+        """Applies a delivery to the hazards kept by the app
+
+        Only repositories already mirrored in the local store are changed,
+        but hazards looked up on GitHub are always forgotten. A delivery for
+        an older version of a hazard than the one stored, as GitHub does not
+        promise to deliver in order, is ignored.
+
+        Args:
+            event (str): the X-GitHub-Event header.
+            payload (dict[str, Any]): body of the delivery.
+
+        Returns:
+            str: what was done - "pong", "updated", "deleted", "relabelled",
+                 "stale" or "ignored".
+
+        Raises:
+            ValueError: if the payload is missing what the event needs.
+        """
+        repo: str
+        stored: str | None
+        outcome: str = "ignored"
+
+        if event == "ping":
+            return "pong"
+
+        if event not in ("issues", "issue_comment", "label"):
+            return outcome
+
+        try:
+            repo = payload["repository"]["full_name"]
+        except (KeyError, TypeError):
+            raise ValueError(f"'{ event }' payload has no repository")
+
+        stored = (
+            HazardSync.objects.filter(repo__iexact=repo)
+            .values_list("repo", flat=True)
+            .first()
+        )
+
+        try:
+            if event == "label":
+                clear_hazard_cache(repo)
+                if stored is not None:
+                    outcome = self._label(stored, payload)
+            else:
+                clear_hazard_cache(repo, payload["issue"]["number"])
+                if (
+                    stored is not None
+                    and "pull_request" not in payload["issue"]
+                ):
+                    outcome = self._issue(stored, event, payload)
+        except (KeyError, TypeError) as error:
+            raise ValueError(f"'{ event }' payload has no { error }")
+
+        if outcome not in ("ignored", "stale"):
+            HazardSync.objects.filter(repo=stored).update(
+                pushed=timezone.now()
+            )
+        return outcome
+
+    def _issue(self, repo: str, event: str, payload: dict[str, Any]) -> str:
+        """Applies an issues or issue_comment delivery
+
+        Both carry the whole issue as it now is.
+
+        Args:
+            repo (str): the repository, as held in the store.
+            event (str): "issues" or "issue_comment".
+            payload (dict[str, Any]): body of the delivery.
+
+        Returns:
+            str: "updated", "deleted" or "stale".
+        """
+        issue: dict[str, Any] = payload["issue"]
+        updated_at: datetime | None = parse_datetime(issue["updated_at"])
+        current: Hazard | None
+
+        if event == "issues" and payload.get("action") in (
+            "deleted",
+            "transferred",
+        ):
+            Hazard.objects.filter(repo=repo, number=issue["number"]).delete()
+            return "deleted"
+
+        with transaction.atomic():
+            current = (
+                Hazard.objects.select_for_update()
+                .filter(repo=repo, number=issue["number"])
+                .first()
+            )
+            if (
+                current is not None
+                and updated_at is not None
+                and current.updated_at > updated_at
+            ):
+                return "stale"
+
+            Hazard.objects.update_or_create(
+                repo=repo,
+                number=issue["number"],
+                defaults={
+                    "title": issue["title"],
+                    "body": issue["body"],
+                    "labels": [label["name"] for label in issue["labels"]],
+                    "state": issue["state"],
+                    "updated_at": updated_at,
+                },
+            )
+        return "updated"
+
+    def _label(self, repo: str, payload: dict[str, Any]) -> str:
+        """Applies a label delivery to the stored hazards
+
+        A renamed label is renamed, and a deleted label removed, on every
+        hazard that has it. GitHub does not send an issues delivery for each.
+
+        Args:
+            repo (str): the repository, as held in the store.
+            payload (dict[str, Any]): body of the delivery.
+
+        Returns:
+            str: "relabelled" or "ignored".
+        """
+        action: str = payload.get("action", "")
+        name: str = payload["label"]["name"]
+        old_name: str = name
+        hazard: Hazard
+        labels: list[str]
+
+        if action == "edited":
+            old_name = (
+                payload.get("changes", {}).get("name", {}).get("from", name)
+            )
+            if old_name == name:
+                return "ignored"
+        elif action != "deleted":
+            return "ignored"
+
+        with transaction.atomic():
+            for hazard in Hazard.objects.select_for_update().filter(
+                repo=repo, labels__icontains=json.dumps(old_name)
+            ):
+                labels = [
+                    label for label in hazard.labels if label != old_name
+                ]
+                if action == "edited" and len(labels) < len(hazard.labels):
+                    labels.append(name)
+                hazard.labels = labels
+                hazard.save(update_fields=["labels"])
+        return "relabelled"
+
+
+def signature(secret: str, body: bytes) -> str:
+    """The signature GitHub gives a delivery
+
+    Args:
+        secret (str): secret shared with GitHub.
+        body (bytes): body of the delivery.
+
+    Returns:
+        str: the X-Hub-Signature-256 header for the delivery.
+    """
+    digest: str = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return f"sha256={ digest }"
+
+
+def read_deliveries(path: str) -> list[dict[str, Any]]:
+    """Reads recorded webhook deliveries
+
+    A recording is a JSON file holding a delivery, or a list of them, where
+    each delivery has the "event" name and the "payload" sent. A directory of
+    recordings is read in file name order.
+
+    Args:
+        path (str): a recording, or a directory of them.
+
+    Returns:
+        list[dict[str, Any]]: event and payload of each delivery.
+
+    Raises:
+        FileNotFoundError: if there is nothing at path.
+        ValueError: if a recording cannot be read.
+    """
+    paths: list[str] = [path]
+    deliveries: list[dict[str, Any]] = []
+    recorded: Any
+    delivery: Any
+
+    if os.path.isdir(path):
+        paths = [
+            os.path.join(path, name)
+            for name in sorted(os.listdir(path))
+            if name.endswith(".json")
+        ]
+    elif not os.path.isfile(path):
+        raise FileNotFoundError(f"'{ path }' does not exist")
+
+    for path in paths:
+        try:
+            with open(path, "r") as file:
+                recorded = json.load(file)
+        except ValueError as error:
+            raise ValueError(f"'{ path }' is not valid JSON - { error }")
+
+        for delivery in recorded if isinstance(recorded, list) else [recorded]:
+            if (
+                not isinstance(delivery, dict)
+                or "event" not in delivery
+                or "payload" not in delivery
+            ):
+                raise ValueError(
+                    f"'{ path }' does not hold an event and payload"
+                )
+            deliveries.append(delivery)
+    return deliveries
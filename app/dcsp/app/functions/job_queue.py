@@ -0,0 +1,402 @@
+"""Background job queue
+
+A lightweight in-process queue for long running tasks, such as copying
+templates, starting mkdocs and pushing to GitHub. Jobs are run on a thread
+pool so that the view that submitted them can return straight away. The status
+of each job is persisted to a json file so that it can be polled by the
+browser, and survives a restart of the web server. The file is shared by all
+web server workers, using locked_files, so a job submitted to one worker can be
+polled from any other. Each worker runs only the jobs submitted to it. Calls to
+GitHub made by a job are scheduled as background work.
+
+Classes:
+    JobQueue: queue, run and report on background jobs
+
+Functions:
+    job_queue: returns the process-wide job queue
+"""
+
+import json
+import os
+import threading
+import time as t
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+import app.functions.constants as c
+from app.functions.constants import JobStatus
+from app.functions.github_scheduler import background
+from app.functions.locked_files import atomic_write, cached_read, file_lock
+
+
+class JobQueue:
+    def __init__(
+        self,
+        status_path: str = c.JOBS_STATUS_PATH,
+        workers: int = c.JOBS_WORKERS,
+        run_in_background: bool = True,
+    ) -> None:
+        """Initialise the job queue
+
+        Any persisted job that was queued or running in a process that has
+        since stopped is marked as failed, as it will never complete.
+
+        Args:
+            status_path (str): location of the json file the job statuses are
+                               persisted to.
+            workers (int): number of worker threads.
+            run_in_background (bool): set to False to run jobs in the calling
+                                      thread when submitted. Mainly used for
+                                      unit testing.
+
+        Raises:
+            ValueError: if workers is less than 1.
+        """
+        if workers < 1:
+            raise ValueError(f"'{ workers }' is not a valid number of workers")
+
+        self.status_path: str = status_path
+        self.run_in_background: bool = run_in_background
+        self._lock: threading.Lock = threading.Lock()
+        self._jobs: dict[str, dict[str, Any]] = {}
+        self._sequence: int = max(
+            [job["sequence"] for job in self._load().values()], default=0
+        )
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="dcsp-job"
+        )
+        return
+
+    def submit(
+        self, name: str, function: Callable[..., Any], *args, **kwargs
+    ) -> str:
+        """Adds a job to the queue
+
+        Args:
+            name (str): human readable name of the job.
+            function (Callable): the function to run.
+            *args: positional arguments for the function.
+            **kwargs: keyword arguments for the function.
+
+        Returns:
+            str: the job ID.
+        """
+        job_id: str = uuid.uuid4().hex
+
+        with self._lock:
+            self._sequence += 1
+            self._jobs[job_id] = {
+                "id": job_id,
+                "name": name,
+                "status": JobStatus.QUEUED.value,
+                "sequence": self._sequence,
+                "progress": 0,
+                "result": None,
+                "error": "",
+                "submitted": t.time(),
+                "started": None,
+                "finished": None,
+                "pid": os.getpid(),
+            }
+            _prune(self._jobs)
+            self._save()
+
+        if self.run_in_background:
+            self._executor.submit(self._run, job_id, function, args, kwargs)
+        else:
+            self._run(job_id, function, args, kwargs)
+        return job_id
+
+    def status(self, job_id: str) -> dict[str, Any]:
+        """Returns the status of a job
+
+        Jobs submitted to other processes are read from the status file.
+
+        Args:
+            job_id (str): the job ID, as returned by submit.
+
+        Returns:
+            dict[str, Any]: details of the job, including its position in the
+                            queue (0 if it is no longer queued).
+
+        Raises:
+            KeyError: if the job ID is unknown.
+        """
+        jobs: dict[str, dict[str, Any]] = self._jobs
+        job: dict[str, Any] = {}
+
+        with self._lock:
+            if job_id not in jobs:
+                jobs = self._read()
+            if job_id not in jobs:
+                raise KeyError(f"'{ job_id }' is not a known job")
+
+            job = jobs[job_id].copy()
+            job["position"] = _position(job, jobs)
+        return job
+
+    def is_done(self, job_id: str) -> bool:
+        """Checks if a job has finished, successfully or not
+
+        Args:
+            job_id (str): the job ID.
+
+        Returns:
+            bool: True if finished or failed, False if queued or running.
+        """
+        return self.status(job_id)["status"] in (
+            JobStatus.FINISHED.value,
+            JobStatus.FAILED.value,
+        )
+
+    def set_progress(self, job_id: str, progress: int) -> None:
+        """Records the progress of a running job
+
+        Args:
+            job_id (str): the job ID.
+            progress (int): percentage complete, clipped to between 0 and 100.
+        """
+        with self._lock:
+            self._jobs[job_id]["progress"] = min(max(int(progress), 0), 100)
+            self._save()
+        return
+
+    def _run(
+        self,
+        job_id: str,
+        function: Callable[..., Any],
+        args: tuple,
+        kwargs: dict[str, Any],
+    ) -> None:
+        """Runs a job and records the outcome
+
+        Args:
+            job_id (str): the job ID.
+            function (Callable): the function to run.
+            args (tuple): positional arguments for the function.
+            kwargs (dict[str, Any]): keyword arguments for the function.
+        """
+        result: Any = None
+
+        self._update(job_id, status=JobStatus.RUNNING.value, started=t.time())
+
+        try:
+            with background():
+                result = function(*args, **kwargs)
+        except Exception as error:
+            self._update(
+                job_id,
+                status=JobStatus.FAILED.value,
+                error=f"{ type(error).__name__ }: { error }",
+                finished=t.time(),
+            )
+            return
+
+        try:
+            json.dumps(result)
+        except (TypeError, ValueError):
+            result = str(result)
+
+        self._update(
+            job_id,
+            status=JobStatus.FINISHED.value,
+            progress=100,
+            result=result,
+            finished=t.time(),
+        )
+        return
+
+    def _update(self, job_id: str, **values: Any) -> None:
+        """Updates and persists fields of a job
+
+        Args:
+            job_id (str): the job ID.
+            **values: fields to update.
+        """
+        with self._lock:
+            self._jobs[job_id].update(values)
+            self._save()
+        return
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        """Loads persisted jobs, failing those that were abandoned
+
+        A job is abandoned if it was queued or running in a process that is no
+        longer running, or in an earlier process with the same ID as this one.
+
+        Returns:
+            dict[str, dict[str, Any]]: jobs keyed by ID. Empty if there is no
+                                       status file or it is unreadable.
+        """
+        jobs: dict[str, dict[str, Any]] = {}
+        abandoned: bool = False
+
+        with file_lock(self.status_path):
+            jobs = self._read()
+            for job in jobs.values():
+                if job["status"] in (
+                    JobStatus.QUEUED.value,
+                    JobStatus.RUNNING.value,
+                ) and not _running_elsewhere(job.get("pid")):
+                    job["status"] = JobStatus.FAILED.value
+                    job["error"] = "Server restarted before the job completed"
+                    abandoned = True
+
+            if abandoned:
+                atomic_write(self.status_path, json.dumps(jobs))
+        return jobs
+
+    def _read(self) -> dict[str, dict[str, Any]]:
+        """Reads the jobs of all processes from the status file
+
+        Returns:
+            dict[str, dict[str, Any]]: copies of the jobs keyed by ID. Empty if
+                                       there is no status file or it is
+                                       unreadable.
+        """
+        try:
+            return {
+                job_id: job.copy()
+                for job_id, job in cached_read(
+                    self.status_path, _parse_jobs
+                ).items()
+            }
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self) -> None:
+        """Persists the jobs of this process to the status file
+
+        The jobs of other processes in the file are kept. Must be called with
+        the lock held.
+        """
+        jobs: dict[str, dict[str, Any]] = {}
+
+        with file_lock(self.status_path):
+            jobs = self._read()
+            jobs.update(self._jobs)
+            _prune(jobs)
+            atomic_write(self.status_path, json.dumps(jobs))
+        return
+
+
+def _position(job: dict[str, Any], jobs: dict[str, dict[str, Any]]) -> int:
+    """Position of a job in the queue of the process it was submitted to
+
+    Args:
+        job (dict[str, Any]): the job.
+        jobs (dict[str, dict[str, Any]]): the jobs it is queued with.
+
+    Returns:
+        int: 1 for the next job to run, 0 if the job is not queued.
+    """
+    if job["status"] != JobStatus.QUEUED.value:
+        return 0
+
+    return 1 + sum(
+        1
+        for other in jobs.values()
+        if other["status"] == JobStatus.QUEUED.value
+        and other.get("pid") == job.get("pid")
+        and other["sequence"] < job["sequence"]
+    )
+
+
+def _prune(jobs: dict[str, dict[str, Any]]) -> None:
+    """Forgets the oldest completed jobs
+
+    Keeps the number of jobs at c.JOBS_MAX_KEPT.
+
+    Args:
+        jobs (dict[str, dict[str, Any]]): jobs keyed by ID, changed in place.
+    """
+    completed: list[dict[str, Any]] = []
+
+    if len(jobs) <= c.JOBS_MAX_KEPT:
+        return
+
+    completed = sorted(
+        [
+            job
+            for job in jobs.values()
+            if job["status"]
+            in (JobStatus.FINISHED.value, JobStatus.FAILED.value)
+        ],
+        key=lambda job: (job["submitted"], job["sequence"]),
+    )
+
+    for job in completed[: len(jobs) - c.JOBS_MAX_KEPT]:
+        del jobs[job["id"]]
+    return
+
+
+def _running_elsewhere(pid: int | None) -> bool:
+    """Checks if a job's process is another process still running
+
+    Args:
+        pid (int | None): ID of the process the job was submitted to.
+
+    Returns:
+        bool: True if the process is not this one and is still running.
+    """
+    if pid is None or pid == os.getpid():
+        return False
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _parse_jobs(content: str) -> dict[str, dict[str, Any]]:
+    """Parses the status file
+
+    Args:
+        content (str): content of the file.
+
+    Returns:
+        dict[str, dict[str, Any]]: jobs keyed by ID.
+
+    Raises:
+        ValueError: if the content is not a json object.
+    """
+    jobs: Any = json.loads(content)
+
+    if not isinstance(jobs, dict):
+        raise ValueError("Job status file does not hold an object")
+    return jobs
+
+
+_job_queue: JobQueue | None = None
+_job_queue_lock: threading.Lock = threading.Lock()
+
+
+def job_queue(
+    status_path: str = c.JOBS_STATUS_PATH, run_in_background: bool = True
+) -> JobQueue:
+    """Returns the process-wide job queue
+
+    The queue is created on first use, so that only one thread pool is created
+    per process.
+
+    Args:
+        status_path (str): location of the json file the job statuses are
+                           persisted to. Only used on first call.
+        run_in_background (bool): set to False to run jobs when submitted.
+                                  Only used on first call.
+
+    Returns:
+        JobQueue: the shared job queue.
+    """
+    global _job_queue
+
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue(
+                status_path=status_path, run_in_background=run_in_background
+            )
+    return _job_queue
@@ -0,0 +1,181 @@
+"""Registry of hazard labels
+
+The hazard labels are defined in labels.yml. The file is read once into an
+immutable registry, shared by everything in the process that needs the
+labels, and read again only when the file changes. The file is read through
+the cache of locked_files, so it is never read while being written.
+
+Classes:
+    LabelRegistry: the hazard labels, grouped by category
+
+Functions:
+    label_registry: the registry for the current labels.yml
+    clear_label_registry: forgets the registry, so the file is read again
+"""
+
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping
+
+import yaml
+
+import app.functions.constants as c
+from app.functions.locked_files import cached_read, invalidate
+
+
+_CATEGORIES: tuple[tuple[str, str], ...] = (
+    ("likelihood-", "likelihood"),
+    ("severity-", "severity"),
+    ("risk-level-", "risk"),
+)
+_GENERAL: str = "general"
+
+
+class LabelRegistry:
+    def __init__(self, definitions: Iterable[Mapping[str, Any]]) -> None:
+        """Initialises the LabelRegistry class
+
+        Label names are held in lower case. The registry does not change once
+        made.
+
+        Args:
+            definitions (Iterable[Mapping[str, Any]]): label definitions, each
+                with a name, description and color, as in labels.yml.
+
+        Raises:
+            ValueError: if a definition has no name.
+        """
+        definition: Mapping[str, Any]
+        name: str = ""
+        groups: dict[str, list[str]] = {}
+
+        try:
+            self._definitions: tuple[Mapping[str, Any], ...] = tuple(
+                MappingProxyType(dict(definition))
+                for definition in definitions
+            )
+            self._names: tuple[str, ...] = tuple(
+                str(definition["name"]).lower()
+                for definition in self._definitions
+            )
+        except (KeyError, TypeError):
+            raise ValueError("Hazard label definitions each need a name")
+
+        self._name_set: frozenset[str] = frozenset(self._names)
+        for name in self._names:
+            groups.setdefault(category(name), []).append(name)
+        self._categories: Mapping[str, tuple[str, ...]] = MappingProxyType(
+            {group: tuple(names) for group, names in groups.items()}
+        )
+        return
+
+    def __contains__(self, label: object) -> bool:
+        return isinstance(label, str) and self.is_valid(label)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        """Label names, in the order of labels.yml"""
+        return self._names
+
+    @property
+    def categories(self) -> Mapping[str, tuple[str, ...]]:
+        """Label names by category, in the order of labels.yml"""
+        return self._categories
+
+    def definitions(self) -> list[dict[str, Any]]:
+        """Label definitions, as in labels.yml
+
+        Returns:
+            list[dict[str, Any]]: a copy of each definition.
+        """
+        return [dict(definition) for definition in self._definitions]
+
+    def is_valid(self, label: str) -> bool:
+        """Checks if a label name is a hazard label
+
+        Args:
+            label (str): label to be examined.
+
+        Returns:
+            bool: True if a hazard label, False if not.
+        """
+        return label.lower() in self._name_set
+
+    def invalid(self, labels: Iterable[str]) -> list[str]:
+        """Finds the labels that are not hazard labels
+
+        Args:
+            labels (Iterable[str]): labels to be examined.
+
+        Returns:
+            list[str]: the labels that are not valid, in the order given.
+        """
+        return [label for label in labels if not self.is_valid(label)]
+
+    def in_category(self, name: str) -> tuple[str, ...]:
+        """Label names in a category
+
+        Args:
+            name (str): "likelihood", "severity", "risk" or "general".
+
+        Returns:
+            tuple[str, ...]: the label names, empty if there are none.
+        """
+        return self._categories.get(name, ())
+
+
+def category(label: str) -> str:
+    """The category of a label, from the start of its name
+
+    Args:
+        label (str): label name.
+
+    Returns:
+        str: "likelihood", "severity", "risk" or "general".
+    """
+    prefix: str
+    name: str
+
+    for prefix, name in _CATEGORIES:
+        if label.lower().startswith(prefix):
+            return name
+    return _GENERAL
+
+
+def label_registry() -> LabelRegistry:
+    """The registry for the current labels.yml
+
+    The file is only read again if it has changed since it was last read.
+
+    Returns:
+        LabelRegistry: the hazard labels.
+
+    Raises:
+        FileNotFoundError: if there is no labels.yml at c.ISSUE_LABELS_PATH.
+    """
+    path: str = c.ISSUE_LABELS_PATH
+
+    try:
+        return cached_read(path, _parse_labels)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Labels.yml does not exist at '{ path }'")
+
+
+def clear_label_registry() -> None:
+    """Forgets the registry, so labels.yml is read again on next use"""
+    invalidate(c.ISSUE_LABELS_PATH)
+    return
+
+
+def _parse_labels(content: str) -> LabelRegistry:
+    """Makes the registry from the content of labels.yml
+
+    Args:
+        content (str): content of labels.yml.
+
+    Returns:
+        LabelRegistry: the hazard labels.
+    """
+    return LabelRegistry(yaml.safe_load(content) or [])
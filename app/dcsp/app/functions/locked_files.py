@@ -0,0 +1,233 @@
+"""Multi-worker safe reading and writing of small files
+
+The env files and placeholders.yml are shared by all web server workers.
+Writes take an exclusive advisory lock (fcntl) and replace the file in one go
+by renaming a temporary file over it, so a reader never sees a half written
+file. Reads are cached per process on the file's modification time, inode and
+size, and only take a shared lock when the file has changed and needs to be
+read again.
+
+The locks are held on separate lock files, as renaming a new file into place
+would otherwise leave the lock on the old file. Locks are reentrant within a
+thread.
+
+Functions:
+    file_lock: advisory lock on a file
+    atomic_write: replaces the content of a file in one go
+    cached_read: reads and parses a file, cached on the file changing
+    file_signature: identifies the version of a file on disk
+    invalidate: drops a file from the cache
+    clear_cache: empties the cache of parsed files
+"""
+
+import fcntl
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+import app.functions.constants as c
+
+
+_cache: dict[str, tuple[tuple[int, ...], Callable[[str], Any], Any]] = {}
+_cache_lock: threading.Lock = threading.Lock()
+_held: threading.local = threading.local()
+
+
+@contextmanager
+def file_lock(path: str, shared: bool = False) -> Iterator[None]:
+    """Advisory lock on a file, shared between processes
+
+    If the thread already holds the lock, it is used again rather than
+    waiting on itself.
+
+    Args:
+        path (str): path of the file to lock.
+        shared (bool): set to True for a shared (read) lock, otherwise the lock
+                       is exclusive.
+
+    Raises:
+        RuntimeError: if an exclusive lock is requested while the thread holds
+                      a shared lock on the same file.
+    """
+    lock_path: str = _lock_path(path)
+    held: dict[str, list[Any]] = _held_locks()
+    lock_fd: int
+
+    if lock_path in held:
+        if not shared and held[lock_path][1]:
+            raise RuntimeError(
+                f"Cannot take an exclusive lock on '{ path }' while holding a "
+                "shared lock"
+            )
+        held[lock_path][2] += 1
+        try:
+            yield
+        finally:
+            held[lock_path][2] -= 1
+        return
+
+    os.makedirs(c.LOCKS_DIR, mode=0o700, exist_ok=True)
+    lock_fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        held[lock_path] = [lock_fd, shared, 1]
+        try:
+            yield
+        finally:
+            del held[lock_path]
+            fcntl.flock(lock_fd, fcntl.LOCK_UN)
+    finally:
+        os.close(lock_fd)
+    return
+
+
+def atomic_write(path: str, content: str) -> None:
+    """Replaces the content of a file in one go
+
+    The content is written to a temporary file in the same folder, which is
+    then renamed over the file while holding an exclusive lock. The file keeps
+    its permissions.
+
+    Args:
+        path (str): path of the file.
+        content (str): the new content.
+    """
+    real_path: str = os.path.realpath(path)
+    temp_fd: int
+    temp_path: str = ""
+
+    with file_lock(real_path):
+        temp_fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(real_path),
+            prefix=f".{ os.path.basename(real_path) }_",
+            suffix=".tmp",
+        )
+        try:
+            with os.fdopen(temp_fd, "w") as file:
+                file.write(content)
+                file.flush()
+                os.fsync(file.fileno())
+
+            if os.path.isfile(real_path):
+                shutil.copymode(real_path, temp_path)
+            os.replace(temp_path, real_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        finally:
+            invalidate(real_path)
+    return
+
+
+def cached_read(path: str, parse: Callable[[str], Any]) -> Any:
+    """Reads and parses a file, cached on the file changing
+
+    No lock is taken if the file has not changed since it was last read in
+    this process. Callers must not change the returned value, as it is shared.
+
+    Args:
+        path (str): path of the file.
+        parse (Callable[[str], Any]): turns the content of the file into the
+                                      value to return. Should be a module level
+                                      function, as it is part of the cache key.
+
+    Returns:
+        Any: the parsed content.
+
+    Raises:
+        FileNotFoundError: if the file does not exist.
+    """
+    real_path: str = os.path.realpath(path)
+    signature: tuple[int, ...] = file_signature(real_path)
+    content: str = ""
+    value: Any
+
+    if not signature:
+        raise FileNotFoundError(f"'{ path }' does not exist")
+
+    with _cache_lock:
+        if real_path in _cache:
+            if _cache[real_path][:2] == (signature, parse):
+                return _cache[real_path][2]
+
+    with file_lock(real_path, shared=True):
+        signature = file_signature(real_path)
+        with open(real_path, "r") as file:
+            content = file.read()
+
+    value = parse(content)
+
+    with _cache_lock:
+        _cache[real_path] = (signature, parse, value)
+    return value
+
+
+def file_signature(path: str) -> tuple[int, ...]:
+    """Identifies the version of a file on disk
+
+    Args:
+        path (str): path of the file.
+
+    Returns:
+        tuple[int, ...]: modification and change times, inode and size. Empty
+                         if the file does not exist.
+    """
+    try:
+        stat: os.stat_result = os.stat(path)
+    except FileNotFoundError:
+        return ()
+    return (stat.st_mtime_ns, stat.st_ctime_ns, stat.st_ino, stat.st_size)
+
+
+def invalidate(path: str) -> None:
+    """Drops a file from the cache
+
+    Writes can land within the resolution of the file system clock, so
+    anything that writes to a cached file should call this afterwards.
+
+    Args:
+        path (str): path of the file.
+    """
+    with _cache_lock:
+        _cache.pop(os.path.realpath(path), None)
+    return
+
+
+def clear_cache() -> None:
+    """Empties the cache of parsed files"""
+    with _cache_lock:
+        _cache.clear()
+    return
+
+
+def _lock_path(path: str) -> str:
+    """Lock file used for a file
+
+    Args:
+        path (str): path of the file.
+
+    Returns:
+        str: path of the lock file in c.LOCKS_DIR.
+    """
+    real_path: str = os.path.realpath(path)
+    digest: str = hashlib.sha256(real_path.encode()).hexdigest()[:16]
+    return os.path.join(
+        c.LOCKS_DIR, f"{ os.path.basename(real_path) }.{ digest }.lock"
+    )
+
+
+def _held_locks() -> dict[str, list[Any]]:
+    """Locks held by the current thread
+
+    Returns:
+        dict[str, list[Any]]: lock file descriptor, whether shared and depth,
+                              keyed by lock file path.
+    """
+    if not hasattr(_held, "locks"):
+        _held.locks = {}
+    return _held.locks
@@ -0,0 +1,354 @@
+"""Long-lived mkdocs builder
+
+Starting mkdocs pays the import cost of the theme and plugins (material,
+macros, mkdocstrings and its python handler) every time. This module keeps a
+worker process running that imports mkdocs and the plugins once, and then
+builds sites on request over a local socket.
+
+Builds run one at a time on a thread of their own in the builder, so a ping
+is answered straight away even while a site is being built. Once listening,
+the builder writes its process ID next to the socket, so the web pages can
+check that it is up without a round trip to it.
+
+Classes:
+    WarmBuilder: start, stop and send build requests to the builder process
+
+Functions:
+    pid_path: file the builder writes its process ID to
+    serve: the main loop of the builder process
+"""
+
+import importlib
+import os
+import queue
+import threading
+import time as t
+from multiprocessing import AuthenticationError, get_context
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any
+
+import app.functions.constants as c
+
+
+class WarmBuilder:
+    def __init__(
+        self,
+        address: str = c.MKDOCS_BUILDER_SOCKET,
+        authkey: bytes | None = None,
+        preload_configs: list[str] | None = None,
+    ) -> None:
+        """Initialises the WarmBuilder class
+
+        Args:
+            address (str): path of the unix socket the builder listens on.
+            authkey (bytes | None): key used to authenticate requests to the
+                                    builder. Defaults to the Django secret key,
+                                    so that all web server workers share the
+                                    one builder.
+            preload_configs (list[str] | None): mkdocs config files loaded
+                                                when the builder starts, so
+                                                that their plugins are
+                                                imported. Defaults to the main
+                                                mkdocs config.
+        """
+        self.address: str = address
+        self.authkey: bytes = (
+            authkey
+            if authkey is not None
+            else os.getenv("DJANGO_SECRET_KEY", "").encode()
+        )
+        self.preload_configs: list[str] = (
+            preload_configs
+            if preload_configs is not None
+            else [f"{ c.MKDOCS }mkdocs.yml"]
+        )
+        self.pid_path: str = pid_path(address)
+        return
+
+    def is_started(self) -> bool:
+        """Checks if the builder process is up, without contacting it
+
+        Reads the process ID the builder writes once it is listening. Cheap
+        enough to call on every page.
+
+        Returns:
+            bool: True if the builder process is alive, False if not.
+        """
+        pid: int
+
+        try:
+            with open(self.pid_path, "r") as file:
+                pid = int(file.read())
+        except (OSError, ValueError):
+            return False
+
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def is_running(self) -> bool:
+        """Checks if the builder process is accepting requests
+
+        Returns:
+            bool: True if the builder answered a ping, False if not.
+        """
+        try:
+            return bool(self._request({"command": "ping"}, c.TIME_INTERVAL))
+        except (OSError, EOFError, AuthenticationError):
+            return False
+
+    def start(self, wait: bool = False) -> bool:
+        """Starts the builder process if it is not already running
+
+        Args:
+            wait (bool): set to True to wait for the builder to accept
+                         requests before exiting the method.
+
+        Returns:
+            bool: when wait = True, if the builder does not start up in the
+                  allotted time, False is returned.
+        """
+        n: int = 0
+
+        if self.is_running():
+            return True
+
+        get_context("spawn").Process(
+            target=serve,
+            args=(self.address, self.authkey, self.preload_configs),
+            name="dcsp-mkdocs-builder",
+            daemon=True,
+        ).start()
+
+        if wait:
+            while not self.is_running():
+                t.sleep(c.TIME_INTERVAL)
+                n += 1
+                if n > c.MAX_WAIT:
+                    return False
+        return True
+
+    def stop(self) -> None:
+        """Stops the builder process, if running"""
+        try:
+            self._request({"command": "stop"}, c.TIME_INTERVAL)
+        except (OSError, EOFError, AuthenticationError):
+            pass
+        return
+
+    def build(
+        self,
+        config_file: str,
+        site_dir: str = "",
+        timeout: float = c.MKDOCS_BUILD_TIMEOUT,
+    ) -> dict[str, Any]:
+        """Builds a site using the builder process
+
+        Args:
+            config_file (str): path of the mkdocs config file.
+            site_dir (str): where to build the site. Defaults to the site_dir
+                            in the config file.
+            timeout (float): seconds to wait for the build to complete.
+
+        Returns:
+            dict[str, Any]: "success" (bool), "duration" of the build in
+                            seconds, "pid" of the builder process and "error"
+                            message if not successful.
+
+        Raises:
+            FileNotFoundError: if config file does not exist.
+            RuntimeError: if the builder is not running.
+            TimeoutError: if the build does not complete in time.
+        """
+        if not os.path.isfile(config_file):
+            raise FileNotFoundError(f"'{ config_file }' does not exist")
+
+        try:
+            return self._request(
+                {
+                    "command": "build",
+                    "config_file": config_file,
+                    "site_dir": site_dir,
+                },
+                timeout,
+            )
+        except TimeoutError:
+            raise
+        except (OSError, EOFError) as error:
+            raise RuntimeError(f"mkdocs builder is not running - { error }")
+
+    def _request(
+        self, request: dict[str, Any], timeout: float
+    ) -> dict[str, Any]:
+        """Sends a request to the builder and waits for the reply
+
+        Args:
+            request (dict[str, Any]): the request.
+            timeout (float): seconds to wait for a reply.
+
+        Returns:
+            dict[str, Any]: the reply.
+
+        Raises:
+            TimeoutError: if no reply in time.
+        """
+        connection: Connection
+
+        with Client(
+            self.address, family="AF_UNIX", authkey=self.authkey
+        ) as connection:
+            connection.send(request)
+            if not connection.poll(timeout):
+                raise TimeoutError(
+                    f"No reply from mkdocs builder after { timeout }s"
+                )
+            return connection.recv()
+
+
+def pid_path(address: str) -> str:
+    """File the builder on a socket writes its process ID to
+
+    Args:
+        address (str): path of the unix socket the builder listens on.
+
+    Returns:
+        str: path of the file.
+    """
+    return f"{ address }.pid"
+
+
+def serve(address: str, authkey: bytes, preload_configs: list[str]) -> None:
+    """Main loop of the builder process
+
+    Imports mkdocs and the plugins once, and then answers requests. Builds
+    are handed to a single build thread, so no more than one build is ever
+    running, and pings and stop requests are answered while one is.
+
+    Args:
+        address (str): path of the unix socket to listen on.
+        authkey (bytes): key that clients must authenticate with.
+        preload_configs (list[str]): mkdocs config files to load on start.
+    """
+    from mkdocs.config import load_config
+
+    module: str = ""
+    config_file: str = ""
+    request: dict[str, Any] = {}
+    builds: queue.Queue[
+        tuple[Connection, dict[str, Any]] | None
+    ] = queue.Queue()
+    builder: threading.Thread = threading.Thread(
+        target=_build_loop, args=(builds,), name="dcsp-mkdocs-build"
+    )
+    connection: Connection
+
+    for module in c.MKDOCS_PRELOAD_MODULES:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+
+    for config_file in preload_configs:
+        try:
+            load_config(config_file)
+        except Exception:  # nosec B112
+            continue
+
+    if os.path.exists(address):
+        os.unlink(address)
+
+    builder.start()
+    with Listener(address, family="AF_UNIX", authkey=authkey) as listener:
+        os.chmod(address, 0o600)
+        with open(pid_path(address), "w") as file:
+            file.write(str(os.getpid()))
+
+        while True:
+            try:
+                connection = listener.accept()
+            except (OSError, EOFError, AuthenticationError):
+                continue
+
+            try:
+                request = connection.recv()
+            except (OSError, EOFError):
+                connection.close()
+                continue
+
+            if request.get("command") == "build":
+                # Closed by the build thread once it has replied
+                builds.put((connection, request))
+                continue
+
+            with connection:
+                try:
+                    connection.send({"success": True})
+                except (OSError, EOFError):
+                    pass
+
+            if request.get("command") == "stop":
+                break
+
+    # Lets a build already asked for finish and reply
+    builds.put(None)
+    builder.join()
+
+    for path in (address, pid_path(address)):
+        if os.path.exists(path):
+            os.unlink(path)
+    return
+
+
+def _build_loop(
+    builds: queue.Queue[tuple[Connection, dict[str, Any]] | None],
+) -> None:
+    """Runs the builds asked for, one at a time, and replies to each
+
+    Args:
+        builds (queue.Queue): connection and request of each build, then None
+                              to stop.
+    """
+    from mkdocs.commands.build import build
+    from mkdocs.config import load_config
+
+    item: tuple[Connection, dict[str, Any]] | None
+    connection: Connection
+    request: dict[str, Any]
+    reply: dict[str, Any]
+    start: float
+    config: Any
+
+    while True:
+        item = builds.get()
+        if item is None:
+            break
+        connection, request = item
+
+        start = t.monotonic()
+        try:
+            config = load_config(
+                request["config_file"],
+                site_dir=request["site_dir"] or None,
+            )
+            config.plugins.on_startup(command="build", dirty=False)
+            try:
+                build(config)
+            finally:
+                config.plugins.on_shutdown()
+        except Exception as error:
+            reply = {"success": False, "error": str(error)}
+        else:
+            reply = {"success": True, "error": ""}
+        reply["duration"] = t.monotonic() - start
+        reply["pid"] = os.getpid()
+
+        with connection:
+            try:
+                connection.send(reply)
+            except (OSError, EOFError):
+                pass
+    return
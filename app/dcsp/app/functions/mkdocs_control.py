@@ -1,102 +1,246 @@
 """Starting and stopping (and test if running) of mkdocs
 
-Starts, stops and assesses state of mkdocs serve
+The static site is built by the long-lived mkdocs builder and served from the
+site folder by Django. Builds are only run by the rebuild scheduler, or on
+demand, so there is no mkdocs serve watching the files and rebuilding on
+every change alongside it.
 
 Classes:
-    MkdocsControl: manage mkdocs server
+    MkdocsControl: manage the mkdocs builder
+    RebuildScheduler: coalesce bursts of file changes into single builds
 """
 
 import psutil
 import time as t
-import os
-from typing import TextIO
-import subprocess  # nosec B404
+import threading
+from typing import Any, Callable
 
 import app.functions.constants as c
+from app.functions.mkdocs_builder import WarmBuilder
 
 
 class MkdocsControl:
-    def __init__(self, cwd_sh: str = c.MKDOCS) -> None:
+    def __init__(
+        self, cwd_sh: str = c.MKDOCS, builder: WarmBuilder | None = None
+    ) -> None:
         """Initialises the MkDocsControl class
 
         Args:
-            cwd_sh (str): the current working directory for the shell script
+            cwd_sh (str): the mkdocs folder, holding mkdocs.yml
+            builder (WarmBuilder | None): the long-lived builder used for
+                                          building the site. Defaults to the
+                                          builder on the standard socket.
         """
         self.process_name: str = "mkdocs"
-        self.process_arg1: str = "serve"
         self.cwd_sh: str = cwd_sh
+        self.builder: WarmBuilder = builder or WarmBuilder(
+            preload_configs=[f"{ cwd_sh }mkdocs.yml"]
+        )
         return
 
     def is_process_running(self) -> bool:
-        """Checks if there is an instance of an mkdocs serve running
+        """Checks if the mkdocs builder is running
 
         Returns:
             bool: True is running, False if not running
         """
-        process: psutil.Process  # TODO can this be initialised to something?
+        return self.builder.is_running()
 
-        for process in psutil.process_iter(["pid", "name"]):
-            if process.info["name"] == self.process_name:  # type: ignore[attr-defined]
-                return True
-        return False
+    def is_started(self) -> bool:
+        """Checks if the mkdocs builder is up, without contacting it
+
+        For use on every page, where waiting on the builder is too slow.
+
+        Returns:
+            bool: True if the builder process is alive, False if not
+        """
+        return self.builder.is_started()
 
-    # TODO: need to have error managment in this function
     def start(self, wait: bool = False) -> bool:
-        """Tests if an instance of mkdocs serve is running
+        """Starts the mkdocs builder if it is not already running
 
         Args:
-            wait (bool): set to True to wait for the mkdocs instance to start before
+            wait (bool): set to True to wait for the builder to start before
                   exiting the method.
 
         Returns:
-            bool: when wait = True, if mkdocs does not start up in alloated
-                  time, False is returned.
+            bool: when wait = True, if the builder does not start up in
+                  alloated time, False is returned.
         """
-        n: int = 0
-        file: TextIO
-
-        if not self.is_process_running():
-            # Needed to use shell script to stop blocking and the creation of
-            # zombies
-            os.chdir(self.cwd_sh)
-            file = open("mkdocs_serve.sh", "w")
-            file.write("#!/bin/bash\n")
-            file.write("mkdocs serve > /dev/null 2>&1 &")
-            file.close()
-            subprocess.Popen(
-                ["/usr/bin/sh", f"{ self.cwd_sh }mkdocs_serve.sh"], shell=False
-            )  # nosec B603
-
-            if wait:
-                while not self.is_process_running():
-                    t.sleep(c.TIME_INTERVAL)
-                    n += 1
-                    if n > c.MAX_WAIT:
-                        return False
-        return True
+        return self.builder.start(wait=wait)
 
     def stop(self, wait: bool = False) -> bool:
-        """Stops all instances of mkdocs serve that are running
+        """Stops the mkdocs builder, and any mkdocs serve left running
 
         Args:
-            wait (bool): set to True to wait for the mkdocs instance to stop before
+            wait (bool): set to True to wait for the builder to stop before
                   exiting the method.
 
         Returns:
-            bool: when wait = True, if mkdocs does not stop in alloated
+            bool: when wait = True, if the builder does not stop in alloated
                   time, False is returned
         """
         process: psutil.Process
         n: int = 0
 
+        # Started by earlier versions, which served the site with mkdocs serve
         for process in psutil.process_iter(["pid", "name"]):
             if process.info["name"] == self.process_name:  # type: ignore[attr-defined]
                 process.kill()
-                # subprocess.Popen(["pkill", "-f", self.process_name])
-                if wait:
-                    while self.is_process_running():
-                        t.sleep(c.TIME_INTERVAL)
-                        n += 1
-                        if n > c.MAX_WAIT:
-                            return False
+
+        self.builder.stop()
+        if wait:
+            while self.is_process_running():
+                t.sleep(c.TIME_INTERVAL)
+                n += 1
+                if n > c.MAX_WAIT:
+                    return False
         return True
+
+    def build(self, site_dir: str = "") -> dict[str, Any]:
+        """Builds the static site using the long-lived builder
+
+        The builder process is started if it is not already running.
+
+        Args:
+            site_dir (str): where to build the site. Defaults to the site_dir
+                            in mkdocs.yml.
+
+        Returns:
+            dict[str, Any]: "success" (bool), "duration" of the build in
+                            seconds, "pid" of the builder process and "error"
+                            message if not successful.
+
+        Raises:
+            RuntimeError: if the builder could not be started.
+        """
+        if not self.builder.start(wait=True):
+            raise RuntimeError("mkdocs builder did not start in allotted time")
+
+        return self.builder.build(f"{ self.cwd_sh }mkdocs.yml", site_dir)
+
+    def notify_change(self, path: str = "") -> None:
+        """Records that a file used by the site has changed
+
+        The change is passed to the rebuild scheduler for this mkdocs folder,
+        which batches changes arriving in quick succession into one build.
+
+        Args:
+            path (str): the file or folder that changed.
+        """
+        self.scheduler().notify(path)
+        return
+
+    def scheduler(self) -> "RebuildScheduler":
+        """Returns the rebuild scheduler for this mkdocs folder
+
+        One scheduler is shared by all MkdocsControl instances for the same
+        folder in the process, so that builds are never run concurrently.
+
+        Returns:
+            RebuildScheduler: the shared scheduler.
+        """
+        with _schedulers_lock:
+            if self.cwd_sh not in _schedulers:
+                _schedulers[self.cwd_sh] = RebuildScheduler(self.build)
+            return _schedulers[self.cwd_sh]
+
+
+class RebuildScheduler:
+    def __init__(
+        self,
+        build: Callable[[], Any],
+        window: float = c.MKDOCS_REBUILD_WINDOW,
+    ) -> None:
+        """Initialises the RebuildScheduler class
+
+        Args:
+            build (Callable): function that builds the site.
+            window (float): seconds to wait for further changes before
+                            building.
+        """
+        self.build: Callable[[], Any] = build
+        self.window: float = window
+        self.builds: int = 0
+        self.last_result: Any = None
+        self.last_changes: set[str] = set()
+        self._pending: set[str] = set()
+        self._building: bool = False
+        self._timer: threading.Timer | None = None
+        self._lock: threading.Lock = threading.Lock()
+        self._idle: threading.Event = threading.Event()
+        self._idle.set()
+        return
+
+    def notify(self, path: str = "") -> None:
+        """Records a change and schedules a build
+
+        Each change restarts the window, so a burst of changes results in one
+        build once the changes stop. Changes arriving while a build is running
+        are held back for a single follow-up build.
+
+        Args:
+            path (str): the file or folder that changed.
+        """
+        with self._lock:
+            self._pending.add(path)
+            self._idle.clear()
+            if not self._building:
+                self._start_timer()
+        return
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Waits for all scheduled builds to complete
+
+        Args:
+            timeout (float | None): seconds to wait, None to wait forever.
+
+        Returns:
+            bool: True if idle, False if timed out.
+        """
+        return self._idle.wait(timeout)
+
+    def _start_timer(self) -> None:
+        """(Re)starts the window timer
+
+        Must be called with the lock held.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.window, self._run_build)
+        self._timer.daemon = True
+        self._timer.start()
+        return
+
+    def _run_build(self) -> None:
+        """Runs one build for all the changes collected so far"""
+        changes: set[str] = set()
+        result: Any = None
+
+        with self._lock:
+            if self._building or not self._pending:
+                return
+            changes = self._pending
+            self._pending = set()
+            self._building = True
+            self._timer = None
+
+        try:
+            result = self.build()
+        except Exception as error:
+            result = {"success": False, "error": str(error)}
+
+        with self._lock:
+            self.builds += 1
+            self.last_result = result
+            self.last_changes = changes
+            self._building = False
+            if self._pending:
+                self._start_timer()
+            else:
+                self._idle.set()
+        return
+
+
+_schedulers: dict[str, RebuildScheduler] = {}
+_schedulers_lock: threading.Lock = threading.Lock()
@@ -0,0 +1,142 @@
+"""Settings store
+
+Installation settings, such as the setup step and the GitHub credentials, are
+kept as key/value pairs in the database, so that all web server workers see
+the same values.
+
+Reads are served from a process-wide cache. Before each read a single small
+query checks that nothing has changed since the cache was filled, so a change
+made by another worker is picked up straight away.
+
+Classes:
+    SettingsStore: read and write the installation settings
+
+Functions:
+    clear_cache: empties the process-wide cache of settings
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from django.db import transaction
+from django.db.models import Count, Max
+
+from app.models import Setting
+
+
+_cache: dict[str, Any] = {"version": None, "values": {}}
+_cache_lock: threading.Lock = threading.Lock()
+
+
+class SettingsStore:
+    def read(self, key_to_read: str) -> str:
+        """Reads a setting
+
+        Args:
+            key_to_read (str): name of the setting.
+
+        Returns:
+            str: value of the setting. Empty string ("") if the setting has not
+                 been set.
+        """
+        return self._values().get(key_to_read, "")
+
+    def read_all(self) -> dict[str, str]:
+        """Reads all settings
+
+        Returns:
+            dict[str, str]: all settings, with keys in alphabetical order.
+        """
+        values: dict[str, str] = self._values()
+        keys_list: list[str] = list(values.keys())
+
+        keys_list.sort(key=str.lower)
+        return {key: values[key] for key in keys_list}
+
+    def add(self, key: str, value: str) -> None:
+        """Adds or changes a setting
+
+        Args:
+            key (str): name of the setting.
+            value (str): value to set.
+        """
+        Setting.objects.update_or_create(key=key, defaults={"value": value})
+        return
+
+    def delete(self, key_to_delete: str) -> bool:
+        """Removes a setting
+
+        Args:
+            key_to_delete (str): name of the setting.
+
+        Returns:
+            bool: True if was present and deleted, False if was never present.
+        """
+        deleted: int = 0
+
+        deleted, _ = Setting.objects.filter(key=key_to_delete).delete()
+        return deleted > 0
+
+    def delete_all(self) -> None:
+        """Removes all settings"""
+        Setting.objects.all().delete()
+        return
+
+    @contextmanager
+    def batch(self) -> Iterator["SettingsStore"]:
+        """Groups changes to the settings into a single transaction
+
+        Other workers see either all of the changes or none of them. Nothing
+        is saved if the batch raises an exception.
+
+        Yields:
+            SettingsStore: this settings store.
+        """
+        with transaction.atomic():
+            yield self
+        return
+
+    def _values(self) -> dict[str, str]:
+        """All settings, from the process-wide cache
+
+        Returns:
+            dict[str, str]: all settings.
+        """
+        version: tuple[Any, ...] = _version()
+        values: dict[str, str] = {}
+
+        with _cache_lock:
+            if _cache["version"] == version:
+                return _cache["values"].copy()
+
+        values = dict(Setting.objects.values_list("key", "value"))
+
+        with _cache_lock:
+            _cache["version"] = version
+            _cache["values"] = values
+        return values.copy()
+
+
+def clear_cache() -> None:
+    """Empties the process-wide cache of settings"""
+    with _cache_lock:
+        _cache["version"] = None
+        _cache["values"] = {}
+    return
+
+
+def _version() -> tuple[Any, ...]:
+    """Identifies the current version of the settings
+
+    Any add or change moves on the latest update time or the highest ID, and
+    any delete changes the count.
+
+    Returns:
+        tuple[Any, ...]: number of settings, the highest ID and the latest
+                         update time.
+    """
+    aggregate: dict[str, Any] = Setting.objects.aggregate(
+        count=Count("id"), last_id=Max("id"), updated=Max("updated")
+    )
+    return (aggregate["count"], aggregate["last_id"], aggregate["updated"])
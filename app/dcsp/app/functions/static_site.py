@@ -0,0 +1,148 @@
+"""Serving of the built mkdocs site
+
+Helpers for serving the static site that mkdocs builds, so that it can be
+delivered by the web server (or the reverse proxy in front of it) rather than
+by the mkdocs development server.
+
+Classes:
+    StaticSite: locate files in the built site and work out their caching
+"""
+
+import os
+import re
+import hashlib
+import mimetypes
+from functools import lru_cache
+
+import app.functions.constants as c
+
+
+class StaticSite:
+    def __init__(self, site_dir: str = c.MKDOCS_SITE) -> None:
+        """Initialises the StaticSite class
+
+        Args:
+            site_dir (str): location of the built site.
+        """
+        self.site_dir: str = os.path.realpath(site_dir)
+        return
+
+    def is_built(self) -> bool:
+        """Checks if the site has been built
+
+        Returns:
+            bool: True if there is an index page in the site folder.
+        """
+        return os.path.isfile(os.path.join(self.site_dir, "index.html"))
+
+    def resolve(self, path: str) -> str:
+        """Finds the file to serve for a requested path
+
+        Folders are served by their index.html, as mkdocs uses directory
+        urls.
+
+        Args:
+            path (str): path requested, relative to the site root.
+
+        Returns:
+            str: absolute path of the file.
+
+        Raises:
+            FileNotFoundError: if there is no such file in the site, or the
+                               path points outside of the site.
+        """
+        full_path: str = os.path.realpath(
+            os.path.join(self.site_dir, path.lstrip("/"))
+        )
+
+        if os.path.commonpath([full_path, self.site_dir]) != self.site_dir:
+            raise FileNotFoundError(f"'{ path }' is outside of the site")
+
+        if os.path.isdir(full_path):
+            full_path = os.path.join(full_path, "index.html")
+
+        if not os.path.isfile(full_path):
+            raise FileNotFoundError(f"'{ path }' is not in the site")
+
+        return full_path
+
+    def relative_path(self, file_path: str) -> str:
+        """Path of a file relative to the site root
+
+        Args:
+            file_path (str): absolute path of a file in the site.
+
+        Returns:
+            str: the relative path, using forward slashes.
+        """
+        return os.path.relpath(file_path, self.site_dir).replace(os.sep, "/")
+
+    def etag(self, file_path: str) -> str:
+        """Strong entity tag for a file
+
+        The tag is a hash of the content, and is only recalculated when the
+        file changes.
+
+        Args:
+            file_path (str): absolute path of the file.
+
+        Returns:
+            str: the quoted entity tag.
+        """
+        stat: os.stat_result = os.stat(file_path)
+        return _content_etag(
+            file_path, stat.st_mtime_ns, stat.st_size, stat.st_ino
+        )
+
+    def content_type(self, file_path: str) -> str:
+        """Content type of a file
+
+        Args:
+            file_path (str): path of the file.
+
+        Returns:
+            str: the mime type, "application/octet-stream" if unknown.
+        """
+        content_type: str | None = mimetypes.guess_type(file_path)[0]
+        return content_type or "application/octet-stream"
+
+    def cache_control(self, file_path: str) -> str:
+        """Cache-Control header for a file
+
+        Assets with a content hash in their name never change, so can be
+        cached forever. Everything else must be revalidated, which is cheap
+        with the entity tag.
+
+        Args:
+            file_path (str): path of the file.
+
+        Returns:
+            str: value for the Cache-Control header.
+        """
+        if re.search(c.HASHED_ASSET_REGEX, os.path.basename(file_path)):
+            return c.CACHE_CONTROL_IMMUTABLE
+        return c.CACHE_CONTROL_REVALIDATE
+
+
+@lru_cache(maxsize=c.ETAG_CACHE_SIZE)
+def _content_etag(file_path: str, mtime_ns: int, size: int, inode: int) -> str:
+    """Hashes the content of a file
+
+    Cached on the file's modification time, size and inode, so a file is only
+    read again once it has changed.
+
+    Args:
+        file_path (str): path of the file.
+        mtime_ns (int): modification time of the file.
+        size (int): size of the file.
+        inode (int): inode of the file.
+
+    Returns:
+        str: the quoted entity tag.
+    """
+    digest = hashlib.sha256()
+
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(65536), b""):
+            digest.update(chunk)
+    return f'"{ digest.hexdigest()[:32] }"'
@@ -0,0 +1,86 @@
+"""Imports a hazard register as hazards on GitHub
+
+Checks every hazard in the register, then logs those not already imported:
+
+    python3 manage.py import_hazards register.csv
+    python3 manage.py import_hazards register.xlsx --dry-run
+"""
+
+from typing import Any
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+from app.functions.git_control import GitController
+from app.functions.hazard_import import HazardImport, read_hazards
+
+
+class Command(BaseCommand):
+    help = "Imports a hazard register (CSV, XLSX or YAML) as hazards on GitHub"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path", help="Location of the hazard register")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Check the register without logging any hazards",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Number of hazards logged at the same time",
+        )
+        return
+
+    def handle(self, *args, **options) -> None:
+        hazard_import: HazardImport
+        report: dict[str, Any]
+        entry: dict[str, Any]
+
+        try:
+            hazards = read_hazards(options["path"])
+            if options["workers"] is None:
+                hazard_import = HazardImport(GitController())
+            else:
+                hazard_import = HazardImport(
+                    GitController(), workers=options["workers"]
+                )
+            report = hazard_import.run(
+                hazards, progress=self.progress, dry_run=options["dry_run"]
+            )
+        except (FileNotFoundError, ValueError) as error:
+            raise CommandError(str(error))
+
+        for entry in report["invalid"]:
+            self.stderr.write(f"Row { entry['row'] }: { entry['error'] }")
+        for entry in report["failed"]:
+            self.stderr.write(
+                f"Row { entry['row'] } '{ entry['title'] }' failed: { entry['error'] }"
+            )
+
+        if report["invalid"]:
+            raise CommandError(
+                f"{ len(report['invalid']) } hazard(s) failed their checks, "
+                "nothing imported"
+            )
+
+        self.stdout.write(
+            f"{ len(report['created']) } hazard(s) created, "
+            f"{ len(report['skipped']) } already imported, "
+            f"{ len(report['failed']) } failed"
+        )
+        return
+
+    def progress(self, done: int, total: int) -> None:
+        """Reports the progress of the import
+
+        Args:
+            done (int): hazards dealt with so far.
+            total (int): hazards to log.
+        """
+        self.stdout.write(f"{ done }/{ total }")
+        return
@@ -0,0 +1,93 @@
+"""Replays recorded GitHub webhook deliveries
+
+For testing the webhook offline. Each recording is a JSON file holding a
+delivery, or a list of them, with the "event" name and the "payload" GitHub
+sent. By default the deliveries are applied straight to the local store of
+hazards. With --url they are signed with GITHUB_WEBHOOK_SECRET and posted to
+a running app instead, as GitHub would:
+
+    python3 manage.py replay_webhooks recordings/
+    python3 manage.py replay_webhooks recordings/ --url http://localhost:8000/github_webhook
+"""
+
+import json
+import os
+
+import requests
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+import app.functions.constants as c
+from app.functions.hazard_webhook import (
+    HazardWebhook,
+    read_deliveries,
+    signature,
+)
+
+
+class Command(BaseCommand):
+    help = "Replays recorded GitHub webhook deliveries"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "path",
+            help="A recording, or a directory of recordings (.json)",
+        )
+        parser.add_argument(
+            "--url",
+            default="",
+            help="Post the deliveries, signed, to this webhook url",
+        )
+        return
+
+    def handle(self, *args, **options) -> None:
+        secret: str = os.getenv(c.EnvKeys.GITHUB_WEBHOOK_SECRET.value, "")
+        webhook: HazardWebhook = HazardWebhook()
+        deliveries: list[dict] = []
+        delivery: dict
+        body: bytes
+        response: requests.Response
+        outcome: str = ""
+
+        if options["url"] and secret == "":
+            raise CommandError(
+                f"{ c.EnvKeys.GITHUB_WEBHOOK_SECRET.value } has not been set"
+            )
+
+        try:
+            deliveries = read_deliveries(options["path"])
+        except (FileNotFoundError, ValueError) as error:
+            raise CommandError(str(error))
+
+        for delivery in deliveries:
+            if options["url"]:
+                body = json.dumps(delivery["payload"]).encode()
+                try:
+                    response = requests.post(
+                        options["url"],
+                        data=body,
+                        headers={
+                            "Content-Type": "application/json",
+                            "X-GitHub-Event": delivery["event"],
+                            "X-Hub-Signature-256": signature(secret, body),
+                        },
+                        timeout=10,
+                    )
+                except requests.exceptions.RequestException as error:
+                    raise CommandError(str(error))
+                outcome = f"{ response.status_code } { response.text }"
+            else:
+                try:
+                    outcome = webhook.handle(
+                        delivery["event"], delivery["payload"]
+                    )
+                except ValueError as error:
+                    outcome = f"error - { error }"
+
+            self.stdout.write(f"{ delivery['event'] }: { outcome }")
+
+        self.stdout.write(f"{ len(deliveries) } delivery(s) replayed")
+        return
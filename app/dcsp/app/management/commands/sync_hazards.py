@@ -0,0 +1,40 @@
+"""Syncs the local store of hazards with GitHub
+
+Run on a schedule, for example from cron, to keep the hazards shown by the app
+up to date without waiting for a page to be loaded:
+
+    python3 manage.py sync_hazards
+"""
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+from app.functions.git_control import GitController
+from app.functions.hazard_store import HazardStore
+
+
+class Command(BaseCommand):
+    help = "Syncs the local store of hazards with GitHub"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Fetch all hazards again, not only those changed since the "
+            "last sync",
+        )
+        return
+
+    def handle(self, *args, **options) -> None:
+        count: int = 0
+
+        try:
+            count = HazardStore(GitController()).sync(full=options["full"])
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        self.stdout.write(f"{ count } hazard(s) added or changed")
+        return
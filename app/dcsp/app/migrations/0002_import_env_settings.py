@@ -0,0 +1,53 @@
+"""Imports the installation settings from the env files
+
+Earlier versions stored the setup step and GitHub credentials in the env
+files. Only these keys are imported, so that secrets such as the Django secret
+key are not copied into the database.
+"""
+
+import os
+
+from django.conf import settings
+from django.db import migrations
+from dotenv import dotenv_values
+
+import app.functions.constants as c
+
+
+def import_env_settings(apps, schema_editor) -> None:
+    """Copies the installation settings from the env files into the database
+
+    The settings file is read first, then the placeholders env file fills in
+    anything that is missing. Skipped when testing, so test databases start
+    empty.
+    """
+    Setting = apps.get_model("app", "Setting")
+    keys: list[str] = [key.value for key in c.EnvKeysPH] + ["setup_step"]
+    env_path: str = ""
+    value: str | None = ""
+
+    if getattr(settings, "TESTING", False):
+        return
+
+    for env_path in (settings.ENV_LOCATION, c.ENV_PATH_PLACEHOLDERS):
+        if not os.path.isfile(env_path):
+            continue
+
+        for key, value in dotenv_values(env_path).items():
+            if key in keys and value:
+                Setting.objects.get_or_create(
+                    key=key, defaults={"value": value}
+                )
+    return
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app", "0001_settings"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            import_env_settings, reverse_code=migrations.RunPython.noop
+        ),
+    ]
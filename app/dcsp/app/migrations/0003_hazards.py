@@ -0,0 +1,64 @@
+# Generated by Django 4.2.6 on 2026-10-19 07:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app", "0002_import_env_settings"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HazardSync",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("repo", models.CharField(max_length=200, unique=True)),
+                ("watermark", models.DateTimeField(null=True)),
+                ("synced", models.DateTimeField(null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="Hazard",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("repo", models.CharField(max_length=200)),
+                ("number", models.IntegerField()),
+                ("title", models.TextField()),
+                ("body", models.TextField(blank=True, null=True)),
+                ("labels", models.JSONField(default=list)),
+                ("state", models.CharField(max_length=10)),
+                ("updated_at", models.DateTimeField()),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["repo", "state", "number"],
+                        name="app_hazard_repo_fa9cec_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="hazard",
+            constraint=models.UniqueConstraint(
+                fields=("repo", "number"), name="unique_hazard_number"
+            ),
+        ),
+    ]
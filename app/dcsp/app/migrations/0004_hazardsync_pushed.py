@@ -0,0 +1,17 @@
+# Generated by Django 4.2.6 on 2026-10-19 08:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app", "0003_hazards"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="hazardsync",
+            name="pushed",
+            field=models.DateTimeField(null=True),
+        ),
+    ]
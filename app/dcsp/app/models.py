@@ -1,3 +1,48 @@
 from django.db import models
 
-# Create your models here.
+
+class Setting(models.Model):
+    """Key/value setting for the installation, such as the setup step"""
+
+    key = models.CharField(max_length=100, unique=True)
+    value = models.TextField(blank=True, default="")
+    updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return self.key
+
+
+class Hazard(models.Model):
+    """Hazard (GitHub issue) mirrored from GitHub"""
+
+    repo = models.CharField(max_length=200)
+    number = models.IntegerField()
+    title = models.TextField()
+    body = models.TextField(blank=True, null=True)
+    labels = models.JSONField(default=list)
+    state = models.CharField(max_length=10)
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["repo", "number"], name="unique_hazard_number"
+            )
+        ]
+        indexes = [models.Index(fields=["repo", "state", "number"])]
+
+    def __str__(self) -> str:
+        return f"{ self.repo }#{ self.number }"
+
+
+class HazardSync(models.Model):
+    """Progress of mirroring the hazards of a repository"""
+
+    repo = models.CharField(max_length=200, unique=True)
+    watermark = models.DateTimeField(null=True)
+    synced = models.DateTimeField(null=True)
+    # Last change pushed by a GitHub webhook
+    pushed = models.DateTimeField(null=True)
+
+    def __str__(self) -> str:
+        return self.repo
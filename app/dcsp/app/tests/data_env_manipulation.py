@@ -4,3 +4,5 @@ VALUE3 = "value3"
 VALUE4 = "value4"
 
 READ_ALL_RETURN = {"key1": "value1", "key2": "value2", "key3": "value3"}
+
+BATCH_RETURN = {"key2": "value2", "key3": "value3", "key4": "value4"}
@@ -8,6 +8,22 @@ INSTALLATION_FORM_STAND_ALONE_DATA_GOOD = {
     "code_location_I": "",
 }
 
+INSTALLATION_FORM_STAND_ALONE_DATA_EMAIL = {
+    "installation_type": "SA",
+    "github_repo_SA": "a_repo",
+    "github_username_SA": "Bob",
+    "email_SA": "bob@domain.com",
+    "github_token_SA": "a_token",
+    "code_location_I": "",
+}
+
+CREDENTIALS_CHECK_REPO_MISSING = {
+    "github_username_exists": True,
+    "github_organisation_exists": True,
+    "repo_exists": False,
+    "permission": None,
+}
+
 INSTALLATION_FORM_INTEGRATED_DATA_GOOD = {
     "installation_type": "I",
     "github_repo_SA": "aaaf",
@@ -1,7 +1,9 @@
 """Data for testing git and Github functionality"""
 
 import app.functions.constants as c
-from unittest.mock import call
+from unittest.mock import ANY, call
+from datetime import datetime, timedelta, timezone
+from typing import Any
 
 CREDENTIALS_CHECK_REPO_EXISTS = {
     "github_username_exists": True,
@@ -230,6 +232,282 @@ CHECK_CREDENTIALS_REPO_CALL = f"{ git_contoller_args['github_organisation'] }/{
 
 
 GET_REPOS = ["repo_1", "repo_2"]
+GET_REPOS_PAGE_2 = (
+    f"{ c.GITHUB_API_URL }/organizations/1/repos?per_page=100&page=2"
+)
+
+GET_REPOS_CALLS = [
+    call(
+        f"{ c.GITHUB_API_URL }/users/{ git_contoller_args['github_organisation'] }/repos",
+        params={"per_page": 100},
+        auth=(
+            git_contoller_args["github_username"],
+            git_contoller_args["github_token"],
+        ),
+        timeout=10,
+    ),
+    call(
+        GET_REPOS_PAGE_2,
+        params={},
+        auth=(
+            git_contoller_args["github_username"],
+            git_contoller_args["github_token"],
+        ),
+        timeout=10,
+    ),
+]
+
+OPEN_ISSUES = [
+    {
+        "number": 1,
+        "title": "Hazard 1",
+        "body": "Body 1",
+        "labels": [{"name": "hazard"}, {"name": "severity-minor"}],
+    },
+    {"number": 2, "title": "Hazard 2", "body": None, "labels": []},
+]
+
+HAZARDS_OPEN = [
+    {
+        "number": 1,
+        "title": "Hazard 1",
+        "body": "Body 1",
+        "labels": ["hazard", "severity-minor"],
+    },
+    {"number": 2, "title": "Hazard 2", "body": None, "labels": []},
+]
+
+HAZARDS_OPEN_CALLS = [
+    call(
+        f"{ c.GITHUB_API_URL }/repos/{ git_contoller_args['github_organisation'] }/{ git_contoller_args['github_repo'] }/issues",
+        params={"per_page": 100, "state": "open"},
+        auth=(
+            git_contoller_args["github_username"],
+            git_contoller_args["github_token"],
+        ),
+        timeout=10,
+    ),
+]
 
 TIME_ERROR_MESSAGE = "Timeout while connecting to GitHub API"
 NO_CONNECTION_ERROR_MESSAGE = "No connection available to GitHub API"
+
+UPDATED_ISSUES = [
+    {
+        "number": 1,
+        "title": "Hazard 1",
+        "body": "Body 1",
+        "labels": [{"name": "hazard"}],
+        "state": "closed",
+        "updated_at": "2024-01-01T10:00:00Z",
+    },
+    {
+        "number": 2,
+        "title": "A pull request",
+        "body": "",
+        "labels": [],
+        "state": "open",
+        "updated_at": "2024-01-02T10:00:00Z",
+        "pull_request": {},
+    },
+]
+
+HAZARDS_UPDATED = [
+    {
+        "number": 1,
+        "title": "Hazard 1",
+        "body": "Body 1",
+        "labels": ["hazard"],
+        "state": "closed",
+        "updated_at": "2024-01-01T10:00:00Z",
+    },
+]
+
+HAZARDS_UPDATED_SINCE = datetime(
+    2024, 1, 1, 11, tzinfo=timezone(timedelta(hours=1))
+)
+
+HAZARDS_UPDATED_CALLS = [
+    call(
+        f"{ c.GITHUB_API_URL }/repos/{ git_contoller_args['github_organisation'] }/{ git_contoller_args['github_repo'] }/issues",
+        params={
+            "per_page": 100,
+            "state": "all",
+            "sort": "updated",
+            "direction": "asc",
+            "since": "2024-01-01T10:00:00Z",
+        },
+        auth=(
+            git_contoller_args["github_username"],
+            git_contoller_args["github_token"],
+        ),
+        timeout=10,
+    ),
+]
+
+HAZARD_GRAPHQL: dict[str, Any] = {
+    "data": {
+        "repository": {
+            "issue": {
+                "number": 1,
+                "title": "Hazard 1",
+                "body": "Body 1",
+                "state": "OPEN",
+                "labels": {"nodes": [{"name": "hazard"}]},
+                "comments": {
+                    "nodes": [
+                        {
+                            "author": {"login": "a_user"},
+                            "body": "A comment",
+                            "createdAt": "2024-01-01T10:00:00Z",
+                        },
+                        {
+                            "author": None,
+                            "body": "A comment from a deleted user",
+                            "createdAt": "2024-01-02T10:00:00Z",
+                        },
+                    ]
+                },
+            }
+        }
+    }
+}
+
+HAZARD_GRAPHQL_NOT_FOUND = {
+    "data": {"repository": {"issue": None}},
+    "errors": [
+        {
+            "type": "NOT_FOUND",
+            "message": "Could not resolve to an Issue with the number of 1.",
+        }
+    ],
+}
+
+HAZARD_GRAPHQL_REPO_BAD = {
+    "data": {"repository": None},
+    "errors": [
+        {"type": "NOT_FOUND", "message": "Could not resolve to a Repository"}
+    ],
+}
+
+HAZARD = {
+    "number": 1,
+    "title": "Hazard 1",
+    "body": "Body 1",
+    "labels": ["hazard"],
+    "state": "open",
+    "comments": [
+        {
+            "author": "a_user",
+            "body": "A comment",
+            "created_at": "2024-01-01T10:00:00Z",
+        },
+        {
+            "author": "",
+            "body": "A comment from a deleted user",
+            "created_at": "2024-01-02T10:00:00Z",
+        },
+    ],
+}
+
+HAZARD_CALLS = [
+    call(
+        c.GITHUB_GRAPHQL_URL,
+        json={
+            "query": ANY,
+            "variables": {
+                "owner": git_contoller_args["github_organisation"],
+                "name": git_contoller_args["github_repo"],
+                "number": 1,
+                "comments": c.HAZARD_RECENT_COMMENTS,
+            },
+        },
+        headers={
+            "Authorization": f"bearer { git_contoller_args['github_token'] }"
+        },
+        timeout=10,
+    ),
+]
+
+REPO_ON_GITHUB_CALLS = [
+    call(
+        f"{ c.GITHUB_API_URL }/repos/{ git_contoller_args['github_organisation'] }/{ GET_REPOS[0] }",
+        auth=(
+            git_contoller_args["github_username"],
+            git_contoller_args["github_token"],
+        ),
+        timeout=10,
+    ),
+    call(
+        f"{ c.GITHUB_API_URL }/repos/{ git_contoller_args['github_organisation'] }/{ REPO_BAD_NAME }",
+        auth=(
+            git_contoller_args["github_username"],
+            git_contoller_args["github_token"],
+        ),
+        timeout=10,
+    ),
+]
+
+HAZARDS_FULL_GRAPHQL = [
+    {
+        "data": {
+            "repository": {
+                "issues": {
+                    "pageInfo": {"hasNextPage": True, "endCursor": "cursor1"},
+                    "nodes": [
+                        HAZARD_GRAPHQL["data"]["repository"]["issue"]
+                        | {
+                            "updatedAt": "2024-01-02T10:00:00Z",
+                            "assignees": {"nodes": [{"login": "a_user"}]},
+                            "comments": HAZARD_GRAPHQL["data"]["repository"][
+                                "issue"
+                            ]["comments"]
+                            | {"totalCount": 12},
+                        }
+                    ],
+                }
+            }
+        }
+    },
+    {
+        "data": {
+            "repository": {
+                "issues": {
+                    "pageInfo": {"hasNextPage": False, "endCursor": "cursor2"},
+                    "nodes": [
+                        {
+                            "number": 2,
+                            "title": "Hazard 2",
+                            "body": "",
+                            "state": "OPEN",
+                            "updatedAt": "2024-01-03T10:00:00Z",
+                            "labels": {"nodes": []},
+                            "assignees": {"nodes": []},
+                            "comments": {"totalCount": 0, "nodes": []},
+                        }
+                    ],
+                }
+            }
+        }
+    },
+]
+
+HAZARDS_FULL = [
+    HAZARD
+    | {
+        "assignees": ["a_user"],
+        "updated_at": "2024-01-02T10:00:00Z",
+        "comment_count": 12,
+    },
+    {
+        "number": 2,
+        "title": "Hazard 2",
+        "body": "",
+        "labels": [],
+        "state": "open",
+        "comments": [],
+        "assignees": [],
+        "updated_at": "2024-01-03T10:00:00Z",
+        "comment_count": 0,
+    },
+]
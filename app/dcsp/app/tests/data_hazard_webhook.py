@@ -0,0 +1,56 @@
+SECRET = "a_secret"  # nosec B105
+
+REPO = "an_org/a_repo"
+
+
+def issue(
+    number=1,
+    updated_at="2024-01-02T10:00:00Z",
+    labels=("hazard",),
+    state="open",
+):
+    return {
+        "number": number,
+        "title": f"Hazard {number}",
+        "body": f"Body {number} changed",
+        "labels": [{"name": label} for label in labels],
+        "state": state,
+        "updated_at": updated_at,
+    }
+
+
+def issues_payload(action="edited", repo="An_Org/A_Repo", **kwargs):
+    return {
+        "action": action,
+        "issue": issue(**kwargs),
+        "repository": {"full_name": repo},
+    }
+
+
+def comment_payload(action="created", pull_request=False):
+    payload = {
+        "action": action,
+        "issue": issue(),
+        "comment": {"body": "A comment"},
+        "repository": {"full_name": REPO},
+    }
+    if pull_request:
+        payload["issue"]["pull_request"] = {"url": "a_url"}
+    return payload
+
+
+def label_payload(action, name, old_name=None):
+    payload = {
+        "action": action,
+        "label": {"name": name},
+        "repository": {"full_name": REPO},
+    }
+    if old_name is not None:
+        payload["changes"] = {"name": {"from": old_name}}
+    return payload
+
+
+DELIVERIES = [
+    {"event": "ping", "payload": {"zen": "Keep it simple"}},
+    {"event": "issues", "payload": issues_payload()},
+]
@@ -0,0 +1,25 @@
+"""Data for testing the background job queue"""
+
+import app.functions.constants as c
+
+JOBS_STATUS_PATH = f"{ c.TESTS_LOCATION }test_django/jobs_test.json"
+
+JOB_NAME = "A test job"
+JOB_RESULT = {"outcome": "done"}
+JOB_ERROR_MESSAGE = "Something went wrong"
+JOB_ID_BAD = "not_a_job_id"
+
+PERSISTED_RUNNING_JOB = {
+    "abc": {
+        "id": "abc",
+        "name": JOB_NAME,
+        "status": "running",
+        "sequence": 4,
+        "progress": 50,
+        "result": None,
+        "error": "",
+        "submitted": 0,
+        "started": 0,
+        "finished": None,
+    }
+}
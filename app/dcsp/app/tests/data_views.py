@@ -1,3 +1,5 @@
+from datetime import datetime, timezone
+
 import app.functions.constants as c
 
 INSTALLATION_POST_STAND_ALONE_DATA_GOOD = {
@@ -100,7 +102,7 @@ STD_CONTEXT_SETUP_3 = {
 START_AFRESH_SETUP_3 = "GITHUB_USERNAME='a username'\nEMAIL='john.doe@domain.com'\nGITHUB_ORGANISATION='an organisation'\nGITHUB_REPO='www.somesite.com'\nGITHUB_TOKEN='a token'\nsetup_step='3'\n"
 
 ISSUE_NUMBER_CURRENT = 6
-ISSUE_NUMBER_NONEXISTENT = 1
+ISSUE_NUMBER_NONEXISTENT = 99
 
 HAZARD_COMMENT_DATA = {"comment": "comment"}
 
@@ -110,3 +112,70 @@ CREDENTIALS_CHECK_REPO_EXISTS = {
     "repo_exists": True,
     "permission": "admin",
 }
+
+HAZARDS_UPDATED = [
+    {
+        "number": 1,
+        "title": "Hazard 1",
+        "body": "Body 1",
+        "labels": ["hazard"],
+        "state": "open",
+        "updated_at": "2024-01-01T10:00:00Z",
+    },
+    {
+        "number": 3,
+        "title": "Hazard 3",
+        "body": "Body 3",
+        "labels": [],
+        "state": "closed",
+        "updated_at": "2024-01-02T10:00:00Z",
+    },
+]
+
+HAZARDS_OPEN = [
+    {
+        "number": 1,
+        "title": "Hazard 1",
+        "body": "Body 1",
+        "labels": ["hazard"],
+    },
+]
+
+# Odd numbered hazards are about doses, even numbered have a risk level
+HAZARDS_UPDATED_MANY = [
+    {
+        "number": number,
+        "title": f"Hazard {number}",
+        "body": "Wrong dose" if number % 2 else "Missing allergy",
+        "labels": ["hazard"]
+        + ([] if number % 2 else ["risk-level-2-acceptable"]),
+        "state": "open",
+        "updated_at": "2024-01-01T10:00:00Z",
+    }
+    for number in range(1, 4 * c.HAZARDS_PER_PAGE + 2)
+]
+
+SYNCED_LONG_AGO = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+HAZARD = {
+    "number": 1,
+    "title": "Hazard 1",
+    "body": "Body 1",
+    "labels": ["hazard"],
+    "state": "open",
+    "comments": [
+        {
+            "author": "a_user",
+            "body": "A comment",
+            "created_at": "2024-01-01T10:00:00Z",
+        },
+    ],
+}
+
+PUSH_OUTCOME = {
+    "status": "pushed",
+    "commit": "4b825dc642cb6eb9a060e54bf8d69288fbee4904",
+    "summary": "[new commit]",
+    "seconds": 0.5,
+    "files": ["mkdocs/docs/hazard.md", "mkdocs/docs/placeholders.yml"],
+}
@@ -0,0 +1,1075 @@
+"""A stand in for the GitHub API, for offline tests and benchmarks
+
+Serves, from data held in memory, the REST endpoints and GraphQL queries that
+GitController and AsyncGitController use: users, organisations, repositories,
+issues, labels, comments and collaborator permission. The server runs on a
+local port, on a thread per request, so calls made at the same time are
+answered at the same time as they would be by GitHub.
+
+Each reply can be held back by a set latency, and carries the X-RateLimit-*
+headers GitHub sends. Once the rate limit is used up calls are refused with a
+403, until the limit resets. GET replies carry an ETag, and are answered with
+304 Not Modified, which does not count against the rate limit, if the
+If-None-Match header matches.
+
+    with fake_github(latency=0.05) as github:
+        github.add_user("jane")
+        github.add_repo("jane", "docs", collaborators={"jane": "admin"})
+        gc = GitController(github_username="jane", ...)
+
+Classes:
+    FakeGithub: the stand in GitHub API
+
+Functions:
+    fake_github: runs a FakeGithub with the controllers pointed at it
+"""
+
+import base64
+import hashlib
+import json
+import re
+import threading
+import time as t
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Iterator
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import app.functions.constants as c
+from app.functions.github_client import close_clients
+
+# Time the clock of the fake starts at, so timestamps are repeatable
+START_TIME: datetime = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeGithub:
+    def __init__(
+        self,
+        latency: float = 0,
+        rate_limit: int = 5000,
+        rate_reset: float = 3600,
+        tokens: dict[str, str] | None = None,
+        per_page: int = 30,
+    ) -> None:
+        """Initialises the FakeGithub class
+
+        The server is not started until start() is called.
+
+        Args:
+            latency (float): seconds each reply is held back for.
+            rate_limit (int): calls allowed for each set of credentials before
+                              the limit resets.
+            rate_reset (float): seconds from the first call until the rate
+                                limit resets.
+            tokens (dict[str, str] | None): token of each username that is
+                allowed in, whatever username is sent with it. Any
+                credentials are allowed in if None.
+            per_page (int): items in a page of a list, if the caller does not
+                            ask for a number.
+
+        Raises:
+            ValueError: if latency is negative or rate_limit is less than 1.
+        """
+        if latency < 0:
+            raise ValueError(f"'{ latency }' is not a valid latency")
+
+        if rate_limit < 1:
+            raise ValueError(f"'{ rate_limit }' is not a valid rate limit")
+
+        self.latency: float = latency
+        self.rate_limit: int = rate_limit
+        self.rate_reset: float = rate_reset
+        self.tokens: dict[str, str] | None = tokens
+        self.per_page: int = per_page
+        self.requests: list[tuple[str, str, Any]] = []
+        self.users: dict[str, dict[str, Any]] = {}
+        self.repos: dict[str, dict[str, Any]] = {}
+        self._budgets: dict[str, dict[str, int]] = {}
+        self._clock: datetime = START_TIME
+        self._next_id: int = 1
+        self._lock: threading.RLock = threading.RLock()
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+        self._routes: list[tuple[str, re.Pattern, Callable[..., Any]]] = [
+            ("GET", re.compile(r"/users/([^/]+)"), self._get_user),
+            ("GET", re.compile(r"/users/([^/]+)/repos"), self._get_repos),
+            ("GET", re.compile(r"/orgs/([^/]+)"), self._get_org),
+            ("POST", re.compile(r"/orgs/([^/]+)/repos"), self._create_repo),
+            ("GET", re.compile(r"/repos/([^/]+/[^/]+)"), self._get_repo),
+            ("DELETE", re.compile(r"/repos/([^/]+/[^/]+)"), self._delete_repo),
+            (
+                "GET",
+                re.compile(r"/repos/([^/]+/[^/]+)/issues"),
+                self._get_issues,
+            ),
+            (
+                "POST",
+                re.compile(r"/repos/([^/]+/[^/]+)/issues"),
+                self._create_issue,
+            ),
+            (
+                "GET",
+                re.compile(r"/repos/([^/]+/[^/]+)/issues/(\d+)"),
+                self._get_issue,
+            ),
+            (
+                "PATCH",
+                re.compile(r"/repos/([^/]+/[^/]+)/issues/(\d+)"),
+                self._edit_issue,
+            ),
+            (
+                "GET",
+                re.compile(r"/repos/([^/]+/[^/]+)/issues/(\d+)/comments"),
+                self._get_comments,
+            ),
+            (
+                "POST",
+                re.compile(r"/repos/([^/]+/[^/]+)/issues/(\d+)/comments"),
+                self._create_comment,
+            ),
+            (
+                "GET",
+                re.compile(r"/repos/([^/]+/[^/]+)/labels"),
+                self._get_labels,
+            ),
+            (
+                "POST",
+                re.compile(r"/repos/([^/]+/[^/]+)/labels"),
+                self._create_label,
+            ),
+            (
+                "GET",
+                re.compile(
+                    r"/repos/([^/]+/[^/]+)/collaborators/([^/]+)/permission"
+                ),
+                self._get_permission,
+            ),
+            ("POST", re.compile(r"/graphql"), self._graphql),
+        ]
+        return
+
+    @property
+    def url(self) -> str:
+        """Base url of the API
+
+        Returns:
+            str: the url, without a trailing slash.
+
+        Raises:
+            RuntimeError: if the server has not been started.
+        """
+        if self._server is None:
+            raise RuntimeError("The fake GitHub server has not been started")
+        return f"http://127.0.0.1:{ self._server.server_address[1] }"
+
+    def start(self) -> "FakeGithub":
+        """Starts serving on a free local port
+
+        Returns:
+            FakeGithub: itself, for chaining.
+        """
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.github = self  # type: ignore[attr-defined]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="fake-github",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops serving"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return
+
+    def add_user(self, login: str, organisation: bool = False) -> None:
+        """Adds a user, or an organisation
+
+        Args:
+            login (str): the username or organisation name.
+            organisation (bool): set to True for an organisation.
+        """
+        with self._lock:
+            self.users[login.lower()] = {
+                "login": login,
+                "id": self._new_id(),
+                "type": "Organization" if organisation else "User",
+            }
+        return
+
+    def add_repo(
+        self,
+        owner: str,
+        name: str,
+        labels: list[str] | None = None,
+        collaborators: dict[str, str] | None = None,
+    ) -> dict[str, Any]:
+        """Adds a repository, and its owner if not known
+
+        Args:
+            owner (str): user or organisation the repository is under.
+            name (str): name of the repository.
+            labels (list[str] | None): names of the labels of the repository.
+            collaborators (dict[str, str] | None): permission ("admin",
+                "write", "read") of each collaborator.
+
+        Returns:
+            dict[str, Any]: the repository, as held by the fake.
+        """
+        label: str
+
+        with self._lock:
+            if owner.lower() not in self.users:
+                self.add_user(owner, organisation=True)
+            self.repos[f"{ owner }/{ name }".lower()] = {
+                "id": self._new_id(),
+                "name": name,
+                "owner": self.users[owner.lower()]["login"],
+                "issues": {},
+                "labels": {},
+                "collaborators": {
+                    user.lower(): permission
+                    for user, permission in (collaborators or {}).items()
+                },
+            }
+            for label in labels or []:
+                self._label(f"{ owner }/{ name }", label)
+            return self.repos[f"{ owner }/{ name }".lower()]
+
+    def add_issue(
+        self,
+        repo: str,
+        title: str,
+        body: str = "",
+        labels: list[str] | None = None,
+        state: str = "open",
+        assignees: list[str] | None = None,
+        pull_request: bool = False,
+        author: str = "ghost",
+    ) -> int:
+        """Adds an issue, or a pull request, to a repository
+
+        Args:
+            repo (str): the repository, as "owner/name".
+            title (str): title of the issue.
+            body (str): body of the issue.
+            labels (list[str] | None): names of the labels of the issue.
+            state (str): "open" or "closed".
+            assignees (list[str] | None): logins of the assignees.
+            pull_request (bool): set to True to add a pull request, which
+                                 the issues list also returns.
+            author (str): login of the author.
+
+        Returns:
+            int: number of the issue.
+
+        Raises:
+            KeyError: if the repository is not known.
+        """
+        issues: dict[int, dict[str, Any]]
+        number: int
+        now: str
+
+        with self._lock:
+            issues = self.repos[repo.lower()]["issues"]
+            number = len(issues) + 1
+            now = self._tick()
+            issues[number] = {
+                "id": self._new_id(),
+                "number": number,
+                "title": title,
+                "body": body,
+                "state": state,
+                "labels": [self._label(repo, label) for label in labels or []],
+                "assignees": list(assignees or []),
+                "comments": [],
+                "created_at": now,
+                "updated_at": now,
+                "closed_at": now if state == "closed" else None,
+                "pull_request": pull_request,
+                "author": author,
+            }
+            return number
+
+    def add_comment(
+        self, repo: str, number: int, body: str, author: str = "ghost"
+    ) -> None:
+        """Adds a comment to an issue
+
+        Args:
+            repo (str): the repository, as "owner/name".
+            number (int): number of the issue.
+            body (str): the comment.
+            author (str): login of the author.
+
+        Raises:
+            KeyError: if the repository or issue is not known.
+        """
+        issue: dict[str, Any]
+
+        with self._lock:
+            issue = self.repos[repo.lower()]["issues"][number]
+            issue["updated_at"] = self._tick()
+            issue["comments"].append(
+                {
+                    "id": self._new_id(),
+                    "body": body,
+                    "author": author,
+                    "created_at": issue["updated_at"],
+                }
+            )
+        return
+
+    def issue(self, repo: str, number: int) -> dict[str, Any]:
+        """An issue, as held by the fake
+
+        Args:
+            repo (str): the repository, as "owner/name".
+            number (int): number of the issue.
+
+        Returns:
+            dict[str, Any]: the issue, with label names and the comments.
+
+        Raises:
+            KeyError: if the repository or issue is not known.
+        """
+        with self._lock:
+            issue: dict[str, Any] = self.repos[repo.lower()]["issues"][number]
+            return issue | {
+                "labels": [label["name"] for label in issue["labels"]],
+                "comments": [comment.copy() for comment in issue["comments"]],
+            }
+
+    def calls(self, method: str = "", path: str = "") -> int:
+        """Number of calls made to the fake
+
+        Args:
+            method (str): only count calls with this method, if set.
+            path (str): only count calls to this path, if set.
+
+        Returns:
+            int: the number of calls.
+        """
+        with self._lock:
+            return len(
+                [
+                    request
+                    for request in self.requests
+                    if (method == "" or request[0] == method)
+                    and (path == "" or request[1] == path)
+                ]
+            )
+
+    def handle(
+        self,
+        method: str,
+        target: str,
+        headers: dict[str, str],
+        body: bytes,
+    ) -> tuple[int, dict[str, str], bytes]:
+        """Answers a call to the API
+
+        Args:
+            method (str): HTTP method.
+            target (str): path and query string called.
+            headers (dict[str, str]): headers of the call, with lower case
+                                      names.
+            body (bytes): body of the call.
+
+        Returns:
+            tuple[int, dict[str, str], bytes]: status, headers and body of
+                                               the reply.
+        """
+        parts = urlsplit(target)
+        query: dict[str, str] = {
+            key: values[-1] for key, values in parse_qs(parts.query).items()
+        }
+        credentials: tuple[str, str] | None = self._credentials(headers)
+        resource: str = "graphql" if parts.path == "/graphql" else "core"
+        reply_headers: dict[str, str] = {"Content-Type": "application/json"}
+        data: Any = None
+        status: int = 404
+        reply: Any = {"message": "Not Found"}
+        route: tuple[str, re.Pattern, Callable[..., Any]]
+        match: re.Match | None
+        budget: dict[str, int]
+        links: str = ""
+        etag: str
+        encoded: bytes
+
+        if self.latency:
+            t.sleep(self.latency)
+
+        try:
+            data = json.loads(body) if body else None
+        except ValueError:
+            return self._reply(400, {"message": "Problems parsing JSON"})
+
+        with self._lock:
+            self.requests.append((method, parts.path, data))
+
+            if credentials is None:
+                return self._reply(401, {"message": "Bad credentials"})
+
+            budget = self._budget(credentials[1], resource)
+            reply_headers.update(self._rate_headers(budget, resource))
+            if budget["remaining"] <= 0:
+                return self._reply(
+                    403,
+                    {
+                        "message": f"API rate limit exceeded for { credentials[0] }."
+                    },
+                    reply_headers,
+                )
+
+            for route in self._routes:
+                match = route[1].fullmatch(parts.path)
+                if route[0] == method and match is not None:
+                    try:
+                        status, reply = route[2](
+                            *match.groups(),
+                            query=query,
+                            data=data or {},
+                            user=credentials[0],
+                        )
+                    except KeyError:
+                        status, reply = 404, {"message": "Not Found"}
+                    break
+            else:
+                if any(
+                    route[1].fullmatch(parts.path) for route in self._routes
+                ):
+                    status, reply = 405, {"message": "Method Not Allowed"}
+
+            if isinstance(reply, tuple):
+                reply, links = reply
+                if links:
+                    reply_headers["Link"] = links
+            encoded = b"" if reply is None else json.dumps(reply).encode()
+
+            if method == "GET" and status == 200:
+                etag = f'"{ hashlib.sha1(encoded).hexdigest() }"'  # nosec B324
+                reply_headers["ETag"] = etag
+                if headers.get("if-none-match") == etag:
+                    # Not counted against the rate limit
+                    return 304, reply_headers, b""
+
+            budget["remaining"] -= 1
+            reply_headers.update(self._rate_headers(budget, resource))
+        return status, reply_headers, encoded
+
+    def _reply(
+        self,
+        status: int,
+        reply: Any,
+        headers: dict[str, str] | None = None,
+    ) -> tuple[int, dict[str, str], bytes]:
+        """A reply with a JSON body
+
+        Args:
+            status (int): status code.
+            reply (Any): body of the reply.
+            headers (dict[str, str] | None): headers of the reply.
+
+        Returns:
+            tuple[int, dict[str, str], bytes]: status, headers and body.
+        """
+        return (
+            status,
+            (headers or {}) | {"Content-Type": "application/json"},
+            json.dumps(reply).encode(),
+        )
+
+    def _credentials(self, headers: dict[str, str]) -> tuple[str, str] | None:
+        """Who a call is made by
+
+        As GitHub, the rate limit is counted against the token, whatever
+        username is sent with it.
+
+        Args:
+            headers (dict[str, str]): headers of the call.
+
+        Returns:
+            tuple[str, str] | None: the user, and the key of the rate limit
+                                    budget of the call. The user is the owner
+                                    of the token if tokens are set, else the
+                                    username sent. "anonymous" for a call
+                                    without credentials, and None for
+                                    credentials that are not allowed in.
+        """
+        authorization: str = headers.get("authorization", "")
+        scheme: str
+        value: str
+        username: str = ""
+        token: str = ""
+
+        if authorization == "":
+            return "anonymous", "anonymous"
+
+        scheme, _, value = authorization.partition(" ")
+        if scheme.lower() == "basic":
+            try:
+                username, _, token = (
+                    base64.b64decode(value).decode().partition(":")
+                )
+            except ValueError:
+                return None
+        elif scheme.lower() in ("bearer", "token"):
+            token = value
+        else:
+            return None
+
+        if self.tokens is not None:
+            if token not in self.tokens.values():
+                return None
+            username = [
+                name for name, value in self.tokens.items() if value == token
+            ][0]
+            return username, username
+
+        token = hashlib.sha256(token.encode()).hexdigest()[:12]
+        return username or token, token
+
+    def _budget(self, credentials: str, resource: str) -> dict[str, int]:
+        """Rate limit budget of a set of credentials, reset if due
+
+        Must be called with the lock held.
+
+        Args:
+            credentials (str): key of the budget, for the token the call is
+                               made with.
+            resource (str): "core" or "graphql", which GitHub limits apart.
+
+        Returns:
+            dict[str, int]: "remaining" calls and the "reset" time, in epoch
+                            seconds.
+        """
+        key: str = f"{ credentials }:{ resource }"
+
+        if key not in self._budgets or self._budgets[key]["reset"] <= t.time():
+            self._budgets[key] = {
+                "remaining": self.rate_limit,
+                "reset": int(t.time() + self.rate_reset),
+            }
+        return self._budgets[key]
+
+    def _rate_headers(
+        self, budget: dict[str, int], resource: str
+    ) -> dict[str, str]:
+        """Rate limit headers, as GitHub sends them
+
+        Args:
+            budget (dict[str, int]): the budget of the caller.
+            resource (str): "core" or "graphql".
+
+        Returns:
+            dict[str, str]: the X-RateLimit-* headers.
+        """
+        return {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(max(budget["remaining"], 0)),
+            "X-RateLimit-Reset": str(budget["reset"]),
+            "X-RateLimit-Used": str(
+                self.rate_limit - max(budget["remaining"], 0)
+            ),
+            "X-RateLimit-Resource": resource,
+        }
+
+    def _new_id(self) -> int:
+        """Next id for an object, must be called with the lock held"""
+        self._next_id += 1
+        return self._next_id
+
+    def _tick(self) -> str:
+        """Moves the clock on a second, must be called with the lock held
+
+        Returns:
+            str: the new time, as GitHub formats it.
+        """
+        self._clock += timedelta(seconds=1)
+        return self._clock.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def _repo(self, repo: str) -> dict[str, Any]:
+        """A repository, must be called with the lock held
+
+        Raises:
+            KeyError: if the repository is not known.
+        """
+        return self.repos[repo.lower()]
+
+    def _label(self, repo: str, name: str) -> dict[str, Any]:
+        """A label of a repository, created if not known
+
+        GitHub creates the labels given to a new issue that the repository
+        does not have. Must be called with the lock held.
+
+        Args:
+            repo (str): the repository, as "owner/name".
+            name (str): name of the label.
+
+        Returns:
+            dict[str, Any]: the label.
+        """
+        labels: dict[str, dict[str, Any]] = self._repo(repo)["labels"]
+
+        if name.lower() not in labels:
+            labels[name.lower()] = {
+                "id": self._new_id(),
+                "name": name,
+                "color": "ededed",
+                "description": None,
+            }
+        return labels[name.lower()]
+
+    def _page(
+        self, path: str, items: list[Any], query: dict[str, str]
+    ) -> tuple[list[Any], str]:
+        """A page of a list, with its Link header
+
+        Args:
+            path (str): path of the list.
+            items (list[Any]): all of the items.
+            query (dict[str, str]): query string of the call.
+
+        Returns:
+            tuple[list[Any], str]: the items on the page, and the Link
+                                   header ("" if there is only one page).
+        """
+        per_page: int = min(int(query.get("per_page", self.per_page)), 100)
+        page: int = max(int(query.get("page", 1)), 1)
+        last: int = max((len(items) + per_page - 1) // per_page, 1)
+        links: list[str] = []
+
+        if page < last:
+            links.append(
+                f'<{ self.url }{ path }?{ urlencode(query | {"page": page + 1}) }>; rel="next"'
+            )
+            links.append(
+                f'<{ self.url }{ path }?{ urlencode(query | {"page": last}) }>; rel="last"'
+            )
+        return (
+            items[(page - 1) * per_page : page * per_page],
+            ", ".join(links),
+        )
+
+    def _user_json(self, login: str) -> dict[str, Any]:
+        """A user or organisation, as the API returns it"""
+        user: dict[str, Any] = self.users[login.lower()]
+
+        return {
+            "login": user["login"],
+            "id": user["id"],
+            "type": user["type"],
+            "url": f"{ self.url }/users/{ user['login'] }",
+        }
+
+    def _repo_json(self, repo: str) -> dict[str, Any]:
+        """A repository, as the API returns it"""
+        stored: dict[str, Any] = self._repo(repo)
+        full_name: str = f"{ stored['owner'] }/{ stored['name'] }"
+
+        return {
+            "id": stored["id"],
+            "name": stored["name"],
+            "full_name": full_name,
+            "owner": self._user_json(stored["owner"]),
+            "private": False,
+            "url": f"{ self.url }/repos/{ full_name }",
+            "html_url": f"https://github.com/{ full_name }",
+        }
+
+    def _issue_json(self, repo: str, issue: dict[str, Any]) -> dict[str, Any]:
+        """An issue, as the API returns it"""
+        url: str = (
+            f"{ self._repo_json(repo)['url'] }/issues/{ issue['number'] }"
+        )
+        result: dict[str, Any] = {
+            "id": issue["id"],
+            "number": issue["number"],
+            "title": issue["title"],
+            "body": issue["body"],
+            "state": issue["state"],
+            "labels": [label.copy() for label in issue["labels"]],
+            "assignees": [{"login": login} for login in issue["assignees"]],
+            "comments": len(issue["comments"]),
+            "created_at": issue["created_at"],
+            "updated_at": issue["updated_at"],
+            "closed_at": issue["closed_at"],
+            "user": {"login": issue["author"]},
+            "url": url,
+            "repository_url": self._repo_json(repo)["url"],
+        }
+
+        if issue["pull_request"]:
+            result["pull_request"] = {"url": url.replace("issues", "pulls")}
+        return result
+
+    def _comment_json(self, comment: dict[str, Any]) -> dict[str, Any]:
+        """A comment, as the API returns it"""
+        return {
+            "id": comment["id"],
+            "body": comment["body"],
+            "user": {"login": comment["author"]},
+            "created_at": comment["created_at"],
+            "updated_at": comment["created_at"],
+        }
+
+    def _get_user(self, login: str, **_: Any) -> tuple[int, Any]:
+        return 200, self._user_json(login)
+
+    def _get_repos(
+        self, login: str, query: dict[str, str], **_: Any
+    ) -> tuple[int, Any]:
+        self._user_json(login)
+        return 200, self._page(
+            f"/users/{ login }/repos",
+            [
+                self._repo_json(name)
+                for name, repo in sorted(self.repos.items())
+                if repo["owner"].lower() == login.lower()
+            ],
+            query,
+        )
+
+    def _get_org(self, login: str, **_: Any) -> tuple[int, Any]:
+        if self.users[login.lower()]["type"] != "Organization":
+            raise KeyError(login)
+        return 200, self._user_json(login) | {
+            "url": f"{ self.url }/orgs/{ self.users[login.lower()]['login'] }"
+        }
+
+    def _create_repo(
+        self, login: str, data: dict[str, Any], **_: Any
+    ) -> tuple[int, Any]:
+        if "name" not in data:
+            return 422, {"message": "Validation Failed"}
+        if f"{ login }/{ data['name'] }".lower() in self.repos:
+            return 422, {"message": "Repository creation failed."}
+        self.add_repo(self.users[login.lower()]["login"], data["name"])
+        return 201, self._repo_json(f"{ login }/{ data['name'] }")
+
+    def _get_repo(self, repo: str, **_: Any) -> tuple[int, Any]:
+        return 200, self._repo_json(repo)
+
+    def _delete_repo(self, repo: str, **_: Any) -> tuple[int, Any]:
+        del self.repos[repo.lower()]
+        return 204, None
+
+    def _get_issues(
+        self, repo: str, query: dict[str, str], **_: Any
+    ) -> tuple[int, Any]:
+        state: str = query.get("state", "open")
+        sort: str = "updated_at" if query.get("sort") == "updated" else "id"
+        issues: list[dict[str, Any]] = [
+            issue
+            for issue in self._repo(repo)["issues"].values()
+            if state in ("all", issue["state"])
+            and issue["updated_at"] >= query.get("since", "")
+        ]
+
+        issues.sort(
+            key=lambda issue: (issue[sort], issue["number"]),
+            reverse=query.get("direction", "desc") == "desc",
+        )
+        return 200, self._page(
+            f"/repos/{ repo }/issues",
+            [self._issue_json(repo, issue) for issue in issues],
+            query,
+        )
+
+    def _create_issue(
+        self, repo: str, data: dict[str, Any], user: str, **_: Any
+    ) -> tuple[int, Any]:
+        number: int
+
+        self._repo(repo)
+        if not data.get("title"):
+            return 422, {"message": "Validation Failed"}
+        number = self.add_issue(
+            repo,
+            data["title"],
+            data.get("body") or "",
+            data.get("labels") or [],
+            assignees=data.get("assignees") or [],
+            author=user,
+        )
+        return 201, self._issue_json(repo, self._repo(repo)["issues"][number])
+
+    def _get_issue(self, repo: str, number: str, **_: Any) -> tuple[int, Any]:
+        return 200, self._issue_json(
+            repo, self._repo(repo)["issues"][int(number)]
+        )
+
+    def _edit_issue(
+        self, repo: str, number: str, data: dict[str, Any], **_: Any
+    ) -> tuple[int, Any]:
+        issue: dict[str, Any] = self._repo(repo)["issues"][int(number)]
+
+        for field in ("title", "body", "assignees"):
+            if field in data:
+                issue[field] = data[field]
+        if "labels" in data:
+            issue["labels"] = [
+                self._label(repo, label) for label in data["labels"]
+            ]
+        if data.get("state") in ("open", "closed"):
+            issue["state"] = data["state"]
+        issue["updated_at"] = self._tick()
+        issue["closed_at"] = (
+            issue["updated_at"] if issue["state"] == "closed" else None
+        )
+        return 200, self._issue_json(repo, issue)
+
+    def _get_comments(
+        self, repo: str, number: str, query: dict[str, str], **_: Any
+    ) -> tuple[int, Any]:
+        return 200, self._page(
+            f"/repos/{ repo }/issues/{ number }/comments",
+            [
+                self._comment_json(comment)
+                for comment in self._repo(repo)["issues"][int(number)][
+                    "comments"
+                ]
+            ],
+            query,
+        )
+
+    def _create_comment(
+        self,
+        repo: str,
+        number: str,
+        data: dict[str, Any],
+        user: str,
+        **_: Any,
+    ) -> tuple[int, Any]:
+        if not data.get("body"):
+            return 422, {"message": "Validation Failed"}
+        self.add_comment(repo, int(number), data["body"], user)
+        return 201, self._comment_json(
+            self._repo(repo)["issues"][int(number)]["comments"][-1]
+        )
+
+    def _get_labels(
+        self, repo: str, query: dict[str, str], **_: Any
+    ) -> tuple[int, Any]:
+        return 200, self._page(
+            f"/repos/{ repo }/labels",
+            [label.copy() for label in self._repo(repo)["labels"].values()],
+            query,
+        )
+
+    def _create_label(
+        self, repo: str, data: dict[str, Any], **_: Any
+    ) -> tuple[int, Any]:
+        label: dict[str, Any]
+
+        if not data.get("name"):
+            return 422, {"message": "Validation Failed"}
+        if data["name"].lower() in self._repo(repo)["labels"]:
+            return 422, {"message": "Validation Failed"}
+        label = self._label(repo, data["name"])
+        label["color"] = data.get("color", label["color"])
+        label["description"] = data.get("description")
+        return 201, label.copy()
+
+    def _get_permission(
+        self, repo: str, login: str, **_: Any
+    ) -> tuple[int, Any]:
+        return 200, {
+            "permission": self._repo(repo)["collaborators"].get(
+                login.lower(), "none"
+            ),
+            "user": self._user_json(login),
+        }
+
+    def _graphql(self, data: dict[str, Any], **_: Any) -> tuple[int, Any]:
+        """Answers the hazard and hazards queries of GitController"""
+        variables: dict[str, Any] = data.get("variables") or {}
+        repo: str = f"{ variables.get('owner') }/{ variables.get('name') }"
+        issues: list[dict[str, Any]]
+        start: int
+        first: int
+
+        if repo.lower() not in self.repos:
+            return 200, {
+                "data": {"repository": None},
+                "errors": [
+                    {
+                        "type": "NOT_FOUND",
+                        "path": ["repository"],
+                        "message": f"Could not resolve to a Repository with the name '{ repo }'.",
+                    }
+                ],
+            }
+
+        if "number" in variables:
+            if variables["number"] not in self._repo(repo)["issues"]:
+                return 200, {
+                    "data": {"repository": {"issue": None}},
+                    "errors": [
+                        {
+                            "type": "NOT_FOUND",
+                            "path": ["repository", "issue"],
+                            "message": f"Could not resolve to an issue or pull request with the number of { variables['number'] }.",
+                        }
+                    ],
+                }
+            return 200, {
+                "data": {
+                    "repository": {
+                        "issue": self._graphql_issue(
+                            self._repo(repo)["issues"][variables["number"]],
+                            variables.get("comments", 0),
+                        )
+                    }
+                }
+            }
+
+        if "first" in variables:
+            issues = [
+                issue
+                for issue in self._repo(repo)["issues"].values()
+                if not issue["pull_request"]
+                and (
+                    variables.get("states") is None
+                    or issue["state"].upper() in variables["states"]
+                )
+            ]
+            start = int(variables.get("after") or 0)
+            first = variables["first"]
+            return 200, {
+                "data": {
+                    "repository": {
+                        "issues": {
+                            "pageInfo": {
+                                "hasNextPage": start + first < len(issues),
+                                "endCursor": str(start + first),
+                            },
+                            "nodes": [
+                                self._graphql_issue(
+                                    issue,
+                                    variables.get("comments", 0),
+                                    variables.get("withComments", True),
+                                )
+                                for issue in issues[start : start + first]
+                            ],
+                        }
+                    }
+                }
+            }
+
+        return 200, {
+            "errors": [
+                {"message": "The fake GitHub does not answer this query"}
+            ]
+        }
+
+    def _graphql_issue(
+        self,
+        issue: dict[str, Any],
+        comments: int,
+        with_comments: bool = True,
+    ) -> dict[str, Any]:
+        """An issue, as the GraphQL API returns it"""
+        result: dict[str, Any] = {
+            "number": issue["number"],
+            "title": issue["title"],
+            "body": issue["body"],
+            "state": issue["state"].upper(),
+            "updatedAt": issue["updated_at"],
+            "labels": {
+                "nodes": [{"name": label["name"]} for label in issue["labels"]]
+            },
+            "assignees": {
+                "nodes": [{"login": login} for login in issue["assignees"]]
+            },
+        }
+
+        if with_comments:
+            result["comments"] = {
+                "totalCount": len(issue["comments"]),
+                "nodes": [
+                    {
+                        "author": {"login": comment["author"]},
+                        "body": comment["body"],
+                        "createdAt": comment["created_at"],
+                    }
+                    for comment in issue["comments"][-comments:]
+                    if comments > 0
+                ],
+            }
+        return result
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Passes each call on to the FakeGithub of the server"""
+
+    protocol_version = "HTTP/1.1"
+
+    def _handle(self) -> None:
+        body: bytes = self.rfile.read(
+            int(self.headers.get("Content-Length") or 0)
+        )
+        status: int
+        headers: dict[str, str]
+        reply: bytes
+
+        status, headers, reply = self.server.github.handle(  # type: ignore[attr-defined]
+            self.command,
+            self.path,
+            {name.lower(): value for name, value in self.headers.items()},
+            body,
+        )
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+        return
+
+    do_GET = do_POST = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Calls are not logged"""
+        return
+
+
+@contextmanager
+def fake_github(**kwargs: Any) -> Iterator[FakeGithub]:
+    """Runs a FakeGithub with the controllers pointed at it
+
+    The GitHub API and GraphQL urls are pointed at the fake, and the shared
+    GitHub clients are closed before and after, so that none are left
+    pointing at the wrong API.
+
+    Args:
+        **kwargs: as for FakeGithub.
+
+    Yields:
+        FakeGithub: the running fake.
+    """
+    github: FakeGithub = FakeGithub(**kwargs).start()
+
+    try:
+        with patch.object(c, "GITHUB_API_URL", github.url), patch.object(
+            c, "GITHUB_GRAPHQL_URL", f"{ github.url }/graphql"
+        ):
+            close_clients()
+            try:
+                yield github
+            finally:
+                close_clients()
+    finally:
+        github.stop()
+    return
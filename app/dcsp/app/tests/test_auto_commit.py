@@ -0,0 +1,227 @@
+"""Testing of auto_commit.py
+
+"""
+
+from unittest import TestCase
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time as t
+
+import app.functions.constants as c
+from app.functions.constants import PushStatus
+
+sys.path.append(c.FUNCTIONS_APP)
+from app.functions.auto_commit import (
+    AutoCommit,
+    auto_commit,
+    commit_message,
+)
+
+DOCS = "/docs/"
+
+
+class AutoCommitTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.journal = os.path.join(self.temp_dir, "auto_commit.json")
+        self.messages = []
+        self.paths = []
+        self.outcome = {
+            "status": PushStatus.PUSHED.value,
+            "commit": "4b825dc642cb6eb9a060e54bf8d69288fbee4904",
+            "summary": "[new commit]",
+        }
+        self.release_commit = threading.Event()
+        self.release_commit.set()
+        self.committing = threading.Event()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def commit(self, message, paths):
+        self.committing.set()
+        self.release_commit.wait(5)
+        self.messages.append(message)
+        self.paths.append(paths)
+        return self.outcome
+
+    def auto_commit(self, quiet=0.05):
+        return AutoCommit(self.commit, self.journal, quiet, DOCS)
+
+    def test_saves_coalesced(self):
+        committer = self.auto_commit()
+        for name in ["b.md", "a.md", "b.md", "folder/c.md"]:
+            committer.record(f"{ DOCS }{ name }")
+
+        self.assertTrue(committer.wait_idle(5))
+        self.assertEqual(committer.commits, 1)
+        self.assertEqual(
+            self.messages,
+            ["Update 3 documents\n\n- a.md\n- b.md\n- folder/c.md"],
+        )
+        self.assertEqual(committer.last_outcome, self.outcome)
+        self.assertEqual(committer.pending(), [])
+        self.assertEqual(
+            self.paths,
+            [[f"{ DOCS }a.md", f"{ DOCS }b.md", f"{ DOCS }folder/c.md"]],
+        )
+
+    def test_quiet_period_restarts(self):
+        committer = self.auto_commit(quiet=0.2)
+        committer.record(f"{ DOCS }a.md")
+        t.sleep(0.1)
+        committer.record(f"{ DOCS }b.md")
+        t.sleep(0.15)
+        self.assertEqual(committer.commits, 0)
+
+        self.assertTrue(committer.wait_idle(5))
+        self.assertEqual(committer.commits, 1)
+
+    def test_save_during_commit_follow_up(self):
+        committer = self.auto_commit()
+        self.release_commit.clear()
+        committer.record(f"{ DOCS }a.md")
+        self.assertTrue(self.committing.wait(5))
+        committer.record(f"{ DOCS }a.md")
+        committer.record(f"{ DOCS }b.md")
+        self.release_commit.set()
+
+        self.assertTrue(committer.wait_idle(5))
+        self.assertEqual(committer.commits, 2)
+        self.assertEqual(
+            self.messages,
+            ["Update a.md", "Update 2 documents\n\n- a.md\n- b.md"],
+        )
+
+    def test_journal_persisted(self):
+        committer = self.auto_commit(quiet=60)
+        committer.record(f"{ DOCS }a.md")
+
+        with open(self.journal, "r") as file:
+            self.assertEqual(list(json.load(file)), [f"{ DOCS }a.md"])
+
+        restarted = self.auto_commit()
+        self.assertEqual(restarted.pending(), [f"{ DOCS }a.md"])
+        self.assertTrue(restarted.wait_idle(5))
+        self.assertEqual(self.messages, ["Update a.md"])
+
+        with open(self.journal, "r") as file:
+            self.assertEqual(json.load(file), {})
+
+    def test_journal_shared(self):
+        other = self.auto_commit(quiet=60)
+        committer = self.auto_commit()
+        self.release_commit.clear()
+        other.record(f"{ DOCS }a.md")
+        committer.record(f"{ DOCS }b.md")
+        self.assertTrue(self.committing.wait(5))
+        other.record(f"{ DOCS }c.md")
+        self.release_commit.set()
+
+        # The save made by the other meanwhile is kept, then committed
+        self.assertTrue(committer.wait_idle(5))
+        self.assertEqual(
+            self.paths,
+            [[f"{ DOCS }a.md", f"{ DOCS }b.md"], [f"{ DOCS }c.md"]],
+        )
+        self.assertEqual(other.pending(), [])
+
+    def test_journal_unreadable(self):
+        with open(self.journal, "w") as file:
+            file.write("{ not json")
+
+        self.assertEqual(self.auto_commit().pending(), [])
+
+    def test_commit_failed_kept(self):
+        self.outcome = {
+            "status": PushStatus.FAILED.value,
+            "commit": None,
+            "summary": "fatal: not a git repository",
+        }
+        committer = self.auto_commit()
+        committer.record(f"{ DOCS }a.md")
+
+        self.assertTrue(committer.wait_idle(5))
+        self.assertEqual(committer.pending(), [f"{ DOCS }a.md"])
+
+        self.outcome = {
+            "status": PushStatus.PUSHED.value,
+            "commit": "4b825dc642cb6eb9a060e54bf8d69288fbee4904",
+            "summary": "[new commit]",
+        }
+        committer.record(f"{ DOCS }b.md")
+        self.assertTrue(committer.wait_idle(5))
+        self.assertEqual(committer.pending(), [])
+        self.assertEqual(
+            self.messages[-1], "Update 2 documents\n\n- a.md\n- b.md"
+        )
+
+    def test_commit_error(self):
+        def failing_commit(message, paths):
+            raise RuntimeError("push failed")
+
+        committer = AutoCommit(failing_commit, self.journal, 0.05, DOCS)
+        committer.record(f"{ DOCS }a.md")
+
+        self.assertTrue(committer.wait_idle(5))
+        self.assertEqual(
+            committer.last_outcome["status"], PushStatus.FAILED.value
+        )
+        self.assertEqual(
+            committer.last_outcome["summary"], "RuntimeError: push failed"
+        )
+        self.assertEqual(committer.pending(), [f"{ DOCS }a.md"])
+
+    def test_rejected_kept(self):
+        self.outcome = {
+            "status": PushStatus.REJECTED.value,
+            "commit": "4b825dc642cb6eb9a060e54bf8d69288fbee4904",
+            "summary": "[rejected] (fetch first)",
+        }
+        committer = self.auto_commit()
+        committer.record(f"{ DOCS }a.md")
+
+        self.assertTrue(committer.wait_idle(5))
+        self.assertEqual(committer.pending(), [f"{ DOCS }a.md"])
+
+        with open(self.journal, "r") as file:
+            self.assertEqual(list(json.load(file)), [f"{ DOCS }a.md"])
+
+    def test_nothing_to_commit_not_kept(self):
+        self.outcome = {
+            "status": PushStatus.NOTHING_TO_COMMIT.value,
+            "commit": None,
+            "summary": "Nothing to commit",
+        }
+        committer = self.auto_commit()
+        committer.record(f"{ DOCS }a.md")
+
+        self.assertTrue(committer.wait_idle(5))
+        self.assertEqual(committer.pending(), [])
+
+    def test_bad_quiet(self):
+        with self.assertRaises(ValueError):
+            AutoCommit(self.commit, self.journal, -1)
+
+    def test_shared(self):
+        self.assertIs(
+            auto_commit(self.commit, self.journal),
+            auto_commit(self.commit, self.journal),
+        )
+
+
+class CommitMessageTest(TestCase):
+    def test_one_document(self):
+        self.assertEqual(
+            commit_message([f"{ DOCS }hazard.md"], DOCS), "Update hazard.md"
+        )
+
+    def test_outside_docs(self):
+        self.assertEqual(
+            commit_message(["/docs2/a.md", f"{ DOCS }b.md"], DOCS),
+            "Update 2 documents\n\n- /docs2/a.md\n- b.md",
+        )
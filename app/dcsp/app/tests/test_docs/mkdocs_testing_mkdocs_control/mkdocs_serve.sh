@@ -1,2 +0,0 @@
-#!/bin/bash
-mkdocs serve > /dev/null 2>&1 &
\ No newline at end of file
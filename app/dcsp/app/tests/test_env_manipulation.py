@@ -4,13 +4,15 @@ NB: Not built for asynchronous testing
 """
 
 from unittest import TestCase
+from unittest.mock import patch
 import sys
+import os
 from dotenv import set_key, dotenv_values
 
 import app.functions.constants as c
 
 sys.path.append(c.FUNCTIONS_APP)
-from app.functions.env_manipulation import ENVManipulator
+from app.functions.env_manipulation import ENVManipulator, clear_cache
 import app.tests.data_env_manipulation as d
 
 
@@ -62,3 +64,118 @@ class ENVManipulatorTest(TestCase):
         set_key(c.TESTING_ENV_PATH_MKDOCS, "key2", d.VALUE2)
         em = ENVManipulator(c.TESTING_ENV_PATH_MKDOCS)
         self.assertEqual(em.read_all(), d.READ_ALL_RETURN)
+
+
+class ENVCacheTest(TestCase):
+    def setUp(self):
+        clear_cache()
+        open(c.TESTING_ENV_PATH_MKDOCS, "w").close()
+        set_key(c.TESTING_ENV_PATH_MKDOCS, "key1", d.VALUE1)
+
+    def test_parsed_once(self):
+        with patch(
+            "app.functions.env_manipulation.dotenv_values",
+            wraps=dotenv_values,
+        ) as mock_dotenv_values:
+            self.assertEqual(
+                ENVManipulator(c.TESTING_ENV_PATH_MKDOCS).read("key1"),
+                d.VALUE1,
+            )
+            self.assertEqual(
+                ENVManipulator(c.TESTING_ENV_PATH_MKDOCS).read_all(),
+                {"key1": d.VALUE1},
+            )
+        self.assertEqual(mock_dotenv_values.call_count, 1)
+
+    def test_external_change(self):
+        em = ENVManipulator(c.TESTING_ENV_PATH_MKDOCS)
+        self.assertEqual(em.read("key2"), "")
+        set_key(c.TESTING_ENV_PATH_MKDOCS, "key2", d.VALUE2)
+        self.assertEqual(em.read("key2"), d.VALUE2)
+
+    def test_own_write(self):
+        em = ENVManipulator(c.TESTING_ENV_PATH_MKDOCS)
+        self.assertEqual(em.read("key1"), d.VALUE1)
+        em.add("key1", d.VALUE2)
+        self.assertEqual(em.read("key1"), d.VALUE2)
+        em.delete("key1")
+        self.assertEqual(em.read("key1"), "")
+
+    def test_returns_copy(self):
+        em = ENVManipulator(c.TESTING_ENV_PATH_MKDOCS)
+        em.read_all()["key1"] = d.VALUE4
+        self.assertEqual(em.read("key1"), d.VALUE1)
+
+    def test_missing_file(self):
+        em = ENVManipulator(f"{ c.TESTING_ENV_PATH_MKDOCS }_missing")
+        self.assertEqual(em.read("key1"), "")
+        self.assertEqual(em.read_all(), {})
+
+
+class ENVBatchTest(TestCase):
+    def setUp(self):
+        open(c.TESTING_ENV_PATH_MKDOCS, "w").close()
+        set_key(c.TESTING_ENV_PATH_MKDOCS, "key1", d.VALUE1)
+        set_key(c.TESTING_ENV_PATH_MKDOCS, "key2", d.VALUE2)
+
+    def test_batch(self):
+        em = ENVManipulator(c.TESTING_ENV_PATH_MKDOCS)
+
+        with patch(
+            "app.functions.locked_files.os.replace", wraps=os.replace
+        ) as mock_replace:
+            with em.batch():
+                em.add("key3", d.VALUE3)
+                em.add("key4", d.VALUE4)
+                self.assertTrue(em.delete("key1"))
+                self.assertEqual(em.read("key3"), d.VALUE3)
+                self.assertNotIn(
+                    "key3", dotenv_values(c.TESTING_ENV_PATH_MKDOCS)
+                )
+        self.assertEqual(mock_replace.call_count, 1)
+        self.assertEqual(
+            dotenv_values(c.TESTING_ENV_PATH_MKDOCS), d.BATCH_RETURN
+        )
+
+    def test_batch_exception(self):
+        em = ENVManipulator(c.TESTING_ENV_PATH_MKDOCS)
+
+        with self.assertRaises(ValueError):
+            with em.batch():
+                em.add("key3", d.VALUE3)
+                raise ValueError("Abandon batch")
+        self.assertNotIn("key3", dotenv_values(c.TESTING_ENV_PATH_MKDOCS))
+        self.assertEqual(em.read("key3"), "")
+
+    def test_batch_nested(self):
+        em = ENVManipulator(c.TESTING_ENV_PATH_MKDOCS)
+
+        with em.batch():
+            with em.batch():
+                em.add("key3", d.VALUE3)
+            self.assertNotIn("key3", dotenv_values(c.TESTING_ENV_PATH_MKDOCS))
+        self.assertEqual(
+            dotenv_values(c.TESTING_ENV_PATH_MKDOCS).get("key3"), d.VALUE3
+        )
+
+    def test_batch_no_changes(self):
+        em = ENVManipulator(c.TESTING_ENV_PATH_MKDOCS)
+
+        with patch("app.functions.locked_files.os.replace") as mock_replace:
+            with em.batch():
+                self.assertFalse(em.delete("wrong_key"))
+        mock_replace.assert_not_called()
+
+    def test_delete_all_keeps_file(self):
+        em = ENVManipulator(c.TESTING_ENV_PATH_MKDOCS)
+        em.delete_all()
+        self.assertTrue(os.path.isfile(c.TESTING_ENV_PATH_MKDOCS))
+        self.assertEqual(em.read_all(), {})
+
+    def test_quoted_values(self):
+        em = ENVManipulator(c.TESTING_ENV_PATH_MKDOCS)
+        em.add("key3", "it's # not a comment")
+        self.assertEqual(
+            dotenv_values(c.TESTING_ENV_PATH_MKDOCS).get("key3"),
+            "it's # not a comment",
+        )
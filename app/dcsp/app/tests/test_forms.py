@@ -4,8 +4,9 @@
 
 """
 
-from django.test import TestCase, tag, override_settings
+from django.test import TestCase, override_settings
 from django.conf import settings
+from unittest.mock import AsyncMock, patch
 
 import sys
 
@@ -22,6 +23,7 @@ sys.path.append(c.FUNCTIONS_APP)
 from app.functions.docs_builder import Builder
 
 import app.tests.data_forms as d
+from app.tests.fake_github import fake_github
 
 from app.forms import (
     InstallationForm,
@@ -33,13 +35,30 @@ from app.forms import (
 )
 
 
-@tag("git")
 class InstallationFormTest(TestCase):
+    def setUp(self):
+        context = fake_github()
+        self.github = context.__enter__()
+        self.addCleanup(context.__exit__, None, None, None)
+        self.github.add_user("Bob")
+        self.github.add_repo("Bob", "a_repo", collaborators={"Bob": "admin"})
+
     def test_stand_alone_data_good(self):
-        pass
+        form = InstallationForm(
+            data=d.INSTALLATION_FORM_STAND_ALONE_DATA_EMAIL
+        )
+        self.assertTrue(form.is_valid())
 
     def test_stand_alone_data_bad(self):
-        pass
+        form = InstallationForm(
+            data=d.INSTALLATION_FORM_STAND_ALONE_DATA_EMAIL
+            | {"github_repo_SA": "another_repo"}
+        )
+        self.assertFalse(form.is_valid())
+        self.assertEqual(
+            form.errors["github_repo_SA"],
+            ["Repository does not exist", "No admin rights to this repo"],
+        )
 
     def test_integrated_path_good(self):
         form = InstallationForm(data=d.INSTALLATION_FORM_INTEGRATED_DATA_GOOD)
@@ -50,6 +69,37 @@ class InstallationFormTest(TestCase):
         self.assertFalse(form.is_valid())
 
 
+class InstallationFormAsyncTest(TestCase):
+    @patch("app.forms.AsyncGitController")
+    async def test_ais_valid_repo_missing(self, mock_git_controller):
+        mock_git_controller.return_value.check_github_credentials = AsyncMock(
+            return_value=d.CREDENTIALS_CHECK_REPO_MISSING
+        )
+        form = InstallationForm(
+            data=d.INSTALLATION_FORM_STAND_ALONE_DATA_EMAIL
+        )
+
+        self.assertFalse(await form.ais_valid())
+        self.assertEqual(
+            form.errors["github_repo_SA"],
+            ["Repository does not exist", "No admin rights to this repo"],
+        )
+        mock_git_controller.assert_called_once_with(
+            github_username="Bob",
+            email="bob@domain.com",
+            github_organisation="Bob",
+            github_repo="a_repo",
+            github_token="a_token",
+        )
+
+    @patch("app.forms.AsyncGitController")
+    async def test_ais_valid_integrated(self, mock_git_controller):
+        form = InstallationForm(data=d.INSTALLATION_FORM_INTEGRATED_DATA_GOOD)
+
+        self.assertTrue(await form.ais_valid())
+        mock_git_controller.assert_not_called()
+
+
 class TemplateSelectFormTest(TestCase):
     def test_template_choice_good_data(self):
         form = TemplateSelectForm(d.TEMPLATE_SELECT_FORM_GOOD_DATA)
@@ -4,7 +4,7 @@
 
 """
 
-from unittest import TestCase
+from unittest import TestCase, IsolatedAsyncioTestCase
 from django.test import tag
 import sys
 import os
@@ -16,13 +16,122 @@ from github import Github, Issue, Auth, GithubException
 from unittest.mock import Mock, patch, call
 from unittest.mock import create_autospec
 import time as t
+from datetime import datetime
+import asyncio
+import threading
+import subprocess  # nosec B404
+import tempfile
+from contextlib import contextmanager
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 
 import app.functions.constants as c
 
 sys.path.append(c.FUNCTIONS_APP)
-from app.functions.git_control import GitController
+from app.functions.git_control import (
+    GitController,
+    AsyncGitController,
+    clear_hazard_cache,
+    clear_repo_cache,
+)
+from app.functions.constants import HazardLookup, PushStatus
+from app.functions.github_client import close_clients
+from app.functions.locked_files import file_lock
+from app.functions.github_scheduler import (
+    CircuitBreaker,
+    GithubUnavailable,
+    RateLimitScheduler,
+)
 
 import app.tests.data_git_control as d
+from app.tests.fake_github import fake_github
+
+
+def get_responses(username, organisation, repo, delay=0):
+    """Mock GET responses for the credential checks, matched on url
+
+    The checks run concurrently, so responses cannot be given in call order.
+    """
+    status_codes = {
+        d.CHECK_CREDENTIALS_GET_CALLS[0].args[0]: username,
+        d.CHECK_CREDENTIALS_GET_CALLS[1].args[0]: organisation,
+        d.CHECK_CREDENTIALS_GET_CALLS[2].args[0]: repo,
+    }
+
+    def get(url, **kwargs):
+        t.sleep(delay)
+        return Mock(status_code=status_codes[url])
+
+    return get
+
+
+@contextmanager
+def local_remote(identity=True):
+    """A clone of a local bare repository, with one commit on main
+
+    Args:
+        identity: set to False to leave git without a user name and email, so
+                  git config is only read from inside the temporary directory.
+
+    Yields:
+        tuple[str, str]: paths of the bare repository and the clone.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        environment = {
+            "HOME": temp_dir,
+            "XDG_CONFIG_HOME": temp_dir,
+            "GIT_CONFIG_NOSYSTEM": "1",
+        }
+        with patch.dict(os.environ, environment):
+            origin = os.path.join(temp_dir, "origin.git")
+            clone = os.path.join(temp_dir, "clone")
+            Repo.init(origin, bare=True, initial_branch="main")
+            repo = Repo.clone_from(origin, clone)
+            with repo.config_writer() as writer:
+                writer.set_value("user", "name", "Jane")
+                writer.set_value("user", "email", "jane@domain.com")
+            with open(os.path.join(clone, "README.md"), "w") as file:
+                file.write("# Docs\n")
+            repo.git.add("--all")
+            repo.git.commit("-m", "First commit")
+            repo.git.push("origin", "HEAD:main")
+            repo.git.branch("--set-upstream-to=origin/main")
+            if not identity:
+                with repo.config_writer() as writer:
+                    writer.remove_section("user")
+            yield origin, clone
+
+
+def write_doc(clone, name, text="# A hazard\n"):
+    """Writes a document under the paths commit_and_push manages"""
+    path = os.path.join(clone, c.GIT_MANAGED_PATHS[0], name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as file:
+        file.write(text)
+    return path
+
+
+def page_response(items, status_code=200, next_url=None):
+    """Mock GET response for a page of a paginated list"""
+    response = Mock(status_code=status_code)
+    response.json.return_value = items
+    response.links = {"next": {"url": next_url}} if next_url else {}
+    if status_code != 200:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            response=response
+        )
+    return response
+
+
+def graphql_response(data, status_code=200):
+    """Mock POST response from the GraphQL API"""
+    response = Mock(status_code=status_code)
+    response.json.return_value = data
+    if status_code != 200:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            f"{ status_code } Client Error", response=response
+        )
+    return response
 
 
 # @tag("git")
@@ -53,6 +162,51 @@ class GitControllerTest(TestCase):
                         f.write(f"{ key_again.value }='some test data'\n")
             f.close()
 
+    def setUp(self):
+        close_clients()
+        clear_hazard_cache()
+        clear_repo_cache()
+
+    def tearDown(self):
+        close_clients()
+        clear_hazard_cache()
+        clear_repo_cache()
+
+    def start_fake_github(self):
+        """Points the controller at a stand in GitHub API, so runs offline"""
+        self.scheduler = RateLimitScheduler(retries=0)
+        for target in (
+            "app.functions.github_cache.github_scheduler",
+            "app.functions.github_client.github_scheduler",
+            "app.functions.git_control.github_scheduler",
+        ):
+            patcher = patch(target, return_value=self.scheduler)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        context = fake_github(
+            tokens={
+                d.git_contoller_args["github_username"]: d.git_contoller_args[
+                    "github_token"
+                ]
+            }
+        )
+        self.github = context.__enter__()
+        self.addCleanup(context.__exit__, None, None, None)
+        self.github.add_user(d.git_contoller_args["github_username"])
+        self.github.add_repo(
+            d.git_contoller_args["github_organisation"],
+            d.git_contoller_args["github_repo"],
+            labels=["hazard"],
+            collaborators={d.git_contoller_args["github_username"]: "admin"},
+        )
+        self.repo = (
+            f"{ d.git_contoller_args['github_organisation'] }/"
+            f"{ d.git_contoller_args['github_repo'] }"
+        )
+        self.gc = GitController(**d.git_contoller_args)
+        return
+
     def test_init(self):
         GitController(env_location=c.TESTING_ENV_PATH_GIT)
 
@@ -119,16 +273,10 @@ class GitControllerTest(TestCase):
         )
 
     # @tag("run")
-    @patch("app.functions.git_control.requests.get")
-    @patch("app.functions.git_control.Github")
+    @patch("app.functions.github_client.GithubClient.get")
+    @patch("app.functions.github_client.Github")
     def test_check_github_credentials(self, mock_github, mock_get):
-        mock_get.side_effect = iter(
-            [
-                Mock(status_code=200),
-                Mock(status_code=200),
-                Mock(status_code=200),
-            ]
-        )
+        mock_get.side_effect = get_responses(200, 200, 200)
 
         mock_github_instance = Mock()
         mock_github.return_value = mock_github_instance
@@ -143,7 +291,7 @@ class GitControllerTest(TestCase):
         )
 
         calls = mock_get.call_args_list
-        self.assertEqual(calls, d.CHECK_CREDENTIALS_GET_CALLS)
+        self.assertCountEqual(calls, d.CHECK_CREDENTIALS_GET_CALLS)
 
         mock_github.assert_called_once()
         calls_github = mock_github.call_args_list
@@ -166,8 +314,8 @@ class GitControllerTest(TestCase):
         )
 
     # @tag("run")
-    @patch("app.functions.git_control.requests.get")
-    @patch("app.functions.git_control.Github")
+    @patch("app.functions.github_client.GithubClient.get")
+    @patch("app.functions.github_client.Github")
     def test_check_github_credentials_no_connection(
         self, mock_github, mock_get
     ):
@@ -185,15 +333,14 @@ class GitControllerTest(TestCase):
 
         self.assertEqual(str(error.exception), d.NO_CONNECTION_ERROR_MESSAGE)
 
-        self.assertEqual(mock_get.call_count, 1)
         calls = mock_get.call_args_list
-        self.assertEqual(calls[0], d.CHECK_CREDENTIALS_GET_CALLS[0])
+        self.assertCountEqual(calls, d.CHECK_CREDENTIALS_GET_CALLS)
 
         self.assertEqual(mock_github.call_count, 0)
 
     # @tag("run")
-    @patch("app.functions.git_control.requests.get")
-    @patch("app.functions.git_control.Github")
+    @patch("app.functions.github_client.GithubClient.get")
+    @patch("app.functions.github_client.Github")
     def test_check_github_credentials_timeout(self, mock_github, mock_get):
         mock_get.side_effect = requests.exceptions.Timeout(
             "Test Timeout Error"
@@ -209,27 +356,102 @@ class GitControllerTest(TestCase):
 
         self.assertEqual(str(error.exception), d.TIME_ERROR_MESSAGE)
 
-        self.assertEqual(mock_get.call_count, 1)
         calls = mock_get.call_args_list
-        self.assertEqual(calls[0], d.CHECK_CREDENTIALS_GET_CALLS[0])
+        self.assertCountEqual(calls, d.CHECK_CREDENTIALS_GET_CALLS)
 
         self.assertEqual(mock_github.call_count, 0)
 
+    # @tag("run")
+    @patch("app.functions.github_client.GithubClient.get")
+    @patch("app.functions.github_client.Github")
+    def test_check_github_credentials_deadline(self, mock_github, mock_get):
+        mock_get.side_effect = get_responses(200, 200, 200, delay=0.5)
+
+        gc = GitController(**d.git_contoller_args)
+
+        with self.assertRaises(requests.exceptions.Timeout) as error:
+            gc.check_github_credentials(deadline=0.1)
+
+        self.assertEqual(str(error.exception), d.TIME_ERROR_MESSAGE)
+        self.assertEqual(mock_github.call_count, 0)
+
+    # @tag("run")
+    @patch("app.functions.github_client.GithubClient.get")
+    @patch("app.functions.github_client.Github")
+    def test_check_github_credentials_deadline_permission(
+        self, mock_github, mock_get
+    ):
+        mock_get.side_effect = get_responses(200, 200, 200)
+        mock_repo_instance = mock_github.return_value.get_repo.return_value
+        mock_repo_instance.get_collaborator_permission.side_effect = (
+            lambda username: t.sleep(1)
+        )
+
+        gc = GitController(**d.git_contoller_args)
+        start = t.monotonic()
+
+        with self.assertRaises(requests.exceptions.Timeout) as error:
+            gc.check_github_credentials(deadline=0.3)
+
+        self.assertEqual(str(error.exception), d.TIME_ERROR_MESSAGE)
+        self.assertLess(t.monotonic() - start, 0.8)
+
+    @patch("app.functions.github_client.GithubClient.get")
+    @patch("app.functions.github_client.Github")
+    def test_repo_permission_deadline_passed(self, mock_github, mock_get):
+        mock_get.side_effect = get_responses(200, 200, 200)
+        mock_repo_instance = mock_github.return_value.get_repo.return_value
+
+        gc = GitController(**d.git_contoller_args)
+
+        with self.assertRaises(requests.exceptions.Timeout) as error:
+            gc._repo_permission(t.monotonic() - 1)
+
+        self.assertEqual(str(error.exception), d.TIME_ERROR_MESSAGE)
+        mock_repo_instance.get_collaborator_permission.assert_not_called()
+
+    @patch("app.functions.github_client.GithubClient.get")
+    @patch("app.functions.github_client.Github")
+    def test_check_github_credentials_permission_error(
+        self, mock_github, mock_get
+    ):
+        mock_get.side_effect = get_responses(200, 200, 200)
+        mock_repo_instance = mock_github.return_value.get_repo.return_value
+        mock_repo_instance.get_collaborator_permission.side_effect = (
+            GithubException(403, {"message": "API rate limit exceeded"})
+        )
+
+        gc = GitController(**d.git_contoller_args)
+
+        with self.assertRaises(GithubException) as error:
+            gc.check_github_credentials()
+
+        self.assertEqual(error.exception.status, 403)
+
+    # @tag("run")
+    @patch("app.functions.github_client.GithubClient.get")
+    @patch("app.functions.github_client.Github")
+    def test_check_github_credentials_concurrent(self, mock_github, mock_get):
+        mock_get.side_effect = get_responses(200, 200, 404, delay=0.3)
+
+        gc = GitController(**d.git_contoller_args)
+        start = t.monotonic()
+
+        self.assertEqual(
+            gc.check_github_credentials(),
+            d.CREDENTIALS_CHECK_REPO_DOES_NOT_EXIST,
+        )
+        self.assertLess(t.monotonic() - start, 0.8)
+
     # TODO #30 may need to catch time outs and no connections in different request places
 
     # @tag("run")
-    @patch("app.functions.git_control.requests.get")
-    @patch("app.functions.git_control.Github")
+    @patch("app.functions.github_client.GithubClient.get")
+    @patch("app.functions.github_client.Github")
     def test_check_github_credentials_repo_does_not_exist(
         self, mock_github, mock_get
     ):
-        mock_get.side_effect = iter(
-            [
-                Mock(status_code=200),
-                Mock(status_code=200),
-                Mock(status_code=404),
-            ]
-        )
+        mock_get.side_effect = get_responses(200, 200, 404)
 
         mock_github_instance = Mock()
         mock_github.return_value = mock_github_instance
@@ -243,30 +465,24 @@ class GitControllerTest(TestCase):
 
         self.assertEqual(mock_get.call_count, 3)
         calls = mock_get.call_args_list
-        self.assertEqual(calls, d.CHECK_CREDENTIALS_GET_CALLS)
+        self.assertCountEqual(calls, d.CHECK_CREDENTIALS_GET_CALLS)
 
         self.assertEqual(mock_github.call_count, 0)
 
     # @tag("run")
-    @patch("app.functions.git_control.requests.get")
-    @patch("app.functions.git_control.Github")
+    @patch("app.functions.github_client.GithubClient.get")
+    @patch("app.functions.github_client.Github")
     def test_check_github_credentials_username_bad(
         self, mock_github, mock_get
     ):
-        mock_get.side_effect = iter(
-            [
-                Mock(status_code=404),
-                Mock(status_code=200),
-                Mock(status_code=200),
-            ]
-        )
+        mock_get.side_effect = get_responses(404, 200, 200)
 
         mock_github_instance = Mock()
         mock_github.return_value = mock_github_instance
         mock_repo_instance = Mock()
         mock_github_instance.get_repo.return_value = mock_repo_instance
         mock_repo_instance.get_collaborator_permission.side_effect = (
-            GithubException("No permission for repo")
+            GithubException(404, {"message": "Not Found"})
         )
 
         gc = GitController(**d.git_contoller_args)
@@ -277,7 +493,7 @@ class GitControllerTest(TestCase):
 
         self.assertEqual(mock_get.call_count, 3)
         calls_get = mock_get.call_args_list
-        self.assertEqual(calls_get, d.CHECK_CREDENTIALS_GET_CALLS)
+        self.assertCountEqual(calls_get, d.CHECK_CREDENTIALS_GET_CALLS)
 
         mock_github.assert_called_once()
         calls_github = mock_github.call_args_list
@@ -300,18 +516,12 @@ class GitControllerTest(TestCase):
         )
 
     # @tag("run")
-    @patch("app.functions.git_control.requests.get")
-    @patch("app.functions.git_control.Github")
+    @patch("app.functions.github_client.GithubClient.get")
+    @patch("app.functions.github_client.Github")
     def test_check_github_credentials_organisation_bad(
         self, mock_github, mock_get
     ):
-        mock_get.side_effect = iter(
-            [
-                Mock(status_code=200),
-                Mock(status_code=404),
-                Mock(status_code=404),
-            ]
-        )
+        mock_get.side_effect = get_responses(200, 404, 404)
 
         mock_github_instance = Mock()
         mock_github.return_value = mock_github_instance
@@ -324,12 +534,32 @@ class GitControllerTest(TestCase):
 
         self.assertEqual(mock_get.call_count, 3)
         calls = mock_get.call_args_list
-        self.assertEqual(calls, d.CHECK_CREDENTIALS_GET_CALLS)
+        self.assertCountEqual(calls, d.CHECK_CREDENTIALS_GET_CALLS)
 
         self.assertEqual(mock_github.call_count, 0)
 
+    @patch("app.functions.github_client.GithubClient.get")
+    def test_username_exists(self, mock_get):
+        mock_get.return_value = Mock(status_code=200)
+        gc = GitController(**d.git_contoller_args)
+        self.assertTrue(gc.username_exists())
+        mock_get.assert_called_once()
+        self.assertEqual(
+            mock_get.call_args_list[0], d.CHECK_CREDENTIALS_GET_CALLS[0]
+        )
+
+    @patch("app.functions.github_client.GithubClient.get")
+    def test_repo_exists_bad_status(self, mock_get):
+        mock_get.return_value = Mock(status_code=500)
+        gc = GitController(**d.git_contoller_args)
+        with self.assertRaises(ValueError):
+            gc.repo_exists()
+        self.assertEqual(
+            mock_get.call_args_list[0], d.CHECK_CREDENTIALS_GET_CALLS[2]
+        )
+
     # @tag("run")
-    @patch("app.functions.git_control.requests.get")
+    @patch("app.functions.github_client.GithubClient.get")
     def test_organisation_exists(self, mock_get):
         mock_get.return_value = Mock(status_code=200)
         gc = GitController(**d.git_contoller_args)
@@ -341,7 +571,7 @@ class GitControllerTest(TestCase):
         self.assertEqual(calls[0], d.CHECK_CREDENTIALS_GET_CALLS[1])
 
     # @tag("run")
-    @patch("app.functions.git_control.requests.get")
+    @patch("app.functions.github_client.GithubClient.get")
     def test_organisation_does_not_exists(self, mock_get):
         mock_get.return_value = Mock(status_code=404)
         gc = GitController(**d.git_contoller_args)
@@ -353,186 +583,614 @@ class GitControllerTest(TestCase):
         self.assertEqual(calls[0], d.CHECK_CREDENTIALS_GET_CALLS[1])
 
     # @tag("run")
-    @patch("app.functions.git_control.Github")
-    def test_get_repos(self, mock_github):
-        mock_github_instance = Mock()
-        mock_github.return_value = mock_github_instance
-        mock_repo_instance = Mock()
-        mock_github_instance.get_user.return_value = mock_repo_instance
-        mock_name0 = Mock()
-        setattr(mock_name0, "name", d.GET_REPOS[0])
-        mock_name1 = Mock()
-        setattr(mock_name1, "name", d.GET_REPOS[1])
-        mock_repo_instance.get_repos.return_value = iter(
-            [mock_name0, mock_name1]
+    @patch("app.functions.github_client.GithubClient.get")
+    def test_get_repos(self, mock_get):
+        mock_get.side_effect = iter(
+            [
+                page_response(
+                    [{"name": d.GET_REPOS[0]}], next_url=d.GET_REPOS_PAGE_2
+                ),
+                page_response([{"name": d.GET_REPOS[1]}]),
+            ]
         )
 
         gc = GitController(**d.git_contoller_args)
-        self.assertTrue(
-            gc.get_repos(d.git_contoller_args["github_organisation"]),
-            d.GET_REPOS,
-        )
+        repos = gc.get_repos(d.git_contoller_args["github_organisation"])
+        mock_get.assert_not_called()
+        self.assertEqual(next(repos), d.GET_REPOS[0])
+        mock_get.assert_called_once()
+        self.assertEqual(list(repos), d.GET_REPOS[1:])
+        self.assertEqual(mock_get.call_args_list, d.GET_REPOS_CALLS)
 
-        mock_github.assert_called_once()
-        calls_github = mock_github.call_args_list
-        self.assertEqual(calls_github[0].args, d.CHECK_CREDENTIALS_GITHUB_CALL)
+    # @tag("run")
+    @patch("app.functions.github_client.GithubClient.get")
+    def test_get_repos_domain_nonexist(self, mock_get):
+        mock_get.return_value = page_response({"message": "Not Found"}, 404)
+
+        gc = GitController(**d.git_contoller_args)
+        with self.assertRaises(ValueError) as error:
+            list(gc.get_repos(d.git_contoller_args["github_organisation"]))
 
-        mock_github_instance.get_user.assert_called_once()
-        calls_get_user = mock_github_instance.get_user.call_args_list
         self.assertEqual(
-            calls_get_user[0].args[0],
-            d.git_contoller_args["github_organisation"],
+            str(error.exception),
+            f"Error with getting user / organisastion '{ d.git_contoller_args['github_organisation'] }', returned - 'Not Found'",
         )
+        mock_get.assert_called_once()
+        self.assertEqual(mock_get.call_args_list[0], d.GET_REPOS_CALLS[0])
+
+    # @tag("run")
+    @patch("app.functions.github_client.GithubClient.get")
+    def test_current_repo_on_github(self, mock_get):
+        mock_get.side_effect = [Mock(status_code=200), Mock(status_code=404)]
 
-        mock_repo_instance.get_repos.assert_called_once()
-        calls_repos = mock_github_instance.get_repos.call_args_list
-        self.assertEqual(calls_repos, [])
+        gc = GitController(**d.git_contoller_args)
+        self.assertTrue(
+            gc.current_repo_on_github(
+                d.git_contoller_args["github_organisation"], d.GET_REPOS[0]
+            )
+        )
+        self.assertFalse(
+            gc.current_repo_on_github(
+                d.git_contoller_args["github_organisation"], d.REPO_BAD_NAME
+            )
+        )
+        self.assertEqual(mock_get.call_args_list, d.REPO_ON_GITHUB_CALLS)
 
     # @tag("run")
-    @patch("app.functions.git_control.Github")
-    def test_get_repos_domain_nonexist(self, mock_github):
-        mock_github_instance = Mock()
-        mock_github.return_value = mock_github_instance
-        mock_github_instance.get_user.side_effect = GithubException(
-            "User / organisation not found", data={"message": "Not Found"}
+    @patch("app.functions.github_client.GithubClient.get")
+    def test_current_repo_on_github_bad_status(self, mock_get):
+        mock_get.return_value = Mock(status_code=401)
+
+        gc = GitController(**d.git_contoller_args)
+        with self.assertRaises(ValueError):
+            gc.current_repo_on_github(
+                d.git_contoller_args["github_organisation"], d.GET_REPOS[0]
+            )
+
+    # @tag("run")
+    @patch("app.functions.git_control.t.monotonic")
+    @patch("app.functions.github_client.GithubClient.get")
+    def test_current_repo_on_github_cached(self, mock_get, mock_monotonic):
+        mock_get.side_effect = [
+            Mock(status_code=200),
+            Mock(status_code=404),
+            Mock(status_code=404),
+            Mock(status_code=200),
+        ]
+        mock_monotonic.return_value = 1000
+        organisation = d.git_contoller_args["github_organisation"]
+
+        gc = GitController(**d.git_contoller_args)
+        self.assertTrue(gc.current_repo_on_github(organisation, "Repo"))
+        mock_monotonic.return_value = 1000 + c.REPO_EXISTS_SECONDS - 1
+        self.assertTrue(gc.current_repo_on_github(organisation, "repo"))
+        self.assertEqual(mock_get.call_count, 1)
+
+        mock_monotonic.return_value = 1000 + c.REPO_EXISTS_SECONDS
+        self.assertFalse(gc.current_repo_on_github(organisation, "repo"))
+        self.assertEqual(mock_get.call_count, 2)
+
+        mock_monotonic.return_value += c.REPO_MISSING_SECONDS - 1
+        self.assertFalse(gc.current_repo_on_github(organisation, "repo"))
+        self.assertEqual(mock_get.call_count, 2)
+
+        mock_monotonic.return_value += 1
+        self.assertFalse(gc.current_repo_on_github(organisation, "repo"))
+        self.assertEqual(mock_get.call_count, 3)
+
+    # @tag("run")
+    @patch("app.functions.github_client.Github")
+    @patch("app.functions.github_client.GithubClient.get")
+    def test_create_and_delete_repo_cached(self, mock_get, mock_github):
+        mock_get.return_value = Mock(status_code=404)
+        organisation = d.git_contoller_args["github_organisation"]
+
+        gc = GitController(**d.git_contoller_args)
+        self.assertTrue(gc.create_repo(organisation, d.REPO_NAME_NEW))
+        self.assertTrue(
+            gc.current_repo_on_github(organisation, d.REPO_NAME_NEW)
+        )
+        self.assertTrue(gc.delete_repo(organisation, d.REPO_NAME_NEW))
+        self.assertFalse(
+            gc.current_repo_on_github(organisation, d.REPO_NAME_NEW)
         )
+        mock_get.assert_called_once()
+
+    # @tag("run")
+    @patch("app.functions.github_client.GithubClient.get")
+    def test_hazards_open_mocked(self, mock_get):
+        mock_get.return_value = page_response(d.OPEN_ISSUES)
+
+        gc = GitController(**d.git_contoller_args)
+        self.assertEqual(gc.hazards_open(), d.HAZARDS_OPEN)
+        self.assertEqual(mock_get.call_args_list, d.HAZARDS_OPEN_CALLS)
+
+    # @tag("run")
+    @patch("app.functions.github_client.GithubClient.get")
+    def test_hazards_open_repo_bad_mocked(self, mock_get):
+        mock_get.return_value = page_response({"message": "Not Found"}, 404)
 
         gc = GitController(**d.git_contoller_args)
         with self.assertRaises(ValueError) as error:
-            gc.get_repos(d.git_contoller_args["github_organisation"])
+            gc.hazards_open()
 
         self.assertEqual(
             str(error.exception),
-            f"Error with getting user / organisastion '{ d.git_contoller_args['github_organisation'] }', returned - 'Not Found'",
+            f"Error with accessing repo '{ d.CHECK_CREDENTIALS_REPO_CALL }', return value 'Not Found'",
         )
 
-        mock_github.assert_called_once()
-        calls_github = mock_github.call_args_list
-        self.assertEqual(calls_github[0].args, d.CHECK_CREDENTIALS_GITHUB_CALL)
+    # @tag("run")
+    @patch("app.functions.github_client.GithubClient.get")
+    def test_hazards_updated(self, mock_get):
+        mock_get.return_value = page_response(d.UPDATED_ISSUES)
 
-        mock_github_instance.get_user.assert_called_once()
-        calls_get_user = mock_github_instance.get_user.call_args_list
+        gc = GitController(**d.git_contoller_args)
         self.assertEqual(
-            calls_get_user[0].args[0],
-            d.git_contoller_args["github_organisation"],
+            list(gc.hazards_updated(d.HAZARDS_UPDATED_SINCE)),
+            d.HAZARDS_UPDATED,
         )
+        self.assertEqual(mock_get.call_args_list, d.HAZARDS_UPDATED_CALLS)
 
     # @tag("run")
-    @patch("app.functions.git_control.Github")
-    def test_current_repo_on_github(self, mock_github):
-        mock_github_instance = Mock()
-        mock_github.return_value = mock_github_instance
-        mock_repo_instance = Mock()
-        mock_github_instance.get_user.return_value = mock_repo_instance
-        mock_name0 = Mock()
-        setattr(mock_name0, "name", d.GET_REPOS[0])
-        mock_name1 = Mock()
-        setattr(mock_name1, "name", d.GET_REPOS[1])
-        mock_repo_instance.get_repos.return_value = iter(
-            [mock_name0, mock_name1]
-        )
+    @patch("app.functions.github_client.GithubClient.get")
+    def test_hazards_updated_all(self, mock_get):
+        mock_get.return_value = page_response([])
 
         gc = GitController(**d.git_contoller_args)
-        self.assertTrue(
-            gc.current_repo_on_github(
-                d.git_contoller_args["github_organisation"], d.GET_REPOS[0]
-            )
+        self.assertEqual(list(gc.hazards_updated()), [])
+        self.assertNotIn("since", mock_get.call_args[1]["params"])
+
+    # @tag("run")
+    @patch("app.functions.github_client.GithubClient.get")
+    def test_hazards_updated_repo_bad(self, mock_get):
+        mock_get.return_value = page_response({"message": "Not Found"}, 404)
+
+        gc = GitController(**d.git_contoller_args)
+        with self.assertRaises(ValueError):
+            list(gc.hazards_updated())
+
+    # @tag("run")
+    @patch("app.functions.github_client.GithubClient.post")
+    def test_hazard(self, mock_post):
+        mock_post.return_value = graphql_response(d.HAZARD_GRAPHQL)
+
+        gc = GitController(**d.git_contoller_args)
+        self.assertEqual(gc.hazard(1), d.HAZARD)
+        self.assertEqual(mock_post.call_args_list, d.HAZARD_CALLS)
+
+    # @tag("run")
+    @patch("app.functions.github_client.GithubClient.post")
+    def test_hazard_not_found(self, mock_post):
+        mock_post.return_value = graphql_response(d.HAZARD_GRAPHQL_NOT_FOUND)
+
+        gc = GitController(**d.git_contoller_args)
+        self.assertIs(gc.hazard(1), HazardLookup.NOT_FOUND)
+
+    # @tag("run")
+    @patch("app.functions.github_client.GithubClient.post")
+    def test_hazard_repo_bad(self, mock_post):
+        mock_post.return_value = graphql_response(d.HAZARD_GRAPHQL_REPO_BAD)
+
+        gc = GitController(**d.git_contoller_args)
+        with self.assertRaises(ValueError) as error:
+            gc.hazard(1)
+        self.assertEqual(
+            str(error.exception),
+            f"Error with accessing repo '{ d.CHECK_CREDENTIALS_REPO_CALL }', return value 'Could not resolve to a Repository'",
         )
 
-        mock_github.assert_called_once()
-        calls_github = mock_github.call_args_list
-        self.assertEqual(calls_github[0].args, d.CHECK_CREDENTIALS_GITHUB_CALL)
+    # @tag("run")
+    @patch("app.functions.github_client.GithubClient.post")
+    def test_hazard_bad_status(self, mock_post):
+        mock_post.return_value = graphql_response({}, 401)
+
+        gc = GitController(**d.git_contoller_args)
+        with self.assertRaises(ValueError):
+            gc.hazard(1)
+
+    # @tag("run")
+    @patch("app.functions.git_control.t.monotonic")
+    @patch("app.functions.github_client.GithubClient.post")
+    def test_hazard_cached(self, mock_post, mock_monotonic):
+        mock_post.side_effect = [
+            graphql_response(d.HAZARD_GRAPHQL),
+            graphql_response(d.HAZARD_GRAPHQL_NOT_FOUND),
+        ]
+        mock_monotonic.return_value = 1000
+
+        gc = GitController(**d.git_contoller_args)
+        self.assertEqual(gc.hazard(1), d.HAZARD)
+        mock_monotonic.return_value = 1000 + c.HAZARD_CACHE_SECONDS - 1
+        self.assertEqual(gc.hazard(1), d.HAZARD)
+        mock_post.assert_called_once()
 
-        mock_github_instance.get_user.assert_called_once()
-        calls_get_user = mock_github_instance.get_user.call_args_list
+        mock_monotonic.return_value = 1000 + c.HAZARD_CACHE_SECONDS
+        self.assertIs(gc.hazard(1), HazardLookup.NOT_FOUND)
+        self.assertEqual(mock_post.call_count, 2)
+
+    # @tag("run")
+    @patch("app.functions.github_client.GithubClient.post")
+    def test_hazards_full(self, mock_post):
+        mock_post.side_effect = [
+            graphql_response(page) for page in d.HAZARDS_FULL_GRAPHQL
+        ]
+
+        gc = GitController(**d.git_contoller_args)
+        self.assertEqual(list(gc.hazards_full()), d.HAZARDS_FULL)
+        self.assertEqual(mock_post.call_count, 2)
+
+        variables = [
+            call[1]["json"]["variables"] for call in mock_post.call_args_list
+        ]
+        self.assertEqual(variables[0]["states"], ["OPEN"])
+        self.assertEqual(variables[0]["first"], c.GITHUB_PER_PAGE)
+        self.assertEqual(variables[0]["comments"], c.HAZARD_RECENT_COMMENTS)
+        self.assertTrue(variables[0]["withComments"])
+        self.assertEqual(variables[1]["after"], "cursor1")
+
+        # Hazards fetched in the batch are looked up without another request
+        self.assertEqual(gc.hazard(1)["comments"], d.HAZARD["comments"])
+        self.assertEqual(mock_post.call_count, 2)
+
+    # @tag("run")
+    @patch("app.functions.github_client.GithubClient.post")
+    def test_hazards_full_no_comments(self, mock_post):
+        mock_post.side_effect = [
+            graphql_response(d.HAZARDS_FULL_GRAPHQL[1]),
+            graphql_response(d.HAZARD_GRAPHQL_NOT_FOUND),
+        ]
+
+        gc = GitController(**d.git_contoller_args)
         self.assertEqual(
-            calls_get_user[0].args[0],
-            d.git_contoller_args["github_organisation"],
+            list(gc.hazards_full("all", comments=0)), d.HAZARDS_FULL[1:]
         )
+        variables = mock_post.call_args[1]["json"]["variables"]
+        self.assertIsNone(variables["states"])
+        self.assertFalse(variables["withComments"])
 
-        mock_repo_instance.get_repos.assert_called_once()
-        calls_repos = mock_github_instance.get_repos.call_args_list
-        self.assertEqual(calls_repos, [])
+        # Not cached, as the comments were not fetched
+        self.assertIs(gc.hazard(2), HazardLookup.NOT_FOUND)
 
-    @tag("git")
-    def test_create_repo(self):
-        gc = GitController(env_location=c.TESTING_ENV_PATH_GIT)
-        if gc.current_repo_on_github(
-            d.git_contoller_args["github_organisation"], d.REPO_NAME_NEW
-        ):
-            gc.delete_repo(
-                d.git_contoller_args["github_organisation"], d.REPO_NAME_NEW
-            )
+    def test_hazards_full_bad_arguments(self):
+        gc = GitController(**d.git_contoller_args)
+        with self.assertRaises(ValueError):
+            list(gc.hazards_full("pending"))
+        with self.assertRaises(ValueError):
+            list(gc.hazards_full(comments=101))
 
-        self.assertFalse(
-            gc.current_repo_on_github(
-                d.git_contoller_args["github_organisation"], d.REPO_NAME_NEW
-            )
+    # @tag("run")
+    @patch("app.functions.github_client.GithubClient.post")
+    def test_hazards_full_repo_bad(self, mock_post):
+        mock_post.return_value = graphql_response(d.HAZARD_GRAPHQL_REPO_BAD)
+
+        gc = GitController(**d.git_contoller_args)
+        with self.assertRaises(ValueError) as error:
+            list(gc.hazards_full())
+        self.assertEqual(
+            str(error.exception),
+            f"Error with accessing repo '{ d.CHECK_CREDENTIALS_REPO_CALL }', return value 'Could not resolve to a Repository'",
         )
 
-        gc.create_repo(
-            d.git_contoller_args["github_organisation"], d.REPO_NAME_NEW
+    # @tag("run")
+    @patch("app.functions.github_client.GithubClient.post")
+    def test_clear_hazard_cache_filtered(self, mock_post):
+        mock_post.return_value = graphql_response(d.HAZARD_GRAPHQL)
+        gc = GitController(**d.git_contoller_args)
+        gc.hazard(1)
+        gc.hazard(2)
+
+        clear_hazard_cache("another_org/a_repo")
+        clear_hazard_cache(d.CHECK_CREDENTIALS_REPO_CALL.upper(), 2)
+        gc.hazard(1)
+        self.assertEqual(mock_post.call_count, 2)
+        gc.hazard(2)
+        self.assertEqual(mock_post.call_count, 3)
+
+    def test_github_client_shared(self):
+        self.assertIs(
+            GitController(**d.git_contoller_args).client(),
+            GitController(**d.git_contoller_args).client(),
         )
+
+    def test_create_repo(self):
+        self.start_fake_github()
+        organisation = d.git_contoller_args["github_organisation"]
+
+        self.assertTrue(self.gc.create_repo(organisation, d.REPO_NAME_NEW))
         self.assertTrue(
-            gc.current_repo_on_github(
-                d.git_contoller_args["github_organisation"], d.REPO_NAME_NEW
-            )
+            self.gc.current_repo_on_github(organisation, d.REPO_NAME_NEW)
+        )
+        self.assertFalse(self.gc.create_repo(organisation, d.REPO_NAME_NEW))
+        self.assertIn(
+            f"{ organisation }/{ d.REPO_NAME_NEW }", self.github.repos
         )
 
-    @tag("git")
     def test_create_repo_organisation_bad(self):
-        gc = GitController(env_location=c.TESTING_ENV_PATH_GIT)
+        self.start_fake_github()
         with self.assertRaises(ValueError) as error:
-            gc.create_repo(d.ORGANISATION_NAME_BAD, d.REPO_NAME_NEW)
+            self.gc.create_repo(d.ORGANISATION_NAME_BAD, d.REPO_NAME_NEW)
         self.assertEqual(
             str(error.exception),
             f"Error with getting user / organisastion '{ d.ORGANISATION_NAME_BAD }', returned - 'Not Found'",
         )
 
-    @tag("git")
     def test_delete_repo(self):
-        gc = GitController(env_location=c.TESTING_ENV_PATH_GIT)
-        if not gc.current_repo_on_github(
-            d.git_contoller_args["github_organisation"], d.REPO_NAME_NEW
-        ):
-            gc.create_repo(
-                d.git_contoller_args["github_organisation"], d.REPO_NAME_NEW
-            )
+        self.start_fake_github()
+        organisation = d.git_contoller_args["github_organisation"]
+        self.github.add_repo(organisation, d.REPO_NAME_NEW)
 
         self.assertTrue(
-            gc.current_repo_on_github(
-                d.git_contoller_args["github_organisation"], d.REPO_NAME_NEW
-            )
-        )
-
-        gc.delete_repo(
-            d.git_contoller_args["github_organisation"], d.REPO_NAME_NEW
+            self.gc.current_repo_on_github(organisation, d.REPO_NAME_NEW)
         )
-
+        self.assertTrue(self.gc.delete_repo(organisation, d.REPO_NAME_NEW))
         self.assertFalse(
-            gc.current_repo_on_github(
-                d.git_contoller_args["github_organisation"], d.REPO_NAME_NEW
-            )
+            self.gc.current_repo_on_github(organisation, d.REPO_NAME_NEW)
+        )
+        self.assertFalse(self.gc.delete_repo(organisation, d.REPO_NAME_NEW))
+        self.assertNotIn(
+            f"{ organisation }/{ d.REPO_NAME_NEW }", self.github.repos
         )
 
-    # TODO #21 - needs testing of test_commit_and_push
     def test_commit_and_push(self):
-        pass
+        with local_remote() as (origin, clone):
+            gc = GitController(
+                **d.git_contoller_args | {"repo_path_local": clone}
+            )
+            events = []
+            write_doc(clone, "hazard.md")
+
+            outcome = gc.commit_and_push(
+                "Add a hazard", progress=events.append
+            )
+
+            self.assertEqual(outcome["status"], PushStatus.PUSHED.value)
+            self.assertEqual(
+                outcome["files"], [f"{ c.GIT_MANAGED_PATHS[0] }hazard.md"]
+            )
+            self.assertEqual(
+                outcome["commit"], Repo(origin).heads.main.commit.hexsha
+            )
+            self.assertEqual(
+                Repo(origin).heads.main.commit.message, "Add a hazard\n"
+            )
+            for event in events:
+                self.assertEqual(
+                    set(event), {"stage", "current", "total", "message"}
+                )
 
     def test_commit_and_push_already_committed(self):
-        pass
+        with local_remote() as (_, clone):
+            gc = GitController(
+                **d.git_contoller_args | {"repo_path_local": clone}
+            )
 
-    @tag("git")
-    def test_hazard_log(self):
-        gc = GitController(
-            github_repo=d.REPO_NAME_CURRENT,
-            env_location=c.TESTING_ENV_PATH_GIT,
+            outcome = gc.commit_and_push("Nothing changed")
+
+            self.assertEqual(
+                outcome["status"], PushStatus.NOTHING_TO_COMMIT.value
+            )
+            self.assertIsNone(outcome["commit"])
+            self.assertEqual(outcome["files"], [])
+
+    def test_commit_and_push_only_managed_paths(self):
+        with local_remote() as (origin, clone):
+            gc = GitController(
+                **d.git_contoller_args | {"repo_path_local": clone}
+            )
+            repo = Repo(clone)
+            write_doc(clone, "hazard.md")
+            with open(os.path.join(clone, "staged.css"), "w") as file:
+                file.write("body {}\n")
+            repo.git.add("staged.css")
+            with open(os.path.join(clone, "untracked.js"), "w") as file:
+                file.write("// Not a document\n")
+
+            outcome = gc.commit_and_push("Add a hazard")
+
+            self.assertEqual(outcome["status"], PushStatus.PUSHED.value)
+            self.assertEqual(
+                [item.path for item in Repo(origin).heads.main.commit.tree],
+                ["README.md", c.GIT_MANAGED_PATHS[0].split("/")[0]],
+            )
+            self.assertEqual(
+                [item.a_path for item in repo.index.diff("HEAD")],
+                ["staged.css"],
+            )
+            self.assertEqual(repo.untracked_files, ["untracked.js"])
+
+    def test_commit_and_push_nothing_managed_changed(self):
+        with local_remote() as (_, clone):
+            gc = GitController(
+                **d.git_contoller_args | {"repo_path_local": clone}
+            )
+            with open(os.path.join(clone, "untracked.js"), "w") as file:
+                file.write("// Not a document\n")
+
+            outcome = gc.commit_and_push("Nothing changed")
+
+            self.assertEqual(
+                outcome["status"], PushStatus.NOTHING_TO_COMMIT.value
+            )
+            self.assertEqual(Repo(clone).untracked_files, ["untracked.js"])
+
+    def test_commit_and_push_unpushed_commit(self):
+        with local_remote() as (origin, clone):
+            gc = GitController(
+                **d.git_contoller_args | {"repo_path_local": clone}
+            )
+            repo = Repo(clone)
+            write_doc(clone, "hazard.md")
+            repo.git.add("--all")
+            repo.git.commit("-m", "Push failed")
+
+            outcome = gc.commit_and_push("Nothing changed")
+
+            self.assertEqual(outcome["status"], PushStatus.PUSHED.value)
+            self.assertEqual(outcome["files"], [])
+            self.assertEqual(
+                outcome["commit"], Repo(origin).heads.main.commit.hexsha
+            )
+            self.assertEqual(
+                gc.commit_and_push("Nothing changed")["status"],
+                PushStatus.NOTHING_TO_COMMIT.value,
+            )
+
+    def test_commit_and_push_commit_failed(self):
+        with local_remote() as (origin, clone):
+            gc = GitController(
+                **d.git_contoller_args | {"repo_path_local": clone}
+            )
+            hook = os.path.join(clone, ".git", "hooks", "pre-commit")
+            with open(hook, "w") as file:
+                file.write("#!/bin/sh\necho 'Hook failed' >&2\nexit 1\n")
+            os.chmod(hook, 0o755)
+            write_doc(clone, "hazard.md")
+
+            outcome = gc.commit_and_push("Add a hazard")
+
+            self.assertEqual(outcome["status"], PushStatus.FAILED.value)
+            self.assertIn("Hook failed", outcome["summary"])
+            self.assertEqual(len(list(Repo(origin).iter_commits("main"))), 1)
+
+    @patch("app.functions.git_control.Repo")
+    def test_commit_and_push_status_only(self, mock_repo):
+        git = mock_repo.return_value.git
+        git.status.return_value = ""
+        gc = GitController(**d.git_contoller_args)
+
+        outcome = gc.commit_and_push("Nothing changed")
+
+        self.assertEqual(outcome["status"], PushStatus.NOTHING_TO_COMMIT.value)
+        git.status.assert_called_once_with(
+            "--porcelain=v1",
+            "-z",
+            "--untracked-files=all",
+            "--",
+            *c.GIT_MANAGED_PATHS,
         )
-        gc.hazard_log("title", "body", ["hazard"])
-        # TODO - should really check hazard was created
-        close_all_issues()
+        git.add.assert_not_called()
+        git.commit.assert_not_called()
+
+    def test_commit_and_push_locked(self):
+        with local_remote() as (origin, clone):
+            gc = GitController(
+                **d.git_contoller_args | {"repo_path_local": clone}
+            )
+            write_doc(clone, "hazard.md")
+            outcomes = []
+            thread = threading.Thread(
+                target=lambda: outcomes.append(
+                    gc.commit_and_push("Add a hazard")
+                )
+            )
+
+            with file_lock(os.path.join(clone, ".git")):
+                thread.start()
+                thread.join(0.5)
+                self.assertTrue(thread.is_alive())
+                self.assertEqual(len(list(Repo(clone).iter_commits())), 1)
+
+            thread.join(10)
+            self.assertEqual(outcomes[0]["status"], PushStatus.PUSHED.value)
+
+    def test_commit_and_push_changed_files(self):
+        with local_remote() as (_, clone):
+            gc = GitController(
+                **d.git_contoller_args | {"repo_path_local": clone}
+            )
+            write_doc(clone, "hazard.md")
+            write_doc(clone, "old.md")
+            gc.commit_and_push("Add hazards")
+            os.remove(os.path.join(clone, c.GIT_MANAGED_PATHS[0], "old.md"))
+            write_doc(clone, "hazard.md", "# A changed hazard\n")
+            write_doc(clone, "new/hazard.md")
+
+            outcome = gc.commit_and_push("Change hazards")
+
+            self.assertEqual(outcome["status"], PushStatus.PUSHED.value)
+            self.assertEqual(
+                outcome["files"],
+                [
+                    f"{ c.GIT_MANAGED_PATHS[0] }hazard.md",
+                    f"{ c.GIT_MANAGED_PATHS[0] }new/hazard.md",
+                    f"{ c.GIT_MANAGED_PATHS[0] }old.md",
+                ],
+            )
+            self.assertFalse(Repo(clone).is_dirty(untracked_files=True))
+
+    def test_commit_and_push_rejected(self):
+        with local_remote() as (origin, clone):
+            other = os.path.join(os.path.dirname(clone), "other")
+            other_repo = Repo.clone_from(origin, other)
+            with other_repo.config_writer() as writer:
+                writer.set_value("user", "name", "Jane")
+                writer.set_value("user", "email", "jane@domain.com")
+            with open(os.path.join(other, "other.md"), "w") as file:
+                file.write("# Another change\n")
+            other_repo.git.add("--all")
+            other_repo.git.commit("-m", "Another change")
+            other_repo.git.push("origin", "main")
+
+            gc = GitController(
+                **d.git_contoller_args | {"repo_path_local": clone}
+            )
+            write_doc(clone, "hazard.md")
+
+            outcome = gc.commit_and_push("Add a hazard")
+
+            self.assertEqual(outcome["status"], PushStatus.REJECTED.value)
+            self.assertIsNotNone(outcome["commit"])
+
+    def test_commit_and_push_identity(self):
+        with local_remote(identity=False) as (_, clone):
+            gc = GitController(
+                **d.git_contoller_args | {"repo_path_local": clone}
+            )
+            write_doc(clone, "hazard.md")
+
+            gc.commit_and_push("Add a hazard")
+
+            commit = Repo(clone).head.commit
+            self.assertEqual(
+                commit.author.name, d.git_contoller_args["github_username"]
+            )
+            self.assertEqual(
+                commit.committer.email, d.git_contoller_args["email"]
+            )
+            self.assertNotIn(
+                "user", Repo(clone).config_reader("repository").sections()
+            )
+
+    def test_credential_helper(self):
+        gc = GitController(**d.git_contoller_args)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filled = subprocess.run(  # nosec B603, B607
+                ["git", "credential", "fill"],
+                input="protocol=https\nhost=github.com\n\n",
+                capture_output=True,
+                text=True,
+                cwd=temp_dir,
+                env=os.environ | gc._credential_environment(),
+                timeout=10,
+            )
+
+        self.assertIn(
+            f"username={ d.git_contoller_args['github_username'] }",
+            filled.stdout,
+        )
+        self.assertIn(
+            f"password={ d.git_contoller_args['github_token'] }",
+            filled.stdout,
+        )
+
+    def test_hazard_log(self):
+        self.start_fake_github()
+        number = self.gc.hazard_log("title", "body", ["hazard"])
+
+        self.assertEqual(number, 1)
+        self.assertEqual(self.github.issue(self.repo, 1)["title"], "title")
 
-    @tag("git")
     def test_hazard_log_label_bad(self):
         gc = GitController(
             github_repo=d.REPO_NAME_CURRENT,
@@ -546,29 +1204,24 @@ class GitControllerTest(TestCase):
             f"'{ d.LABEL_NAME_BAD}' is not a valid hazard label. Please review label.yml for available values.",
         )
 
-    @tag("git")
     def test_hazard_log_repo_bad(self):
+        self.start_fake_github()
         gc = GitController(
-            github_repo=d.REPO_BAD_NAME,
-            env_location=c.TESTING_ENV_PATH_GIT,
+            **d.git_contoller_args | {"github_repo": d.REPO_BAD_NAME}
         )
         with self.assertRaises(ValueError) as error:
             gc.hazard_log("title", "body", ["hazard"])
-
-        dot_values = dotenv_values(c.TESTING_ENV_PATH_GIT)
         self.assertEqual(
             str(error.exception),
-            f"Error with accessing repo '{ dot_values.get(c.EnvKeysPH.GITHUB_ORGANISATION.value) }/{ d.REPO_BAD_NAME }', return value 'Not Found'",
+            f"Error with accessing repo '{ d.git_contoller_args['github_organisation'] }/{ d.REPO_BAD_NAME }', return value 'Not Found'",
         )
 
-    @tag("git")
     def test_available_hazard_labels_full(self):
         gc = GitController(env_location=c.TESTING_ENV_PATH_GIT)
         self.assertEqual(
             gc.available_hazard_labels(), d.AVAILABLE_HAZARD_LABELS_FULL
         )
 
-    @tag("git")
     def test_available_hazard_labels_name_only(self):
         gc = GitController(env_location=c.TESTING_ENV_PATH_GIT)
         self.assertEqual(
@@ -576,7 +1229,6 @@ class GitControllerTest(TestCase):
             d.AVAILABLE_HAZARD_LABELS_NAME_ONLY,
         )
 
-    @tag("git")
     def test_available_hazard_labels_details_wrong(self):
         gc = GitController(env_location=c.TESTING_ENV_PATH_GIT)
         with self.assertRaises(ValueError) as error:
@@ -614,36 +1266,36 @@ class GitControllerTest(TestCase):
         gc = GitController(env_location=c.TESTING_ENV_PATH_GIT)
         self.assertFalse(gc.verify_hazard_label("hazard2"))
 
-    @tag("git")
     def test_hazards_open(self):
-        gc = GitController(
-            github_repo=d.REPO_NAME_CURRENT,
-            env_location=c.TESTING_ENV_PATH_GIT,
-        )
-        gc.hazard_log("title", "body", ["hazard"])
+        self.start_fake_github()
+        self.gc.hazard_log("title", "body", ["hazard"])
+        self.github.add_issue(self.repo, "Closed", state="closed")
 
-        open_hazard = gc.hazards_open()[0]
-        self.assertTrue(open_hazard["title"], "title")
-        self.assertTrue(open_hazard["body"], "body")
-        self.assertTrue(open_hazard["labels"], {"hazard"})
-        close_all_issues()
+        self.assertEqual(
+            self.gc.hazards_open(),
+            [
+                {
+                    "number": 1,
+                    "title": "title",
+                    "body": "body",
+                    "labels": ["hazard"],
+                }
+            ],
+        )
 
-    @tag("git")
     def test_hazards_open_repo_bad(self):
+        self.start_fake_github()
         gc = GitController(
-            github_repo=d.REPO_BAD_NAME,
-            env_location=c.TESTING_ENV_PATH_GIT,
+            **d.git_contoller_args | {"github_repo": d.REPO_BAD_NAME}
         )
 
         with self.assertRaises(ValueError) as error:
-            gc.hazard_log("title", "body", ["hazard"])
+            gc.hazards_open()
 
-        dot_values = dotenv_values(c.TESTING_ENV_PATH_GIT)
         self.assertEqual(
             str(error.exception),
-            f"Error with accessing repo '{ dot_values.get(c.EnvKeysPH.GITHUB_ORGANISATION.value) }/{ d.REPO_BAD_NAME }', return value 'Not Found'",
+            f"Error with accessing repo '{ d.git_contoller_args['github_organisation'] }/{ d.REPO_BAD_NAME }', return value 'Not Found'",
         )
-        close_all_issues()
 
     def test_repo_domain_name(self):
         gc = GitController(
@@ -654,19 +1306,25 @@ class GitControllerTest(TestCase):
             gc.repo_domain_name(), d.git_contoller_args["github_organisation"]
         )
 
-    @tag("git")
     def test_add_comment_to_hazard(self):
-        gc = GitController(
-            github_repo=d.REPO_NAME_CURRENT,
-            env_location=c.TESTING_ENV_PATH_GIT,
-        )
-        gc.hazard_log("title", "body", ["hazard"])
+        self.start_fake_github()
+        number = self.gc.hazard_log("title", "body", ["hazard"])
+        self.gc.hazard(number)
 
-        hazard_number = gc.hazards_open()[0]["number"]
-        gc.add_comment_to_hazard(
-            hazard_number=hazard_number, comment="a comment"
+        self.gc.add_comment_to_hazard(number, "a comment")
+
+        self.assertEqual(
+            self.gc.hazard(number)["comments"],
+            [
+                {
+                    "author": d.git_contoller_args["github_username"],
+                    "body": "a comment",
+                    "created_at": self.github.issue(self.repo, number)[
+                        "comments"
+                    ][0]["created_at"],
+                }
+            ],
         )
-        close_all_issues()
 
     def test_add_comment_to_hazard_number_missing(self):
         gc = GitController(
@@ -688,6 +1346,180 @@ class GitControllerTest(TestCase):
             gc.add_comment_to_hazard(hazard_number=1)
         self.assertEqual(str(error.exception), "No comment has been provided")
 
+    def test_check_github_credentials_fake_github(self):
+        self.start_fake_github()
+        self.assertEqual(
+            self.gc.check_github_credentials(),
+            {
+                "github_username_exists": True,
+                "github_organisation_exists": True,
+                "repo_exists": True,
+                "permission": "admin",
+            },
+        )
+
+    def test_check_github_credentials_repo_missing(self):
+        self.start_fake_github()
+        gc = GitController(
+            **d.git_contoller_args | {"github_repo": d.REPO_BAD_NAME}
+        )
+        self.assertEqual(
+            gc.check_github_credentials(),
+            {
+                "github_username_exists": True,
+                "github_organisation_exists": True,
+                "repo_exists": False,
+                "permission": None,
+            },
+        )
+
+    def test_check_github_credentials_concurrent_fake_github(self):
+        self.start_fake_github()
+        self.github.latency = 0.3
+        start = t.monotonic()
+        self.gc.check_github_credentials()
+
+        # Three checks at once, then the permission
+        self.assertLess(t.monotonic() - start, 0.9)
+        self.assertEqual(self.github.calls(), 4)
+
+    def test_token_bad(self):
+        self.start_fake_github()
+        gc = GitController(
+            **d.git_contoller_args | {"github_token": "not_the_token"}
+        )
+        with self.assertRaises(ValueError) as error:
+            gc.username_exists()
+        self.assertEqual(
+            str(error.exception),
+            "Error with Github username checking. Returned value of: 401",
+        )
+
+    @patch("app.functions.constants.GITHUB_PER_PAGE", 10)
+    def test_get_repos_paged(self):
+        self.start_fake_github()
+        for n in range(24):
+            self.github.add_repo(
+                d.git_contoller_args["github_organisation"],
+                f"repo-{ str(n).zfill(2) }",
+            )
+
+        repos = list(
+            self.gc.get_repos(d.git_contoller_args["github_organisation"])
+        )
+
+        self.assertEqual(len(repos), 25)
+        self.assertEqual(repos[0], d.git_contoller_args["github_repo"])
+        self.assertEqual(
+            self.github.calls(
+                "GET",
+                f"/users/{ d.git_contoller_args['github_organisation'] }/repos",
+            ),
+            3,
+        )
+
+    def test_hazard_log_scheduled(self):
+        self.start_fake_github()
+        identity = requests.Request(
+            "POST",
+            f"{ c.GITHUB_API_URL }/repos/{ self.repo }/issues",
+            auth=(
+                d.git_contoller_args["github_username"],
+                d.git_contoller_args["github_token"],
+            ),
+        ).prepare()
+
+        number = self.gc.hazard_log("title", "body", ["hazard"])
+        self.gc.add_comment_to_hazard(number, "a comment")
+        self.assertEqual(
+            self.scheduler.budget(identity)["remaining"],
+            self.github.rate_limit - self.github.calls(),
+        )
+
+        for _ in range(c.GITHUB_BREAKER_FAILURES):
+            self.scheduler.breaker.record_failure()
+        calls = self.github.calls()
+        with self.assertRaises(GithubUnavailable):
+            self.gc.hazard_log("title", "body", ["hazard"])
+        self.assertEqual(self.github.calls(), calls)
+
+    def test_hazard_not_found_fake_github(self):
+        self.start_fake_github()
+        self.assertEqual(self.gc.hazard(99), HazardLookup.NOT_FOUND)
+
+    def test_hazards_updated_fake_github(self):
+        self.start_fake_github()
+        for title in ("First", "Second", "Third"):
+            self.github.add_issue(self.repo, title)
+        self.github.add_issue(self.repo, "A pull request", pull_request=True)
+        self.github.add_comment(self.repo, 1, "Updates the first")
+
+        hazards = list(
+            self.gc.hazards_updated(
+                datetime.fromisoformat(
+                    self.github.issue(self.repo, 2)["updated_at"]
+                )
+            )
+        )
+
+        self.assertEqual(
+            [hazard["title"] for hazard in hazards],
+            ["Second", "Third", "First"],
+        )
+
+    @patch("app.functions.constants.GITHUB_PER_PAGE", 2)
+    def test_hazards_full_paged(self):
+        self.start_fake_github()
+        for n in range(5):
+            self.github.add_issue(
+                self.repo, f"Hazard { n }", labels=["hazard"]
+            )
+        self.github.add_issue(self.repo, "Closed", state="closed")
+        self.github.add_issue(self.repo, "A pull request", pull_request=True)
+        self.github.add_comment(self.repo, 3, "A comment", "jane")
+
+        hazards = list(self.gc.hazards_full())
+
+        self.assertEqual(
+            [hazard["number"] for hazard in hazards], [1, 2, 3, 4, 5]
+        )
+        self.assertEqual(hazards[2]["comment_count"], 1)
+        self.assertEqual(hazards[2]["comments"][0]["author"], "jane")
+        self.assertEqual(self.github.calls("POST", "/graphql"), 3)
+
+    def test_rate_limit(self):
+        self.start_fake_github()
+        self.github.rate_limit = 2
+        self.gc.username_exists()
+        self.gc.hazards_open()
+
+        # Budget used up, so answered from the cache or not at all
+        self.assertTrue(self.gc.username_exists())
+        with self.assertRaises(GithubUnavailable):
+            list(self.gc.get_repos(d.git_contoller_args["github_username"]))
+
+        # Sent as the organisation, but with the same token and budget
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.gc.repo_exists()
+        self.assertEqual(self.github.calls(), 2)
+
+    def test_rate_limit_headers(self):
+        self.start_fake_github()
+        self.gc.username_exists()
+
+        budget = self.scheduler.budget(
+            requests.Request(
+                "GET",
+                f"{ c.GITHUB_API_URL }/users/{ d.git_contoller_args['github_username'] }",
+                auth=(
+                    d.git_contoller_args["github_username"],
+                    d.git_contoller_args["github_token"],
+                ),
+            ).prepare()
+        )
+        self.assertEqual(budget["limit"], 5000)
+        self.assertEqual(budget["remaining"], 4999)
+
     @classmethod
     def tearDownClass(cls):
         # gc = GitController(env_location=c.TESTING_ENV_PATH_GIT)
@@ -698,3 +1530,305 @@ class GitControllerTest(TestCase):
 
         # close_all_issues()
         pass
+
+
+def github_app(statuses, delay=0):
+    """Stand in for the GitHub API, for the async controller
+
+    Args:
+        statuses: status code to reply with for each path.
+        delay: seconds to wait before replying.
+    """
+    app = web.Application()
+    app["requests"] = []
+
+    async def reply(request):
+        body = await request.json() if request.can_read_body else None
+        app["requests"].append((request.method, request.path, body))
+        await asyncio.sleep(delay)
+        status = statuses.get(request.path, 404)
+        if request.path == "/graphql":
+            return web.json_response(d.HAZARD_GRAPHQL, status=status)
+        if request.path.endswith("/permission"):
+            return web.json_response({"permission": "admin"}, status=status)
+        if request.method == "POST" and status == 201:
+            return web.json_response({"number": 5}, status=status)
+        return web.json_response({"message": "Not Found"}, status=status)
+
+    app.router.add_route("*", "/{path:.*}", reply)
+    return app
+
+
+class AsyncGitControllerTest(IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not os.path.isfile(c.ENV_PATH_PLACEHOLDERS):
+            open(c.ENV_PATH_PLACEHOLDERS, "w").close()
+
+    def setUp(self):
+        clear_hazard_cache()
+        patcher = patch(
+            "app.functions.git_control.github_scheduler",
+            return_value=RateLimitScheduler(
+                retries=0, breaker=CircuitBreaker(failures=2)
+            ),
+        )
+        self.mock_scheduler = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.gc = AsyncGitController(**d.git_contoller_args)
+
+    def tearDown(self):
+        clear_hazard_cache()
+
+    def start_fake_github(self):
+        """Points the controller at a stand in GitHub API with latency"""
+        context = fake_github(latency=0.2)
+        self.github = context.__enter__()
+        self.addCleanup(context.__exit__, None, None, None)
+        self.github.add_user(d.git_contoller_args["github_username"])
+        self.github.add_repo(
+            d.git_contoller_args["github_organisation"],
+            d.git_contoller_args["github_repo"],
+            collaborators={d.git_contoller_args["github_username"]: "write"},
+        )
+        self.addAsyncCleanup(self.gc.close)
+        return
+
+    async def serve(self, statuses, delay=0):
+        """Starts a stand in GitHub API and points the controller at it"""
+        app = github_app(statuses, delay)
+        server = TestServer(app)
+        await server.start_server()
+        self.addAsyncCleanup(server.close)
+        self.addAsyncCleanup(self.gc.close)
+        url = str(server.make_url("")).rstrip("/")
+        for name, value in (
+            ("GITHUB_API_URL", url),
+            ("GITHUB_GRAPHQL_URL", f"{ url }/graphql"),
+        ):
+            patcher = patch(f"app.functions.constants.{ name }", value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        return app
+
+    async def test_check_github_credentials(self):
+        app = await self.serve(
+            {
+                "/users/Bob": 200,
+                "/users/org": 200,
+                "/repos/org/a_repo": 200,
+                "/repos/org/a_repo/collaborators/Bob/permission": 200,
+            },
+            delay=0.2,
+        )
+
+        start = t.monotonic()
+        self.assertEqual(
+            await self.gc.check_github_credentials(),
+            d.CREDENTIALS_CHECK_REPO_EXISTS,
+        )
+        # The three checks run at the same time, then the permission
+        self.assertLess(t.monotonic() - start, 0.7)
+        self.assertCountEqual(
+            [path for _, path, _ in app["requests"]],
+            [
+                "/users/Bob",
+                "/users/org",
+                "/repos/org/a_repo",
+                "/repos/org/a_repo/collaborators/Bob/permission",
+            ],
+        )
+
+    async def test_check_github_credentials_repo_missing(self):
+        await self.serve({"/users/Bob": 200, "/users/org": 404})
+
+        self.assertEqual(
+            await self.gc.check_github_credentials(),
+            {
+                "github_username_exists": True,
+                "github_organisation_exists": False,
+                "repo_exists": False,
+                "permission": None,
+            },
+        )
+
+    async def test_check_github_credentials_permission_bad(self):
+        await self.serve(
+            {
+                "/users/Bob": 200,
+                "/users/org": 200,
+                "/repos/org/a_repo": 200,
+                "/repos/org/a_repo/collaborators/Bob/permission": 403,
+            }
+        )
+
+        with self.assertRaises(ValueError) as error:
+            await self.gc.check_github_credentials()
+        self.assertEqual(
+            str(error.exception),
+            "Error with Github permission checking. Returned value of: 403",
+        )
+
+    async def test_check_github_credentials_status_bad(self):
+        await self.serve({"/users/Bob": 500, "/users/org": 200})
+
+        with self.assertRaises(ValueError) as error:
+            await self.gc.check_github_credentials()
+        self.assertEqual(
+            str(error.exception),
+            "Error with Github username checking. Returned value of: 500",
+        )
+
+    async def test_check_github_credentials_deadline(self):
+        await self.serve({"/users/Bob": 200}, delay=1)
+
+        with self.assertRaises(requests.exceptions.Timeout) as error:
+            await self.gc.check_github_credentials(deadline=0.1)
+        self.assertEqual(
+            str(error.exception), "Timeout while connecting to GitHub API"
+        )
+
+    async def test_hazard(self):
+        app = await self.serve({"/graphql": 200})
+
+        self.assertEqual(await self.gc.hazard(1), d.HAZARD)
+        self.assertEqual(await self.gc.hazard(1), d.HAZARD)
+        self.assertEqual(len(app["requests"]), 1)
+        self.assertEqual(
+            app["requests"][0][2]["variables"],
+            {
+                "owner": "org",
+                "name": "a_repo",
+                "number": 1,
+                "comments": c.HAZARD_RECENT_COMMENTS,
+            },
+        )
+
+    async def test_hazard_status_bad(self):
+        await self.serve({"/graphql": 502})
+
+        with self.assertRaises(ValueError):
+            await self.gc.hazard(1)
+
+    async def test_hazard_log(self):
+        app = await self.serve({"/repos/org/a_repo/issues": 201})
+
+        self.assertEqual(
+            await self.gc.hazard_log("A title", "A body", ["hazard"]), 5
+        )
+        self.assertEqual(
+            app["requests"],
+            [
+                (
+                    "POST",
+                    "/repos/org/a_repo/issues",
+                    {
+                        "title": "A title",
+                        "body": "A body",
+                        "labels": ["hazard"],
+                    },
+                )
+            ],
+        )
+
+    async def test_hazard_log_label_bad(self):
+        with self.assertRaises(ValueError):
+            await self.gc.hazard_log("A title", "A body", ["not a label"])
+
+    async def test_hazard_log_repo_bad(self):
+        await self.serve({})
+
+        with self.assertRaises(ValueError) as error:
+            await self.gc.hazard_log("A title", "A body", ["hazard"])
+        self.assertEqual(
+            str(error.exception),
+            "Error with accessing repo 'org/a_repo', return value 'Not Found'",
+        )
+
+    async def test_add_comment_to_hazard(self):
+        app = await self.serve(
+            {"/graphql": 200, "/repos/org/a_repo/issues/1/comments": 201}
+        )
+
+        await self.gc.hazard(1)
+        await self.gc.add_comment_to_hazard(1, "A comment")
+        await self.gc.hazard(1)
+        self.assertEqual(
+            [(method, path) for method, path, _ in app["requests"]],
+            [
+                ("POST", "/graphql"),
+                ("POST", "/repos/org/a_repo/issues/1/comments"),
+                ("POST", "/graphql"),
+            ],
+        )
+
+    async def test_add_comment_to_hazard_comment_missing(self):
+        with self.assertRaises(ValueError) as error:
+            await self.gc.add_comment_to_hazard(hazard_number=1)
+        self.assertEqual(str(error.exception), "No comment has been provided")
+
+    async def test_no_connection(self):
+        await self.serve({})
+        await self.gc.close()
+        with patch(
+            "app.functions.constants.GITHUB_API_URL", "http://127.0.0.1:1"
+        ):
+            for _ in range(2):
+                with self.assertRaises(
+                    requests.exceptions.ConnectionError
+                ) as error:
+                    await self.gc.username_exists()
+                self.assertEqual(
+                    str(error.exception),
+                    "No connection available to GitHub API",
+                )
+
+            # Breaker now open, so GitHub is not called
+            with self.assertRaises(GithubUnavailable):
+                await self.gc.username_exists()
+
+    async def test_other_error_recorded(self):
+        await self.serve({"/users/Bob": 200})
+        with patch.object(
+            self.gc, "_client", side_effect=RuntimeError("Session closed")
+        ):
+            for _ in range(2):
+                with self.assertRaises(RuntimeError):
+                    await self.gc.username_exists()
+
+        with self.assertRaises(GithubUnavailable):
+            await self.gc.username_exists()
+
+    async def test_cancelled_recorded(self):
+        await self.serve({"/users/Bob": 200}, delay=1)
+        for _ in range(2):
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(self.gc.username_exists(), 0.1)
+
+        with self.assertRaises(GithubUnavailable):
+            await self.gc.username_exists()
+
+    async def test_check_github_credentials_fake_github(self):
+        self.start_fake_github()
+        start = t.monotonic()
+        credentials = await self.gc.check_github_credentials()
+
+        self.assertLess(t.monotonic() - start, 0.6)
+        self.assertEqual(
+            credentials,
+            {
+                "github_username_exists": True,
+                "github_organisation_exists": True,
+                "repo_exists": True,
+                "permission": "write",
+            },
+        )
+
+    async def test_hazard_log_and_comment(self):
+        self.start_fake_github()
+        number = await self.gc.hazard_log("title", "body", ["hazard"])
+        await self.gc.add_comment_to_hazard(number, "a comment")
+
+        hazard = await self.gc.hazard(number)
+        self.assertEqual(hazard["labels"], ["hazard"])
+        self.assertEqual(hazard["comments"][0]["body"], "a comment")
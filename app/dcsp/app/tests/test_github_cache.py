@@ -0,0 +1,238 @@
+"""Testing of github_cache.py
+
+"""
+
+from unittest import TestCase
+from unittest.mock import patch
+import sys
+import os
+import io
+import tempfile
+
+import requests
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+import app.functions.constants as c
+
+sys.path.append(c.FUNCTIONS_APP)
+from app.functions.github_cache import (
+    ConditionalCache,
+    ConditionalCacheAdapter,
+)
+from app.functions.github_scheduler import (
+    CircuitBreaker,
+    GithubUnavailable,
+    RateLimitScheduler,
+)
+
+
+URL = f"{ c.GITHUB_API_URL }/repos/an_org/a_repo/issues"
+
+
+def response(status_code, content=b"", headers=None):
+    """Raw response as returned by HTTPAdapter.send"""
+    result = Response()
+    result.status_code = status_code
+    result.headers = CaseInsensitiveDict(headers or {})
+    result._content = content
+    result._content_consumed = True
+    result.raw = io.BytesIO(content)
+    result.connection = None
+    return result
+
+
+def session(cache):
+    """Session that sends requests through the cache"""
+    result = requests.Session()
+    result.mount(
+        "https://", ConditionalCacheAdapter(cache, RateLimitScheduler())
+    )
+    return result
+
+
+class ConditionalCacheTest(TestCase):
+    def test_size_bad(self):
+        with self.assertRaises(ValueError):
+            ConditionalCache(0)
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_revalidated(self, mock_send):
+        cache = ConditionalCache()
+        mock_send.side_effect = [
+            response(
+                200,
+                b'[{"number": 1}]',
+                {"ETag": '"abc"', "Content-Type": "application/json"},
+            ),
+            response(
+                304, headers={"ETag": '"abc"', "X-RateLimit-Remaining": "10"}
+            ),
+        ]
+
+        with session(cache) as s:
+            first = s.get(URL, auth=("Bob", "a_token"))
+            second = s.get(URL, auth=("Bob", "a_token"))
+
+        self.assertNotIn(
+            "If-None-Match", mock_send.call_args_list[0][0][0].headers
+        )
+        self.assertEqual(
+            mock_send.call_args_list[1][0][0].headers["If-None-Match"], '"abc"'
+        )
+        self.assertEqual(first.json(), [{"number": 1}])
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json(), [{"number": 1}])
+        self.assertEqual(second.headers["X-RateLimit-Remaining"], "10")
+        self.assertEqual(second.headers["Content-Type"], "application/json")
+        self.assertEqual(second.headers[c.GITHUB_CACHE_HEADER], "revalidated")
+        self.assertNotIn(c.GITHUB_CACHE_HEADER, first.headers)
+        self.assertEqual(cache.hits, 1)
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_changed(self, mock_send):
+        cache = ConditionalCache()
+        mock_send.side_effect = [
+            response(200, b"[1]", {"ETag": '"abc"'}),
+            response(200, b"[2]", {"ETag": '"def"'}),
+            response(304, headers={"ETag": '"def"'}),
+        ]
+
+        with session(cache) as s:
+            s.get(URL)
+            self.assertEqual(s.get(URL).json(), [2])
+            self.assertEqual(s.get(URL).json(), [2])
+
+        self.assertEqual(
+            mock_send.call_args_list[2][0][0].headers["If-None-Match"], '"def"'
+        )
+        self.assertEqual(len(cache), 1)
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_credentials_part_of_key(self, mock_send):
+        cache = ConditionalCache()
+        mock_send.side_effect = [
+            response(200, b"[1]", {"ETag": '"abc"'}),
+            response(200, b"[2]", {"ETag": '"def"'}),
+        ]
+
+        with session(cache) as s:
+            s.get(URL, auth=("Bob", "a_token"))
+            s.get(URL, auth=("Jane", "another_token"))
+
+        self.assertNotIn(
+            "If-None-Match", mock_send.call_args_list[1][0][0].headers
+        )
+        self.assertEqual(len(cache), 2)
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_not_cached(self, mock_send):
+        cache = ConditionalCache()
+        mock_send.side_effect = [
+            response(200, b"[1]"),
+            response(404, b"{}", {"ETag": '"abc"'}),
+            response(201, b"{}", {"ETag": '"abc"'}),
+        ]
+
+        with session(cache) as s:
+            s.get(URL)
+            s.get(f"{ URL }/1")
+            s.post(URL, json={"title": "A hazard"})
+
+        self.assertEqual(len(cache), 0)
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_lru(self, mock_send):
+        cache = ConditionalCache(2)
+        mock_send.side_effect = [
+            response(200, b"[1]", {"ETag": '"1"'}),
+            response(200, b"[2]", {"ETag": '"2"'}),
+            response(304),
+            response(200, b"[3]", {"ETag": '"3"'}),
+            response(200, b"[2]", {"ETag": '"2"'}),
+        ]
+
+        with session(cache) as s:
+            s.get(f"{ URL }/1")
+            s.get(f"{ URL }/2")
+            s.get(f"{ URL }/1")
+            s.get(f"{ URL }/3")
+            s.get(f"{ URL }/2")
+
+        self.assertEqual(
+            mock_send.call_args_list[2][0][0].headers["If-None-Match"], '"1"'
+        )
+        self.assertNotIn(
+            "If-None-Match", mock_send.call_args_list[4][0][0].headers
+        )
+        self.assertEqual(len(cache), 2)
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_persisted(self, mock_send):
+        mock_send.side_effect = [
+            response(200, b"[1]", {"ETag": '"abc"'}),
+            response(304),
+        ]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "github_cache.json")
+            with session(ConditionalCache(path=path)) as s:
+                s.get(URL)
+
+            cache = ConditionalCache(path=path)
+            self.assertEqual(len(cache), 1)
+            with session(cache) as s:
+                self.assertEqual(s.get(URL).json(), [1])
+
+            cache.clear()
+            self.assertEqual(len(ConditionalCache(path=path)), 0)
+
+    def test_persisted_unreadable(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "github_cache.json")
+            with open(path, "w") as file:
+                file.write("not json")
+
+            self.assertEqual(len(ConditionalCache(path=path)), 0)
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_stale_when_unavailable(self, mock_send):
+        cache = ConditionalCache()
+        scheduler = RateLimitScheduler(
+            retries=0, breaker=CircuitBreaker(failures=1)
+        )
+        mock_send.side_effect = [
+            response(200, b"[1]", {"ETag": '"abc"'}),
+            requests.exceptions.ConnectionError(),
+        ]
+
+        with requests.Session() as s:
+            s.mount("https://", ConditionalCacheAdapter(cache, scheduler))
+            s.get(URL)
+            stale = s.get(URL)
+            self.assertEqual(stale.json(), [1])
+            self.assertEqual(stale.headers[c.GITHUB_CACHE_HEADER], "stale")
+
+            # Breaker now open, so GitHub is not called
+            self.assertEqual(s.get(URL).json(), [1])
+            with self.assertRaises(GithubUnavailable):
+                s.get(f"{ URL }/1")
+
+        self.assertEqual(mock_send.call_count, 2)
+        self.assertEqual(cache.hits, 2)
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_stale_on_server_error(self, mock_send):
+        cache = ConditionalCache()
+        mock_send.side_effect = [
+            response(200, b"[1]", {"ETag": '"abc"'}),
+            response(500, b"{}"),
+        ]
+
+        with session(cache) as s:
+            s.get(URL)
+            stale = s.get(URL)
+
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(stale.json(), [1])
+        self.assertEqual(stale.headers[c.GITHUB_CACHE_HEADER], "stale")
@@ -0,0 +1,105 @@
+"""Testing of github_client.py
+
+"""
+
+from unittest import TestCase
+from unittest.mock import Mock, patch
+import sys
+
+import requests
+
+import app.functions.constants as c
+
+sys.path.append(c.FUNCTIONS_APP)
+from app.functions.github_client import (
+    GithubClient,
+    github_client,
+    close_clients,
+)
+from app.functions.github_scheduler import RateLimitScheduler
+
+
+class GithubClientTest(TestCase):
+    def setUp(self):
+        close_clients()
+
+    def tearDown(self):
+        close_clients()
+
+    def test_pool_size(self):
+        client = GithubClient("Bob", "a_token", pool_size=3)
+        adapter = client.session.get_adapter(f"{ c.GITHUB_API_URL }/users")
+        self.assertEqual(adapter._pool_maxsize, 3)
+        client.close()
+
+    def test_pool_size_bad(self):
+        with self.assertRaises(ValueError):
+            GithubClient("Bob", "a_token", pool_size=0)
+
+    @patch("app.functions.github_client.Github")
+    def test_github_pool_size(self, mock_github):
+        client = GithubClient("Bob", "a_token", pool_size=3)
+        mock_github.assert_not_called()
+        self.assertIs(client.github, client.github)
+        mock_github.assert_called_once_with(
+            "Bob", "a_token", base_url=c.GITHUB_API_URL, pool_size=3
+        )
+
+    def test_get(self):
+        client = GithubClient("Bob", "a_token")
+        client.session.get = Mock(return_value=Mock(status_code=200))
+        self.assertEqual(
+            client.get(
+                f"{ c.GITHUB_API_URL }/users/Bob", timeout=10
+            ).status_code,
+            200,
+        )
+        client.session.get.assert_called_once_with(
+            f"{ c.GITHUB_API_URL }/users/Bob", timeout=10
+        )
+
+    @patch("app.functions.github_client.Github")
+    def test_call(self, mock_github):
+        client = GithubClient("Bob", "a_token")
+        mock_github.return_value.requester.rate_limiting = (4999, 5000)
+        mock_github.return_value.requester.rate_limiting_resettime = 2000
+        function = Mock(return_value="a_result")
+
+        with patch(
+            "app.functions.github_client.github_scheduler",
+            return_value=RateLimitScheduler(),
+        ) as mock_scheduler:
+            self.assertEqual(
+                client.call("POST", "/repos/an_org/a_repo/issues", function),
+                "a_result",
+            )
+        function.assert_called_once_with()
+        self.assertEqual(
+            mock_scheduler.return_value.budget(
+                requests.Request(
+                    "GET",
+                    f"{ c.GITHUB_API_URL }/repos/an_org/a_repo",
+                    auth=("Bob", "a_token"),
+                ).prepare()
+            ),
+            {"limit": 5000, "remaining": 4999, "reset": 2000},
+        )
+
+    def test_shared(self):
+        self.assertIs(
+            github_client("Bob", "a_token"), github_client("Bob", "a_token")
+        )
+
+    def test_not_shared_between_credentials(self):
+        self.assertIsNot(
+            github_client("Bob", "a_token"),
+            github_client("Bob", "another_token"),
+        )
+        self.assertIsNot(
+            github_client("Bob", "a_token"), github_client("Alice", "a_token")
+        )
+
+    def test_close_clients(self):
+        client = github_client("Bob", "a_token")
+        close_clients()
+        self.assertIsNot(client, github_client("Bob", "a_token"))
@@ -0,0 +1,388 @@
+"""Testing of github_scheduler.py
+
+"""
+
+from unittest import TestCase
+from unittest.mock import Mock, patch
+import sys
+
+import requests
+from github import GithubException
+
+import app.functions.constants as c
+from app.functions.constants import GithubPriority
+
+sys.path.append(c.FUNCTIONS_APP)
+from app.functions.github_scheduler import (
+    CircuitBreaker,
+    GithubUnavailable,
+    RateLimitScheduler,
+    background,
+    current_priority,
+    _backoff,
+)
+
+
+URL = f"{ c.GITHUB_API_URL }/repos/an_org/a_repo/issues"
+
+
+def prepared(method="GET", username="Bob", token="a_token", url=URL):
+    return requests.Request(method, url, auth=(username, token)).prepare()
+
+
+def response(status_code=200, remaining=None, reset=None, headers=None):
+    result = Mock(status_code=status_code, headers=dict(headers or {}))
+    if remaining is not None:
+        result.headers["X-RateLimit-Limit"] = "5000"
+        result.headers["X-RateLimit-Remaining"] = str(remaining)
+        result.headers["X-RateLimit-Reset"] = str(reset)
+    return result
+
+
+class CircuitBreakerTest(TestCase):
+    def test_failures_bad(self):
+        with self.assertRaises(ValueError):
+            CircuitBreaker(0)
+
+    @patch("app.functions.github_scheduler.t.monotonic")
+    def test_opens_and_recovers(self, mock_monotonic):
+        mock_monotonic.return_value = 1000
+        breaker = CircuitBreaker(2, 30)
+
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "closed")
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+        self.assertFalse(breaker.allow())
+
+        mock_monotonic.return_value = 1030
+        self.assertEqual(breaker.state, "half-open")
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, "closed")
+        self.assertTrue(breaker.allow())
+
+    @patch("app.functions.github_scheduler.t.monotonic")
+    def test_trial_fails(self, mock_monotonic):
+        mock_monotonic.return_value = 1000
+        breaker = CircuitBreaker(1, 30)
+        breaker.record_failure()
+
+        mock_monotonic.return_value = 1030
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+        self.assertFalse(breaker.allow())
+
+    def test_success_resets_count(self):
+        breaker = CircuitBreaker(2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "closed")
+
+
+class PriorityTest(TestCase):
+    def test_background(self):
+        self.assertEqual(current_priority(), GithubPriority.INTERACTIVE)
+        with background():
+            self.assertEqual(current_priority(), GithubPriority.BACKGROUND)
+        self.assertEqual(current_priority(), GithubPriority.INTERACTIVE)
+
+    def test_backoff(self):
+        for attempt in range(10):
+            delay = _backoff(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(
+                delay,
+                min(
+                    c.GITHUB_BACKOFF_MAX, c.GITHUB_BACKOFF_BASE * 2**attempt
+                ),
+            )
+
+
+@patch("app.functions.github_scheduler.t.sleep")
+class RateLimitSchedulerTest(TestCase):
+    def test_workers_bad(self, mock_sleep):
+        with self.assertRaises(ValueError):
+            RateLimitScheduler(background_workers=0)
+
+    def test_send(self, mock_sleep):
+        scheduler = RateLimitScheduler()
+        send = Mock(return_value=response(200, 4999, 2000000000))
+        request = prepared()
+
+        self.assertEqual(
+            scheduler.send(request, send, timeout=10).status_code, 200
+        )
+        send.assert_called_once_with(
+            request, timeout=c.GITHUB_INTERACTIVE_TIMEOUT
+        )
+        self.assertEqual(
+            scheduler.budget(request),
+            {"limit": 5000, "remaining": 4999, "reset": 2000000000},
+        )
+        self.assertIsNone(scheduler.budget(prepared(token="another_token")))
+        mock_sleep.assert_not_called()
+
+    def test_budget_per_token(self, mock_sleep):
+        scheduler = RateLimitScheduler()
+        send = Mock(return_value=response(200, 4999, 2000000000))
+        scheduler.send(prepared(), send)
+        bearer = requests.Request(
+            "GET", URL, headers={"Authorization": "bearer a_token"}
+        ).prepare()
+
+        self.assertEqual(
+            scheduler.budget(prepared(username="an_org"))["remaining"], 4999
+        )
+        self.assertEqual(scheduler.budget(bearer)["remaining"], 4999)
+
+    def test_budget_per_resource(self, mock_sleep):
+        scheduler = RateLimitScheduler()
+        send = Mock(return_value=response(200, 4999, 2000000000))
+        scheduler.send(prepared(), send)
+
+        self.assertIsNone(scheduler.budget(prepared(url=c.GITHUB_GRAPHQL_URL)))
+        self.assertIsNone(
+            scheduler.budget(
+                prepared(url=f"{ c.GITHUB_API_URL }/search/issues")
+            )
+        )
+
+    def test_background_timeout_kept(self, mock_sleep):
+        scheduler = RateLimitScheduler()
+        send = Mock(return_value=response())
+
+        with background():
+            scheduler.send(prepared(), send, timeout=10)
+        self.assertEqual(send.call_args[1]["timeout"], 10)
+
+    def test_timeout_tuple_capped(self, mock_sleep):
+        scheduler = RateLimitScheduler()
+        send = Mock(return_value=response())
+
+        scheduler.send(prepared(), send, timeout=(3, 60))
+        self.assertEqual(
+            send.call_args[1]["timeout"], (3, c.GITHUB_INTERACTIVE_TIMEOUT)
+        )
+
+    @patch("app.functions.github_scheduler.t.time")
+    def test_interactive_uses_reserve(self, mock_time, mock_sleep):
+        mock_time.return_value = 1000
+        scheduler = RateLimitScheduler(reserve=100)
+        send = Mock(return_value=response(200, 50, 1060))
+
+        scheduler.send(prepared(), send)
+        scheduler.send(prepared(), send)
+        self.assertEqual(send.call_count, 2)
+        mock_sleep.assert_not_called()
+
+    @patch("app.functions.github_scheduler.t.time")
+    def test_interactive_used_up(self, mock_time, mock_sleep):
+        mock_time.return_value = 1000
+        scheduler = RateLimitScheduler()
+        send = Mock(return_value=response(200, 0, 1060))
+
+        scheduler.send(prepared(), send)
+        with self.assertRaises(GithubUnavailable):
+            scheduler.send(prepared(), send)
+        send.assert_called_once()
+
+        mock_time.return_value = 1061
+        scheduler.send(prepared(), send)
+        self.assertEqual(send.call_count, 2)
+
+    @patch("app.functions.github_scheduler.t.time")
+    def test_background_waits_for_reset(self, mock_time, mock_sleep):
+        mock_time.return_value = 1000
+        scheduler = RateLimitScheduler(reserve=100)
+        send = Mock(return_value=response(200, 100, 1060))
+
+        scheduler.send(prepared(), send)
+        with background():
+            scheduler.send(prepared(), send)
+        mock_sleep.assert_called_once_with(60)
+        self.assertEqual(send.call_count, 2)
+
+    @patch("app.functions.github_scheduler.t.time")
+    def test_background_reset_too_far(self, mock_time, mock_sleep):
+        mock_time.return_value = 1000
+        scheduler = RateLimitScheduler(reserve=100)
+        send = Mock(
+            return_value=response(
+                200, 10, 1000 + c.GITHUB_BACKGROUND_MAX_WAIT + 1
+            )
+        )
+
+        scheduler.send(prepared(), send)
+        with background():
+            with self.assertRaises(GithubUnavailable):
+                scheduler.send(prepared(), send)
+        mock_sleep.assert_not_called()
+
+    def test_retries_connection_error(self, mock_sleep):
+        scheduler = RateLimitScheduler(retries=3)
+        send = Mock(
+            side_effect=[
+                requests.exceptions.ConnectionError(),
+                requests.exceptions.Timeout(),
+                response(),
+            ]
+        )
+
+        self.assertEqual(scheduler.send(prepared(), send).status_code, 200)
+        self.assertEqual(send.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(scheduler.breaker.state, "closed")
+
+    def test_retries_used_up(self, mock_sleep):
+        scheduler = RateLimitScheduler(retries=2)
+        send = Mock(side_effect=requests.exceptions.Timeout())
+
+        with background():
+            with self.assertRaises(requests.exceptions.Timeout):
+                scheduler.send(prepared(), send)
+        self.assertEqual(send.call_count, 3)
+
+    def test_server_error_retried(self, mock_sleep):
+        scheduler = RateLimitScheduler(retries=2)
+        send = Mock(return_value=response(503))
+
+        with background():
+            self.assertEqual(scheduler.send(prepared(), send).status_code, 503)
+        self.assertEqual(send.call_count, 3)
+
+    def test_retry_after(self, mock_sleep):
+        scheduler = RateLimitScheduler(retries=2)
+        send = Mock(
+            side_effect=[
+                response(403, headers={"Retry-After": "2"}),
+                response(),
+            ]
+        )
+
+        self.assertEqual(scheduler.send(prepared(), send).status_code, 200)
+        mock_sleep.assert_called_once_with(2.0)
+
+    def test_client_error_not_retried(self, mock_sleep):
+        scheduler = RateLimitScheduler()
+        send = Mock(return_value=response(404))
+
+        self.assertEqual(scheduler.send(prepared(), send).status_code, 404)
+        send.assert_called_once()
+        self.assertEqual(scheduler.breaker.state, "closed")
+
+    def test_post_not_retried(self, mock_sleep):
+        scheduler = RateLimitScheduler()
+        send = Mock(side_effect=requests.exceptions.ConnectionError())
+
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            scheduler.send(prepared("POST"), send)
+        send.assert_called_once()
+
+    @patch("app.functions.github_scheduler.t.monotonic")
+    def test_interactive_deadline(self, mock_monotonic, mock_sleep):
+        mock_monotonic.return_value = 1000
+        scheduler = RateLimitScheduler(retries=10)
+
+        def send(request, **kwargs):
+            mock_monotonic.return_value += c.GITHUB_INTERACTIVE_TIMEOUT
+            raise requests.exceptions.Timeout()
+
+        with self.assertRaises(requests.exceptions.Timeout):
+            scheduler.send(prepared(), send)
+        self.assertLessEqual(mock_sleep.call_count, 1)
+
+    @patch("app.functions.github_scheduler.random.uniform")
+    @patch("app.functions.github_scheduler.t.monotonic")
+    def test_interactive_deadline_retry_timeout(
+        self, mock_monotonic, mock_uniform, mock_sleep
+    ):
+        mock_monotonic.return_value = 1000
+        mock_uniform.return_value = 0.25
+        scheduler = RateLimitScheduler(retries=10)
+
+        def send(request, **kwargs):
+            mock_monotonic.return_value += 3
+            raise requests.exceptions.Timeout()
+
+        # A retry would not time out before the deadline
+        with self.assertRaises(requests.exceptions.Timeout):
+            scheduler.send(prepared(), send)
+        mock_sleep.assert_not_called()
+
+    def test_breaker_trial_other_error(self, mock_sleep):
+        breaker = CircuitBreaker(failures=1, cooldown=0)
+        scheduler = RateLimitScheduler(retries=0, breaker=breaker)
+        breaker.record_failure()
+        send = Mock(side_effect=requests.exceptions.ChunkedEncodingError())
+
+        with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+            scheduler.send(prepared(), send)
+        self.assertTrue(breaker.allow())
+
+        send.side_effect = None
+        send.return_value = response()
+        breaker.record_failure()
+        self.assertEqual(scheduler.send(prepared(), send).status_code, 200)
+        self.assertEqual(breaker.state, "closed")
+
+    def test_breaker_fails_fast(self, mock_sleep):
+        scheduler = RateLimitScheduler(
+            retries=0, breaker=CircuitBreaker(failures=2)
+        )
+        send = Mock(side_effect=requests.exceptions.ConnectionError())
+
+        for _ in range(2):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                scheduler.send(prepared(), send)
+        with self.assertRaises(GithubUnavailable):
+            scheduler.send(prepared(), send)
+        self.assertEqual(send.call_count, 2)
+
+    def test_call(self, mock_sleep):
+        scheduler = RateLimitScheduler(breaker=CircuitBreaker(failures=1))
+        function = Mock(return_value="a_result")
+
+        self.assertEqual(scheduler.call(prepared(), function), "a_result")
+        function.assert_called_once_with()
+        self.assertEqual(scheduler.breaker.state, "closed")
+
+    def test_call_client_error(self, mock_sleep):
+        scheduler = RateLimitScheduler(breaker=CircuitBreaker(failures=1))
+        function = Mock(side_effect=GithubException(404, {}))
+
+        with self.assertRaises(GithubException):
+            scheduler.call(prepared(), function)
+        self.assertEqual(scheduler.breaker.state, "closed")
+
+    def test_call_fails_fast(self, mock_sleep):
+        scheduler = RateLimitScheduler(breaker=CircuitBreaker(failures=1))
+        function = Mock(side_effect=GithubException(502, {}))
+
+        with self.assertRaises(GithubException):
+            scheduler.call(prepared(), function)
+        with self.assertRaises(GithubUnavailable):
+            scheduler.call(prepared(), function)
+        self.assertEqual(function.call_count, 1)
+
+    @patch("app.functions.github_scheduler.t.time", return_value=1000)
+    def test_call_used_up(self, mock_time, mock_sleep):
+        scheduler = RateLimitScheduler()
+        function = Mock()
+        scheduler.record(prepared(), 5000, 0, 2000)
+
+        with self.assertRaises(GithubUnavailable):
+            scheduler.call(prepared(), function)
+        function.assert_not_called()
+
+    def test_record_bad(self, mock_sleep):
+        scheduler = RateLimitScheduler()
+
+        scheduler.record(prepared(), -1, -1, 0)
+        scheduler.record(prepared(), Mock(), 1, 0)
+        scheduler.update(prepared(), {})
+        self.assertIsNone(scheduler.budget(prepared()))
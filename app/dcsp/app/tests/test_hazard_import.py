@@ -0,0 +1,270 @@
+"""Testing of hazard_import.py
+
+"""
+
+from django.test import TestCase
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from io import StringIO
+from unittest.mock import Mock, patch
+import itertools
+import os
+import sys
+import tempfile
+
+import openpyxl
+
+import app.functions.constants as c
+
+sys.path.append(c.FUNCTIONS_APP)
+from app.functions.hazard_import import (
+    HazardImport,
+    import_key,
+    read_hazards,
+)
+from app.models import HazardSync
+
+
+REGISTER_CSV = """Title,Body,Labels
+Wrong dose,Dose shown in mg not mcg,hazard; likelihood-high
+Missing allergy,Allergy not shown,hazard
+"""
+
+REGISTER_YAML = """
+- title: Wrong dose
+  body: Dose shown in mg not mcg
+  labels: [hazard, likelihood-high]
+- title: Missing allergy
+  body: Allergy not shown
+  labels: hazard
+  key: allergy-1
+"""
+
+
+def register(content, extension):
+    """Writes a hazard register to a temporary file"""
+    file = tempfile.NamedTemporaryFile(
+        "w", suffix=extension, delete=False, encoding="utf-8"
+    )
+    with file:
+        file.write(content)
+    return file.name
+
+
+def git_controller(existing=()):
+    gc = Mock()
+    gc.repo_domain_name.return_value = "an_org"
+    gc.github_repo = "a_repo"
+    gc.hazards_updated.side_effect = lambda since: iter(existing)
+    gc.hazard_log.side_effect = itertools.count(1)
+    return gc
+
+
+def issue(number, body):
+    return {
+        "number": number,
+        "title": f"Hazard {number}",
+        "body": body,
+        "labels": ["hazard"],
+        "state": "open",
+        "updated_at": "2024-01-01T10:00:00Z",
+    }
+
+
+class ReadHazardsTest(TestCase):
+    def tearDown(self):
+        for path in getattr(self, "paths", []):
+            os.remove(path)
+
+    def read(self, content, extension):
+        self.paths = getattr(self, "paths", []) + [
+            register(content, extension)
+        ]
+        return read_hazards(self.paths[-1])
+
+    def test_csv(self):
+        self.assertEqual(
+            self.read(REGISTER_CSV, ".csv"),
+            [
+                {
+                    "row": 1,
+                    "title": "Wrong dose",
+                    "body": "Dose shown in mg not mcg",
+                    "labels": ["hazard", "likelihood-high"],
+                    "key": "",
+                },
+                {
+                    "row": 2,
+                    "title": "Missing allergy",
+                    "body": "Allergy not shown",
+                    "labels": ["hazard"],
+                    "key": "",
+                },
+            ],
+        )
+
+    def test_xlsx(self):
+        workbook = openpyxl.Workbook()
+        workbook.active.append(["Title", "Body", "Labels", "Key"])
+        workbook.active.append(["Wrong dose", "Dose shown", "hazard", "d-1"])
+        workbook.active.append([None, None, None, None])
+        self.paths = [register("", ".xlsx")]
+        workbook.save(self.paths[0])
+
+        self.assertEqual(
+            read_hazards(self.paths[0]),
+            [
+                {
+                    "row": 1,
+                    "title": "Wrong dose",
+                    "body": "Dose shown",
+                    "labels": ["hazard"],
+                    "key": "d-1",
+                }
+            ],
+        )
+
+    def test_yaml(self):
+        hazards = self.read(REGISTER_YAML, ".yml")
+        self.assertEqual(hazards[0]["labels"], ["hazard", "likelihood-high"])
+        self.assertEqual(hazards[1]["labels"], ["hazard"])
+        self.assertEqual(hazards[1]["key"], "allergy-1")
+
+    def test_yaml_not_list(self):
+        with self.assertRaises(ValueError):
+            self.read("title: Wrong dose\n", ".yaml")
+
+    def test_extension_bad(self):
+        with self.assertRaises(ValueError) as error:
+            self.read("", ".txt")
+        self.assertEqual(
+            str(error.exception), "'.txt' files cannot be imported"
+        )
+
+    def test_missing(self):
+        with self.assertRaises(FileNotFoundError):
+            read_hazards("/not/a/register.csv")
+
+
+@patch("app.functions.hazard_import.t.sleep")
+class HazardImportTest(TestCase):
+    def hazards(self):
+        path = register(REGISTER_CSV, ".csv")
+        self.addCleanup(os.remove, path)
+        return read_hazards(path)
+
+    def test_workers_bad(self, mock_sleep):
+        with self.assertRaises(ValueError):
+            HazardImport(git_controller(), workers=0)
+
+    def test_run(self, mock_sleep):
+        gc = git_controller()
+        progress = Mock()
+        hazards = self.hazards()
+
+        report = HazardImport(gc, workers=2).run(hazards, progress=progress)
+
+        self.assertEqual(report["total"], 2)
+        self.assertEqual(
+            sorted(entry["number"] for entry in report["created"]), [1, 2]
+        )
+        self.assertEqual([entry["row"] for entry in report["created"]], [1, 2])
+        self.assertEqual(report["skipped"], [])
+        self.assertEqual(report["failed"], [])
+        self.assertEqual(progress.call_args[0], (2, 2))
+
+        title, body, labels = gc.hazard_log.call_args_list[0][0]
+        self.assertIn(f"dcsp-import-key: { import_key(hazards[0]) }", body)
+        self.assertFalse(gc.hazard_log.call_args_list[0][1]["check_labels"])
+        self.assertIsNone(HazardSync.objects.get().synced)
+
+    def test_run_again_skips_imported(self, mock_sleep):
+        hazards = self.hazards()
+        gc = git_controller(
+            [
+                issue(
+                    1,
+                    f"Dose shown in mg not mcg\n\n"
+                    f"<!-- dcsp-import-key: { import_key(hazards[0]) } -->",
+                )
+            ]
+        )
+
+        report = HazardImport(gc).run(hazards)
+
+        self.assertEqual([entry["row"] for entry in report["skipped"]], [1])
+        self.assertEqual([entry["row"] for entry in report["created"]], [2])
+        gc.hazard_log.assert_called_once()
+
+    def test_repeated_in_register(self, mock_sleep):
+        hazards = self.hazards()
+        gc = git_controller()
+
+        report = HazardImport(gc).run(hazards + [hazards[0] | {"row": 3}])
+
+        self.assertEqual([entry["row"] for entry in report["skipped"]], [3])
+        self.assertEqual(gc.hazard_log.call_count, 2)
+
+    def test_invalid_label_logs_nothing(self, mock_sleep):
+        hazards = self.hazards()
+        hazards[1]["labels"].append("not-a-label")
+        gc = git_controller()
+
+        report = HazardImport(gc).run(hazards)
+
+        self.assertEqual(
+            report["invalid"],
+            [{"row": 2, "error": "Labels not valid - not-a-label"}],
+        )
+        gc.hazard_log.assert_not_called()
+        gc.hazards_updated.assert_not_called()
+
+    def test_failed(self, mock_sleep):
+        gc = git_controller()
+        gc.hazard_log.side_effect = [1, ValueError("Error with repo")]
+
+        report = HazardImport(gc, workers=1).run(self.hazards())
+
+        self.assertEqual(len(report["created"]), 1)
+        self.assertEqual(report["failed"][0]["error"], "Error with repo")
+
+    def test_dry_run(self, mock_sleep):
+        gc = git_controller()
+
+        report = HazardImport(gc).run(self.hazards(), dry_run=True)
+
+        self.assertEqual(report["created"], [])
+        gc.hazard_log.assert_not_called()
+
+    @patch("app.functions.hazard_import.t.monotonic")
+    def test_paced(self, mock_monotonic, mock_sleep):
+        mock_monotonic.return_value = 1000
+        gc = git_controller()
+
+        HazardImport(gc, workers=1, interval=2).run(self.hazards())
+
+        mock_sleep.assert_called_once_with(2)
+
+    @patch("app.management.commands.import_hazards.GitController")
+    def test_command(self, mock_git_controller, mock_sleep):
+        mock_git_controller.return_value = git_controller()
+        path = register(REGISTER_YAML, ".yml")
+        self.addCleanup(os.remove, path)
+        out = StringIO()
+
+        call_command("import_hazards", path, stdout=out)
+        self.assertIn(
+            "2 hazard(s) created, 0 already imported, 0 failed",
+            out.getvalue(),
+        )
+
+    @patch("app.management.commands.import_hazards.GitController")
+    def test_command_invalid(self, mock_git_controller, mock_sleep):
+        mock_git_controller.return_value = git_controller()
+        path = register(REGISTER_CSV.replace("likelihood-high", "bad"), ".csv")
+        self.addCleanup(os.remove, path)
+
+        with self.assertRaises(CommandError):
+            call_command(
+                "import_hazards", path, stdout=StringIO(), stderr=StringIO()
+            )
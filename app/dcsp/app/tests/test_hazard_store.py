@@ -0,0 +1,311 @@
+"""Testing of hazard_store.py
+
+"""
+
+from django.test import TestCase
+from django.core.management import call_command
+from django.utils import timezone
+from datetime import datetime, timedelta
+from io import StringIO
+from asgiref.sync import sync_to_async
+from unittest.mock import Mock, patch, call
+import sys
+
+import app.functions.constants as c
+
+sys.path.append(c.FUNCTIONS_APP)
+from app.functions.hazard_store import HazardStore
+from app.models import Hazard, HazardSync
+
+
+def hazard(number, updated_at, state="open", title=None):
+    return {
+        "number": number,
+        "title": title or f"Hazard {number}",
+        "body": f"Body {number}",
+        "labels": ["hazard"],
+        "state": state,
+        "updated_at": updated_at,
+    }
+
+
+def git_controller(*pages):
+    gc = Mock()
+    gc.repo_domain_name.return_value = "an_org"
+    gc.github_repo = "a_repo"
+    gc.hazards_updated.side_effect = [iter(page) for page in pages]
+    return gc
+
+
+class HazardStoreTest(TestCase):
+    def test_sync_first(self):
+        gc = git_controller(
+            [
+                hazard(2, "2024-01-01T10:00:00Z"),
+                hazard(1, "2024-01-02T10:00:00Z"),
+            ]
+        )
+        store = HazardStore(gc)
+
+        self.assertEqual(store.sync(), 2)
+        gc.hazards_updated.assert_called_once_with(None)
+        self.assertEqual(
+            store.hazards_open(),
+            [
+                {
+                    "number": 1,
+                    "title": "Hazard 1",
+                    "body": "Body 1",
+                    "labels": ["hazard"],
+                },
+                {
+                    "number": 2,
+                    "title": "Hazard 2",
+                    "body": "Body 2",
+                    "labels": ["hazard"],
+                },
+            ],
+        )
+        self.assertEqual(
+            HazardSync.objects.get(repo="an_org/a_repo").watermark,
+            datetime(2024, 1, 2, 10, tzinfo=timezone.utc),
+        )
+        self.assertFalse(store.is_stale())
+
+    def test_sync_incremental(self):
+        gc = git_controller(
+            [
+                hazard(1, "2024-01-01T10:00:00Z"),
+                hazard(2, "2024-01-02T10:00:00Z"),
+            ],
+            [
+                hazard(2, "2024-01-02T10:00:00Z"),
+                hazard(1, "2024-01-03T10:00:00Z", state="closed"),
+                hazard(3, "2024-01-04T10:00:00Z", title="New"),
+            ],
+        )
+        store = HazardStore(gc)
+        store.sync()
+
+        self.assertEqual(store.sync(), 3)
+        self.assertEqual(
+            gc.hazards_updated.call_args_list[1],
+            call(datetime(2024, 1, 2, 10, tzinfo=timezone.utc)),
+        )
+        self.assertEqual(
+            [hazard["number"] for hazard in store.hazards_open()], [2, 3]
+        )
+        self.assertEqual(store.hazard(3)["title"], "New")
+        self.assertEqual(store.hazard(1)["state"], "closed")
+        self.assertEqual(Hazard.objects.count(), 3)
+
+    def test_sync_full(self):
+        gc = git_controller([hazard(1, "2024-01-01T10:00:00Z")])
+        gc.hazards_full.return_value = iter(
+            [
+                hazard(2, "2024-01-03T10:00:00Z"),
+                hazard(1, "2024-01-02T10:00:00Z"),
+            ]
+        )
+        store = HazardStore(gc)
+        store.sync()
+
+        self.assertEqual(store.sync(full=True), 2)
+        gc.hazards_updated.assert_called_once()
+        gc.hazards_full.assert_called_once_with("all")
+        self.assertEqual(Hazard.objects.count(), 2)
+        self.assertEqual(
+            HazardSync.objects.get().watermark,
+            datetime(2024, 1, 3, 10, tzinfo=timezone.utc),
+        )
+
+    def test_sync_full_error_keeps_watermark(self):
+        def hazards_full(state):
+            yield hazard(2, "2024-01-03T10:00:00Z")
+            raise ValueError("Error with repo")
+
+        gc = git_controller([hazard(1, "2024-01-01T10:00:00Z")])
+        gc.hazards_full.side_effect = hazards_full
+        store = HazardStore(gc)
+        store.sync()
+
+        with self.assertRaises(ValueError):
+            store.sync(full=True)
+        self.assertEqual(
+            HazardSync.objects.get().watermark,
+            datetime(2024, 1, 1, 10, tzinfo=timezone.utc),
+        )
+
+    def test_sync_batches(self):
+        gc = git_controller(
+            [
+                hazard(number, f"2024-01-01T10:{ number % 60:02d}:00Z")
+                for number in range(c.GITHUB_PER_PAGE + 1)
+            ]
+        )
+
+        self.assertEqual(HazardStore(gc).sync(), c.GITHUB_PER_PAGE + 1)
+        self.assertEqual(Hazard.objects.count(), c.GITHUB_PER_PAGE + 1)
+
+    def test_sync_error_keeps_progress(self):
+        def hazards_updated(since):
+            yield from [
+                hazard(number, "2024-01-01T10:00:00Z")
+                for number in range(c.GITHUB_PER_PAGE)
+            ]
+            raise ValueError("Error with accessing repo")
+
+        gc = git_controller()
+        gc.hazards_updated.side_effect = hazards_updated
+        store = HazardStore(gc)
+
+        with self.assertRaises(ValueError):
+            store.sync()
+        self.assertEqual(Hazard.objects.count(), c.GITHUB_PER_PAGE)
+        self.assertIsNone(store.last_synced())
+        self.assertEqual(
+            HazardSync.objects.get(repo="an_org/a_repo").watermark,
+            datetime(2024, 1, 1, 10, tzinfo=timezone.utc),
+        )
+
+    def test_sync_updated_at_bad(self):
+        gc = git_controller([hazard(1, "not a time")])
+
+        with self.assertRaises(ValueError) as error:
+            HazardStore(gc).sync()
+        self.assertEqual(
+            str(error.exception),
+            "'not a time' is not a valid time for hazard 1",
+        )
+        self.assertEqual(Hazard.objects.count(), 0)
+
+    @patch("app.functions.hazard_store._sync_lock")
+    def test_sync_not_blocking(self, mock_sync_lock):
+        mock_sync_lock.return_value.acquire.return_value = False
+        gc = git_controller()
+
+        self.assertEqual(HazardStore(gc).sync(blocking=False), -1)
+        mock_sync_lock.return_value.acquire.assert_called_once_with(
+            blocking=False
+        )
+        gc.hazards_updated.assert_not_called()
+
+    def test_stale(self):
+        store = HazardStore(git_controller([]))
+        self.assertTrue(store.is_stale())
+        self.assertIsNone(store.last_synced())
+
+        store.sync()
+        self.assertFalse(store.is_stale())
+        self.assertTrue(store.is_stale(max_age=-1))
+
+        HazardSync.objects.update(
+            synced=timezone.now()
+            - timedelta(seconds=c.HAZARD_SYNC_INTERVAL + 1)
+        )
+        self.assertTrue(store.is_stale())
+
+    def test_expire(self):
+        store = HazardStore(git_controller([]))
+        store.sync()
+        store.expire()
+        self.assertIsNone(store.last_synced())
+        self.assertTrue(store.is_stale())
+
+    def filtered_store(self):
+        gc = git_controller(
+            [
+                hazard(1, "2024-01-01T10:00:00Z")
+                | {"labels": ["hazard", "risk-level-1-acceptable"]},
+                hazard(2, "2024-01-01T10:00:00Z", title="Wrong dose")
+                | {"labels": ["hazard", "risk-level-3-undesirable"]},
+                hazard(3, "2024-01-01T10:00:00Z")
+                | {"labels": ["new-hazard-for-triage"], "body": "Dose lost"},
+                hazard(4, "2024-01-01T10:00:00Z", state="closed"),
+            ]
+        )
+        store = HazardStore(gc)
+        store.sync()
+        return store
+
+    def test_hazards_open_filtered(self):
+        store = self.filtered_store()
+
+        def numbers(**filters):
+            return [
+                hazard["number"] for hazard in store.hazards_open(**filters)
+            ]
+
+        self.assertEqual(numbers(), [1, 2, 3])
+        self.assertEqual(numbers(labels=["hazard"]), [1, 2])
+        self.assertEqual(
+            numbers(labels=["hazard", "risk-level-3-undesirable"]), [2]
+        )
+        # Matches a whole label, not part of one
+        self.assertEqual(numbers(labels=["risk-level-3"]), [])
+        self.assertEqual(numbers(text="DOSE"), [2, 3])
+        self.assertEqual(numbers(labels=["hazard"], text="dose"), [2])
+
+    def test_hazards_open_page(self):
+        store = self.filtered_store()
+
+        self.assertEqual(
+            store.hazards_open_page(2, per_page=2),
+            {
+                "hazards": [
+                    {
+                        "number": 3,
+                        "title": "Hazard 3",
+                        "body": "Dose lost",
+                        "labels": ["new-hazard-for-triage"],
+                    }
+                ],
+                "page": 2,
+                "pages": 2,
+                "count": 3,
+            },
+        )
+        self.assertEqual(store.hazards_open_page(9, per_page=2)["page"], 2)
+        self.assertEqual(store.hazards_open_page("x", per_page=2)["page"], 1)
+        self.assertEqual(
+            store.hazards_open_page(labels=["deprecated-hazard"]),
+            {"hazards": [], "page": 1, "pages": 1, "count": 0},
+        )
+
+    async def test_aiter_hazards_open(self):
+        store = await sync_to_async(self.filtered_store)()
+
+        self.assertEqual(
+            [
+                hazard
+                async for hazard in store.aiter_hazards_open(chunk_size=1)
+            ],
+            await sync_to_async(store.hazards_open)(),
+        )
+        self.assertEqual(
+            [
+                hazard["number"]
+                async for hazard in store.aiter_hazards_open(text="dose")
+            ],
+            [2, 3],
+        )
+
+    def test_hazard_not_in_store(self):
+        self.assertIsNone(HazardStore(git_controller()).hazard(1))
+
+    def test_repos_kept_apart(self):
+        gc = git_controller([hazard(1, "2024-01-01T10:00:00Z")])
+        HazardStore(gc).sync()
+        gc.github_repo = "another_repo"
+
+        self.assertEqual(HazardStore(gc).hazards_open(), [])
+
+    @patch("app.management.commands.sync_hazards.GitController")
+    def test_command(self, mock_git_controller):
+        mock_git_controller.return_value = git_controller(
+            [hazard(1, "2024-01-01T10:00:00Z")]
+        )
+        out = StringIO()
+
+        call_command("sync_hazards", stdout=out)
+        self.assertEqual(out.getvalue(), "1 hazard(s) added or changed\n")
@@ -0,0 +1,265 @@
+"""Testing of hazard_webhook.py
+
+"""
+
+from django.test import TestCase
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+from datetime import datetime, timedelta
+from io import StringIO
+from unittest.mock import Mock, patch
+import json
+import os
+import sys
+import tempfile
+
+import app.functions.constants as c
+
+sys.path.append(c.FUNCTIONS_APP)
+from app.functions.hazard_store import HazardStore
+from app.functions.hazard_webhook import (
+    HazardWebhook,
+    read_deliveries,
+    signature,
+)
+from app.models import Hazard, HazardSync
+import app.tests.data_hazard_webhook as d
+
+
+def stored(number=1, labels=("hazard",), updated_at="2024-01-01T10:00:00Z"):
+    return Hazard.objects.create(
+        repo=d.REPO,
+        number=number,
+        title=f"Hazard {number}",
+        body=f"Body {number}",
+        labels=list(labels),
+        state="open",
+        updated_at=datetime.fromisoformat(updated_at.replace("Z", "+00:00")),
+    )
+
+
+class HazardWebhookTest(TestCase):
+    def setUp(self):
+        HazardSync.objects.create(repo=d.REPO, synced=timezone.now())
+        self.webhook = HazardWebhook(d.SECRET)
+
+    def test_verify(self):
+        body = b'{"zen": "Keep it simple"}'
+
+        self.assertTrue(self.webhook.verify(body, signature(d.SECRET, body)))
+        self.assertFalse(self.webhook.verify(body, signature("wrong", body)))
+        self.assertFalse(self.webhook.verify(body, ""))
+        self.assertFalse(HazardWebhook().verify(body, signature("", body)))
+
+    @patch("app.functions.hazard_webhook.clear_hazard_cache")
+    def test_issue_updated(self, mock_clear_hazard_cache):
+        stored()
+
+        self.assertEqual(
+            self.webhook.handle(
+                "issues", d.issues_payload(labels=["hazard", "severity-minor"])
+            ),
+            "updated",
+        )
+        hazard = Hazard.objects.get(repo=d.REPO, number=1)
+        self.assertEqual(hazard.body, "Body 1 changed")
+        self.assertEqual(hazard.labels, ["hazard", "severity-minor"])
+        mock_clear_hazard_cache.assert_called_once_with("An_Org/A_Repo", 1)
+        self.assertIsNotNone(HazardSync.objects.get().pushed)
+
+    def test_issue_opened(self):
+        self.webhook.handle("issues", d.issues_payload("opened", number=2))
+        self.assertEqual(Hazard.objects.get(number=2).title, "Hazard 2")
+
+    def test_issue_out_of_order(self):
+        stored(updated_at="2024-01-03T10:00:00Z")
+
+        self.assertEqual(
+            self.webhook.handle("issues", d.issues_payload()), "stale"
+        )
+        self.assertEqual(Hazard.objects.get().body, "Body 1")
+        self.assertIsNone(HazardSync.objects.get().pushed)
+
+    def test_issue_deleted(self):
+        stored()
+
+        self.assertEqual(
+            self.webhook.handle("issues", d.issues_payload("deleted")),
+            "deleted",
+        )
+        self.assertEqual(Hazard.objects.count(), 0)
+
+    def test_comment(self):
+        stored()
+
+        self.assertEqual(
+            self.webhook.handle("issue_comment", d.comment_payload("deleted")),
+            "updated",
+        )
+        self.assertEqual(Hazard.objects.get().body, "Body 1 changed")
+
+    def test_comment_on_pull_request(self):
+        self.assertEqual(
+            self.webhook.handle(
+                "issue_comment", d.comment_payload(pull_request=True)
+            ),
+            "ignored",
+        )
+        self.assertEqual(Hazard.objects.count(), 0)
+
+    def test_label_renamed(self):
+        stored(1, ["hazard", "severity-minor"])
+        stored(2, ["hazard"])
+
+        self.assertEqual(
+            self.webhook.handle(
+                "label",
+                d.label_payload("edited", "severity-small", "severity-minor"),
+            ),
+            "relabelled",
+        )
+        self.assertEqual(
+            Hazard.objects.get(number=1).labels, ["hazard", "severity-small"]
+        )
+        self.assertEqual(Hazard.objects.get(number=2).labels, ["hazard"])
+
+    def test_label_deleted(self):
+        stored(1, ["hazard", "severity-minor"])
+
+        self.webhook.handle("label", d.label_payload("deleted", "hazard"))
+        self.assertEqual(Hazard.objects.get().labels, ["severity-minor"])
+
+    def test_label_ignored(self):
+        self.assertEqual(
+            self.webhook.handle("label", d.label_payload("created", "new")),
+            "ignored",
+        )
+        self.assertEqual(
+            self.webhook.handle(
+                "label", d.label_payload("edited", "hazard", "hazard")
+            ),
+            "ignored",
+        )
+
+    @patch("app.functions.hazard_webhook.clear_hazard_cache")
+    def test_repo_not_stored(self, mock_clear_hazard_cache):
+        self.assertEqual(
+            self.webhook.handle(
+                "issues", d.issues_payload(repo="an_org/another_repo")
+            ),
+            "ignored",
+        )
+        self.assertEqual(Hazard.objects.count(), 0)
+        mock_clear_hazard_cache.assert_called_once_with(
+            "an_org/another_repo", 1
+        )
+
+    def test_other_events(self):
+        self.assertEqual(self.webhook.handle("ping", {}), "pong")
+        self.assertEqual(self.webhook.handle("push", {}), "ignored")
+
+    def test_payload_bad(self):
+        with self.assertRaises(ValueError):
+            self.webhook.handle("issues", {"action": "edited"})
+        with self.assertRaises(ValueError):
+            self.webhook.handle(
+                "issues", {"repository": {"full_name": d.REPO}}
+            )
+
+    def test_pushed_store_synced_less_often(self):
+        gc = Mock()
+        gc.repo_domain_name.return_value = "an_org"
+        gc.github_repo = "a_repo"
+        store = HazardStore(gc)
+        HazardSync.objects.update(
+            synced=timezone.now()
+            - timedelta(seconds=c.HAZARD_SYNC_INTERVAL + 1)
+        )
+        self.assertTrue(store.is_stale())
+
+        self.webhook.handle("issues", d.issues_payload())
+        self.assertFalse(store.is_stale())
+
+        HazardSync.objects.update(
+            synced=timezone.now()
+            - timedelta(seconds=c.HAZARD_WEBHOOK_SYNC_INTERVAL + 1)
+        )
+        self.assertTrue(store.is_stale())
+
+    def test_pushed_long_ago_synced_as_usual(self):
+        gc = Mock()
+        gc.repo_domain_name.return_value = "an_org"
+        gc.github_repo = "a_repo"
+        store = HazardStore(gc)
+        self.webhook.handle("issues", d.issues_payload())
+        HazardSync.objects.update(
+            synced=timezone.now()
+            - timedelta(seconds=c.HAZARD_SYNC_INTERVAL + 1),
+            pushed=timezone.now()
+            - timedelta(seconds=c.HAZARD_WEBHOOK_SYNC_INTERVAL + 1),
+        )
+        self.assertTrue(store.is_stale())
+
+
+class ReplayTest(TestCase):
+    def setUp(self):
+        HazardSync.objects.create(repo=d.REPO, synced=timezone.now())
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def record(self, name, content):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "w") as file:
+            file.write(content)
+        return path
+
+    def test_read_deliveries(self):
+        self.record("2.json", json.dumps(d.DELIVERIES[1]))
+        self.record("1.json", json.dumps(d.DELIVERIES[:1]))
+        self.record("notes.txt", "not a recording")
+
+        self.assertEqual(read_deliveries(self.temp_dir.name), d.DELIVERIES)
+
+    def test_read_deliveries_bad(self):
+        with self.assertRaises(FileNotFoundError):
+            read_deliveries("/not/a/recording.json")
+        with self.assertRaises(ValueError):
+            read_deliveries(self.record("bad.json", "not json"))
+        with self.assertRaises(ValueError):
+            read_deliveries(self.record("bad.json", '{"event": "ping"}'))
+
+    def test_command(self):
+        path = self.record("deliveries.json", json.dumps(d.DELIVERIES))
+        out = StringIO()
+
+        call_command("replay_webhooks", path, stdout=out)
+        self.assertEqual(
+            out.getvalue(),
+            "ping: pong\nissues: updated\n2 delivery(s) replayed\n",
+        )
+        self.assertEqual(Hazard.objects.get().body, "Body 1 changed")
+
+    @patch.dict(os.environ, {"GITHUB_WEBHOOK_SECRET": d.SECRET})
+    @patch("app.management.commands.replay_webhooks.requests.post")
+    def test_command_url(self, mock_post):
+        mock_post.return_value = Mock(status_code=200, text="{}")
+        path = self.record("deliveries.json", json.dumps(d.DELIVERIES[1]))
+
+        call_command(
+            "replay_webhooks", path, url="http://testserver", stdout=StringIO()
+        )
+        body = mock_post.call_args[1]["data"]
+        headers = mock_post.call_args[1]["headers"]
+        self.assertEqual(headers["X-GitHub-Event"], "issues")
+        self.assertEqual(
+            headers["X-Hub-Signature-256"], signature(d.SECRET, body)
+        )
+        self.assertEqual(Hazard.objects.count(), 0)
+
+    @patch.dict(os.environ, {"GITHUB_WEBHOOK_SECRET": ""})
+    def test_command_url_no_secret(self):
+        path = self.record("deliveries.json", json.dumps(d.DELIVERIES))
+
+        with self.assertRaises(CommandError):
+            call_command("replay_webhooks", path, url="http://testserver")
@@ -0,0 +1,136 @@
+"""Testing of job_queue.py
+
+"""
+
+from unittest import TestCase
+import sys
+import os
+import json
+import threading
+
+import app.functions.constants as c
+
+sys.path.append(c.FUNCTIONS_APP)
+from app.functions.job_queue import JobQueue
+from app.functions.github_scheduler import current_priority
+
+import app.tests.data_job_queue as d
+
+
+class JobQueueTest(TestCase):
+    def setUp(self):
+        if os.path.isfile(d.JOBS_STATUS_PATH):
+            os.remove(d.JOBS_STATUS_PATH)
+
+    def test_init_workers_bad(self):
+        with self.assertRaises(ValueError) as error:
+            JobQueue(d.JOBS_STATUS_PATH, workers=0)
+        self.assertEqual(
+            str(error.exception), "'0' is not a valid number of workers"
+        )
+
+    def test_submit_synchronous(self):
+        jq = JobQueue(d.JOBS_STATUS_PATH, run_in_background=False)
+        job_id = jq.submit(d.JOB_NAME, lambda: d.JOB_RESULT)
+        job = jq.status(job_id)
+        self.assertEqual(job["status"], c.JobStatus.FINISHED.value)
+        self.assertEqual(job["result"], d.JOB_RESULT)
+        self.assertEqual(job["progress"], 100)
+        self.assertEqual(job["position"], 0)
+        self.assertTrue(jq.is_done(job_id))
+
+    def test_submit_background_priority(self):
+        jq = JobQueue(d.JOBS_STATUS_PATH, run_in_background=False)
+        job_id = jq.submit(d.JOB_NAME, lambda: current_priority().value)
+        self.assertEqual(
+            jq.status(job_id)["result"], c.GithubPriority.BACKGROUND.value
+        )
+        self.assertEqual(current_priority(), c.GithubPriority.INTERACTIVE)
+
+    def test_submit_failure(self):
+        def failing_job():
+            raise ValueError(d.JOB_ERROR_MESSAGE)
+
+        jq = JobQueue(d.JOBS_STATUS_PATH, run_in_background=False)
+        job_id = jq.submit(d.JOB_NAME, failing_job)
+        job = jq.status(job_id)
+        self.assertEqual(job["status"], c.JobStatus.FAILED.value)
+        self.assertEqual(job["error"], f"ValueError: { d.JOB_ERROR_MESSAGE }")
+
+    def test_submit_background_queue_position(self):
+        release = threading.Event()
+        jq = JobQueue(d.JOBS_STATUS_PATH, workers=1)
+        first_job = jq.submit(d.JOB_NAME, release.wait, 5)
+        second_job = jq.submit(d.JOB_NAME, lambda: d.JOB_RESULT)
+        third_job = jq.submit(d.JOB_NAME, lambda: d.JOB_RESULT)
+
+        self.assertFalse(jq.is_done(first_job))
+        self.assertEqual(jq.status(second_job)["position"], 1)
+        self.assertEqual(jq.status(third_job)["position"], 2)
+
+        release.set()
+        jq._executor.shutdown(wait=True)
+        self.assertTrue(jq.is_done(third_job))
+        self.assertEqual(jq.status(third_job)["result"], d.JOB_RESULT)
+
+    def test_set_progress(self):
+        jq = JobQueue(d.JOBS_STATUS_PATH, run_in_background=False)
+        job_id = jq.submit(d.JOB_NAME, lambda: None)
+        jq.set_progress(job_id, 150)
+        self.assertEqual(jq.status(job_id)["progress"], 100)
+
+    def test_status_job_id_bad(self):
+        jq = JobQueue(d.JOBS_STATUS_PATH, run_in_background=False)
+        with self.assertRaises(KeyError):
+            jq.status(d.JOB_ID_BAD)
+
+    def test_persisted(self):
+        jq = JobQueue(d.JOBS_STATUS_PATH, run_in_background=False)
+        job_id = jq.submit(d.JOB_NAME, lambda: d.JOB_RESULT)
+        jq_reloaded = JobQueue(d.JOBS_STATUS_PATH, run_in_background=False)
+        self.assertEqual(jq_reloaded.status(job_id)["result"], d.JOB_RESULT)
+
+    def test_persisted_running_job_failed(self):
+        with open(d.JOBS_STATUS_PATH, "w") as file:
+            json.dump(d.PERSISTED_RUNNING_JOB, file)
+
+        jq = JobQueue(d.JOBS_STATUS_PATH, run_in_background=False)
+        self.assertEqual(jq.status("abc")["status"], c.JobStatus.FAILED.value)
+
+    def test_persisted_running_job_other_process(self):
+        job = {**d.PERSISTED_RUNNING_JOB["abc"], "pid": os.getppid()}
+        with open(d.JOBS_STATUS_PATH, "w") as file:
+            json.dump({"abc": job}, file)
+
+        jq = JobQueue(d.JOBS_STATUS_PATH, run_in_background=False)
+        self.assertEqual(jq.status("abc")["status"], c.JobStatus.RUNNING.value)
+
+    def test_status_other_process(self):
+        jq = JobQueue(d.JOBS_STATUS_PATH, run_in_background=False)
+        jq_other = JobQueue(d.JOBS_STATUS_PATH, run_in_background=False)
+        job_id = jq.submit(d.JOB_NAME, lambda: d.JOB_RESULT)
+
+        self.assertEqual(jq_other.status(job_id)["result"], d.JOB_RESULT)
+
+    def test_save_keeps_other_process_jobs(self):
+        jq = JobQueue(d.JOBS_STATUS_PATH, run_in_background=False)
+        jq_other = JobQueue(d.JOBS_STATUS_PATH, run_in_background=False)
+        job_id = jq.submit(d.JOB_NAME, lambda: d.JOB_RESULT)
+        other_job_id = jq_other.submit(d.JOB_NAME, lambda: d.JOB_RESULT)
+
+        with open(d.JOBS_STATUS_PATH, "r") as file:
+            self.assertEqual(set(json.load(file)), {job_id, other_job_id})
+
+    def test_prune(self):
+        jq = JobQueue(d.JOBS_STATUS_PATH, run_in_background=False)
+        first_job = jq.submit(d.JOB_NAME, lambda: None)
+        for _ in range(c.JOBS_MAX_KEPT):
+            jq.submit(d.JOB_NAME, lambda: None)
+
+        with self.assertRaises(KeyError):
+            jq.status(first_job)
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.path.isfile(d.JOBS_STATUS_PATH):
+            os.remove(d.JOBS_STATUS_PATH)
@@ -0,0 +1,127 @@
+"""Testing of label_registry.py
+
+"""
+
+from unittest import TestCase
+from unittest.mock import patch
+import os
+import shutil
+import sys
+import tempfile
+
+import app.functions.constants as c
+
+sys.path.append(c.FUNCTIONS_APP)
+from app.functions.label_registry import (
+    LabelRegistry,
+    category,
+    clear_label_registry,
+    label_registry,
+)
+import app.tests.data_git_control as d
+
+
+class LabelRegistryTest(TestCase):
+    def setUp(self):
+        self.registry = LabelRegistry(d.AVAILABLE_HAZARD_LABELS_FULL)
+
+    def test_names(self):
+        self.assertEqual(
+            list(self.registry.names), d.AVAILABLE_HAZARD_LABELS_NAME_ONLY
+        )
+        self.assertEqual(len(self.registry), len(self.registry.names))
+
+    def test_definitions_copied(self):
+        definitions = self.registry.definitions()
+        self.assertEqual(definitions, d.AVAILABLE_HAZARD_LABELS_FULL)
+
+        definitions[0]["name"] = "changed"
+        self.assertEqual(self.registry.definitions()[0]["name"], "hazard")
+
+    def test_exact_match(self):
+        self.assertTrue(self.registry.is_valid("hazard"))
+        self.assertTrue(self.registry.is_valid("Likelihood-High"))
+        self.assertIn("severity-minor", self.registry)
+        self.assertFalse(self.registry.is_valid("hazard2"))
+        self.assertFalse(self.registry.is_valid("likelihood"))
+        self.assertNotIn(None, self.registry)
+
+    def test_invalid(self):
+        self.assertEqual(
+            self.registry.invalid(["hazard", "likelihood", "hazard2"]),
+            ["likelihood", "hazard2"],
+        )
+
+    def test_categories(self):
+        self.assertEqual(
+            list(self.registry.categories),
+            ["general", "likelihood", "severity", "risk"],
+        )
+        self.assertEqual(
+            self.registry.in_category("general"),
+            ("hazard", "new-hazard-for-triage", "deprecated-hazard"),
+        )
+        self.assertIn(
+            "risk-level-5-unacceptable", self.registry.in_category("risk")
+        )
+        self.assertEqual(self.registry.in_category("not-a-category"), ())
+
+    def test_immutable(self):
+        with self.assertRaises(TypeError):
+            self.registry.categories["general"] = ()
+        with self.assertRaises(AttributeError):
+            self.registry.names = ()
+
+    def test_name_missing(self):
+        with self.assertRaises(ValueError):
+            LabelRegistry([{"description": "No name"}])
+
+    def test_category(self):
+        self.assertEqual(category("likelihood-low"), "likelihood")
+        self.assertEqual(category("SEVERITY-MINOR"), "severity")
+        self.assertEqual(category("risk-level-1-acceptable"), "risk")
+        self.assertEqual(category("hazard"), "general")
+
+
+class LabelRegistryCacheTest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "labels.yml")
+        shutil.copyfile(c.ISSUE_LABELS_PATH, self.path)
+        patcher = patch.object(c, "ISSUE_LABELS_PATH", self.path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        clear_label_registry()
+        self.addCleanup(clear_label_registry)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_read_once(self):
+        with patch("app.functions.label_registry.yaml.safe_load") as load:
+            load.return_value = d.AVAILABLE_HAZARD_LABELS_FULL
+            first = label_registry()
+            self.assertIs(label_registry(), first)
+        load.assert_called_once()
+
+    def test_read_again_when_changed(self):
+        first = label_registry()
+
+        with open(self.path, "a") as file:
+            file.write('\n- name: "hazard-extra"\n  color: "892CBB"\n')
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+
+        second = label_registry()
+        self.assertIsNot(second, first)
+        self.assertTrue(second.is_valid("hazard-extra"))
+        self.assertFalse(first.is_valid("hazard-extra"))
+
+    def test_missing(self):
+        os.remove(self.path)
+        with self.assertRaises(FileNotFoundError) as error:
+            label_registry()
+        self.assertEqual(
+            str(error.exception),
+            f"Labels.yml does not exist at '{ self.path }'",
+        )
@@ -0,0 +1,115 @@
+"""Testing of locked_files.py
+
+"""
+
+from unittest import TestCase
+from unittest.mock import Mock, patch
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import time as t
+
+import app.functions.constants as c
+
+sys.path.append(c.FUNCTIONS_APP)
+import app.functions.locked_files as lf
+
+
+class LockedFilesTest(TestCase):
+    def setUp(self):
+        lf.clear_cache()
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, "file.txt")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_atomic_write(self):
+        lf.atomic_write(self.path, "first")
+        lf.atomic_write(self.path, "second")
+
+        with open(self.path, "r") as file:
+            self.assertEqual(file.read(), "second")
+        self.assertEqual(os.listdir(self.folder), ["file.txt"])
+
+    def test_atomic_write_keeps_mode(self):
+        lf.atomic_write(self.path, "first")
+        os.chmod(self.path, 0o640)
+        lf.atomic_write(self.path, "second")
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o640)
+
+    def test_atomic_write_failure(self):
+        lf.atomic_write(self.path, "first")
+
+        with patch("app.functions.locked_files.os.replace") as mock_replace:
+            mock_replace.side_effect = OSError("Disk full")
+            with self.assertRaises(OSError):
+                lf.atomic_write(self.path, "second")
+
+        with open(self.path, "r") as file:
+            self.assertEqual(file.read(), "first")
+        self.assertEqual(os.listdir(self.folder), ["file.txt"])
+
+    def test_lock_reentrant(self):
+        with lf.file_lock(self.path):
+            with lf.file_lock(self.path, shared=True):
+                lf.atomic_write(self.path, "content")
+
+    def test_lock_upgrade(self):
+        with lf.file_lock(self.path, shared=True):
+            with self.assertRaises(RuntimeError):
+                with lf.file_lock(self.path):
+                    pass
+
+    def test_lock_exclusive(self):
+        events = []
+
+        def other_writer():
+            with lf.file_lock(self.path):
+                events.append("other")
+
+        with lf.file_lock(self.path):
+            thread = threading.Thread(target=other_writer)
+            thread.start()
+            t.sleep(0.2)
+            events.append("first")
+        thread.join(5)
+        self.assertEqual(events, ["first", "other"])
+
+    def test_lock_shared(self):
+        events = []
+
+        def other_reader():
+            with lf.file_lock(self.path, shared=True):
+                events.append("other")
+
+        with lf.file_lock(self.path, shared=True):
+            thread = threading.Thread(target=other_reader)
+            thread.start()
+            thread.join(5)
+            events.append("first")
+        self.assertEqual(events, ["other", "first"])
+
+    def test_cached_read(self):
+        parse = Mock(side_effect=str.upper)
+        lf.atomic_write(self.path, "first")
+
+        self.assertEqual(lf.cached_read(self.path, parse), "FIRST")
+        self.assertEqual(lf.cached_read(self.path, parse), "FIRST")
+        self.assertEqual(parse.call_count, 1)
+
+    def test_cached_read_changed(self):
+        lf.atomic_write(self.path, "first")
+        self.assertEqual(lf.cached_read(self.path, str.upper), "FIRST")
+
+        with open(self.path, "w") as file:
+            file.write("second version")
+        self.assertEqual(
+            lf.cached_read(self.path, str.upper), "SECOND VERSION"
+        )
+
+    def test_cached_read_missing(self):
+        with self.assertRaises(FileNotFoundError):
+            lf.cached_read(self.path, str.upper)
@@ -0,0 +1,95 @@
+"""Testing of mkdocs_builder.py
+
+    NB: Not built for asynchronous testing
+
+"""
+from unittest import TestCase
+import sys
+import os
+import tempfile
+import threading
+import time as t
+
+import app.functions.constants as c
+
+sys.path.append(c.FUNCTIONS_APP)
+from app.functions.mkdocs_builder import WarmBuilder
+from app.functions.mkdocs_control import MkdocsControl
+
+TESTING_BUILDER_SOCKET = "/tmp/dcsp_mkdocs_builder_test.sock"  # nosec B108
+TESTING_CONFIG = f"{ c.TESTING_MKDOCS_CONTROL }mkdocs.yml"
+
+
+class WarmBuilderTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.builder = WarmBuilder(
+            TESTING_BUILDER_SOCKET, b"test key", [TESTING_CONFIG]
+        )
+
+    def test_start(self):
+        self.assertTrue(self.builder.start(wait=True))
+        self.assertTrue(self.builder.is_running())
+
+    def test_is_started(self):
+        self.builder.start(wait=True)
+        self.assertTrue(self.builder.is_started())
+
+        builder_stopped = WarmBuilder(f"{ TESTING_BUILDER_SOCKET }.none")
+        self.assertFalse(builder_stopped.is_started())
+
+    def test_ping_during_build(self):
+        self.builder.start(wait=True)
+        with tempfile.TemporaryDirectory() as site_dir:
+            build = threading.Thread(
+                target=self.builder.build, args=(TESTING_CONFIG, site_dir)
+            )
+            build.start()
+            t.sleep(0.05)
+            start = t.monotonic()
+            self.assertTrue(self.builder.is_running())
+            pinged = t.monotonic() - start
+            build.join()
+
+        self.assertLess(pinged, 0.5)
+
+    def test_is_running_bad_authkey(self):
+        self.builder.start(wait=True)
+        builder_bad_key = WarmBuilder(TESTING_BUILDER_SOCKET, b"wrong key")
+        self.assertFalse(builder_bad_key.is_running())
+
+    def test_build(self):
+        self.builder.start(wait=True)
+        with tempfile.TemporaryDirectory() as site_dir:
+            results = self.builder.build(TESTING_CONFIG, site_dir)
+            self.assertTrue(results["success"])
+            self.assertTrue(os.path.isfile(f"{ site_dir }/index.html"))
+
+    def test_build_twice_reuses_process(self):
+        self.builder.start(wait=True)
+        with tempfile.TemporaryDirectory() as site_dir:
+            first = self.builder.build(TESTING_CONFIG, site_dir)
+            second = self.builder.build(TESTING_CONFIG, site_dir)
+
+        self.assertTrue(first["success"])
+        self.assertTrue(second["success"])
+        self.assertEqual(first["pid"], second["pid"])
+        self.assertNotEqual(first["pid"], os.getpid())
+
+    def test_build_config_bad(self):
+        with self.assertRaises(FileNotFoundError):
+            self.builder.build("/not/a/mkdocs.yml")
+
+    def test_build_not_running(self):
+        builder_stopped = WarmBuilder(f"{ TESTING_BUILDER_SOCKET }.none")
+        with self.assertRaises(RuntimeError):
+            builder_stopped.build(TESTING_CONFIG)
+
+    def test_mkdocs_control_build(self):
+        mkdoc_control = MkdocsControl(c.TESTING_MKDOCS_CONTROL, self.builder)
+        with tempfile.TemporaryDirectory() as site_dir:
+            self.assertTrue(mkdoc_control.build(site_dir)["success"])
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.builder.stop()
@@ -5,11 +5,25 @@
 """
 from unittest import TestCase
 import sys
+import os
+import threading
+import time as t
+
+import psutil
 
 import app.functions.constants as c
 
 sys.path.append(c.FUNCTIONS_APP)
-from app.functions.mkdocs_control import MkdocsControl
+from app.functions.mkdocs_builder import WarmBuilder
+from app.functions.mkdocs_control import MkdocsControl, RebuildScheduler
+
+TESTING_BUILDER_SOCKET = "/tmp/dcsp_mkdocs_control_test.sock"  # nosec B108
+
+
+def mkdocs_control():
+    return MkdocsControl(
+        c.TESTING_MKDOCS_CONTROL, WarmBuilder(TESTING_BUILDER_SOCKET, b"key")
+    )
 
 
 class MkdocsControlTest(TestCase):
@@ -17,25 +31,38 @@ class MkdocsControlTest(TestCase):
         MkdocsControl()
 
     def test_is_process_running_up(self):
-        mkdoc_control = MkdocsControl(c.TESTING_MKDOCS_CONTROL)
+        mkdoc_control = mkdocs_control()
         if not mkdoc_control.is_process_running():
             self.assertTrue(mkdoc_control.start(wait=True))
 
         self.assertTrue(mkdoc_control.is_process_running())
 
+    def test_start_no_mkdocs_serve(self):
+        mkdoc_control = mkdocs_control()
+        mkdoc_control.start(wait=True)
+        self.assertFalse(
+            os.path.isfile(f"{ c.TESTING_MKDOCS_CONTROL }mkdocs_serve.sh")
+        )
+        self.assertFalse(
+            any(
+                process.info["name"] == "mkdocs"
+                for process in psutil.process_iter(["name"])
+            )
+        )
+
     def test_is_process_running_down(self):
-        mkdoc_control = MkdocsControl(c.TESTING_MKDOCS_CONTROL)
+        mkdoc_control = mkdocs_control()
         mkdoc_control.stop(wait=True)
         self.assertFalse(mkdoc_control.is_process_running())
 
     def test_start(self):
-        mkdoc_control = MkdocsControl(c.TESTING_MKDOCS_CONTROL)
+        mkdoc_control = mkdocs_control()
         mkdoc_control.stop(wait=True)
         mkdoc_control.start(wait=True)
         self.assertTrue(mkdoc_control.is_process_running())
 
     def test_stop(self):
-        mkdoc_control = MkdocsControl(c.TESTING_MKDOCS_CONTROL)
+        mkdoc_control = mkdocs_control()
         mkdoc_control.start(wait=True)
         mkdoc_control.stop(wait=True)
         self.assertFalse(mkdoc_control.is_process_running())
@@ -43,5 +70,65 @@ class MkdocsControlTest(TestCase):
     @classmethod
     def tearDownClass(cls):
         pass
-        mkdoc_control = MkdocsControl(c.TESTING_MKDOCS_CONTROL)
+        mkdoc_control = mkdocs_control()
         mkdoc_control.stop(wait=True)
+
+
+class RebuildSchedulerTest(TestCase):
+    def setUp(self):
+        self.builds_running = 0
+        self.max_builds_running = 0
+        self.release_build = threading.Event()
+        self.release_build.set()
+
+    def build(self):
+        self.builds_running += 1
+        self.max_builds_running = max(
+            self.max_builds_running, self.builds_running
+        )
+        self.release_build.wait(5)
+        self.builds_running -= 1
+        return {"success": True}
+
+    def test_burst_coalesced(self):
+        scheduler = RebuildScheduler(self.build, window=0.1)
+        for n in range(20):
+            scheduler.notify(f"file{ n }.md")
+        self.assertTrue(scheduler.wait_idle(5))
+        self.assertEqual(scheduler.builds, 1)
+        self.assertEqual(len(scheduler.last_changes), 20)
+        self.assertEqual(scheduler.last_result, {"success": True})
+
+    def test_change_during_build_follow_up(self):
+        scheduler = RebuildScheduler(self.build, window=0.05)
+        self.release_build.clear()
+        scheduler.notify("file1.md")
+        while self.builds_running == 0:
+            t.sleep(0.01)
+        scheduler.notify("file2.md")
+        scheduler.notify("file3.md")
+        self.release_build.set()
+        self.assertTrue(scheduler.wait_idle(5))
+        self.assertEqual(scheduler.builds, 2)
+        self.assertEqual(scheduler.last_changes, {"file2.md", "file3.md"})
+        self.assertEqual(self.max_builds_running, 1)
+
+    def test_no_change_no_build(self):
+        scheduler = RebuildScheduler(self.build, window=0.05)
+        self.assertTrue(scheduler.wait_idle(0))
+        self.assertEqual(scheduler.builds, 0)
+
+    def test_build_error(self):
+        def failing_build():
+            raise RuntimeError("build failed")
+
+        scheduler = RebuildScheduler(failing_build, window=0.05)
+        scheduler.notify("file1.md")
+        self.assertTrue(scheduler.wait_idle(5))
+        self.assertFalse(scheduler.last_result["success"])
+
+    def test_shared_between_controls(self):
+        self.assertIs(
+            MkdocsControl(c.TESTING_MKDOCS_CONTROL).scheduler(),
+            MkdocsControl(c.TESTING_MKDOCS_CONTROL).scheduler(),
+        )
@@ -0,0 +1,106 @@
+"""Testing of settings_store.py
+
+"""
+
+from django.test import TestCase, override_settings
+from django.apps import apps
+import importlib
+import sys
+
+import app.functions.constants as c
+
+sys.path.append(c.FUNCTIONS_APP)
+from app.functions.settings_store import SettingsStore, clear_cache
+from app.functions.env_manipulation import ENVManipulator
+from app.models import Setting
+
+
+class SettingsStoreTest(TestCase):
+    def setUp(self):
+        clear_cache()
+        self.store = SettingsStore()
+
+    def test_read_not_set(self):
+        self.assertEqual(self.store.read("key1"), "")
+
+    def test_add_and_read(self):
+        self.store.add("key1", "value1")
+        self.assertEqual(self.store.read("key1"), "value1")
+        self.store.add("key1", "value2")
+        self.assertEqual(self.store.read("key1"), "value2")
+
+    def test_read_all(self):
+        self.store.add("key3", "value3")
+        self.store.add("key1", "value1")
+        self.store.add("Key2", "value2")
+        self.assertEqual(
+            list(self.store.read_all().items()),
+            [("key1", "value1"), ("Key2", "value2"), ("key3", "value3")],
+        )
+
+    def test_delete(self):
+        self.store.add("key1", "value1")
+        self.assertTrue(self.store.delete("key1"))
+        self.assertEqual(self.store.read("key1"), "")
+
+    def test_delete_not_present(self):
+        self.assertFalse(self.store.delete("wrong_key"))
+
+    def test_delete_all(self):
+        self.store.add("key1", "value1")
+        self.store.add("key2", "value2")
+        self.store.delete_all()
+        self.assertEqual(self.store.read_all(), {})
+
+    def test_batch_exception(self):
+        with self.assertRaises(ValueError):
+            with self.store.batch():
+                self.store.add("key1", "value1")
+                raise ValueError("Abandon batch")
+        self.assertEqual(self.store.read("key1"), "")
+
+    def test_cached(self):
+        self.store.add("key1", "value1")
+        self.store.read("key1")
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.store.read("key1"), "value1")
+
+    def test_change_by_other_worker(self):
+        self.store.add("key1", "value1")
+        self.store.read("key1")
+        Setting.objects.filter(key="key1").update(value="value2")
+        Setting.objects.create(key="key2", value="")
+        self.assertEqual(self.store.read("key1"), "value2")
+
+    def test_returns_copy(self):
+        self.store.add("key1", "value1")
+        self.store.read_all()["key1"] = "changed"
+        self.assertEqual(self.store.read("key1"), "value1")
+
+
+class ImportEnvSettingsTest(TestCase):
+    def setUp(self):
+        clear_cache()
+        self.migration = importlib.import_module(
+            "app.migrations.0002_import_env_settings"
+        )
+
+    @override_settings(TESTING=False, ENV_LOCATION=c.TESTING_ENV_PATH_GIT)
+    def test_import(self):
+        self.migration.import_env_settings(apps, None)
+        self.assertEqual(
+            SettingsStore().read_all(),
+            ENVManipulator(c.TESTING_ENV_PATH_GIT).read_all(),
+        )
+
+    @override_settings(TESTING=False, ENV_LOCATION=c.TESTING_ENV_PATH_GIT)
+    def test_import_keeps_existing(self):
+        SettingsStore().add("EMAIL", "kept@example.com")
+        self.migration.import_env_settings(apps, None)
+        self.assertEqual(SettingsStore().read("EMAIL"), "kept@example.com")
+
+    @override_settings(TESTING=True, ENV_LOCATION=c.TESTING_ENV_PATH_GIT)
+    def test_import_testing(self):
+        self.migration.import_env_settings(apps, None)
+        self.assertEqual(SettingsStore().read_all(), {})
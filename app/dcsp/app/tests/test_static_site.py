@@ -0,0 +1,94 @@
+"""Testing of static_site.py
+
+"""
+
+from unittest import TestCase
+import sys
+import os
+import shutil
+import tempfile
+
+import app.functions.constants as c
+
+sys.path.append(c.FUNCTIONS_APP)
+from app.functions.static_site import StaticSite
+
+
+class StaticSiteTest(TestCase):
+    def setUp(self):
+        self.site = StaticSite(c.TESTING_MKDOCS_SITE)
+
+    def test_is_built(self):
+        self.assertTrue(self.site.is_built())
+
+    def test_is_built_false(self):
+        self.assertFalse(StaticSite(c.TESTING_MKDOCS_DOCS).is_built())
+
+    def test_resolve_home(self):
+        self.assertEqual(
+            self.site.resolve(""),
+            os.path.realpath(f"{ c.TESTING_MKDOCS_SITE }index.html"),
+        )
+
+    def test_resolve_folder(self):
+        self.assertEqual(
+            self.site.resolve("about/"),
+            os.path.realpath(f"{ c.TESTING_MKDOCS_SITE }about/index.html"),
+        )
+
+    def test_resolve_missing(self):
+        with self.assertRaises(FileNotFoundError):
+            self.site.resolve("not_a_page/")
+
+    def test_resolve_outside_site(self):
+        with self.assertRaises(FileNotFoundError):
+            self.site.resolve("../mkdocs/mkdocs.yml")
+
+    def test_relative_path(self):
+        self.assertEqual(
+            self.site.relative_path(self.site.resolve("about/")),
+            "about/index.html",
+        )
+
+    def test_etag_stable(self):
+        file_path = self.site.resolve("")
+        self.assertEqual(self.site.etag(file_path), self.site.etag(file_path))
+        self.assertRegex(self.site.etag(file_path), r'^"[0-9a-f]{32}"$')
+
+    def test_etag_changes(self):
+        site_dir = tempfile.mkdtemp()
+        file_path = os.path.join(site_dir, "index.html")
+
+        try:
+            with open(file_path, "w") as file:
+                file.write("first")
+            first_etag = StaticSite(site_dir).etag(file_path)
+
+            with open(file_path, "w") as file:
+                file.write("second version")
+            self.assertNotEqual(
+                first_etag, StaticSite(site_dir).etag(file_path)
+            )
+        finally:
+            shutil.rmtree(site_dir)
+
+    def test_content_type(self):
+        self.assertEqual(self.site.content_type("index.html"), "text/html")
+        self.assertEqual(
+            self.site.content_type("file.unknown_extension"),
+            "application/octet-stream",
+        )
+
+    def test_cache_control_hashed(self):
+        self.assertEqual(
+            self.site.cache_control(
+                "assets/javascripts/bundle.1a2b3c4d.min.js"
+            ),
+            c.CACHE_CONTROL_IMMUTABLE,
+        )
+
+    def test_cache_control_not_hashed(self):
+        self.assertEqual(
+            self.site.cache_control("assets/stylesheets/extra.css"),
+            c.CACHE_CONTROL_REVALIDATE,
+        )
@@ -1,15 +1,20 @@
-from django.test import TestCase, tag, override_settings
+from asgiref.testing import ApplicationCommunicator
+from django.apps import apps
+from django.test import TestCase, TransactionTestCase, tag, override_settings
 from django.urls import reverse
 from django.conf import settings
-from unittest.mock import Mock, patch, call
+from unittest.mock import AsyncMock, Mock, patch, call
 
 import time as t
+import requests
 import sys
 import os
 import shutil
+import json
 from dotenv import dotenv_values
 
 import app.functions.constants as c
+from app.functions.constants import HazardLookup, PushStatus
 
 """settings.ENV_LOCATION = c.TESTING_ENV_PATH_DJANGO
 settings.GITHUB_REPO = c.TESTING_GITHUB_REPO
@@ -22,11 +27,19 @@ settings.START_AFRESH = True"""
 sys.path.append(c.FUNCTIONS_APP)
 
 from app.functions.env_manipulation import ENVManipulator
-from app.views import std_context
+from app.functions.git_control import GitController, clear_hazard_cache
+from app.functions.settings_store import SettingsStore
+from app.functions.hazard_webhook import signature
+from app.models import Hazard, HazardSync
+from app.views import std_context, jobs, site_build_job, site_file_response
+import app.views as views
 import app.tests.data_views as d
+import app.tests.data_hazard_webhook as dw
+from app.tests.fake_github import fake_github
+from dcsp.asgi import application
 
 
-@patch("app.forms.GitController")
+@patch("app.forms.AsyncGitController")
 def setup_level(self, level, mock_git_controller):
     if not isinstance(level, int):
         raise ValueError("Supplied level is not convertable into an integer")
@@ -37,7 +50,7 @@ def setup_level(self, level, mock_git_controller):
         sys.exit(1)
 
     if level >= 1:
-        mock_git_controller_instance = Mock()
+        mock_git_controller_instance = AsyncMock()
         mock_git_controller.return_value = mock_git_controller_instance
         mock_git_controller_instance.check_github_credentials.return_value = (
             d.CREDENTIALS_CHECK_REPO_EXISTS
@@ -70,6 +83,16 @@ def installation_variables():
     return env_for_post
 
 
+def store_env_variables(env_path):
+    settings_store = SettingsStore()
+    em = ENVManipulator(env_path)
+
+    with settings_store.batch():
+        for key, value in em.read_all().items():
+            settings_store.add(key, value)
+    return
+
+
 def env_variables():
     em = ENVManipulator(c.TESTING_ENV_PATH_GIT)
     all_variables = em.read_all()
@@ -117,9 +140,9 @@ class IndexTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, "installation_method.html")
 
-    @patch("app.forms.GitController")
+    @patch("app.forms.AsyncGitController")
     def test_installation_post_good_data(self, mock_git_controller):
-        mock_git_controller_instance = Mock()
+        mock_git_controller_instance = AsyncMock()
         mock_git_controller.return_value = mock_git_controller_instance
         mock_git_controller_instance.check_github_credentials.return_value = (
             d.CREDENTIALS_CHECK_REPO_EXISTS
@@ -132,7 +155,7 @@ class IndexTest(TestCase):
         _, calls_git_controller = mock_git_controller.call_args
         self.assertEqual(calls_git_controller, env_variables())
 
-        mock_git_controller_instance.check_github_credentials.assert_called_once()
+        mock_git_controller_instance.check_github_credentials.assert_awaited_once()
         (
             _,
             calls_git_controller_instance,
@@ -146,9 +169,9 @@ class IndexTest(TestCase):
         self.assertTemplateUsed(response, "template_select.html")"""
 
     #
-    @patch("app.forms.GitController")
+    @patch("app.forms.AsyncGitController")
     def test_installation_post_template_correct(self, mock_git_controller):
-        mock_git_controller_instance = Mock()
+        mock_git_controller_instance = AsyncMock()
         mock_git_controller.return_value = mock_git_controller_instance
         mock_git_controller_instance.check_github_credentials.return_value = (
             d.CREDENTIALS_CHECK_REPO_EXISTS
@@ -226,6 +249,17 @@ class IndexTest(TestCase):
         self.test_template_post_good_data()
         response = self.client.post("/", d.PLACEHOLDERS_GOOD_DATA)
         self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'action="/site/" method="get"')
+        self.assertNotContains(response, "localhost:9000")
+
+    @override_settings(AUTO_COMMIT=True)
+    @patch("app.views.auto_committer")
+    def test_placeholders_post_auto_commit(self, mock_auto_committer):
+        self.test_template_post_good_data()
+        self.client.post("/", d.PLACEHOLDERS_GOOD_DATA)
+        mock_auto_committer.return_value.record.assert_called_once_with(
+            c.TESTING_MKDOCS_PLACEHOLDERS_YAML
+        )
 
     # TODO
     def test_post_good_data_message(self):
@@ -334,6 +368,41 @@ class MdSavedTest(TestCase):
         self.assertEqual(response2.status_code, 200)
         self.assertTemplateUsed(response2, "md_edit.html")
 
+    @patch("app.views.auto_committer")
+    def test_auto_commit_off(self, mock_auto_committer):
+        setup_level(self, 2)
+        self.client.post("/md_saved", d.MD_SAVED_GOOD_DATA)
+        mock_auto_committer.assert_not_called()
+
+    @override_settings(AUTO_COMMIT=True)
+    @patch("app.views.auto_committer")
+    def test_auto_commit_recorded(self, mock_auto_committer):
+        setup_level(self, 2)
+        self.client.post("/md_saved", d.MD_SAVED_GOOD_DATA)
+        mock_auto_committer.return_value.record.assert_called_once_with(
+            d.MD_SAVED_TEMPLATE_FILE_PATH
+        )
+
+    @patch("app.views.auto_committer")
+    def test_auto_commit_off_at_ready(self, mock_auto_committer):
+        apps.get_app_config("app").ready()
+        mock_auto_committer.assert_not_called()
+
+    @override_settings(AUTO_COMMIT=True)
+    @patch("app.views.auto_committer")
+    def test_auto_commit_started_at_ready(self, mock_auto_committer):
+        apps.get_app_config("app").ready()
+        mock_auto_committer.assert_called_once_with()
+
+    @patch("app.views.GitController")
+    def test_push_saved_docs_paths(self, mock_git_controller):
+        mock_git_controller.return_value.repo_path_local = "/repo"
+        views.push_saved_docs("Update a.md", ["/repo/docs/docs/a.md"])
+
+        mock_git_controller.return_value.commit_and_push.assert_called_once_with(
+            "Update a.md", paths=["docs/docs/a.md"]
+        )
+
     # TODO
     def test_post_good_data_message(self):
         pass
@@ -365,7 +434,7 @@ class HazardLogTest(TestCase):
         pass  # TODO - needs finishing
 
     def test_hazard_log_get_template_correct(self):
-        shutil.copyfile(c.TESTING_ENV_PATH_GIT, c.TESTING_ENV_PATH_DJANGO)
+        store_env_variables(c.TESTING_ENV_PATH_GIT)
         response = self.client.get("/hazard_log")
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, "hazard_log.html")
@@ -374,10 +443,24 @@ class HazardLogTest(TestCase):
         pass
 
 
-@tag("git")
 class HazardCommentTest(TestCase):
     def setUp(self):
         setup_level(self, 3)
+        clear_hazard_cache()
+        self.addCleanup(clear_hazard_cache)
+        gc = GitController()
+        context = fake_github()
+        self.github = context.__enter__()
+        self.addCleanup(context.__exit__, None, None, None)
+        self.github.add_user(gc.github_username)
+        self.github.add_repo(
+            gc.repo_domain_name(), gc.github_repo, labels=["hazard"]
+        )
+        self.number = self.github.add_issue(
+            f"{ gc.repo_domain_name() }/{ gc.github_repo }",
+            "A hazard",
+            labels=["hazard"],
+        )
 
     def test_hazard_comment_method_bad(self):
         response = self.client.delete("/hazard_comment/1")
@@ -398,15 +481,12 @@ class HazardCommentTest(TestCase):
         self.assertTemplateUsed(response, "400.html")
 
     def test_hazard_comment_get(self):
-        response = self.client.get(
-            f"/hazard_comment/{ c.TESTING_CURRENT_ISSUE  }"
-        )
+        response = self.client.get(f"/hazard_comment/{ self.number }")
         self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "A hazard")
 
     def test_hazard_comment_get_template_correct(self):
-        response = self.client.get(
-            f"/hazard_comment/{ c.TESTING_CURRENT_ISSUE  }"
-        )
+        response = self.client.get(f"/hazard_comment/{ self.number }")
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, "hazard_comment.html")
 
@@ -427,8 +507,330 @@ class HazardCommentTest(TestCase):
         pass
 
 
+@patch.dict(os.environ, {"GITHUB_WEBHOOK_SECRET": dw.SECRET})
+class GithubWebhookTest(TestCase):
+    def post(self, payload, event="issues", secret=dw.SECRET):
+        body = json.dumps(payload).encode()
+        return self.client.post(
+            "/github_webhook",
+            body,
+            content_type="application/json",
+            headers={
+                "X-GitHub-Event": event,
+                "X-Hub-Signature-256": signature(secret, body),
+            },
+        )
+
+    def test_github_webhook(self):
+        HazardSync.objects.create(repo=dw.REPO)
+        response = self.post(dw.issues_payload("opened"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"outcome": "updated"})
+        self.assertEqual(Hazard.objects.get().title, "Hazard 1")
+
+    def test_github_webhook_signature_bad(self):
+        response = self.post(dw.issues_payload(), secret="wrong")
+
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Hazard.objects.count(), 0)
+
+    def test_github_webhook_payload_bad(self):
+        response = self.post({"action": "edited"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_github_webhook_bad_method(self):
+        response = self.client.get("/github_webhook")
+        self.assertEqual(response.status_code, 405)
+
+    @patch.dict(os.environ, {"GITHUB_WEBHOOK_SECRET": ""})
+    def test_github_webhook_no_secret(self):
+        response = self.post(dw.issues_payload(), secret="")
+        self.assertEqual(response.status_code, 404)
+
+
 class HazardsOpenTest(TestCase):
-    pass
+    def setUp(self):
+        store_env_variables(c.TESTING_ENV_PATH_GIT)
+
+    def test_hazards_open_bad_method(self):
+        response = self.client.delete("/hazards_open")
+        self.assertEqual(response.status_code, 405)
+
+    @patch("app.functions.git_control.GitController.hazards_updated")
+    def test_hazards_open_first_sync(self, mock_hazards_updated):
+        mock_hazards_updated.return_value = iter(d.HAZARDS_UPDATED)
+        response = self.client.get("/hazards_open")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "hazards_open.html")
+        self.assertEqual(response.context["hazards_open"], d.HAZARDS_OPEN)
+        self.assertIsNotNone(response.context["hazards_synced"])
+        mock_hazards_updated.assert_called_once_with(None)
+
+    @patch("app.functions.git_control.GitController.hazards_updated")
+    def test_hazards_open_from_store(self, mock_hazards_updated):
+        mock_hazards_updated.return_value = iter(d.HAZARDS_UPDATED)
+        self.client.get("/hazards_open")
+        response = self.client.get("/hazards_open")
+
+        self.assertEqual(response.context["hazards_open"], d.HAZARDS_OPEN)
+        mock_hazards_updated.assert_called_once()
+
+    @patch("app.functions.git_control.GitController.hazards_updated")
+    def test_hazards_open_stale(self, mock_hazards_updated):
+        mock_hazards_updated.side_effect = [iter(d.HAZARDS_UPDATED), iter([])]
+        self.client.get("/hazards_open")
+        HazardSync.objects.update(synced=d.SYNCED_LONG_AGO)
+        self.client.get("/hazards_open")
+
+        self.assertEqual(mock_hazards_updated.call_count, 2)
+        self.assertIsNotNone(mock_hazards_updated.call_args_list[1][0][0])
+
+    @patch("app.functions.git_control.GitController.hazards_updated")
+    def test_hazards_open_sync_error(self, mock_hazards_updated):
+        mock_hazards_updated.side_effect = ValueError("Error with repo")
+        response = self.client.get("/hazards_open")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["hazards_open"], [])
+        self.assertIsNone(response.context["hazards_synced"])
+
+    @patch("app.views.jobs")
+    def test_hazards_open_first_sync_pending(self, mock_jobs):
+        mock_jobs.return_value.submit.return_value = "job-1"
+        mock_jobs.return_value.status.return_value = {
+            "status": c.JobStatus.RUNNING.value
+        }
+        response = self.client.get("/hazards_open", {"text": "dose"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "job_status.html")
+        self.assertEqual(response.context["job_id"], "job-1")
+        self.assertEqual(
+            response.context["next_url"], "/hazards_open?text=dose"
+        )
+
+    @patch("app.functions.git_control.GitController.hazards_updated")
+    def test_hazards_open_filtered(self, mock_hazards_updated):
+        mock_hazards_updated.return_value = iter(d.HAZARDS_UPDATED_MANY)
+        response = self.client.get(
+            "/hazards_open", {"label": "hazard", "text": "dose", "page": 2}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [hazard["number"] for hazard in response.context["hazards_open"]],
+            list(range(2 * c.HAZARDS_PER_PAGE + 1, 4 * c.HAZARDS_PER_PAGE, 2)),
+        )
+        self.assertEqual(
+            response.context["hazards_page"],
+            {"page": 2, "pages": 3, "count": 2 * c.HAZARDS_PER_PAGE + 1},
+        )
+        self.assertEqual(
+            response.context["page_query"], "label=hazard&text=dose"
+        )
+        self.assertContains(response, "label=hazard&amp;text=dose&page=3")
+
+    @patch("app.functions.git_control.GitController.hazards_updated")
+    def test_hazards_open_filter_bad(self, mock_hazards_updated):
+        mock_hazards_updated.return_value = iter(d.HAZARDS_UPDATED)
+        response = self.client.get("/hazards_open", {"label": "not-a-label"})
+
+        self.assertEqual(response.context["hazards_open"], d.HAZARDS_OPEN)
+        self.assertFalse(response.context["filter_form"].is_valid())
+
+    @patch("app.functions.git_control.GitController.hazards_updated")
+    async def test_hazards_open_stream(self, mock_hazards_updated):
+        mock_hazards_updated.return_value = iter(d.HAZARDS_UPDATED_MANY)
+        response = await self.async_client.get(
+            "/hazards_open", {"risk": "risk-level-2-acceptable", "stream": 1}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response.is_async)
+        content = b"".join(
+            [chunk async for chunk in response.streaming_content]
+        ).decode()
+        self.assertIn("Open hazards", content)
+        self.assertIn('/hazard_comment/2"', content)
+        self.assertNotIn('/hazard_comment/1"', content)
+        self.assertEqual(
+            content.count("Add comment to hazard"), 2 * c.HAZARDS_PER_PAGE
+        )
+        self.assertTrue(content.rstrip().endswith("</html>"))
+
+    @patch("app.functions.git_control.GitController.hazards_updated")
+    def test_hazards_open_refresh(self, mock_hazards_updated):
+        mock_hazards_updated.side_effect = [iter(d.HAZARDS_UPDATED), iter([])]
+        self.client.get("/hazards_open")
+        response = self.client.post("/hazards_open")
+
+        self.assertRedirects(response, "/hazards_open")
+        self.assertEqual(mock_hazards_updated.call_count, 2)
+
+
+class HazardsOpenAsgiTest(TransactionTestCase):
+    """Through the ASGI application, which runs the ORM on its own threads"""
+
+    def setUp(self):
+        store_env_variables(c.TESTING_ENV_PATH_GIT)
+
+    @patch("app.functions.git_control.GitController.hazards_updated")
+    async def test_hazards_open_stream_asgi(self, mock_hazards_updated):
+        mock_hazards_updated.return_value = iter(d.HAZARDS_UPDATED_MANY)
+        messages = []
+        communicator = ApplicationCommunicator(
+            application,
+            {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": "/hazards_open",
+                "raw_path": b"/hazards_open",
+                "query_string": b"risk=risk-level-2-acceptable&stream=1",
+                "root_path": "",
+                "headers": [(b"host", b"testserver")],
+                "client": ("127.0.0.1", 50000),
+                "server": ("testserver", 80),
+            },
+        )
+        await communicator.send_input(
+            {"type": "http.request", "body": b"", "more_body": False}
+        )
+
+        self.assertEqual((await communicator.receive_output(5))["status"], 200)
+        messages.append(await communicator.receive_output(5))
+        while messages[-1].get("more_body"):
+            messages.append(await communicator.receive_output(5))
+
+        # Sent a hazard at a time, not read into one body first
+        self.assertGreater(len(messages), 2 * c.HAZARDS_PER_PAGE)
+        self.assertTrue(
+            b"".join([message.get("body", b"") for message in messages])
+            .rstrip()
+            .endswith(b"</html>")
+        )
+
+
+class HazardCommentLookupTest(TestCase):
+    def setUp(self):
+        store_env_variables(c.TESTING_ENV_PATH_GIT)
+
+    @patch("app.functions.git_control.AsyncGitController.hazard")
+    def test_hazard_comment_get(self, mock_hazard):
+        mock_hazard.return_value = d.HAZARD
+        response = self.client.get("/hazard_comment/1")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "hazard_comment.html")
+        self.assertEqual(response.context["hazard_open"], d.HAZARDS_OPEN[0])
+        self.assertEqual(response.context["comments"], d.HAZARD["comments"])
+        mock_hazard.assert_called_once_with(1)
+
+    @patch("app.functions.git_control.AsyncGitController.hazard")
+    def test_hazard_comment_not_found(self, mock_hazard):
+        mock_hazard.return_value = HazardLookup.NOT_FOUND
+        response = self.client.get("/hazard_comment/1")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertTemplateUsed(response, "400.html")
+
+    @patch("app.functions.git_control.AsyncGitController.hazard")
+    def test_hazard_comment_closed(self, mock_hazard):
+        mock_hazard.return_value = d.HAZARD | {"state": "closed"}
+        response = self.client.get("/hazard_comment/1")
+
+        self.assertEqual(response.status_code, 400)
+
+    @patch("app.views.HazardStore")
+    @patch("app.functions.git_control.AsyncGitController.hazard")
+    def test_hazard_comment_github_unavailable(
+        self, mock_hazard, mock_hazard_store
+    ):
+        mock_hazard.side_effect = requests.exceptions.ConnectionError()
+        mock_hazard_store.return_value.hazard.return_value = {
+            key: value for key, value in d.HAZARD.items() if key != "comments"
+        }
+        response = self.client.get("/hazard_comment/1")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["hazard_open"], d.HAZARDS_OPEN[0])
+        self.assertEqual(response.context["comments"], [])
+        mock_hazard_store.return_value.hazard.assert_called_once_with(1)
+
+    @patch(
+        "app.functions.git_control.AsyncGitController.add_comment_to_hazard"
+    )
+    def test_hazard_comment_post_error(self, mock_add_comment_to_hazard):
+        mock_add_comment_to_hazard.side_effect = ValueError(
+            "Error with accessing repo"
+        )
+        response = self.client.post(
+            "/hazard_comment/1", {"comment": "A comment"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "hazard_comment.html")
+        self.assertContains(response, "Error with accessing repo")
+        mock_add_comment_to_hazard.assert_awaited_once_with(
+            hazard_number=1, comment="A comment"
+        )
+
+    @patch("app.functions.git_control.AsyncGitController.hazard")
+    def test_hazard_comment_error(self, mock_hazard):
+        mock_hazard.side_effect = ValueError("Error with accessing repo")
+        response = self.client.get("/hazard_comment/1")
+
+        self.assertEqual(response.status_code, 500)
+        self.assertTemplateUsed(response, "500.html")
+
+
+class UploadToGithubTest(TestCase):
+    def setUp(self):
+        store_env_variables(c.TESTING_ENV_PATH_GIT)
+
+    @patch("app.functions.git_control.GitController.commit_and_push")
+    def test_upload_pushed(self, mock_commit_and_push):
+        mock_commit_and_push.return_value = d.PUSH_OUTCOME
+        response = self.client.post(
+            "/upload_to_github", {"comment": "A comment"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(
+            response,
+            "Uploaded to Github with a comment of &#x27;A comment&#x27; "
+            "(2 file(s) changed)",
+        )
+        mock_commit_and_push.assert_called_once_with("A comment")
+
+    @patch("app.functions.git_control.GitController.commit_and_push")
+    def test_upload_nothing_to_commit(self, mock_commit_and_push):
+        mock_commit_and_push.return_value = d.PUSH_OUTCOME | {
+            "status": PushStatus.NOTHING_TO_COMMIT.value,
+            "commit": None,
+        }
+        response = self.client.post(
+            "/upload_to_github", {"comment": "A comment"}
+        )
+
+        self.assertContains(response, "No changes to upload to Github")
+
+    @patch("app.functions.git_control.GitController.commit_and_push")
+    def test_upload_rejected(self, mock_commit_and_push):
+        mock_commit_and_push.return_value = d.PUSH_OUTCOME | {
+            "status": PushStatus.REJECTED.value,
+            "summary": "[rejected] (fetch first)",
+        }
+        response = self.client.post(
+            "/upload_to_github", {"comment": "A comment"}
+        )
+
+        self.assertContains(response, "[rejected] (fetch first)")
 
 
 class MkdocsRedirectTest(TestCase):
@@ -442,6 +844,146 @@ class MkdocsRedirectTest(TestCase):
     def test_get_home(self):
         response = self.client.get("/mkdoc_redirect/home")
         self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.url, "/site/")
+
+    def test_get_page(self):
+        response = self.client.get("/mkdoc_redirect/about")
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.url, "/site/about")
+
+
+class MkdocsSiteTest(TestCase):
+    def test_bad_method(self):
+        response = self.client.post("/site/")
+        self.assertEqual(response.status_code, 405)
+
+    def test_get_home(self):
+        response = self.client.get("/site/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"Test site", b"".join(response.streaming_content))
+        self.assertEqual(response["Content-Type"], "text/html")
+        self.assertEqual(response["Cache-Control"], c.CACHE_CONTROL_REVALIDATE)
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+
+    def test_head(self):
+        response = self.client.head("/site/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_folder_redirect(self):
+        response = self.client.get("/site/about")
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.url, "/site/about/")
+
+    def test_not_found(self):
+        response = self.client.get("/site/not_a_page/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_outside_site(self):
+        response = self.client.get("/site/../mkdocs/mkdocs.yml")
+        self.assertEqual(response.status_code, 404)
+
+    def test_not_modified(self):
+        etag = self.client.get("/site/about/")["ETag"]
+        response = self.client.get("/site/about/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_modified(self):
+        response = self.client.get(
+            "/site/about/", HTTP_IF_NONE_MATCH='"not the etag"'
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_hashed_asset(self):
+        response = self.client.get(
+            "/site/assets/javascripts/bundle.1a2b3c4d.min.js"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], c.CACHE_CONTROL_IMMUTABLE)
+
+    @override_settings(SENDFILE_BACKEND="x-accel-redirect")
+    def test_x_accel_redirect(self):
+        response = self.client.get("/site/assets/stylesheets/extra.css")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(
+            response["X-Accel-Redirect"],
+            f"{ settings.SENDFILE_URL_PREFIX }assets/stylesheets/extra.css",
+        )
+
+    @override_settings(SENDFILE_BACKEND="x-sendfile")
+    def test_x_sendfile(self):
+        response = self.client.get("/site/assets/stylesheets/extra.css")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response["X-Sendfile"],
+            os.path.realpath(
+                f"{ c.TESTING_MKDOCS_SITE }assets/stylesheets/extra.css"
+            ),
+        )
+
+    @override_settings(SENDFILE_BACKEND="x-accel-redirect")
+    def test_x_accel_redirect_quoted(self):
+        site = Mock()
+        site.relative_path.return_value = "hazards/Hazard log é.html"
+        site.content_type.return_value = "text/html"
+
+        response = site_file_response(site, "/site/hazards/Hazard log é.html")
+        self.assertEqual(
+            response["X-Accel-Redirect"],
+            f"{ settings.SENDFILE_URL_PREFIX }hazards/Hazard%20log%20%C3%A9.html",
+        )
+
+
+class SiteBuildJobTest(TestCase):
+    def setUp(self):
+        views._site_build_job_id = ""
+
+    def tearDown(self):
+        views._site_build_job_id = ""
+
+    @patch("app.views.jobs")
+    def test_pending_shared(self, mock_jobs):
+        mock_jobs.return_value.submit.side_effect = ["job-1", "job-2"]
+        mock_jobs.return_value.is_done.return_value = False
+
+        self.assertEqual(site_build_job(), "job-1")
+        self.assertEqual(site_build_job(), "job-1")
+        mock_jobs.return_value.submit.assert_called_once()
+
+    @patch("app.views.jobs")
+    def test_done_new_build(self, mock_jobs):
+        mock_jobs.return_value.submit.side_effect = ["job-1", "job-2"]
+        mock_jobs.return_value.is_done.return_value = True
+
+        self.assertEqual(site_build_job(), "job-1")
+        self.assertEqual(site_build_job(), "job-2")
+
+    @patch("app.views.jobs")
+    def test_forgotten_new_build(self, mock_jobs):
+        mock_jobs.return_value.submit.side_effect = ["job-1", "job-2"]
+        mock_jobs.return_value.is_done.side_effect = KeyError("job-1")
+
+        self.assertEqual(site_build_job(), "job-1")
+        self.assertEqual(site_build_job(), "job-2")
+
+
+class JobStatusTest(TestCase):
+    def test_bad_method(self):
+        response = self.client.post("/job_status/a_job")
+        self.assertEqual(response.status_code, 405)
+
+    def test_job_unknown(self):
+        response = self.client.get("/job_status/a_job")
+        self.assertEqual(response.status_code, 404)
+
+    def test_job_status(self):
+        job_id = jobs().submit("A test job", lambda: True)
+        response = self.client.get(f"/job_status/{ job_id }")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "finished")
+        self.assertEqual(response.json()["result"], True)
 
 
 class UpLoadToGithubTest(TestCase):
@@ -494,22 +1036,15 @@ class StartAfreshEnabledTest(TestCase):
         self.assertEqual(response.status_code, 405)
 
     def test_start_afresh_with_nothing_running(self):
-        if not os.path.isfile(c.TESTING_ENV_PATH_DJANGO):
-            self.assertTrue(False)
-
-        f = open(c.TESTING_ENV_PATH_DJANGO, "r")
-        self.assertEqual(f.read(), "")
+        self.assertEqual(SettingsStore().read_all(), {})
 
     def test_start_afresh_with_everything_running(self):
         setup_level(self, 3)
-        if not os.path.isfile(c.TESTING_ENV_PATH_DJANGO):
-            self.assertTrue(False)
 
-        em_django = ENVManipulator(c.TESTING_ENV_PATH_DJANGO)
         em_git = ENVManipulator(c.TESTING_ENV_PATH_GIT)
         git_env_dict = em_git.read_all()
         git_env_dict["setup_step"] = "3"
-        self.assertEqual(em_django.read_all(), git_env_dict)
+        self.assertEqual(SettingsStore().read_all(), git_env_dict)
 
     @classmethod
     def tearDownClass(cls):
@@ -537,22 +1072,15 @@ class StartAfreshDisabledTest(TestCase):
         self.assertEqual(response.status_code, 405)
 
     def test_start_afresh_with_nothing_running(self):
-        if not os.path.isfile(c.TESTING_ENV_PATH_DJANGO):
-            self.assertTrue(False)
-
-        f = open(c.TESTING_ENV_PATH_DJANGO, "r")
-        self.assertEqual(f.read(), "")
+        self.assertEqual(SettingsStore().read_all(), {})
 
     def test_start_afresh_with_everything_running(self):
         setup_level(self, 3)
-        if not os.path.isfile(c.TESTING_ENV_PATH_DJANGO):
-            self.assertTrue(False)
 
-        em_django = ENVManipulator(c.TESTING_ENV_PATH_DJANGO)
         em_git = ENVManipulator(c.TESTING_ENV_PATH_GIT)
         git_env_dict = em_git.read_all()
         git_env_dict["setup_step"] = "3"
-        self.assertEqual(em_django.read_all(), git_env_dict)
+        self.assertEqual(SettingsStore().read_all(), git_env_dict)
 
     @classmethod
     def tearDownClass(cls):
@@ -5,9 +5,12 @@ from django.views.generic.base import RedirectView
 from app import views
 
 """URL patterns
+
+The async views are typed as returning coroutines, which the stubs for path
+do not allow for, though Django serves them.
 """
 urlpatterns = [
-    path("", views.index, name="index"),
+    path("", views.index, name="index"),  # type: ignore[arg-type]
     path(
         "start_afresh",
         views.start_afresh,
@@ -16,18 +19,30 @@ urlpatterns = [
     path("md_edit", views.md_edit, name="md_edit"),
     path("md_saved", views.md_saved, name="md_saved"),
     path("md_new", views.md_new, name="md_new"),
-    path("hazard_log", views.hazard_log, name="hazard_log"),
+    path(
+        "hazard_log",
+        views.hazard_log,  # type: ignore[arg-type]
+        name="hazard_log",
+    ),
     path(
         "hazard_comment/<hazard_number>",
-        views.hazard_comment,
+        views.hazard_comment,  # type: ignore[arg-type]
         name="hazard_comment",
     ),
-    path("hazards_open", views.hazards_open, name="hazards_open"),
+    path(
+        "hazards_open",
+        views.hazards_open,  # type: ignore[arg-type]
+        name="hazards_open",
+    ),
+    path("github_webhook", views.github_webhook, name="github_webhook"),
     path(
         "mkdoc_redirect",
         RedirectView.as_view(url="mkdoc_redirect/home", permanent=False),
         name="mkdoc_redirect_home",
     ),
     path("mkdoc_redirect/<path>", views.mkdoc_redirect, name="mkdoc_redirect"),
+    path("site/", views.mkdoc_site, name="mkdoc_site_home"),
+    path("site/<path:path>", views.mkdoc_site, name="mkdoc_site"),
     path("upload_to_github", views.upload_to_github, name="upload_to_github"),
+    path("job_status/<job_id>", views.job_status, name="job_status"),
 ]
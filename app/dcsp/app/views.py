@@ -6,42 +6,88 @@ mkdocs
 
 Functions:
     index: placeholder
+    index_step: placeholder
     md_edit: placeholder
     md_saved: placeholder
     md_new: placeholder
     hazard_log: placeholder
     hazard_comment: placeholder
     hazards_open: placeholder
+    github_webhook: placeholder
     mkdoc_redirect: placeholder
+    mkdoc_site: placeholder
     upload_to_github: placeholder
+    push_message: placeholder
+    job_status: placeholder
     setup_step: placeholder
     std_context: placeholder
+    async_render: placeholder
+    hazards_open_stream: placeholder
+    jobs: placeholder
+    job_pending_response: placeholder
     start_afresh: placeholder
+    reset_installation: placeholder
+    copy_template: placeholder
+    docs_changed: placeholder
+    docs_saved: placeholder
+    auto_committer: placeholder
+    push_saved_docs: placeholder
+    build_site: placeholder
+    site_build_job: placeholder
+    site_file_response: placeholder
     custom_404: placeholder
     custom_405: placeholder
 """
 from django.shortcuts import render, redirect
-from django.http import HttpResponse, HttpRequest
+from django.http import (
+    HttpResponse,
+    HttpRequest,
+    JsonResponse,
+    FileResponse,
+    QueryDict,
+    StreamingHttpResponse,
+)
+from django.http.response import HttpResponseBase
+from django.template.loader import get_template, render_to_string
+from django.views.decorators.csrf import csrf_exempt
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from django.contrib import messages
 from django.conf import settings
+from asgiref.sync import sync_to_async
 
 import os
 import sys
 from fnmatch import fnmatch
 from dotenv import find_dotenv, dotenv_values
 import shutil
-from typing import Any, TextIO
+import threading
+from typing import Any, AsyncIterator, Iterator, TextIO
+import uuid
+import json
+import requests
+from urllib.parse import quote
 
 # from collections.abc import Buffer
 
 import app.functions.constants as c
-from app.functions.constants import EnvKeysPH
+from app.functions.constants import (
+    EnvKeysPH,
+    HazardLookup,
+    JobStatus,
+    PushStatus,
+)
 
 sys.path.append(c.FUNCTIONS_APP)
-from app.functions.env_manipulation import ENVManipulator
+from app.functions.settings_store import SettingsStore
 from app.functions.mkdocs_control import MkdocsControl
 from app.functions.docs_builder import Builder
-from app.functions.git_control import GitController
+from app.functions.git_control import GitController, AsyncGitController
+from app.functions.hazard_store import HazardStore
+from app.functions.hazard_webhook import HazardWebhook
+from app.functions.job_queue import JobQueue, job_queue
+from app.functions.auto_commit import AutoCommit, auto_commit
+from app.functions.static_site import StaticSite
 
 
 from .forms import (
@@ -53,20 +99,21 @@ from .forms import (
     LogHazardForm,
     UploadToGithubForm,
     HazardCommentForm,
+    HazardFilterForm,
 )
 
 
-def index(request: HttpRequest) -> HttpResponse:
+async def index(request: HttpRequest) -> HttpResponse:
     """Index page, carrying out steps to initialise a static site
 
     Acting as a single page application, this function undertakes several
     steps to set up the mkdocs static site. The state of the installation is
-    stored in an .env file as 'setup_step'. There are 4 steps in the
+    stored in the settings store as 'setup_step'. There are 4 steps in the
     installation process (labelled steps None, 1, 2 and 3).
 
     - None: Initial step for the installation process. No value stored for the
-    step_step in the .env file. During this step the user is asked if they want
-    a 'stand alone' or an 'integrated' installation.
+    step_step in the settings store. During this step the user is asked if they
+    want a 'stand alone' or an 'integrated' installation.
         - Stand alone: this setup is very the DCSP app is only used for hazard
           documentation, with no source code integration. Basically the version
           control is managed by the DCSP app.
@@ -79,8 +126,33 @@ def index(request: HttpRequest) -> HttpResponse:
     - 3: The static site is now built and mkdocs has been started and the site
          should be visible.
 
+    The GitHub credentials entered in the first step are checked on the event
+    loop. The steps themselves are carried out by index_step.
+
+    Args:
+        request (HttpRequest): request from user
+
+    Returns:
+        HttpResponse: for loading the correct webpage
+    """
+    installation_form: InstallationForm | None = None
+
+    if request.method == "POST" and await sync_to_async(setup_step_get)() == 0:
+        installation_form = InstallationForm(request.POST)
+        await installation_form.ais_valid()
+
+    return await sync_to_async(index_step)(request, installation_form)
+
+
+def index_step(
+    request: HttpRequest, installation_form: InstallationForm | None = None
+) -> HttpResponse:
+    """Carries out the current step of the installation, for index
+
     Args:
         request (HttpRequest): request from user
+        installation_form (InstallationForm | None): form posted for the first
+                                                     step, already validated.
 
     Returns:
         HttpResponse: for loading the correct webpage
@@ -91,14 +163,16 @@ def index(request: HttpRequest) -> HttpResponse:
     setup_step: int = 0
     template_choice: str = ""
     form: InstallationForm | TemplateSelectForm | PlaceholdersForm
-    env_m: ENVManipulator
+    settings_store: SettingsStore
     mkdocs: MkdocsControl
     doc_build: Builder
+    job_id: str = ""
+    pending_response: HttpResponse | None
 
     if not (request.method == "POST" or request.method == "GET"):
         return render(request, "405.html", std_context(), status=405)
 
-    env_m = ENVManipulator(settings.ENV_LOCATION)
+    settings_store = SettingsStore()
     setup_step = setup_step_get()
 
     if setup_step == 0:
@@ -110,29 +184,32 @@ def index(request: HttpRequest) -> HttpResponse:
             )
 
         elif request.method == "POST":
-            form = InstallationForm(request.POST)
+            if installation_form is None:
+                installation_form = InstallationForm(request.POST)
+            form = installation_form
             if form.is_valid():
-                env_m.add(
-                    EnvKeysPH.GITHUB_USERNAME.value,
-                    form.cleaned_data["github_username_SA"],
-                )
-                env_m.add(
-                    EnvKeysPH.EMAIL.value,
-                    form.cleaned_data["email_SA"],
-                )
-                env_m.add(
-                    EnvKeysPH.GITHUB_ORGANISATION.value,
-                    form.cleaned_data["github_organisation_SA"],
-                )
-                env_m.add(
-                    EnvKeysPH.GITHUB_REPO.value,
-                    form.cleaned_data["github_repo_SA"],
-                )
-                env_m.add(
-                    EnvKeysPH.GITHUB_TOKEN.value,
-                    form.cleaned_data["github_token_SA"],
-                )
-                env_m.add("setup_step", "1")
+                with settings_store.batch():
+                    settings_store.add(
+                        EnvKeysPH.GITHUB_USERNAME.value,
+                        form.cleaned_data["github_username_SA"],
+                    )
+                    settings_store.add(
+                        EnvKeysPH.EMAIL.value,
+                        form.cleaned_data["email_SA"],
+                    )
+                    settings_store.add(
+                        EnvKeysPH.GITHUB_ORGANISATION.value,
+                        form.cleaned_data["github_organisation_SA"],
+                    )
+                    settings_store.add(
+                        EnvKeysPH.GITHUB_REPO.value,
+                        form.cleaned_data["github_repo_SA"],
+                    )
+                    settings_store.add(
+                        EnvKeysPH.GITHUB_TOKEN.value,
+                        form.cleaned_data["github_token_SA"],
+                    )
+                    settings_store.add("setup_step", "1")
 
                 messages.success(request, "Initialisation selections stored")
 
@@ -161,17 +238,24 @@ def index(request: HttpRequest) -> HttpResponse:
         elif request.method == "POST":
             form = TemplateSelectForm(request.POST)  # type: ignore[assignment]
             if form.is_valid():
-                env_m.add("setup_step", "2")
+                settings_store.add("setup_step", "2")
                 template_choice = form.cleaned_data["template_choice"]
 
-                doc_build = Builder(settings.MKDOCS_LOCATION)
-                doc_build.copy_templates(template_choice)
+                job_id = jobs().submit(
+                    f"Copying { template_choice } template",
+                    copy_template,
+                    template_choice,
+                )
 
                 messages.success(
                     request,
                     f"{ template_choice } template initiated",
                 )
 
+                pending_response = job_pending_response(request, job_id, "/")
+                if pending_response:
+                    return pending_response
+
                 context = {"form": PlaceholdersForm()}
 
                 return render(
@@ -195,7 +279,7 @@ def index(request: HttpRequest) -> HttpResponse:
         elif request.method == "POST":
             form = PlaceholdersForm(data=request.POST)  # type: ignore[assignment]
             if form.is_valid():
-                env_m.add("setup_step", "3")
+                settings_store.add("setup_step", "3")
 
                 doc_build = Builder(settings.MKDOCS_LOCATION)
                 placeholders = doc_build.get_placeholders()
@@ -204,6 +288,8 @@ def index(request: HttpRequest) -> HttpResponse:
                     placeholders[p] = form.cleaned_data[p]
 
                 doc_build.save_placeholders(placeholders)
+                docs_changed(doc_build.placeholders_yml_path)
+                docs_saved(doc_build.placeholders_yml_path)
 
                 messages.success(
                     request,
@@ -211,8 +297,15 @@ def index(request: HttpRequest) -> HttpResponse:
                 )
 
                 mkdocs = MkdocsControl()
-                if not mkdocs.start(wait=True):
-                    return render(request, "500.html")
+                job_id = jobs().submit(
+                    "Starting mkdocs", mkdocs.start, wait=True
+                )
+
+                if jobs().is_done(job_id):
+                    if jobs().status(job_id)["result"] is not True:
+                        return render(request, "500.html")
+                else:
+                    context = {"job_id": job_id}
 
                 return render(
                     request, "placeholders_saved.html", context | std_context()
@@ -337,6 +430,8 @@ def md_saved(request: HttpRequest) -> HttpResponse:
         file = open(file_path, "w")
         file.write(md_text_returned)
         file.close()
+        docs_changed(file_path)
+        docs_saved(file_path)
 
         messages.success(
             request,
@@ -392,10 +487,11 @@ def md_new(request: HttpRequest) -> HttpResponse:
     return render(request, "500.html", status=500)
 
 
-def hazard_log(request: HttpRequest) -> HttpResponse:
+async def hazard_log(request: HttpRequest) -> HttpResponse:
     """Logs hazards as issues on GitHub
 
-    Creates a hazard as an issue on GitHub
+    Creates a hazard as an issue on GitHub. The call to GitHub is made on the
+    event loop, so the worker can serve other requests while it waits.
 
     Args:
         request (HttpRequest): request from user
@@ -404,61 +500,67 @@ def hazard_log(request: HttpRequest) -> HttpResponse:
         HttpResponse: for loading the correct webpage
     """
     context: dict[str, Any] = {}
-    gc: GitController
+    gc: AsyncGitController
     form: LogHazardForm
     hazard: dict[str, Any] = {}
 
     if not (request.method == "GET" or request.method == "POST"):
-        return render(request, "405.html", std_context(), status=405)
+        return await async_render(request, "405.html", status=405)
 
     if request.method == "GET":
-        context = {"form": LogHazardForm()}
-        return render(request, "hazard_log.html", context | std_context())
+        context = {"form": await sync_to_async(LogHazardForm)()}
+        return await async_render(request, "hazard_log.html", context)
 
     if request.method == "POST":
-        form = LogHazardForm(request.POST)
-        if form.is_valid():
+        form = await sync_to_async(LogHazardForm)(request.POST)
+        if await sync_to_async(form.is_valid)():
             hazard["title"] = form.cleaned_data["title"]
             hazard["body"] = form.cleaned_data["body"]
             hazard["labels"] = form.cleaned_data["labels"]
-            gc = GitController()
+            gc = await sync_to_async(AsyncGitController)()
 
             try:
-                gc.hazard_log(
-                    hazard["title"], hazard["body"], hazard["labels"]
-                )
+                async with gc:
+                    await gc.hazard_log(
+                        hazard["title"], hazard["body"], hazard["labels"]
+                    )
             except Exception as error:
                 messages.error(
                     request,
                     f"Error returned from logging hazard - '{ error }'",
                 )
 
-                context = {"form": LogHazardForm(initial=request.POST)}
+                context = {
+                    "form": await sync_to_async(LogHazardForm)(
+                        initial=request.POST
+                    )
+                }
 
-                return render(
-                    request, "hazard_log.html", context | std_context()
-                )
+                return await async_render(request, "hazard_log.html", context)
             else:
+                await sync_to_async(HazardStore(gc).expire)()
                 messages.success(
                     request,
                     f"Hazard has been uploaded to GitHub",
                 )
-                context = {"form": LogHazardForm()}
-                return render(
-                    request, "hazard_log.html", context | std_context()
-                )
+                context = {"form": await sync_to_async(LogHazardForm)()}
+                return await async_render(request, "hazard_log.html", context)
         else:
             context = {"form": form}
-            return render(request, "hazard_log.html", context | std_context())
+            return await async_render(request, "hazard_log.html", context)
 
     # Should never really get here, but added for mypy
-    return render(request, "500.html", std_context(), status=500)
+    return await async_render(request, "500.html", status=500)
 
 
-def hazard_comment(request: HttpRequest, hazard_number: "str") -> HttpResponse:
+async def hazard_comment(
+    request: HttpRequest, hazard_number: "str"
+) -> HttpResponse:
     """Adds a comment to an issue
 
-    If an issue is available, will add a comment on GitHub
+    If an issue is available, will add a comment on GitHub. The calls to
+    GitHub are made on the event loop, so the worker can serve other requests
+    while they wait.
 
     Args:
         request (HttpRequest): request from user
@@ -466,15 +568,13 @@ def hazard_comment(request: HttpRequest, hazard_number: "str") -> HttpResponse:
     Returns:
         HttpResponse: for loading the correct webpage
     """
-    gc: GitController
-    hazards_open_full: list[dict[str, Any]] = []
-    hazard: dict[str, Any] = {}
-    hazard_open: dict = {}
+    gc: AsyncGitController
+    hazard: dict[str, Any] | HazardLookup
     form: HazardCommentForm
     context: dict[str, Any] = {}
 
     if not (request.method == "GET" or request.method == "POST"):
-        return render(request, "405.html", std_context(), status=405)
+        return await async_render(request, "405.html", status=405)
 
     try:
         int(hazard_number)
@@ -483,124 +583,315 @@ def hazard_comment(request: HttpRequest, hazard_number: "str") -> HttpResponse:
             request,
             f"hazard_number '{hazard_number }' is not valid",
         )
-        return render(request, "400.html", std_context(), status=400)
+        return await async_render(request, "400.html", status=400)
 
     if request.method == "GET":
-        gc = GitController(
-            github_repo=settings.GITHUB_REPO,
-            env_location=settings.ENV_LOCATION,
-        )
-        hazards_open_full = gc.hazards_open()
-
-        for hazard in hazards_open_full:
-            if hazard["number"] == int(hazard_number):
-                hazard_open = hazard.copy()
-                break
+        gc = await sync_to_async(AsyncGitController)()
+        try:
+            async with gc:
+                hazard = await gc.hazard(int(hazard_number))
+        except requests.exceptions.RequestException:
+            # GitHub is unavailable, so fall back to the local store
+            hazard = await sync_to_async(HazardStore(gc).hazard)(
+                int(hazard_number)
+            ) or (HazardLookup.NOT_FOUND)
+            if hazard is not HazardLookup.NOT_FOUND:
+                hazard["comments"] = []
+                messages.warning(
+                    request,
+                    "GitHub is not available, showing the last copy of the "
+                    "hazard",
+                )
+        except ValueError as error:
+            messages.error(
+                request,
+                f"Error returned from looking up hazard - '{ error }'",
+            )
+            return await async_render(request, "500.html", status=500)
 
-        if not hazard_open:
+        if hazard is HazardLookup.NOT_FOUND or hazard["state"] != "open":
             messages.error(
                 request,
                 f"hazard_number '{hazard_number }' is not valid",
             )
-            return render(request, "400.html", std_context(), status=400)
+            return await async_render(request, "400.html", status=400)
 
         context = {
-            "hazard_open": hazard_open,
+            "hazard_open": {
+                key: hazard[key]
+                for key in ("number", "title", "body", "labels")
+            },
+            "comments": hazard["comments"],
             "form": HazardCommentForm(
                 initial={"comment": c.TEMPLATE_HAZARD_COMMENT}
             ),
             "hazard_number": hazard_number,
         }
-        return render(request, "hazard_comment.html", context | std_context())
+        return await async_render(request, "hazard_comment.html", context)
 
     if request.method == "POST":
         form = HazardCommentForm(request.POST)
         if form.is_valid():
             comment = form.cleaned_data["comment"]
-            gc = GitController()
-            # TODO - need error handling here
-            gc.add_comment_to_hazard(
-                hazard_number=int(hazard_number), comment=comment
-            )
+            gc = await sync_to_async(AsyncGitController)()
+            try:
+                async with gc:
+                    await gc.add_comment_to_hazard(
+                        hazard_number=int(hazard_number), comment=comment
+                    )
+            except (ValueError, requests.exceptions.RequestException) as error:
+                messages.error(
+                    request,
+                    f"Error returned from updating hazard - '{ error }'",
+                )
+                context = {"form": form, "hazard_number": hazard_number}
+                return await async_render(
+                    request, "hazard_comment.html", context
+                )
+
             messages.success(
                 request,
                 f"Hazard '{ hazard_number }' updated.",
             )
-            context = {"form": LogHazardForm()}
-            return render(
-                request, "hazard_comment.html", context | std_context()
-            )
+            context = {"form": await sync_to_async(LogHazardForm)()}
+            return await async_render(request, "hazard_comment.html", context)
         else:
             context = {"form": form}
-            return render(
-                request, "hazard_comment.html", context | std_context()
-            )
+            return await async_render(request, "hazard_comment.html", context)
 
     # Should never really get here, but added for mypy
-    return render(request, "500.html", std_context(), status=500)
+    return await async_render(request, "500.html", status=500)
 
 
-# TODO - testing needed
-def hazards_open(request: HttpRequest) -> HttpResponse:
-    """Title
+async def hazards_open(request: HttpRequest) -> HttpResponseBase:
+    """Lists the open hazards
 
-    Description
+    Hazards are read from the local store. If the store has never been
+    synced, it is synced as a job, and the page polls the job until it is
+    done. Once older than c.HAZARD_SYNC_INTERVAL, it is synced in the
+    background. A POST syncs the store straight away. Syncs run on the job
+    queue, so they do not hold up the thread the async views share for
+    synchronous work.
+
+    Hazards can be filtered by label, risk level and text, and are shown a
+    page at a time. With "stream" set, all matching hazards are shown on one
+    page, which is streamed as the hazards are read from the store.
 
     Args:
         request (HttpRequest): request from user
 
     Returns:
-        HttpResponse: for loading the correct webpage
+        HttpResponseBase: for loading the correct webpage
     """
     context: dict[str, Any] = {}
-    gc: GitController
-    hazards_open: list[dict] = []
+    gc: AsyncGitController
+    store: HazardStore
+    job_id: str = ""
+    job: dict[str, Any] = {}
+    pending: HttpResponse | None = None
+    filter_form: HazardFilterForm
+    labels: list[str] = []
+    text: str = ""
+    page: int = 1
+    query: QueryDict
+    hazards_page: dict[str, Any]
 
     if not (request.method == "GET" or request.method == "POST"):
-        return render(request, "405.html", std_context(), status=405)
+        return await async_render(request, "405.html", status=405)
+
+    # TODO need to check github credentials are valid
+    gc = await sync_to_async(AsyncGitController)()
+    store = HazardStore(gc)
 
     if request.method == "GET":
-        # TODO need to check github credentials are valid
-        gc = GitController()
-        hazards_open = gc.hazards_open()
-        context = {"hazards_open": hazards_open}
+        if await sync_to_async(store.last_synced)() is None:
+            job_id = await sync_to_async(jobs().submit)(
+                "Syncing hazards", store.sync
+            )
+            job = await sync_to_async(jobs().status)(job_id)
+            if job["status"] == JobStatus.FAILED.value:
+                messages.error(
+                    request,
+                    f"Error returned from syncing hazards - '{ job['error'] }'",
+                )
+            else:
+                pending = await sync_to_async(job_pending_response)(
+                    request, job_id, request.get_full_path()
+                )
+                if pending is not None:
+                    return pending
+        elif await sync_to_async(store.is_stale)():
+            await sync_to_async(jobs().submit)(
+                "Syncing hazards", store.sync, blocking=False
+            )
+
+        filter_form = HazardFilterForm(request.GET)
+        if filter_form.is_valid():
+            labels = filter_form.labels()
+            text = filter_form.cleaned_data["text"]
+            page = filter_form.cleaned_data["page"] or 1
+
+        query = request.GET.copy()
+        query.pop("page", None)
+        query.pop("stream", None)
+        context = {
+            "filter_form": filter_form,
+            "page_query": query.urlencode(),
+            "hazards_synced": await sync_to_async(store.last_synced)(),
+        }
+
+        if request.GET.get("stream"):
+            return await hazards_open_stream(
+                request, context, store.aiter_hazards_open(labels, text)
+            )
 
-        return render(request, "hazards_open.html", context | std_context())
+        hazards_page = await sync_to_async(store.hazards_open_page)(
+            page, labels, text
+        )
+        context["hazards_open"] = hazards_page.pop("hazards")
+        context["hazards_page"] = hazards_page
+        return await async_render(request, "hazards_open.html", context)
 
     if request.method == "POST":
-        return HttpResponse("POST handling not yet built")
+        job_id = await sync_to_async(jobs().submit)(
+            "Syncing hazards", store.sync
+        )
+        pending = await sync_to_async(job_pending_response)(
+            request, job_id, "/hazards_open"
+        )
+        if pending is not None:
+            return pending
+
+        messages.success(request, "Hazards have been synced with GitHub")
+        return redirect("/hazards_open")
 
     # Should never really get here, but added for mypy
-    return render(request, "500.html", std_context(), status=500)
+    return await async_render(request, "500.html", status=500)
+
+
+@csrf_exempt
+def github_webhook(request: HttpRequest) -> HttpResponse:
+    """Receives GitHub webhook deliveries for the hazards
+
+    Deliveries must be signed with the secret set as GITHUB_WEBHOOK_SECRET.
+    Changes to hazards, their comments and the repository labels are applied
+    to the local store of hazards straight away.
+
+    Args:
+        request (HttpRequest): request from GitHub
+
+    Returns:
+        HttpResponse: JSON with what was done, or the error
+    """
+    webhook: HazardWebhook = HazardWebhook(
+        os.getenv(c.EnvKeys.GITHUB_WEBHOOK_SECRET.value, "")
+    )
+    payload: Any
+    outcome: str = ""
+
+    if request.method != "POST":
+        return JsonResponse({"error": "Method not allowed"}, status=405)
+
+    if webhook.secret == "":
+        return JsonResponse(
+            {"error": "Webhook secret has not been set"}, status=404
+        )
+
+    if not webhook.verify(
+        request.body, request.headers.get("X-Hub-Signature-256", "")
+    ):
+        return JsonResponse({"error": "Signature not valid"}, status=403)
+
+    try:
+        payload = json.loads(request.body)
+        outcome = webhook.handle(
+            request.headers.get("X-GitHub-Event", ""), payload
+        )
+    except ValueError as error:
+        return JsonResponse({"error": str(error)}, status=400)
+
+    return JsonResponse({"outcome": outcome})
 
 
 def mkdoc_redirect(request: HttpRequest, path: str) -> HttpResponse:
-    """Title
+    """Redirects to the static site
 
-    Description
+    Kept for older links, the static site is now served by mkdoc_site.
 
     Args:
         request (HttpRequest): request from user
+        path (str): page of the static site, "home" for the index page
     Returns:
         HttpResponse: for loading the correct webpage
     """
-    mkdocs: MkdocsControl
-
     if not request.method == "GET":
         return render(request, "405.html", std_context(), status=405)
 
-    mkdocs = MkdocsControl()
-    mkdocs.start()
-
-    # TODO - need message page for if mkdocs is not running
-
     if path == "home":
-        return redirect(f"http://localhost:9000")
+        return redirect("mkdoc_site_home")
     else:
-        return redirect(f"http://localhost:9000/{ path }")
+        return redirect("mkdoc_site", path=path)
 
-    # Should never really get here, but added for mypy
-    return render(request, "500.html", std_context(), status=500)
+
+def mkdoc_site(request: HttpRequest, path: str = "") -> HttpResponseBase:
+    """Serves the static site built by mkdocs
+
+    Files are served with strong entity tags and conditional GETs are
+    answered with 304 Not Modified. Assets with a content hash in their name
+    are marked as immutable. Where set in settings, the file itself is sent
+    by the reverse proxy using X-Sendfile or X-Accel-Redirect. If the site has
+    not yet been built, a build is started, unless one is already pending.
+
+    Args:
+        request (HttpRequest): request from user
+        path (str): path of the file, relative to the site root
+    Returns:
+        HttpResponseBase: for loading the correct webpage
+    """
+    site: StaticSite = StaticSite(settings.MKDOCS_SITE_LOCATION)
+    file_path: str = ""
+    last_modified: int = 0
+    etag: str = ""
+    job_id: str = ""
+    pending_response: HttpResponse | None
+    response: HttpResponseBase | None
+
+    if not (request.method == "GET" or request.method == "HEAD"):
+        return render(request, "405.html", std_context(), status=405)
+
+    if not site.is_built():
+        job_id = site_build_job()
+
+        pending_response = job_pending_response(request, job_id, request.path)
+        if pending_response:
+            return pending_response
+
+    try:
+        file_path = site.resolve(path)
+    except FileNotFoundError:
+        return render(request, "404.html", std_context(), status=404)
+
+    if (
+        path
+        and not path.endswith("/")
+        and not path.endswith(".html")
+        and file_path.endswith(f"{ os.sep }index.html")
+    ):
+        return redirect(f"{ request.path }/")
+
+    etag = site.etag(file_path)
+    last_modified = int(os.stat(file_path).st_mtime)
+
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        response = site_file_response(site, file_path)
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Cache-Control"] = site.cache_control(file_path)
+    return response
 
 
 # TODO - testing needed
@@ -618,6 +909,7 @@ def upload_to_github(request: HttpRequest) -> HttpResponse:
     context: dict[str, Any] = {}
     gc: GitController
     form: UploadToGithubForm
+    job_id: str = ""
 
     if not (request.method == "GET" or request.method == "POST"):
         return render(request, "405.html", std_context(), status=405)
@@ -635,12 +927,19 @@ def upload_to_github(request: HttpRequest) -> HttpResponse:
             comment = form.cleaned_data["comment"]
             gc = GitController()
             # TODO - need to handle if branch is already up to date
-            gc.commit_and_push(comment)
-            messages.success(
-                request,
-                f"Uploaded to Github with a comment of '{ comment }'",
+            job_id = jobs().submit(
+                "Uploading to Github", gc.commit_and_push, comment
             )
-            context = {"form": UploadToGithubForm()}
+
+            if jobs().is_done(job_id):
+                push_message(request, jobs().status(job_id), comment)
+                context = {"form": UploadToGithubForm()}
+            else:
+                messages.success(
+                    request,
+                    f"Uploading to Github with a comment of '{ comment }'",
+                )
+                context = {"form": UploadToGithubForm(), "job_id": job_id}
             return render(
                 request, "upload_to_github.html", context | std_context()
             )
@@ -655,25 +954,80 @@ def upload_to_github(request: HttpRequest) -> HttpResponse:
     return render(request, "500.html", std_context(), status=500)
 
 
-# -----
+def push_message(
+    request: HttpRequest, job: dict[str, Any], comment: str
+) -> None:
+    """Tells the user how an upload to GitHub went
 
+    Args:
+        request (HttpRequest): request from user
+        job (dict[str, Any]): status of the completed upload job
+        comment (str): the commit comment
+    """
+    outcome: Any = job["result"]
 
-# TODO needs testing
-def setup_step_get(env_location: str = settings.ENV_LOCATION) -> int:
-    """Pulls 'setup_step" from .env and converts to int
+    if job["status"] == JobStatus.FAILED.value or not isinstance(
+        outcome, dict
+    ):
+        messages.error(
+            request, f"Error returned from uploading - '{ job['error'] }'"
+        )
+    elif outcome["status"] == PushStatus.PUSHED.value:
+        messages.success(
+            request,
+            f"Uploaded to Github with a comment of '{ comment }' "
+            f"({ len(outcome.get('files', [])) } file(s) changed)",
+        )
+    elif outcome["status"] == PushStatus.NOTHING_TO_COMMIT.value:
+        messages.info(request, "No changes to upload to Github")
+    else:
+        messages.error(
+            request,
+            f"Error returned from uploading - '{ outcome['summary'] }'",
+        )
+    return
 
-    Extracts the setup step from the local environment file and returns this as
-    an integer
+
+def job_status(request: HttpRequest, job_id: str) -> HttpResponse:
+    """Reports the status of a background job
+
+    Returns the status of a job, as submitted to the job queue, in json so
+    that it can be polled from the browser.
 
     Args:
-        env_location (str): location of the environmental variables file.
+        request (HttpRequest): request from user
+        job_id (str): ID of the job
+
+    Returns:
+        HttpResponse: json of the job status, or a 404 if the job is unknown
+    """
+    if not request.method == "GET":
+        return JsonResponse({"error": "Method not allowed"}, status=405)
+
+    try:
+        return JsonResponse(jobs().status(job_id))
+    except KeyError:
+        return JsonResponse(
+            {"error": f"'{ job_id }' is not a known job"}, status=404
+        )
+
+
+# -----
+
+
+# TODO needs testing
+def setup_step_get() -> int:
+    """Pulls 'setup_step" from the settings store and converts to int
+
+    Extracts the setup step from the settings store and returns this as an
+    integer
 
     Returns:
         int: value of setup_step, sets to zero (0) if variable is set to empty
-             string or does not exist in the env file.
+             string or does not exist in the settings store.
     """
-    env_m: ENVManipulator = ENVManipulator(env_location)
-    setup_step: str | None = env_m.read("setup_step")
+    settings_store: SettingsStore = SettingsStore()
+    setup_step: str | None = settings_store.read("setup_step")
     return_value: int = 0
 
     if setup_step == None or setup_step == "":
@@ -700,7 +1054,7 @@ def std_context() -> dict[str, Any]:
     setup_step: int = 0
 
     mkdocs = MkdocsControl()
-    mkdoc_running = mkdocs.is_process_running()
+    mkdoc_running = mkdocs.is_started()
 
     setup_step = setup_step_get()
 
@@ -717,6 +1071,127 @@ def std_context() -> dict[str, Any]:
     return std_context_dict
 
 
+async def async_render(
+    request: HttpRequest,
+    template_name: str,
+    context: dict[str, Any] | None = None,
+    status: int = 200,
+) -> HttpResponse:
+    """Renders a page from an async view
+
+    Rendering reads the settings store and the messages, so is run as
+    synchronous code.
+
+    Args:
+        request (HttpRequest): request from user
+        template_name (str): template to render
+        context (dict[str, Any] | None): context for the template, std_context
+                                         is added to it.
+        status (int): status code of the response
+
+    Returns:
+        HttpResponse: the rendered page
+    """
+
+    def render_page() -> HttpResponse:
+        return render(
+            request,
+            template_name,
+            (context or {}) | std_context(),
+            status=status,
+        )
+
+    return await sync_to_async(render_page)()
+
+
+async def hazards_open_stream(
+    request: HttpRequest,
+    context: dict[str, Any],
+    hazards: AsyncIterator[dict[str, Any]],
+) -> StreamingHttpResponse:
+    """Streams the open hazards page
+
+    The page is rendered without the hazards, and sent up to where they go
+    straight away. Each hazard is then rendered and sent as it is read, so
+    the whole list is never held in memory. The content is an async iterator,
+    and the app is served on ASGI (dcsp.asgi, under uvicorn), so the hazards
+    are sent as they are read. Under WSGI Django would collect them first.
+
+    Args:
+        request (HttpRequest): request from user
+        context (dict[str, Any]): context for the hazards_open.html template,
+                                  std_context is added to it.
+        hazards (AsyncIterator[dict[str, Any]]): the hazards to list.
+
+    Returns:
+        StreamingHttpResponse: the page
+    """
+    marker: str = f"dcsp-hazards-{ uuid.uuid4().hex }"
+    page: str
+    head: str
+    tail: str
+    hazard_template = get_template("hazard_open.html")
+
+    def render_page() -> str:
+        return render_to_string(
+            "hazards_open.html",
+            context | {"hazards_stream": marker} | std_context(),
+            request=request,
+        )
+
+    page = await sync_to_async(render_page)()
+    head, tail = page.split(marker, 1)
+
+    async def content() -> AsyncIterator[str]:
+        hazard: dict[str, Any]
+
+        yield head
+        async for hazard in hazards:
+            yield hazard_template.render({"hazard": hazard})
+        yield tail
+
+    return StreamingHttpResponse(content(), content_type="text/html")
+
+
+def jobs() -> JobQueue:
+    """Returns the job queue for background tasks
+
+    Returns:
+        JobQueue: the process-wide job queue, set up from settings
+    """
+    return job_queue(settings.JOBS_LOCATION, settings.BACKGROUND_JOBS)
+
+
+def job_pending_response(
+    request: HttpRequest, job_id: str, next_url: str
+) -> HttpResponse | None:
+    """Response for a background job that may not be complete
+
+    Args:
+        request (HttpRequest): request from user
+        job_id (str): ID of the job
+        next_url (str): where the browser is sent once the job is complete
+
+    Returns:
+        HttpResponse | None: a page that polls the job if it is still queued
+                             or running, a 500 page if the job failed, or
+                             None if the job has completed successfully.
+    """
+    job: dict[str, Any] = jobs().status(job_id)
+
+    if job["status"] == JobStatus.FAILED.value:
+        return render(request, "500.html", std_context(), status=500)
+
+    if job["status"] != JobStatus.FINISHED.value:
+        return render(
+            request,
+            "job_status.html",
+            {"job_id": job_id, "next_url": next_url} | std_context(),
+        )
+
+    return None
+
+
 def start_afresh(request: HttpRequest) -> HttpResponse:
     """Title
 
@@ -728,31 +1203,197 @@ def start_afresh(request: HttpRequest) -> HttpResponse:
     Returns:
         HttpResponse: for loading the correct webpage
     """
-
-    env_m: ENVManipulator
-    mkdocs: MkdocsControl
-    # root, dirs, files, d
+    job_id: str = ""
+    pending_response: HttpResponse | None
 
     if not request.method == "GET":
         return render(request, "405.html", std_context(), status=405)
 
     if settings.START_AFRESH or settings.TESTING:
-        for root, dirs, files in os.walk(settings.MKDOCS_DOCS_LOCATION):
-            for file in files:
-                if not fnmatch(file, ".gitkeep"):
-                    os.unlink(os.path.join(root, file))
-            for d in dirs:
-                shutil.rmtree(os.path.join(root, d))
-
-        env_m = ENVManipulator(settings.ENV_LOCATION)
-        env_m.delete_all()
-
-        mkdocs = MkdocsControl()
-        if not mkdocs.stop(wait=True):
+        job_id = jobs().submit("Starting afresh", reset_installation)
+
+        pending_response = job_pending_response(request, job_id, "/")
+        if pending_response:
+            return pending_response
+
+        if jobs().status(job_id)["result"] is not True:
             return render(request, "500.html", status=500)
     return redirect("/")
 
 
+def reset_installation() -> bool:
+    """Removes all documents and settings
+
+    Empties the docs folder, clears the settings store and stops mkdocs.
+
+    Returns:
+        bool: False if mkdocs did not stop in the allotted time
+    """
+    settings_store: SettingsStore
+    mkdocs: MkdocsControl
+
+    for root, dirs, files in os.walk(settings.MKDOCS_DOCS_LOCATION):
+        for file in files:
+            if not fnmatch(file, ".gitkeep"):
+                os.unlink(os.path.join(root, file))
+        for d in dirs:
+            shutil.rmtree(os.path.join(root, d))
+
+    settings_store = SettingsStore()
+    settings_store.delete_all()
+    docs_changed(settings.MKDOCS_DOCS_LOCATION)
+
+    mkdocs = MkdocsControl()
+    return mkdocs.stop(wait=True)
+
+
+def copy_template(template_choice: str) -> None:
+    """Copies a template into the docs folder
+
+    Args:
+        template_choice (str): name of the template to copy.
+    """
+    doc_build: Builder = Builder(settings.MKDOCS_LOCATION)
+
+    doc_build.copy_templates(template_choice)
+    docs_changed(settings.MKDOCS_DOCS_LOCATION)
+    return
+
+
+def docs_changed(path: str) -> None:
+    """Schedules a rebuild of the static site after a change
+
+    Changes are coalesced by the rebuild scheduler, so calling this for every
+    file touched results in one build.
+
+    Args:
+        path (str): file or folder that changed.
+    """
+    if settings.MKDOCS_REBUILD_ON_CHANGE:
+        MkdocsControl(settings.MKDOCS_LOCATION).notify_change(path)
+    return
+
+
+def docs_saved(path: str) -> None:
+    """Records a document saved by the user, for committing automatically
+
+    Only if AUTO_COMMIT is set. Saves are coalesced until none have been made
+    for AUTO_COMMIT_QUIET seconds, then committed and pushed together.
+
+    Args:
+        path (str): file that was saved.
+    """
+    if settings.AUTO_COMMIT:
+        auto_committer().record(path)
+    return
+
+
+def auto_committer() -> AutoCommit:
+    """Returns the auto-commit for documents saved by the user
+
+    Returns:
+        AutoCommit: the process-wide auto-commit, set up from settings
+    """
+    return auto_commit(
+        push_saved_docs,
+        settings.AUTO_COMMIT_JOURNAL,
+        settings.AUTO_COMMIT_QUIET,
+        settings.MKDOCS_DOCS_LOCATION,
+    )
+
+
+def push_saved_docs(commit_message: str, paths: list[str]) -> dict[str, Any]:
+    """Commits and pushes the documents, for the auto-commit
+
+    Args:
+        commit_message (str): message listing the documents saved.
+        paths (list[str]): the documents saved.
+
+    Returns:
+        dict[str, Any]: outcome of the push.
+    """
+    gc: GitController = GitController()
+
+    return gc.commit_and_push(
+        commit_message,
+        paths=[os.path.relpath(path, gc.repo_path_local) for path in paths],
+    )
+
+
+def build_site() -> dict[str, Any]:
+    """Builds the static site
+
+    Returns:
+        dict[str, Any]: results of the build
+
+    Raises:
+        RuntimeError: if the build failed
+    """
+    results: dict[str, Any] = MkdocsControl(settings.MKDOCS_LOCATION).build(
+        settings.MKDOCS_SITE_LOCATION
+    )
+
+    if not results["success"]:
+        raise RuntimeError(f"Site build failed - { results['error'] }")
+    return results
+
+
+_site_build_job_id: str = ""
+_site_build_lock: threading.Lock = threading.Lock()
+
+
+def site_build_job() -> str:
+    """Job building the static site
+
+    Requests for the site while it is being built, such as for its assets or
+    from the page polling the build, share the one build.
+
+    Returns:
+        str: ID of the build job still queued or running, or of a new one.
+    """
+    global _site_build_job_id
+    pending: bool = False
+
+    with _site_build_lock:
+        try:
+            pending = _site_build_job_id != "" and not jobs().is_done(
+                _site_build_job_id
+            )
+        except KeyError:
+            pending = False
+
+        if not pending:
+            _site_build_job_id = jobs().submit("Building site", build_site)
+    return _site_build_job_id
+
+
+def site_file_response(site: StaticSite, file_path: str) -> HttpResponseBase:
+    """Response that sends a file of the static site
+
+    Args:
+        site (StaticSite): the static site.
+        file_path (str): absolute path of the file to send.
+
+    Returns:
+        HttpResponseBase: the file, or headers for the reverse proxy to send it
+    """
+    response: HttpResponseBase
+
+    if settings.SENDFILE_BACKEND == "x-accel-redirect":
+        response = HttpResponse(content_type=site.content_type(file_path))
+        response[
+            "X-Accel-Redirect"
+        ] = f"{ settings.SENDFILE_URL_PREFIX }{ quote(site.relative_path(file_path)) }"
+    elif settings.SENDFILE_BACKEND == "x-sendfile":
+        response = HttpResponse(content_type=site.content_type(file_path))
+        response["X-Sendfile"] = file_path
+    else:
+        response = FileResponse(
+            open(file_path, "rb"), content_type=site.content_type(file_path)
+        )
+    return response
+
+
 def custom_404(request: HttpRequest, exception) -> HttpResponse:
     """Title
 
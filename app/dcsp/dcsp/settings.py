@@ -31,8 +31,24 @@ ENV_LOCATION = c.ENV_PATH
 GITHUB_REPO = c.REPO_NAME
 MKDOCS_LOCATION = c.MKDOCS
 MKDOCS_DOCS_LOCATION = c.MKDOCS_DOCS
+MKDOCS_SITE_LOCATION = c.MKDOCS_SITE
 TESTING = False
 START_AFRESH = True
+JOBS_LOCATION = c.JOBS_STATUS_PATH
+BACKGROUND_JOBS = True
+MKDOCS_REBUILD_ON_CHANGE = True
+# Set to True to commit and push documents saved by the user once no more
+# have been saved for AUTO_COMMIT_QUIET seconds
+AUTO_COMMIT = False
+AUTO_COMMIT_QUIET = c.AUTO_COMMIT_QUIET
+AUTO_COMMIT_JOURNAL = c.AUTO_COMMIT_JOURNAL_PATH
+
+# How the built mkdocs site is handed to the reverse proxy. Set to
+# "x-sendfile" (Apache) or "x-accel-redirect" (Nginx) to have the proxy send
+# the file, or leave empty to have Django send the file itself.
+SENDFILE_BACKEND = ""
+# Internal location of the site on the proxy, for "x-accel-redirect"
+SENDFILE_URL_PREFIX = "/internal/site/"
 
 if not DEBUG:
     START_AFRESH = False
@@ -89,6 +105,8 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "dcsp.wsgi.application"
+# Served with uvicorn, so the async views run on the event loop
+ASGI_APPLICATION = "dcsp.asgi.application"
 
 
 # Database
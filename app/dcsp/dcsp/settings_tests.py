@@ -7,5 +7,10 @@ ENV_LOCATION = c.TESTING_ENV_PATH_DJANGO
 GITHUB_REPO = c.TESTING_GITHUB_REPO
 MKDOCS_LOCATION = c.TESTING_MKDOCS
 MKDOCS_DOCS_LOCATION = c.TESTING_MKDOCS_DOCS
+MKDOCS_SITE_LOCATION = c.TESTING_MKDOCS_SITE
 TESTING = True
 START_AFRESH = True
+JOBS_LOCATION = c.TESTING_JOBS_STATUS_PATH
+BACKGROUND_JOBS = False
+MKDOCS_REBUILD_ON_CHANGE = False
+AUTO_COMMIT_JOURNAL = c.TESTING_AUTO_COMMIT_JOURNAL_PATH